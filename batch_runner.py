@@ -0,0 +1,284 @@
+import argparse # Mengimpor argparse untuk antarmuka baris perintah
+import csv # Mengimpor csv untuk menulis ringkasan gabungan
+import json # Mengimpor json untuk file ringkasan per video (penanda selesai)
+import multiprocessing # Mengimpor multiprocessing untuk konteks proses "spawn"
+import os # Mengimpor os untuk operasi path dan direktori
+import sys # Mengimpor sys untuk kode keluar program
+import time # Mengimpor time untuk mengukur durasi batch
+from concurrent.futures import ProcessPoolExecutor, as_completed # Mengimpor process pool untuk memakai semua core
+
+from rppg_methods import RPPG_METHODS # Metode ekstraksi sinyal rPPG yang tersedia (hanya NumPy, tetap ringan)
+from respiration_methods import RESPIRATION_METHODS # Metode ekstraksi sinyal pernapasan (OpenCV diimpor di worker)
+from face_mesh_roi import FACE_ROI_MODES # Mode ROI wajah rPPG (OpenCV diimpor di worker)
+
+# Ekstensi file yang dianggap sebagai video saat memindai direktori
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v", ".vraw")
+# Nama file ringkasan gabungan di direktori hasil
+SUMMARY_FILENAME = "ringkasan_batch.csv"
+
+# OfflineProcessor milik proses worker; dibuat sekali per proses oleh `_init_worker`
+_worker_processor = None
+
+
+def _init_worker(hop_sec, detect_interval, inference_scale, rppg_method, respiration_method, face_roi):
+    """
+    Inisialisasi proses worker: membuat satu OfflineProcessor (beserta model MediaPipe Pose
+    dan FaceDetection) yang dipakai ulang untuk semua video yang ditangani worker ini.
+    """
+    global _worker_processor
+    import cv2 # Diimpor di dalam worker agar proses utama tetap ringan
+    cv2.setNumThreads(1) # Paralelisme sudah di level proses; hindari oversubscription thread OpenCV
+    from offline_processor import OfflineProcessor
+    _worker_processor = OfflineProcessor(hop_sec=hop_sec, detect_interval=detect_interval,
+                                         inference_scale=inference_scale, rppg_method=rppg_method,
+                                         respiration_method=respiration_method, face_roi=face_roi)
+
+
+def _process_one(video_path, output_dir, marker_path):
+    """
+    Memproses satu video di proses worker, lalu menulis file ringkasan (penanda selesai) secara atomik.
+
+    Returns:
+        dict: Ringkasan hasil, atau dict berisi 'error' jika video gagal diproses.
+    """
+    try:
+        summary = _worker_processor.process_file(video_path, output_dir)
+    except Exception as e:
+        summary = None
+        error = str(e)
+    else:
+        error = "video tidak dapat dibuka"
+    if summary is None:
+        return {"file": video_path, "error": error}
+    summary["worker_pid"] = os.getpid()
+    # Tulis ke file sementara lalu rename, agar penanda tidak pernah setengah jadi jika proses dihentikan
+    tmp_path = marker_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp_path, marker_path)
+    return summary
+
+
+def find_videos(inputs):
+    """
+    Mengumpulkan file video dari daftar file dan/atau direktori (dipindai secara rekursif).
+
+    Args:
+        inputs (list): Daftar path file atau direktori.
+
+    Returns:
+        list: Daftar tuple (path_video, direktori_dasar) yang sudah diurutkan.
+    """
+    videos = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                for name in filenames:
+                    if name.lower().endswith(VIDEO_EXTENSIONS):
+                        videos.append((os.path.join(dirpath, name), path))
+        else:
+            videos.append((path, os.path.dirname(path)))
+    return sorted(videos)
+
+
+class BatchRunner:
+    """
+    Penjadwal batch yang membagi video ke beberapa proses worker (process pool).
+
+    Setiap worker memiliki OfflineProcessor berumur panjang (model MediaPipe dibuat sekali per
+    proses). Hasil setiap video ditulis ke subdirektori yang mencerminkan struktur direktori
+    input, disertai file `<nama>_ringkasan.json` yang sekaligus menjadi penanda selesai.
+    Jika batch dihentikan di tengah jalan, menjalankan ulang perintah yang sama akan
+    melewati video yang sudah memiliki penanda (resume).
+    """
+    def __init__(self, output_dir, workers=None, hop_sec=1.0, resume=True, detect_interval=5, inference_scale=0.5,
+                 rppg_method="pos", respiration_method="intensity", face_roi="box"):
+        """
+        Konstruktor untuk kelas BatchRunner.
+
+        Args:
+            output_dir (str): Direktori hasil.
+            workers (int, optional): Jumlah proses worker. Default: jumlah core CPU.
+            hop_sec (float, optional): Selang waktu antar estimasi laju (detik video). Defaultnya adalah 1.0.
+            resume (bool, optional): Jika True, video yang sudah selesai dilewati. Defaultnya adalah True.
+            detect_interval (int, optional): Deteksi MediaPipe penuh setiap N frame. Defaultnya adalah 5.
+            inference_scale (float, optional): Skala resolusi untuk inferensi MediaPipe. Defaultnya adalah 0.5.
+            rppg_method (str, optional): Metode ekstraksi sinyal rPPG ("green", "chrom", "pos"). Defaultnya adalah "pos".
+            respiration_method (str, optional): Metode ekstraksi sinyal pernapasan ("intensity", "flow", "landmark").
+                                                Defaultnya adalah "intensity".
+            face_roi (str, optional): Mode ROI wajah rPPG ("box", "mesh"). Defaultnya adalah "box".
+        """
+        self.output_dir = output_dir # Direktori hasil
+        self.workers = workers or os.cpu_count() or 1 # Jumlah proses worker
+        self.hop_sec = hop_sec # Selang waktu antar estimasi laju
+        self.resume = resume # Flag resume
+        self.detect_interval = detect_interval # Interval deteksi MediaPipe penuh
+        self.inference_scale = inference_scale # Skala resolusi inferensi MediaPipe
+        self.rppg_method = rppg_method # Metode ekstraksi sinyal rPPG
+        self.respiration_method = respiration_method # Metode ekstraksi sinyal pernapasan
+        self.face_roi = face_roi # Mode ROI wajah rPPG
+
+    def _paths_for(self, video_path, root_dir):
+        """
+        Menentukan direktori hasil dan path penanda selesai untuk satu video.
+
+        Direktori hasil mencerminkan path video relatif terhadap `root_dir` (induk bersama semua input),
+        sehingga video bernama sama dari direktori berbeda tidak menulis ke file hasil yang sama.
+        """
+        rel_dir = os.path.relpath(os.path.dirname(os.path.abspath(video_path)), root_dir)
+        out_dir = os.path.normpath(os.path.join(self.output_dir, rel_dir))
+        stem = os.path.splitext(os.path.basename(video_path))[0]
+        return out_dir, os.path.join(out_dir, f"{stem}_ringkasan.json")
+
+    def run(self, inputs):
+        """
+        Menjalankan batch untuk semua video pada `inputs`.
+
+        Args:
+            inputs (list): Daftar path file atau direktori video.
+
+        Returns:
+            tuple: (jumlah video berhasil, jumlah video gagal).
+        """
+        videos = find_videos(inputs)
+        # Induk bersama direktori dasar semua input; untuk satu direktori input sama dengan direktori itu
+        bases = [os.path.abspath(base_dir or ".") for _, base_dir in videos]
+        try:
+            root_dir = os.path.commonpath(bases) if bases else os.path.abspath(".")
+        except ValueError:
+            root_dir = None # Input di drive berbeda (Windows): path hasil relatif terhadap direktori dasar masing-masing
+        pending = [] # Video yang belum selesai
+        markers = [] # Semua penanda selesai (untuk ringkasan gabungan)
+        for (video_path, _), base in zip(videos, bases):
+            out_dir, marker_path = self._paths_for(video_path, root_dir or base)
+            markers.append(marker_path)
+            if self.resume and os.path.exists(marker_path):
+                continue # Sudah diproses pada run sebelumnya
+            os.makedirs(out_dir, exist_ok=True)
+            pending.append((video_path, out_dir, marker_path))
+        print(f"{len(videos)} video ditemukan, {len(videos) - len(pending)} sudah selesai, "
+              f"{len(pending)} akan diproses dengan {self.workers} worker.")
+
+        done = 0
+        failed = 0
+        total_frames = 0
+        start = time.perf_counter()
+        try:
+            if pending:
+                done, failed, total_frames = self._run_pool(pending)
+        finally:
+            # Ringkasan selalu ditulis (juga jika batch terhenti), berisi semua video yang sudah selesai
+            elapsed = time.perf_counter() - start
+            if elapsed > 0 and total_frames:
+                print(f"Total: {total_frames} frame dalam {elapsed:.1f} s ({total_frames / elapsed:.1f} frame/detik).")
+            self.write_summary(markers)
+        return done, failed
+
+    def _run_pool(self, pending):
+        """
+        Memproses video yang belum selesai di process pool.
+
+        Args:
+            pending (list): Daftar tuple (path_video, direktori_hasil, path_penanda).
+
+        Returns:
+            tuple: (jumlah video berhasil, jumlah video gagal, total frame yang diproses).
+        """
+        done = 0
+        failed = 0
+        total_frames = 0
+        # Konteks "spawn" agar setiap worker memulai runtime MediaPipe/TensorFlow yang bersih
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(pending)), mp_context=context,
+                                 initializer=_init_worker, initargs=(self.hop_sec, self.detect_interval, self.inference_scale,
+                                                                     self.rppg_method, self.respiration_method,
+                                                                     self.face_roi)) as executor:
+            futures = {executor.submit(_process_one, *job): job[0] for job in pending} # Future -> path video
+            try:
+                for future in as_completed(futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Worker mati (misalnya BrokenProcessPool karena crash di MediaPipe/OpenCV): video dicatat
+                        # gagal tanpa penanda selesai, sehingga diproses ulang saat resume
+                        result = {"file": futures[future], "error": f"{type(e).__name__}: {e}"}
+                    if "error" in result:
+                        failed += 1
+                        print(f"Gagal: {result['file']} ({result['error']})")
+                        continue
+                    done += 1
+                    total_frames += result["frames"]
+                    print(f"[{done + failed}/{len(pending)}] {result['file']}: {result['frames']} frame, "
+                          f"{result['fps']:.1f} frame/detik")
+            except KeyboardInterrupt:
+                # Batalkan antrian; video yang sudah selesai tetap memiliki penanda untuk resume
+                print("Dihentikan. Jalankan ulang perintah yang sama untuk melanjutkan.")
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        return done, failed, total_frames
+
+    def write_summary(self, marker_paths):
+        """
+        Menggabungkan semua ringkasan per video (termasuk dari run sebelumnya) ke satu file CSV.
+
+        Args:
+            marker_paths (list): Daftar path file `<nama>_ringkasan.json`.
+
+        Returns:
+            str: Path file ringkasan gabungan.
+        """
+        rows = []
+        for marker_path in marker_paths:
+            if os.path.exists(marker_path):
+                with open(marker_path) as f:
+                    rows.append(json.load(f))
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary_path = os.path.join(self.output_dir, SUMMARY_FILENAME)
+        columns = ["file", "output", "frames", "duration_sec", "elapsed_sec", "fps", "realtime_factor",
+                   "heart_rate_bpm", "respiration_rate_per_min"]
+        with open(summary_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Ringkasan {len(rows)} video ditulis ke {summary_path}.")
+        return summary_path
+
+
+def main(argv=None):
+    """
+    Titik masuk CLI: memproses banyak video (file atau direktori) dengan beberapa proses worker.
+
+    Args:
+        argv (list, optional): Argumen baris perintah. Default: sys.argv[1:].
+
+    Returns:
+        int: Kode keluar (0 jika semua video berhasil diproses).
+    """
+    parser = argparse.ArgumentParser(description="Memproses banyak video rekaman secara paralel (multi-proses).")
+    parser.add_argument("inputs", nargs="+", help="File video dan/atau direktori berisi video")
+    parser.add_argument("-o", "--output-dir", default="hasil_batch", help="Direktori hasil (default: hasil_batch)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Jumlah proses worker (default: jumlah core CPU)")
+    parser.add_argument("--hop", type=float, default=1.0, help="Selang waktu antar estimasi laju dalam detik (default: 1.0)")
+    parser.add_argument("--detect-interval", type=int, default=5,
+                        help="Deteksi MediaPipe penuh setiap N frame, ROI dilacak di antaranya (default: 5)")
+    parser.add_argument("--inference-scale", type=float, default=0.5,
+                        help="Skala resolusi untuk inferensi MediaPipe (default: 0.5)")
+    parser.add_argument("--rppg-method", choices=RPPG_METHODS, default="pos",
+                        help="Metode ekstraksi sinyal rPPG (default: pos)")
+    parser.add_argument("--respiration-method", choices=RESPIRATION_METHODS, default="intensity",
+                        help="Metode ekstraksi sinyal pernapasan: intensity, flow, atau landmark (default: intensity)")
+    parser.add_argument("--face-roi", choices=FACE_ROI_MODES, default="box",
+                        help="ROI wajah rPPG: box (sub-ROI persegi) atau mesh (masker kulit dari landmark Face Mesh) (default: box)")
+    parser.add_argument("--no-resume", action="store_true", help="Proses ulang semua video walaupun sudah selesai")
+    args = parser.parse_args(argv)
+
+    runner = BatchRunner(args.output_dir, workers=args.workers, hop_sec=args.hop, resume=not args.no_resume,
+                         detect_interval=args.detect_interval, inference_scale=args.inference_scale,
+                         rppg_method=args.rppg_method, respiration_method=args.respiration_method,
+                         face_roi=args.face_roi)
+    _, failed = runner.run(args.inputs)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
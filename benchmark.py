@@ -0,0 +1,577 @@
+import argparse # Mengimpor argparse untuk antarmuka baris perintah
+import json # Mengimpor json untuk menyimpan dan membaca baseline
+import os # Mengimpor os untuk operasi path
+import platform # Mengimpor platform untuk mencatat informasi mesin di hasil benchmark
+import subprocess # Mengimpor subprocess untuk mengukur cold start di interpreter baru
+import tempfile # Mengimpor tempfile untuk direktori sesi sementara pemeriksaan filter penyimpanan
+import sys # Mengimpor sys untuk kode keluar program
+import time # Mengimpor time untuk pengukuran durasi
+
+import cv2 # Mengimpor OpenCV untuk menggambar klip sintetis
+import numpy as np # Mengimpor NumPy untuk pembuatan frame dan statistik latensi
+
+# Batas absolut galat estimasi laju terhadap ground truth (selalu diperiksa, dengan atau tanpa baseline)
+MAX_HEART_RATE_ERROR_BPM = 3.0
+MAX_RESPIRATION_RATE_ERROR = 2.0
+# Korelasi minimum kolom "filtered" penyimpanan sesi (timestamp ber-jitter) dengan filter fs tetap
+MIN_STORE_FILTER_CORRELATION = 0.99
+# Toleransi tambahan galat estimasi terhadap baseline sebelum dianggap regresi
+ACCURACY_TOLERANCE = 1.0
+# Kenaikan latensi absolut minimum (ms) agar dianggap regresi; menghindari alarm palsu pada fungsi mikro
+MIN_REGRESSION_MS = 0.05
+# Lokasi default file baseline
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+
+class SyntheticClip:
+    """
+    Klip video sintetis deterministik dengan laju jantung dan pernapasan yang diketahui.
+
+    Frame berisi latar belakang, torso, dan wajah (elips warna kulit). Kanal hijau wajah
+    berdenyut sinusoidal pada `heart_rate_bpm`, dan tepi atas torso bergerak naik-turun
+    pada `respiration_rate_bpm` sehingga intensitas ROI dada ikut berubah. Noise sensor
+    dibangkitkan dari seed per frame, jadi frame ke-i selalu identik. Adegan simetris
+    horizontal sehingga ROI tetap sama setelah frame di-flip (efek cermin).
+
+    Frame dibuat saat diminta (bukan disimpan semua di memori) dan pembuatannya tidak
+    termasuk dalam waktu yang diukur.
+    """
+    def __init__(self, width=640, height=480, fps=30.0, duration_sec=32.0, heart_rate_bpm=72.0,
+                 respiration_rate_bpm=15.0, pulse_amplitude=1.5, chest_amplitude=6.0, noise=2, seed=0):
+        """
+        Konstruktor untuk kelas SyntheticClip.
+
+        Args:
+            width (int, optional): Lebar frame. Defaultnya adalah 640.
+            height (int, optional): Tinggi frame. Defaultnya adalah 480.
+            fps (float, optional): Laju frame klip. Defaultnya adalah 30.0.
+            duration_sec (float, optional): Durasi klip (detik). Defaultnya adalah 32.0.
+            heart_rate_bpm (float, optional): Laju jantung yang disuntikkan (BPM). Defaultnya adalah 72.0.
+            respiration_rate_bpm (float, optional): Laju pernapasan yang disuntikkan (napas/menit). Defaultnya adalah 15.0.
+            pulse_amplitude (float, optional): Amplitudo denyut kanal hijau (level intensitas). Defaultnya adalah 1.5.
+            chest_amplitude (float, optional): Amplitudo gerakan vertikal dada (piksel). Defaultnya adalah 6.0.
+            noise (int, optional): Amplitudo noise sensor seragam (level intensitas). Defaultnya adalah 2.
+            seed (int, optional): Seed noise. Defaultnya adalah 0.
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.n_frames = int(round(duration_sec * fps)) # Jumlah frame klip
+        self.heart_rate_bpm = heart_rate_bpm
+        self.respiration_rate_bpm = respiration_rate_bpm
+        self.pulse_amplitude = pulse_amplitude
+        self.chest_amplitude = chest_amplitude
+        self.noise = noise
+        self.seed = seed
+
+        cx = width // 2 # Adegan dipusatkan secara horizontal
+        # Wajah: elips di sepertiga atas frame
+        self.face_center = (cx, int(height * 0.28))
+        self.face_axes = (int(width * 0.09), int(height * 0.15))
+        fx, fy = self.face_center
+        ax, ay = self.face_axes
+        # ROI wajah (pipi/dahi) di dalam elips, simetris terhadap sumbu tengah
+        self.face_roi = (fx - ax // 2, fy - ay // 2, fx + ax // 2, fy + ay // 2)
+        # Torso: persegi panjang di bawah wajah dengan tepi atas yang bergerak
+        self.torso_x = (cx - int(width * 0.25), cx + int(width * 0.25))
+        self.torso_top = int(height * 0.58) # Posisi rata-rata tepi atas torso
+        # ROI dada memotong tepi atas torso sehingga gerakan naik-turun mengubah intensitasnya
+        self.chest_roi = (cx - int(width * 0.15), self.torso_top - 20, cx + int(width * 0.15), self.torso_top + 20)
+
+        # Latar statis (tanpa torso) dan mask wajah dibuat sekali
+        self.background = np.full((height, width, 3), (70, 60, 50), np.uint8)
+        self.face_mask = np.zeros((height, width), np.uint8)
+        cv2.ellipse(self.face_mask, self.face_center, self.face_axes, 0, 0, 360, 255, -1)
+        self.face_color = np.array([120, 150, 200], np.float32) # Warna kulit (BGR)
+        self.torso_color = (40, 90, 160) # Warna pakaian (BGR)
+
+    def timestamp(self, index):
+        """
+        Returns:
+            float: Waktu frame ke-`index` di dalam klip (detik).
+        """
+        return index / self.fps
+
+    def frame(self, index):
+        """
+        Membuat frame ke-`index` secara deterministik.
+
+        Args:
+            index (int): Nomor frame.
+
+        Returns:
+            numpy.ndarray: Frame BGR uint8.
+        """
+        t = self.timestamp(index)
+        frame = self.background.copy()
+        # Torso dengan tepi atas yang bergerak mengikuti pernapasan
+        shift = self.chest_amplitude * np.sin(2 * np.pi * self.respiration_rate_bpm / 60.0 * t)
+        top = int(round(self.torso_top + shift))
+        frame[top:, self.torso_x[0]:self.torso_x[1]] = self.torso_color
+        # Wajah dengan denyut kanal hijau mengikuti detak jantung
+        pulse = self.pulse_amplitude * np.sin(2 * np.pi * self.heart_rate_bpm / 60.0 * t)
+        color = self.face_color + (0.0, pulse, 0.0)
+        face = self.face_mask > 0
+        frame[face] = np.clip(np.round(color), 0, 255).astype(np.uint8)
+        # Noise sensor deterministik per frame
+        if self.noise:
+            rng = np.random.default_rng(self.seed + index)
+            noise = rng.integers(-self.noise, self.noise + 1, size=frame.shape, dtype=np.int16)
+            frame = np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        return frame
+
+    def __iter__(self):
+        """
+        Menghasilkan (index, timestamp, frame) untuk semua frame klip.
+        """
+        for index in range(self.n_frames):
+            yield index, self.timestamp(index), self.frame(index)
+
+
+def latency_summary(durations, n_items=None):
+    """
+    Meringkas daftar durasi menjadi throughput dan persentil latensi.
+
+    Args:
+        durations (list): Durasi tiap eksekusi (detik).
+        n_items (int, optional): Jumlah item yang diproses (untuk throughput). Default: len(durations).
+
+    Returns:
+        dict: Berisi 'count', 'throughput', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', dan 'max_ms'.
+    """
+    ms = np.asarray(durations, dtype=np.float64) * 1000.0
+    total = ms.sum() / 1000.0
+    n_items = len(ms) if n_items is None else n_items
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (0.0, 0.0, 0.0)
+    return {"count": int(len(ms)), "throughput": n_items / total if total > 0 else 0.0,
+            "mean_ms": float(ms.mean()) if len(ms) else 0.0, "p50_ms": float(p50), "p95_ms": float(p95),
+            "p99_ms": float(p99), "max_ms": float(ms.max()) if len(ms) else 0.0}
+
+
+def bench_processor(processor, clip, roi, n_frames):
+    """
+    Mengukur `process(frame)` satu prosesor sinyal pada klip sintetis.
+
+    ROI diisi langsung (`roi_coords`) karena MediaPipe tidak mengenali wajah/tubuh sintetis;
+    deteksi tetap dijalankan setiap frame (kasus terburuk), dan ROI yang diisi dipertahankan
+    saat deteksi tidak menemukan apa pun.
+
+    Args:
+        processor (RespirationProcessor or RPPGProcessor): Prosesor yang diukur.
+        clip (SyntheticClip): Klip input.
+        roi (tuple): ROI yang diisi (x1, y1, x2, y2).
+        n_frames (int): Jumlah frame yang diproses.
+
+    Returns:
+        dict: Ringkasan latensi (lihat `latency_summary`).
+    """
+    processor.reset()
+    processor.roi_coords = roi
+    durations = []
+    for index in range(min(n_frames, clip.n_frames)):
+        frame = clip.frame(index)
+        start = time.perf_counter()
+        processor.process(frame)
+        durations.append(time.perf_counter() - start)
+    return latency_summary(durations)
+
+
+def bench_signal_utils(clip, repeats=200):
+    """
+    Mengukur fungsi-fungsi `signal_utils` pada jendela 300 sampel (10 detik pada 30 fps).
+
+    Args:
+        clip (SyntheticClip): Klip acuan (untuk frekuensi sampling dan laju jantung).
+        repeats (int, optional): Jumlah pengulangan per fungsi. Defaultnya adalah 200.
+
+    Returns:
+        dict: Ringkasan latensi per fungsi.
+    """
+    from signal_utils import BandpassFilter, butter_bandpass_filter, normalize_signal, smooth_signal
+
+    rng = np.random.default_rng(clip.seed)
+    t = np.arange(300) / clip.fps
+    signal = 100 + np.sin(2 * np.pi * clip.heart_rate_bpm / 60.0 * t) + rng.normal(0, 0.5, t.size)
+    streaming = BandpassFilter(0.7, 4.0, clip.fps, order=3)
+    cases = {
+        "butter_bandpass_filter": lambda: butter_bandpass_filter(signal, 0.7, 4.0, clip.fps, order=3),
+        "normalize_signal": lambda: normalize_signal(signal),
+        "smooth_signal": lambda: smooth_signal(signal),
+        "BandpassFilter.process": lambda: streaming.process(signal[:30]), # Satu detik sampel baru
+    }
+    results = {}
+    for name, fn in cases.items():
+        fn() # Pemanasan (desain filter di-cache pada pemanggilan pertama)
+        durations = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            durations.append(time.perf_counter() - start)
+        results[name] = latency_summary(durations)
+    return results
+
+
+def bench_spectrum(clip, repeats=200):
+    """
+    Membandingkan biaya spektrum per sampel baru: DFT geser (`SlidingSpectrum`) terhadap filter dan
+    FFT penuh jendela 300 sampel (`RateEstimator.estimate`).
+
+    Args:
+        clip (SyntheticClip): Klip acuan (untuk frekuensi sampling dan laju jantung).
+        repeats (int, optional): Jumlah pengulangan per kasus. Defaultnya adalah 200.
+
+    Returns:
+        dict: Ringkasan latensi per kasus.
+    """
+    from sliding_spectrum import heart_rate_spectrum
+    from vital_estimator import heart_rate_estimator
+
+    rng = np.random.default_rng(clip.seed)
+    t = np.arange(300 + repeats + 1) / clip.fps
+    signal = 100 + np.sin(2 * np.pi * clip.heart_rate_bpm / 60.0 * t) + rng.normal(0, 0.5, t.size)
+    spectrum = heart_rate_spectrum(fs=clip.fps)
+    for value, timestamp in zip(signal[:300], t[:300]):
+        spectrum.push(value, timestamp) # Jendela penuh sebelum pengukuran
+    estimator = heart_rate_estimator()
+    cases = {
+        "sliding.push": lambda: spectrum.push(*next(samples)),
+        "sliding.spectrum": lambda: (spectrum.push(*next(samples)), spectrum.spectrum()),
+        "fft.estimate": lambda: estimator.estimate(signal[:300], t[:300]),
+    }
+    results = {}
+    for name, fn in cases.items():
+        samples = iter(zip(signal[300:], t[300:])) # Setiap kasus memakai sampel baru yang sama
+        fn() # Pemanasan (desain filter di-cache pada pemanggilan pertama)
+        durations = []
+        for _ in range(repeats - 1):
+            start = time.perf_counter()
+            fn()
+            durations.append(time.perf_counter() - start)
+        results[name] = latency_summary(durations)
+    return results
+
+
+def bench_visualization(n_updates=200):
+    """
+    Mengukur `Visualization.update` dengan buffer 300 sampel.
+
+    Membutuhkan display (Tkinter); jika tidak tersedia, benchmark ini dilewati.
+
+    Args:
+        n_updates (int, optional): Jumlah update yang diukur. Defaultnya adalah 200.
+
+    Returns:
+        dict or None: Ringkasan latensi, atau None jika display tidak tersedia.
+    """
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    try:
+        root.withdraw()
+        from visualization import Visualization
+        visualization = Visualization(root, max_fps=None) # Tanpa pembatas refresh agar setiap update diukur
+        t = np.arange(300)
+        durations = []
+        for i in range(n_updates):
+            resp = 100 + 5 * np.sin((t + i) / 20.0)
+            rppg = 120 + np.sin((t + i) / 4.0)
+            start = time.perf_counter()
+            visualization.update([resp, rppg])
+            root.update_idletasks()
+            durations.append(time.perf_counter() - start)
+        return latency_summary(durations)
+    finally:
+        root.destroy()
+
+
+def bench_end_to_end(clip, detect_interval=5, inference_scale=0.5):
+    """
+    Mengukur jalur lengkap per frame (fan-out kedua prosesor + estimasi laju) dan
+    membandingkan estimasi akhir dengan laju yang disuntikkan.
+
+    Args:
+        clip (SyntheticClip): Klip input.
+        detect_interval (int, optional): Interval deteksi MediaPipe penuh. Defaultnya adalah 5.
+        inference_scale (float, optional): Skala resolusi inferensi MediaPipe. Defaultnya adalah 0.5.
+
+    Returns:
+        tuple: (ringkasan latensi, dict akurasi estimasi).
+    """
+    from offline_processor import OfflineProcessor
+
+    processor = OfflineProcessor(hop_sec=1.0, detect_interval=detect_interval, inference_scale=inference_scale)
+    try:
+        processor.reset()
+        processor.respiration_processor.roi_coords = clip.chest_roi # ROI diisi (lihat `bench_processor`)
+        processor.rppg_processor.roi_coords = clip.face_roi
+        durations = []
+        hr = rr = None
+        for index, timestamp, frame in clip:
+            start = time.perf_counter()
+            processor.fanout.process(frame, timestamp, draw=False)
+            hr = processor.heart_rate_estimator.update_from_buffer(processor.rppg_processor.signal_buffer,
+                                                                   processor.rppg_processor.artifact_buffer)
+            rr = processor.respiration_rate_estimator.update_from_buffer(processor.respiration_processor.signal_buffer,
+                                                                         processor.respiration_processor.artifact_buffer)
+            durations.append(time.perf_counter() - start)
+    finally:
+        processor.close()
+
+    accuracy = {
+        "heart_rate_true": clip.heart_rate_bpm,
+        "heart_rate_estimate": hr.rate if hr else None,
+        "heart_rate_error": abs(hr.rate - clip.heart_rate_bpm) if hr else None,
+        "respiration_rate_true": clip.respiration_rate_bpm,
+        "respiration_rate_estimate": rr.rate if rr else None,
+        "respiration_rate_error": abs(rr.rate - clip.respiration_rate_bpm) if rr else None,
+    }
+    return latency_summary(durations), accuracy
+
+
+def check_store_filter(clip, n_samples=900, jitter_sec=0.003):
+    """
+    Memeriksa kolom "filtered" `SignalStoreWriter` pada aliran 30 fps ber-jitter yang dikirim satu
+    sampel per batch (seperti dashboard), dibandingkan dengan `BandpassFilter` kausal dengan fs tetap.
+
+    Args:
+        clip (SyntheticClip): Klip acuan (untuk frekuensi sampling dan laju jantung).
+        n_samples (int, optional): Jumlah sampel. Defaultnya adalah 900 (30 detik pada 30 fps).
+        jitter_sec (float, optional): Simpangan baku jitter timestamp (detik). Defaultnya adalah 0.003.
+
+    Returns:
+        float: Korelasi kolom "filtered" dengan output filter acuan.
+    """
+    from signal_store import SignalStore, SignalStoreWriter
+    from signal_utils import BandpassFilter
+    from vital_estimator import HEART_RATE_BAND
+
+    rng = np.random.default_rng(clip.seed)
+    t = np.arange(n_samples) / clip.fps + rng.normal(0, jitter_sec, n_samples)
+    signal = 100 + np.sin(2 * np.pi * clip.heart_rate_bpm / 60.0 * t) + rng.normal(0, 0.3, n_samples)
+    with tempfile.TemporaryDirectory() as directory:
+        writer = SignalStoreWriter(directory)
+        writer.define("rppg", ("value",), band=HEART_RATE_BAND)
+        for timestamp, value in zip(t, signal):
+            writer.append("rppg", [timestamp], value=[value])
+        writer.close()
+        filtered = np.array(SignalStore(directory).table("rppg")["filtered"])
+    valid = ~np.isnan(filtered)
+    reference = np.full(n_samples, np.nan)
+    reference[valid] = BandpassFilter(*HEART_RATE_BAND, clip.fps, order=2).process(signal[valid])
+    return float(np.corrcoef(filtered[valid], reference[valid])[0, 1])
+
+
+# Skrip yang dijalankan di interpreter baru untuk mengukur cold start: impor modul GUI (tanpa membuat
+# jendela), lalu pemuatan dan pemanasan model di `ModelLoader` seperti pada dashboard
+COLD_START_SCRIPT = """
+import json, sys
+from startup import StartupTimeline, ModelLoader
+timeline = StartupTimeline()
+with timeline.phase("impor modul GUI"):
+    import main_dashboard
+def build():
+    from respirasi_processor import RespirationProcessor
+    from rppg_processor import RPPGProcessor
+    return [RespirationProcessor(detect_interval=5, inference_scale=0.5), RPPGProcessor(detect_interval=5, inference_scale=0.5)]
+loader = ModelLoader(build, timeline=timeline)
+loader.start()
+loader.wait()
+sys.stdout.write(json.dumps(timeline.as_dict()))
+"""
+
+
+def bench_cold_start():
+    """
+    Mengukur fase cold start (impor modul GUI, impor SciPy, pembangunan dan pemanasan model) di
+    interpreter Python baru, sehingga cache impor proses benchmark tidak memengaruhi hasil.
+
+    Returns:
+        dict or None: Linimasa startup (lihat `StartupTimeline.as_dict`), atau None jika gagal.
+    """
+    completed = subprocess.run([sys.executable, "-c", COLD_START_SCRIPT], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    if completed.returncode != 0:
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(quick=False):
+    """
+    Menjalankan seluruh suite benchmark.
+
+    Args:
+        quick (bool, optional): Jika True, klip dan jumlah pengulangan diperkecil (untuk pemeriksaan cepat). Defaultnya adalah False.
+
+    Returns:
+        dict: Berisi 'meta', 'benchmarks' (ringkasan latensi per benchmark), 'accuracy', dan
+              'cold_start' (linimasa startup, atau None jika gagal diukur).
+    """
+    from respirasi_processor import RespirationProcessor
+    from rppg_processor import RPPGProcessor
+
+    clip = SyntheticClip(duration_sec=16.0 if quick else 32.0)
+    n_frames = 60 if quick else 300
+    benchmarks = {}
+    print("Benchmark RespirationProcessor.process ...")
+    benchmarks["respirasi.process"] = bench_processor(RespirationProcessor(), clip, clip.chest_roi, n_frames)
+    print("Benchmark RPPGProcessor.process ...")
+    benchmarks["rppg.process"] = bench_processor(RPPGProcessor(), clip, clip.face_roi, n_frames)
+    print("Benchmark signal_utils ...")
+    for name, summary in bench_signal_utils(clip, repeats=50 if quick else 200).items():
+        benchmarks[f"signal_utils.{name}"] = summary
+    print("Benchmark spektrum ...")
+    for name, summary in bench_spectrum(clip, repeats=50 if quick else 200).items():
+        benchmarks[f"spectrum.{name}"] = summary
+    print("Benchmark Visualization.update ...")
+    visualization = bench_visualization(n_updates=50 if quick else 200)
+    if visualization is None:
+        print("  dilewati: display tidak tersedia.")
+    else:
+        benchmarks["visualization.update"] = visualization
+    print("Benchmark end-to-end ...")
+    benchmarks["end_to_end"], accuracy = bench_end_to_end(clip)
+    print("Pemeriksaan filter penyimpanan sesi ...")
+    accuracy["store_filter_correlation"] = check_store_filter(clip)
+    print("Benchmark cold start ...")
+    cold_start = bench_cold_start()
+
+    meta = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "machine": platform.machine(),
+            "python": platform.python_version(), "cpu_count": os.cpu_count(), "quick": quick,
+            "clip": {"width": clip.width, "height": clip.height, "fps": clip.fps, "frames": clip.n_frames}}
+    return {"meta": meta, "benchmarks": benchmarks, "accuracy": accuracy, "cold_start": cold_start}
+
+
+def check_accuracy(accuracy, baseline_accuracy=None):
+    """
+    Memeriksa galat estimasi terhadap batas absolut dan (jika ada) terhadap baseline.
+
+    Returns:
+        list: Pesan regresi; kosong jika semua lolos.
+    """
+    failures = []
+    for key, limit in (("heart_rate_error", MAX_HEART_RATE_ERROR_BPM),
+                       ("respiration_rate_error", MAX_RESPIRATION_RATE_ERROR)):
+        error = accuracy.get(key)
+        if error is None:
+            failures.append(f"{key}: tidak ada estimasi")
+            continue
+        if error > limit:
+            failures.append(f"{key}: {error:.2f} melebihi batas {limit:.2f}")
+        if baseline_accuracy and baseline_accuracy.get(key) is not None:
+            allowed = baseline_accuracy[key] + ACCURACY_TOLERANCE
+            if error > allowed:
+                failures.append(f"{key}: {error:.2f} lebih buruk dari baseline {baseline_accuracy[key]:.2f}")
+    correlation = accuracy.get("store_filter_correlation")
+    if correlation is not None and correlation < MIN_STORE_FILTER_CORRELATION:
+        failures.append(f"store_filter_correlation: {correlation:.3f} di bawah {MIN_STORE_FILTER_CORRELATION:.2f}")
+    return failures
+
+
+def compare_to_baseline(results, baseline, tolerance=0.3):
+    """
+    Membandingkan latensi p50 setiap benchmark dengan baseline.
+
+    Args:
+        results (dict): Hasil `run_benchmarks`.
+        baseline (dict): Hasil yang disimpan sebelumnya.
+        tolerance (float, optional): Kenaikan relatif p50 yang diizinkan (0.3 = 30%). Defaultnya adalah 0.3.
+
+    Returns:
+        list: Pesan regresi; kosong jika semua lolos.
+    """
+    failures = []
+    for name, summary in results["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if reference is None or reference["p50_ms"] <= 0:
+            continue # Benchmark baru atau tidak ada di baseline
+        ratio = summary["p50_ms"] / reference["p50_ms"]
+        if ratio > 1.0 + tolerance and summary["p50_ms"] - reference["p50_ms"] >= MIN_REGRESSION_MS:
+            failures.append(f"{name}: p50 {summary['p50_ms']:.3f} ms vs baseline {reference['p50_ms']:.3f} ms "
+                            f"({(ratio - 1) * 100:+.0f}%)")
+    return failures
+
+
+def format_results(results, baseline=None):
+    """
+    Memformat hasil benchmark menjadi tabel teks.
+
+    Returns:
+        str: Tabel hasil.
+    """
+    lines = [f"{'benchmark':<36} {'throughput':>11} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'baseline':>9}"]
+    for name, s in results["benchmarks"].items():
+        reference = (baseline or {}).get("benchmarks", {}).get(name)
+        ref_text = f"{reference['p50_ms']:9.3f}" if reference else f"{'-':>9}"
+        lines.append(f"{name:<36} {s['throughput']:9.1f}/s {s['p50_ms']:9.3f} {s['p95_ms']:9.3f} "
+                     f"{s['p99_ms']:9.3f} {ref_text}")
+    acc = results["accuracy"]
+    for label, key in (("detak jantung (BPM)", "heart_rate"), ("pernapasan (/menit)", "respiration_rate")):
+        estimate = acc[f"{key}_estimate"]
+        estimate_text = f"{estimate:.2f}" if estimate is not None else "-"
+        lines.append(f"{label}: ground truth {acc[f'{key}_true']:.2f}, estimasi {estimate_text}")
+    if acc.get("store_filter_correlation") is not None:
+        lines.append(f"filter penyimpanan sesi (jitter) vs fs tetap: korelasi {acc['store_filter_correlation']:.4f}")
+    if results.get("cold_start"):
+        phases = ", ".join(f"{p['name']} {p['duration_s'] * 1000:.0f} ms" for p in results["cold_start"]["phases"])
+        lines.append(f"cold start: {phases}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Titik masuk CLI: menjalankan suite benchmark dan membandingkannya dengan baseline.
+
+    Args:
+        argv (list, optional): Argumen baris perintah. Default: sys.argv[1:].
+
+    Returns:
+        int: Kode keluar (0 jika tidak ada regresi, 1 jika ada).
+    """
+    parser = argparse.ArgumentParser(description="Benchmark pipeline pemrosesan dengan klip video sintetis.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help=f"File baseline (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil run ini sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Kenaikan relatif latensi p50 yang diizinkan terhadap baseline (default: 0.3 = 30%%)")
+    parser.add_argument("--quick", action="store_true", help="Klip lebih pendek dan pengulangan lebih sedikit")
+    parser.add_argument("-o", "--output", default=None, help="Simpan hasil lengkap run ini ke file JSON")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(quick=args.quick)
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("quick") != args.quick:
+            print("Peringatan: mode --quick berbeda dengan baseline; perbandingan latensi dilewati.")
+            baseline = {"accuracy": baseline.get("accuracy")}
+
+    print()
+    print(format_results(results, baseline))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = check_accuracy(results["accuracy"], (baseline or {}).get("accuracy"))
+    if baseline is not None:
+        failures += compare_to_baseline(results, baseline, args.tolerance)
+    if args.save_baseline:
+        if failures:
+            print("\nBaseline tidak disimpan karena estimasi laju gagal:")
+        else:
+            with open(args.baseline, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"\nBaseline disimpan ke {args.baseline}.")
+    if failures:
+        print("\nREGRESI TERDETEKSI:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    if baseline is not None:
+        print("\nTidak ada regresi terhadap baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import numpy as np # Mengimpor NumPy untuk koordinat landmark dan uji perubahan bentuk wajah
+
+# Mode ROI wajah untuk rPPG:
+# - "box": sub-ROI persegi (dahi dan pipi) sebagai fraksi bounding box MediaPipe Face Detection
+# - "mesh": poligon dahi dan pipi dari landmark MediaPipe Face Mesh, dirasterisasi menjadi masker kulit
+#           (`SkinMask`) sehingga alis, mata, rambut, dan latar tidak ikut terukur
+FACE_ROI_MODES = ("box", "mesh")
+
+# Indeks landmark Face Mesh (468 titik) yang membentuk poligon kulit, urut mengelilingi area.
+# Kiri/kanan mengikuti citra (frame sudah di-flip), bukan sisi anatomi subjek.
+FOREHEAD_LANDMARKS = (67, 109, 10, 338, 297, 299, 296, 336, 9, 107, 66, 69) # Dahi, di atas alis
+LEFT_CHEEK_LANDMARKS = (116, 117, 118, 119, 100, 142, 203, 206, 216, 192, 213, 147, 123) # Pipi kiri, di bawah mata
+RIGHT_CHEEK_LANDMARKS = (345, 346, 347, 348, 329, 371, 423, 426, 436, 416, 433, 376, 352) # Pipi kanan (cermin pipi kiri)
+FACE_MESH_REGIONS = (FOREHEAD_LANDMARKS, LEFT_CHEEK_LANDMARKS, RIGHT_CHEEK_LANDMARKS) # Urutan sama dengan `face_subrois`
+# Presisi sub-piksel rasterisasi poligon (`cv2.fillPoly` dengan koordinat fixed-point 4 bit)
+_POLY_SHIFT = 4
+
+
+def mesh_points(face_landmarks, width, height, regions=FACE_MESH_REGIONS):
+    """
+    Mengambil titik sudut semua poligon kulit dari hasil Face Mesh dalam piksel resolusi penuh.
+
+    Hanya landmark poligon yang dibaca (bukan 468 titik), karena akses atribut landmark dilakukan di Python.
+
+    Args:
+        face_landmarks: Satu elemen `multi_face_landmarks` hasil MediaPipe Face Mesh.
+        width (int): Lebar frame resolusi penuh.
+        height (int): Tinggi frame resolusi penuh.
+        regions (tuple, optional): Daftar poligon (tuple indeks landmark). Defaultnya adalah `FACE_MESH_REGIONS`.
+
+    Returns:
+        numpy.ndarray: Titik sudut (K, 2) float64, poligon demi poligon sesuai urutan `regions`.
+    """
+    landmark = face_landmarks.landmark
+    points = np.array([(landmark[i].x, landmark[i].y) for region in regions for i in region])
+    return points * (width, height)
+
+
+def points_box(points):
+    """
+    Mengembalikan kotak pembungkus titik (x1, y1, x2, y2) dalam piksel integer.
+    """
+    x1, y1 = np.floor(points.min(axis=0)).astype(int)
+    x2, y2 = np.ceil(points.max(axis=0)).astype(int) + 1
+    return (int(x1), int(y1), int(x2), int(y2))
+
+
+class SkinMask:
+    """
+    Masker kulit dahi dan pipi dari poligon landmark Face Mesh, di-cache di antara deteksi.
+
+    Setiap poligon dirasterisasi sekali menjadi masker uint8 kecil seukuran kotak pembungkusnya,
+    disimpan relatif terhadap pojok kiri atas ROI wajah. Di antara deteksi landmark, masker ikut
+    bergeser bersama ROI hasil pelacakan (`ROITracker`). Saat landmark baru tiba, masker hanya
+    dibangun ulang jika bentuk susunan landmark berubah melebihi `max_deformation` (setelah
+    pergeseran median dikeluarkan), misalnya karena kepala menoleh atau mendekat ke kamera;
+    pergeseran murni cukup menggeser masker lama. Rata-rata kulit dihitung dengan `cv2.mean`
+    bermasker pada view frame, tanpa salinan.
+    """
+    def __init__(self, regions=FACE_MESH_REGIONS, max_deformation=0.03):
+        """
+        Konstruktor untuk kelas SkinMask.
+
+        Args:
+            regions (tuple, optional): Daftar poligon (tuple indeks landmark). Defaultnya adalah `FACE_MESH_REGIONS`.
+            max_deformation (float, optional): Perubahan posisi landmark maksimum (setelah pergeseran median
+                                               dikeluarkan) agar masker lama tetap dipakai, relatif terhadap
+                                               ukuran susunan landmark. Defaultnya adalah 0.03.
+        """
+        self.max_deformation = max_deformation # Ambang perubahan bentuk untuk membangun ulang masker
+        bounds = np.cumsum([0] + [len(region) for region in regions])
+        self._slices = [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:])] # Rentang titik setiap poligon
+        self.reset()
+
+    def reset(self):
+        """
+        Menghapus masker yang di-cache. Dipanggil sebelum memulai sesi monitoring baru.
+        """
+        self.regions = None # Daftar (x_rel, y_rel, masker uint8, poligon relatif int32) per poligon
+        self._anchor = None # Titik sudut relatif terhadap pojok ROI saat masker dibangun, (K, 2)
+        self._offset = (0, 0) # Pergeseran masker (piksel) terhadap posisi saat dibangun
+        self.builds = 0 # Jumlah rasterisasi masker
+        self.reuses = 0 # Jumlah deteksi landmark yang memakai ulang masker lama
+
+    def update(self, points, roi):
+        """
+        Memperbarui masker dari titik sudut poligon hasil deteksi landmark terbaru.
+
+        Args:
+            points (numpy.ndarray): Titik sudut (K, 2) dari `mesh_points`, piksel resolusi penuh.
+            roi (tuple): ROI wajah (x1, y1, x2, y2) pada frame yang sama; acuan posisi masker.
+
+        Returns:
+            bool: True jika masker dibangun ulang, False jika masker lama dipakai ulang.
+        """
+        relative = points - roi[:2]
+        if self._anchor is not None:
+            shift = np.median(relative - self._anchor, axis=0) # Pergeseran bersama semua landmark
+            residual = np.abs(relative - self._anchor - shift).max() # Perubahan bentuk yang tersisa
+            size = max(float(np.ptp(self._anchor, axis=0).max()), 1.0)
+            if residual <= self.max_deformation * size:
+                self._offset = tuple(int(v) for v in np.rint(shift))
+                self.reuses += 1
+                return False
+        self._build(relative)
+        return True
+
+    def _build(self, relative):
+        """
+        Merasterisasi setiap poligon menjadi masker kecil dengan presisi sub-piksel.
+        """
+        import cv2 # Diimpor saat dipakai agar daftar mode tetap ringan diimpor (lihat respiration_methods)
+        regions = []
+        for region in self._slices:
+            polygon = relative[region]
+            x1, y1, x2, y2 = points_box(polygon)
+            mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+            fixed = np.rint((polygon - (x1, y1)) * (1 << _POLY_SHIFT)).astype(np.int32)
+            cv2.fillPoly(mask, [fixed], 255, lineType=cv2.LINE_8, shift=_POLY_SHIFT)
+            regions.append((x1, y1, mask, np.rint(polygon).astype(np.int32)))
+        self.regions = regions
+        self._anchor = relative
+        self._offset = (0, 0)
+        self.builds += 1
+
+    def means(self, frame, roi):
+        """
+        Menghitung rata-rata setiap kanal di dalam masker setiap poligon.
+
+        Args:
+            frame (numpy.ndarray): Frame BGR (H, W, 3) uint8.
+            roi (tuple): ROI wajah (x1, y1, x2, y2) pada frame ini (hasil deteksi atau pelacakan).
+
+        Returns:
+            numpy.ndarray: Rata-rata per poligon dan kanal, bentuk (N, C) float64; NaN untuk poligon yang
+                           berada di luar frame atau jika masker belum ada (lihat `combine_means`).
+        """
+        import cv2
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        means = np.full((len(self._slices), channels), np.nan)
+        if self.regions is None:
+            return means
+        h, w = frame.shape[:2]
+        ox, oy = roi[0] + self._offset[0], roi[1] + self._offset[1]
+        for i, (rx, ry, mask, _) in enumerate(self.regions):
+            x1, y1 = ox + rx, oy + ry
+            x2, y2 = x1 + mask.shape[1], y1 + mask.shape[0]
+            cx1, cy1, cx2, cy2 = max(x1, 0), max(y1, 0), min(x2, w), min(y2, h)
+            if cx2 <= cx1 or cy2 <= cy1:
+                continue
+            if (cx1, cy1, cx2, cy2) != (x1, y1, x2, y2):
+                mask = mask[cy1 - y1:cy2 - y1, cx1 - x1:cx2 - x1] # Poligon terpotong tepi frame
+                if not cv2.countNonZero(mask):
+                    continue
+            means[i] = cv2.mean(frame[cy1:cy2, cx1:cx2], mask=mask)[:channels] # View frame, tanpa salinan
+        return means
+
+    def polygons(self, roi):
+        """
+        Mengembalikan poligon kulit pada posisi ROI saat ini (untuk visualisasi `cv2.polylines`).
+
+        Args:
+            roi (tuple): ROI wajah (x1, y1, x2, y2) pada frame ini.
+
+        Returns:
+            list: Poligon int32 (M, 2) dalam piksel frame; kosong jika masker belum ada.
+        """
+        if self.regions is None:
+            return []
+        origin = np.array([roi[0] + self._offset[0], roi[1] + self._offset[1]], dtype=np.int32)
+        return [polygon + origin for _, _, _, polygon in self.regions]
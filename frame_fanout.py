@@ -0,0 +1,78 @@
+import cv2 # Mengimpor OpenCV untuk membalik frame
+from concurrent.futures import ThreadPoolExecutor # Mengimpor thread pool untuk menjalankan prosesor secara paralel
+from inference_frame import InferenceFrame # Cache konversi RGB/grayscale yang dibagikan antar prosesor
+
+
+class FrameFanout:
+    """
+    Menjalankan beberapa prosesor sinyal secara paralel pada satu frame yang sama.
+
+    Frame dibalik (efek cermin) satu kali, ditandai read-only, lalu dibagikan ke semua
+    prosesor melalui metode `analyze`, bersama satu `InferenceFrame` sehingga konversi
+    BGR->RGB (dan downscale untuk inferensi) maupun grayscale hanya dihitung sekali per frame.
+    MediaPipe melepas GIL saat inferensi, sehingga Pose dan Face Detection dapat berjalan bersamaan di thread pool. Kotak ROI baru
+    digambar di akhir pada salinan frame khusus tampilan, sehingga tidak ada prosesor
+    yang mengukur sinyal dari frame yang sudah berisi overlay.
+    """
+    def __init__(self, processors, max_workers=None, mirror=True):
+        """
+        Konstruktor untuk kelas FrameFanout.
+
+        Args:
+            processors (list): Daftar prosesor yang memiliki metode `analyze(frame, timestamp, inference_frame)`
+                               dan `draw_roi(frame)` (misalnya RespirationProcessor, RPPGProcessor).
+            max_workers (int, optional): Jumlah thread pool. Default: jumlah prosesor dikurangi satu,
+                                         karena prosesor pertama dijalankan di thread pemanggil.
+            mirror (bool, optional): Jika True, frame dibalik secara horizontal sebelum diproses. Defaultnya adalah True.
+        """
+        self.processors = list(processors) # Prosesor yang menerima frame yang sama
+        self.mirror = mirror # Flag efek cermin
+        if max_workers is None:
+            max_workers = max(1, len(self.processors) - 1)
+        # Thread pool untuk prosesor kedua dan seterusnya
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fanout")
+
+    def process(self, frame, timestamp=None, draw=True):
+        """
+        Memproses satu frame dengan semua prosesor secara paralel.
+
+        Args:
+            frame (numpy.ndarray): Frame video input dalam format BGR OpenCV.
+            timestamp (float, optional): Waktu pengambilan frame, diteruskan ke setiap prosesor.
+            draw (bool, optional): Jika False, salinan frame tampilan tidak dibuat (mode headless). Defaultnya adalah True.
+
+        Returns:
+            tuple:
+                - numpy.ndarray or None: Salinan frame (sudah di-flip) dengan semua ROI digambar,
+                                         atau None jika `draw` bernilai False.
+                - list: Nilai sampel dari setiap prosesor (urutan sama dengan `processors`), None jika tidak ada sampel.
+        """
+        if self.mirror:
+            frame = cv2.flip(frame, 1) # Flip satu kali untuk semua prosesor
+        else:
+            frame = frame.view() # View baru: flag read-only di bawah tidak mengubah array milik pemanggil
+        frame.flags.writeable = False # Frame bersama bersifat read-only agar tidak ada prosesor yang mengubahnya
+        shared = InferenceFrame(frame) # Konversi warna dihitung sekali dan dibagikan ke semua prosesor
+
+        # Prosesor kedua dan seterusnya dijalankan di thread pool
+        futures = [self.executor.submit(p.analyze, frame, timestamp, shared) for p in self.processors[1:]]
+        values = []
+        if self.processors:
+            # Prosesor pertama dijalankan langsung di thread pemanggil untuk menghemat satu perpindahan thread
+            values.append(self.processors[0].analyze(frame, timestamp, shared))
+        values.extend(f.result() for f in futures) # Tunggu semua prosesor selesai
+
+        if not draw:
+            return None, values
+
+        # Gambar semua ROI sekali di akhir pada salinan frame khusus tampilan
+        display_frame = frame.copy()
+        for processor in self.processors:
+            processor.draw_roi(display_frame)
+        return display_frame, values
+
+    def shutdown(self):
+        """
+        Menghentikan thread pool. Dipanggil saat aplikasi ditutup.
+        """
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,351 @@
+import threading # Mengimpor threading untuk menjalankan tahap capture dan inferensi di thread terpisah
+import time # Mengimpor time untuk pencatatan timestamp dan pengukuran latensi
+from collections import deque # Mengimpor deque untuk antrian dan jendela statistik berukuran tetap
+
+
+class LatestQueue:
+    """
+    Antrian terbatas (bounded) dengan kebijakan drop-oldest yang aman untuk multi-thread.
+
+    Jika antrian penuh saat item baru dimasukkan, item tertua dibuang sehingga
+    konsumen selalu mendapatkan data terbaru dan produsen tidak pernah terblokir.
+    """
+    def __init__(self, maxsize=1):
+        """
+        Konstruktor untuk kelas LatestQueue.
+
+        Args:
+            maxsize (int, optional): Jumlah maksimum item di dalam antrian. Defaultnya adalah 1.
+        """
+        self.maxsize = max(1, int(maxsize)) # Ukuran minimal antrian adalah 1
+        self._items = deque() # Penyimpanan item antrian
+        self._cond = threading.Condition() # Condition untuk sinkronisasi produsen dan konsumen
+        self.dropped = 0 # Jumlah item yang dibuang karena antrian penuh
+
+    def put(self, item):
+        """
+        Memasukkan item ke antrian, membuang item tertua jika antrian penuh.
+
+        Args:
+            item (object): Item yang akan dimasukkan.
+        """
+        with self._cond:
+            if len(self._items) >= self.maxsize: # Antrian penuh: buang item tertua
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify() # Bangunkan konsumen yang sedang menunggu
+
+    def get(self, timeout=None):
+        """
+        Mengambil item tertua dari antrian, menunggu hingga `timeout` detik jika kosong.
+
+        Args:
+            timeout (float, optional): Waktu tunggu maksimum dalam detik. None berarti menunggu tanpa batas.
+
+        Returns:
+            object or None: Item dari antrian, atau None jika waktu tunggu habis.
+        """
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout) # Tunggu hingga ada item baru atau timeout
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def get_latest(self):
+        """
+        Mengambil item terbaru tanpa menunggu dan membuang item lain yang lebih lama.
+
+        Returns:
+            object or None: Item terbaru, atau None jika antrian kosong.
+        """
+        with self._cond:
+            if not self._items:
+                return None
+            item = self._items.pop() # Ambil item paling baru
+            self.dropped += len(self._items) # Item lama yang terlewati dihitung sebagai drop
+            self._items.clear()
+            return item
+
+    def clear(self):
+        """
+        Mengosongkan antrian tanpa menghitungnya sebagai drop.
+        """
+        with self._cond:
+            self._items.clear()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+
+class StageStats:
+    """
+    Statistik throughput (FPS) dan latensi untuk satu tahap pipeline.
+
+    Menyimpan durasi dan timestamp dari sejumlah sampel terakhir (jendela bergulir),
+    sehingga nilai yang dilaporkan mencerminkan kondisi terkini.
+    """
+    def __init__(self, name, window=120):
+        """
+        Konstruktor untuk kelas StageStats.
+
+        Args:
+            name (str): Nama tahap (misalnya 'capture' atau 'inferensi').
+            window (int, optional): Jumlah sampel terakhir yang digunakan untuk statistik. Defaultnya adalah 120.
+        """
+        self.name = name # Nama tahap pipeline
+        self._durations = deque(maxlen=window) # Durasi tiap eksekusi tahap (detik)
+        self._stamps = deque(maxlen=window) # Waktu selesai tiap eksekusi tahap (detik, monotonic)
+        self._lock = threading.Lock() # Lock karena statistik ditulis dan dibaca dari thread berbeda
+        self.count = 0 # Jumlah total eksekusi tahap
+
+    def record(self, duration, timestamp=None):
+        """
+        Mencatat satu eksekusi tahap.
+
+        Args:
+            duration (float): Durasi eksekusi dalam detik.
+            timestamp (float, optional): Waktu selesai eksekusi. Default: time.monotonic().
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._lock:
+            self._durations.append(duration)
+            self._stamps.append(timestamp)
+            self.count += 1
+
+    def reset(self):
+        """
+        Menghapus seluruh sampel statistik.
+        """
+        with self._lock:
+            self._durations.clear()
+            self._stamps.clear()
+            self.count = 0
+
+    def snapshot(self):
+        """
+        Mengembalikan ringkasan statistik tahap saat ini.
+
+        Returns:
+            dict: Berisi 'name', 'count', 'fps', 'mean_ms', dan 'max_ms'.
+        """
+        with self._lock:
+            durations = list(self._durations)
+            stamps = list(self._stamps)
+            count = self.count
+        fps = 0.0
+        if len(stamps) > 1 and stamps[-1] > stamps[0]:
+            fps = (len(stamps) - 1) / (stamps[-1] - stamps[0]) # Laju eksekusi efektif
+        mean_ms = 1000.0 * sum(durations) / len(durations) if durations else 0.0
+        max_ms = 1000.0 * max(durations) if durations else 0.0
+        return {"name": self.name, "count": count, "fps": fps, "mean_ms": mean_ms, "max_ms": max_ms}
+
+    def summary(self):
+        """
+        Mengembalikan ringkasan statistik dalam bentuk teks singkat.
+
+        Returns:
+            str: Contoh: "capture: 29.8 fps, 3.1 ms".
+        """
+        snap = self.snapshot()
+        return f"{snap['name']}: {snap['fps']:.1f} fps, {snap['mean_ms']:.1f} ms"
+
+
+class FrameResult:
+    """
+    Hasil pemrosesan satu frame oleh tahap inferensi pipeline.
+    """
+    __slots__ = ("index", "timestamp", "value", "latency")
+
+    def __init__(self, index, timestamp, value, latency):
+        """
+        Args:
+            index (int): Nomor urut frame sejak pipeline dimulai.
+            timestamp (float): Waktu pengambilan frame (time.monotonic()).
+            value (object): Nilai yang dikembalikan oleh fungsi pemrosesan.
+            latency (float): Latensi end-to-end dari capture hingga hasil siap (detik).
+        """
+        self.index = index
+        self.timestamp = timestamp
+        self.value = value
+        self.latency = latency
+
+
+class FramePipeline:
+    """
+    Pipeline frame berbasis thread: capture -> inferensi -> konsumen (GUI).
+
+    Thread capture membaca frame dari sumber video dan memasukkannya ke antrian
+    drop-oldest. Thread inferensi mengambil frame, menjalankan fungsi pemrosesan,
+    dan menaruh hasilnya ke antrian hasil. Konsumen (misalnya loop Tkinter) hanya
+    mengambil hasil terbaru melalui `get_latest_result()` sehingga event loop GUI
+    tidak pernah menunggu kamera maupun model MediaPipe.
+    """
+    def __init__(self, cap, process_fn, capture_queue_size=2, result_queue_size=1, profiler=None, scheduler=None):
+        """
+        Konstruktor untuk kelas FramePipeline.
+
+        Args:
+            cap (cv2.VideoCapture or FrameSource): Sumber frame yang memiliki metode `read()`. Jika sumber
+                                                   juga memiliki `read_timestamped()` (lihat frame_source.py),
+                                                   timestamp capture dari sumber yang dipakai.
+            process_fn (callable): Fungsi `process_fn(frame, timestamp)` yang dijalankan di thread inferensi.
+            capture_queue_size (int, optional): Kapasitas antrian antara capture dan inferensi. Defaultnya adalah 2.
+            result_queue_size (int, optional): Kapasitas antrian hasil untuk konsumen. Defaultnya adalah 1.
+            profiler (Profiler, optional): Jika diberikan, durasi capture, latensi end-to-end, dan jumlah
+                                           frame yang dibuang juga dicatat ke profiler ini.
+            scheduler (AdaptiveScheduler, optional): Jika diberikan, thread inferensi mengikuti jadwal laju target
+                                                     dan durasi inferensi dilaporkan ke penjadwal agar beban
+                                                     prosesor disesuaikan (lihat frame_scheduler.py).
+        """
+        self.cap = cap # Sumber frame (kamera)
+        self.process_fn = process_fn # Fungsi pemrosesan frame
+        self.frame_queue = LatestQueue(capture_queue_size) # Antrian capture -> inferensi
+        self.result_queue = LatestQueue(result_queue_size) # Antrian inferensi -> konsumen
+        self.capture_stats = StageStats("capture") # Statistik tahap capture
+        self.inference_stats = StageStats("inferensi") # Statistik tahap inferensi
+        self.latency_stats = StageStats("end-to-end") # Statistik latensi dari capture hingga hasil siap
+        self._stop_event = threading.Event() # Sinyal untuk menghentikan kedua thread
+        self._threads = [] # Daftar thread yang sedang berjalan
+        self.error = None # Pesan error terakhir (misalnya kamera gagal membaca frame)
+        self.profiler = profiler # Profiler tahap opsional
+        self.scheduler = scheduler # Penjadwal laju pemrosesan opsional
+
+    @property
+    def running(self):
+        """
+        bool: True jika thread pipeline sedang berjalan.
+        """
+        return any(t.is_alive() for t in self._threads)
+
+    @property
+    def finished(self):
+        """
+        bool: True jika pipeline pernah dijalankan dan berhenti dengan sendirinya (misalnya kamera terputus).
+        """
+        return bool(self._threads) and not self._stop_event.is_set() and not self._threads[0].is_alive()
+
+    def start(self):
+        """
+        Memulai thread capture dan thread inferensi.
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.error = None
+        self.frame_queue.clear()
+        self.result_queue.clear()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="pipeline-capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="pipeline-inferensi", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=2.0):
+        """
+        Menghentikan pipeline dan menunggu kedua thread selesai.
+
+        Sumber video sebaiknya baru dilepas (`release()`) setelah metode ini kembali,
+        agar tidak ada pemanggilan `read()` yang sedang berlangsung di thread capture.
+
+        Args:
+            timeout (float, optional): Waktu tunggu maksimum per thread dalam detik. Defaultnya adalah 2.0.
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def get_latest_result(self):
+        """
+        Mengambil hasil pemrosesan terbaru tanpa menunggu.
+
+        Returns:
+            FrameResult or None: Hasil terbaru, atau None jika belum ada hasil baru.
+        """
+        return self.result_queue.get_latest()
+
+    def stats(self):
+        """
+        Mengembalikan statistik seluruh tahap pipeline.
+
+        Returns:
+            dict: Ringkasan per tahap serta jumlah frame yang dibuang di tiap antrian.
+        """
+        return {
+            "capture": self.capture_stats.snapshot(),
+            "inferensi": self.inference_stats.snapshot(),
+            "end-to-end": self.latency_stats.snapshot(),
+            "drop_capture": self.frame_queue.dropped,
+            "drop_hasil": self.result_queue.dropped,
+        }
+
+    def summary(self):
+        """
+        Mengembalikan ringkasan statistik pipeline dalam satu baris teks.
+
+        Returns:
+            str: Ringkasan throughput, latensi, dan jumlah drop.
+        """
+        return (f"{self.capture_stats.summary()} | {self.inference_stats.summary()} | "
+                f"latensi {self.latency_stats.snapshot()['mean_ms']:.0f} ms | "
+                f"drop {self.frame_queue.dropped}/{self.result_queue.dropped}")
+
+    def _capture_loop(self):
+        """
+        Loop thread capture: membaca frame secepat sumber video mengizinkan.
+        """
+        index = 0 # Nomor urut frame
+        read_timestamped = getattr(self.cap, "read_timestamped", None) # Sumber dengan timestamp capture sendiri
+        while not self._stop_event.is_set():
+            start = time.monotonic()
+            if read_timestamped is not None:
+                ret, frame, timestamp = read_timestamped() # Timestamp capture asli (misalnya saat replay)
+            else:
+                ret, frame = self.cap.read() # Membaca frame (memblokir hingga frame tersedia)
+                timestamp = time.monotonic() # Waktu frame diterima
+            if not ret:
+                self.error = "Gagal menangkap frame." # Kamera terputus atau akhir video
+                break
+            end = time.monotonic()
+            self.capture_stats.record(end - start, end)
+            self.frame_queue.put((index, timestamp, frame))
+            if self.profiler is not None:
+                self.profiler.record("capture", end - start, end)
+                self.profiler.set_dropped("capture", self.frame_queue.dropped) # Frame yang tidak sempat diinferensi
+            index += 1
+
+    def _inference_loop(self):
+        """
+        Loop thread inferensi: memproses frame terbaru dari antrian capture.
+        """
+        while not self._stop_event.is_set():
+            item = self.frame_queue.get(timeout=0.1) # Timeout agar sinyal berhenti tetap diperiksa
+            if item is None:
+                if not self._threads[0].is_alive():
+                    break # Thread capture sudah berhenti dan antrian kosong
+                continue
+            index, timestamp, frame = item
+            start = time.monotonic()
+            try:
+                value = self.process_fn(frame, timestamp)
+            except Exception as e:
+                # Error pada satu frame tidak menghentikan pipeline
+                print(f"Error saat memproses frame {index}: {e}")
+                continue
+            end = time.monotonic()
+            self.inference_stats.record(end - start, end)
+            self.latency_stats.record(end - timestamp, end)
+            self.result_queue.put(FrameResult(index, timestamp, value, end - timestamp))
+            if self.profiler is not None:
+                self.profiler.record("end-to-end", end - timestamp, end)
+                self.profiler.set_dropped("end-to-end", self.result_queue.dropped) # Hasil yang tidak sempat ditampilkan
+            if self.scheduler is not None:
+                self.scheduler.record(end - start, end)
+                delay = self.scheduler.next_delay(end)
+                if delay > 0:
+                    self._stop_event.wait(delay) # Menunggu jadwal frame berikutnya, tetap responsif terhadap stop
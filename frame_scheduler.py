@@ -0,0 +1,152 @@
+import time # Mengimpor time untuk jadwal frame dan laju yang tercapai
+from collections import deque # Mengimpor deque untuk jendela timestamp frame yang diproses
+
+# Tingkat kualitas pemrosesan, dari yang paling teliti hingga paling murah:
+# (interval deteksi MediaPipe penuh, skala resolusi inferensi). Tingkat 1 sama dengan konfigurasi
+# default dashboard (deteksi setiap 5 frame pada setengah resolusi).
+DEFAULT_LEVELS = ((3, 0.5), (5, 0.5), (8, 0.5), (8, 0.35), (12, 0.25))
+
+
+class AdaptiveScheduler:
+    """
+    Penjadwal frame yang menjaga laju pemrosesan mendekati target dan menyesuaikan beban inferensi.
+
+    Penjadwalan memakai tenggat tetap (`next_delay`): frame berikutnya dijadwalkan satu periode setelah
+    jadwal frame sebelumnya, bukan setelah frame selesai diproses, sehingga durasi pemrosesan tidak
+    menambah jeda dan laju sampling tidak bergeser mengikuti beban CPU. Jika pemrosesan tertinggal lebih
+    dari satu periode, jadwal dimulai ulang tanpa mengejar frame yang terlewat.
+
+    Durasi pemrosesan per frame dirata-rata (EMA) dan dibandingkan dengan anggaran satu periode. Jika
+    rata-rata melewati `headroom` kali anggaran, prosesor diturunkan satu tingkat (deteksi lebih jarang,
+    resolusi inferensi lebih kecil, lihat `DEFAULT_LEVELS`); jika di bawah `upgrade_ratio` kali anggaran,
+    dinaikkan satu tingkat. Setiap perubahan ditahan minimal `hold_frames` frame agar tidak berosilasi.
+    Jika tingkat termurah pun tidak cukup, laju yang tercapai (`achieved_fps`) turun dan sampel menjadi
+    tidak seragam; estimator laju lalu menginterpolasi sinyal ke grid waktu seragam sebelum filter
+    (lihat `RateEstimator`).
+    """
+    def __init__(self, target_fps=30.0, processors=(), levels=DEFAULT_LEVELS, level=1, alpha=0.1,
+                 headroom=0.9, upgrade_ratio=0.5, hold_frames=30, window=60):
+        """
+        Konstruktor untuk kelas AdaptiveScheduler.
+
+        Args:
+            target_fps (float, optional): Laju pemrosesan yang dituju (frame per detik). Defaultnya adalah 30.0.
+            processors (iterable, optional): Prosesor yang bebannya diatur (memiliki `inference_scale`, dan
+                                             `tracker.detect_interval` atau `detect_interval`). Default: tidak ada.
+            levels (tuple, optional): Tingkat (interval deteksi, skala inferensi) dari paling teliti hingga paling
+                                      murah. Defaultnya adalah `DEFAULT_LEVELS`.
+            level (int, optional): Tingkat awal. Defaultnya adalah 1.
+            alpha (float, optional): Faktor EMA durasi pemrosesan. Defaultnya adalah 0.1.
+            headroom (float, optional): Fraksi anggaran periode yang memicu penurunan tingkat. Defaultnya adalah 0.9.
+            upgrade_ratio (float, optional): Fraksi anggaran periode yang memicu kenaikan tingkat. Defaultnya adalah 0.5.
+            hold_frames (int, optional): Jumlah frame minimum antar perubahan tingkat. Defaultnya adalah 30.
+            window (int, optional): Jumlah frame terakhir untuk menghitung laju yang tercapai. Defaultnya adalah 60.
+        """
+        self.target_fps = float(target_fps) # Laju yang dituju
+        self.period = 1.0 / self.target_fps # Anggaran waktu per frame (detik)
+        self.processors = list(processors) # Prosesor yang bebannya diatur
+        self.levels = tuple(levels) # Tangga tingkat kualitas
+        self.initial_level = min(max(int(level), 0), len(self.levels) - 1) # Tingkat awal setiap sesi
+        self.alpha = alpha # Faktor EMA durasi
+        self.headroom = headroom # Ambang penurunan tingkat
+        self.upgrade_ratio = upgrade_ratio # Ambang kenaikan tingkat
+        self.hold_frames = hold_frames # Masa tahan antar perubahan tingkat
+        self._stamps = deque(maxlen=window) # Timestamp selesai frame yang diproses
+        self.reset()
+
+    def reset(self):
+        """
+        Mengembalikan tingkat awal dan menghapus statistik. Dipanggil sebelum memulai sesi monitoring baru.
+        """
+        self.level = self.initial_level # Tingkat kualitas saat ini
+        self.mean_duration = None # EMA durasi pemrosesan per frame (detik)
+        self._since_change = 0 # Jumlah frame sejak perubahan tingkat terakhir
+        self._slot = None # Jadwal mulai frame berikutnya (time.monotonic())
+        self._stamps.clear()
+        self.level_changes = 0 # Jumlah perubahan tingkat
+        self._apply()
+
+    def _apply(self):
+        """
+        Menerapkan interval deteksi dan skala inferensi tingkat saat ini ke semua prosesor.
+        """
+        interval, scale = self.levels[self.level]
+        for processor in self.processors:
+            processor.inference_scale = scale
+            tracker = getattr(processor, "tracker", None)
+            if hasattr(tracker, "detect_interval"):
+                tracker.detect_interval = interval # Prosesor dengan `ROITracker`
+            elif hasattr(processor, "detect_interval"):
+                processor.detect_interval = interval # Prosesor yang mengatur interval sendiri (multi-subjek)
+
+    def record(self, duration, timestamp=None):
+        """
+        Mencatat durasi pemrosesan satu frame lalu menyesuaikan tingkat jika perlu.
+
+        Args:
+            duration (float): Durasi pemrosesan frame (detik).
+            timestamp (float, optional): Waktu selesai pemrosesan. Default: time.monotonic().
+
+        Returns:
+            bool: True jika tingkat berubah pada frame ini.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self._stamps.append(timestamp)
+        if self.mean_duration is None:
+            self.mean_duration = duration
+        else:
+            self.mean_duration += self.alpha * (duration - self.mean_duration)
+        self._since_change += 1
+        if self._since_change < self.hold_frames:
+            return False
+        if self.mean_duration > self.headroom * self.period and self.level < len(self.levels) - 1:
+            self.level += 1 # Di atas anggaran: deteksi lebih jarang dan resolusi inferensi lebih kecil
+        elif self.mean_duration < self.upgrade_ratio * self.period and self.level > 0:
+            self.level -= 1 # Anggaran longgar: kembalikan kualitas
+        else:
+            return False
+        self._since_change = 0
+        self.level_changes += 1
+        self._apply()
+        return True
+
+    def next_delay(self, now=None):
+        """
+        Menghitung jeda hingga jadwal frame berikutnya (tenggat tetap, satu periode per frame).
+
+        Args:
+            now (float, optional): Waktu saat ini (time.monotonic()). Default: waktu saat ini.
+
+        Returns:
+            float: Jeda dalam detik (0 jika jadwal sudah lewat).
+        """
+        if now is None:
+            now = time.monotonic()
+        if self._slot is None:
+            self._slot = now
+        self._slot += self.period
+        if self._slot < now - self.period:
+            self._slot = now # Tertinggal lebih dari satu periode: mulai ulang jadwal, tanpa mengejar
+        return max(self._slot - now, 0.0)
+
+    @property
+    def achieved_fps(self):
+        """
+        Laju pemrosesan yang tercapai pada jendela frame terakhir (Hz), atau None jika belum cukup frame.
+        """
+        if len(self._stamps) < 2 or self._stamps[-1] <= self._stamps[0]:
+            return None
+        return (len(self._stamps) - 1) / (self._stamps[-1] - self._stamps[0])
+
+    def summary(self):
+        """
+        Mengembalikan ringkasan jadwal dalam bentuk teks singkat.
+
+        Returns:
+            str: Contoh: "jadwal 29.6/30 fps, deteksi 1/5, skala 0.50".
+        """
+        fps = self.achieved_fps
+        interval, scale = self.levels[self.level]
+        achieved = f"{fps:.1f}" if fps else "-"
+        return f"jadwal {achieved}/{self.target_fps:.0f} fps, deteksi 1/{interval}, skala {scale:.2f}"
@@ -0,0 +1,426 @@
+import glob # Mengimpor glob untuk mencari file pada urutan gambar
+import os # Mengimpor os untuk operasi path dan ukuran file
+import struct # Mengimpor struct untuk header biner format rekaman mentah
+import time # Mengimpor time untuk timestamp dan pengaturan tempo replay
+
+import cv2 # Mengimpor OpenCV untuk kamera, file video, dan file gambar
+import numpy as np # Mengimpor NumPy untuk akses memory-mapped rekaman mentah
+
+# Ekstensi file rekaman mentah (frame + timestamp capture)
+RAW_EXTENSION = ".vraw"
+# Header rekaman mentah: magic, versi, lebar, tinggi, jumlah kanal, FPS nominal; dipad menjadi 64 byte
+RAW_MAGIC = b"VRAW"
+RAW_VERSION = 1
+RAW_HEADER_FORMAT = "<4sIIIId"
+RAW_HEADER_SIZE = 64
+# Ekstensi file gambar yang dikenali pada urutan gambar
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+class FrameSource:
+    """
+    Antarmuka sumber frame (kamera, file video, urutan gambar, atau rekaman mentah).
+
+    Kompatibel dengan pemakaian `cv2.VideoCapture` di proyek ini (`read()`, `isOpened()`,
+    `release()`), ditambah `read_timestamped()` yang juga mengembalikan timestamp capture.
+    Kamera memakai `time.monotonic()`; sumber rekaman memakai jam rekaman aslinya.
+    """
+    fps = None # Laju frame nominal sumber (None jika tidak diketahui)
+
+    def read_timestamped(self):
+        """
+        Membaca frame berikutnya beserta timestamp capture-nya.
+
+        Returns:
+            tuple: (berhasil, frame BGR, timestamp dalam detik). Frame dan timestamp None jika gagal.
+        """
+        raise NotImplementedError
+
+    def read(self):
+        """
+        Membaca frame berikutnya (kompatibel dengan `cv2.VideoCapture.read`).
+
+        Returns:
+            tuple: (berhasil, frame BGR).
+        """
+        ret, frame, _ = self.read_timestamped()
+        return ret, frame
+
+    def isOpened(self):
+        """
+        Returns:
+            bool: True jika sumber siap dibaca.
+        """
+        return True
+
+    def release(self):
+        """
+        Melepaskan resource sumber frame.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class CameraSource(FrameSource):
+    """
+    Kamera langsung melalui `cv2.VideoCapture`; timestamp diambil saat frame diterima.
+    """
+    def __init__(self, index=0, width=640, height=480):
+        """
+        Konstruktor untuk kelas CameraSource.
+
+        Args:
+            index (int, optional): Indeks kamera. Defaultnya adalah 0.
+            width (int, optional): Lebar frame yang diminta. Defaultnya adalah 640.
+            height (int, optional): Tinggi frame yang diminta. Defaultnya adalah 480.
+        """
+        self.cap = cv2.VideoCapture(index) # Objek VideoCapture kamera
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width) # Lebar frame yang diinginkan
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height) # Tinggi frame yang diinginkan
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or None
+
+    def read_timestamped(self):
+        ret, frame = self.cap.read() # Memblokir hingga frame tersedia
+        timestamp = time.monotonic() # Waktu frame diterima
+        if not ret:
+            return False, None, None
+        return True, frame, timestamp
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ReplaySource(FrameSource):
+    """
+    Dasar untuk sumber rekaman: mengatur tempo replay dan memetakan waktu rekaman ke timestamp.
+
+    Timestamp frame adalah `start_time + offset`, dengan `offset` waktu frame relatif terhadap
+    frame pertama rekaman. Jika `realtime` True, `read` menunggu hingga waktu aslinya sehingga
+    replay berjalan dengan tempo yang sama persis seperti saat direkam; jika False, frame
+    dikembalikan secepat mungkin namun timestamp tetap mengikuti jam rekaman (deterministik).
+    """
+    def __init__(self, realtime=False, start_time=None):
+        """
+        Konstruktor untuk kelas ReplaySource.
+
+        Args:
+            realtime (bool, optional): Replay dengan tempo asli. Defaultnya adalah False (secepat mungkin).
+            start_time (float, optional): Timestamp frame pertama. Default: time.monotonic() saat frame
+                                          pertama dibaca, sehingga sejalan dengan jam kamera langsung.
+        """
+        self.realtime = realtime # Flag replay dengan tempo asli
+        self.start_time = start_time # Timestamp frame pertama (None = time.monotonic())
+        self._base = None # Timestamp dasar yang dipakai
+        self._wall_start = None # Waktu dinding saat frame pertama dibaca (untuk tempo replay)
+
+    def _emit(self, frame, offset):
+        """
+        Mengembalikan frame dengan timestamp terpetakan, menunggu dulu jika replay real-time.
+
+        Args:
+            frame (numpy.ndarray): Frame BGR.
+            offset (float): Waktu frame relatif terhadap frame pertama rekaman (detik).
+
+        Returns:
+            tuple: (True, frame, timestamp).
+        """
+        if self._base is None:
+            self._wall_start = time.monotonic()
+            self._base = self._wall_start if self.start_time is None else self.start_time
+        if self.realtime:
+            delay = self._wall_start + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay) # Tahan frame hingga waktu aslinya
+        return True, frame, self._base + offset
+
+
+class VideoFileSource(ReplaySource):
+    """
+    File video; waktu frame adalah `indeks / fps` dari metadata video.
+    """
+    def __init__(self, path, realtime=False, start_time=None):
+        """
+        Konstruktor untuk kelas VideoFileSource.
+
+        Args:
+            path (str): Path file video.
+            realtime (bool, optional): Replay dengan tempo asli. Defaultnya adalah False.
+            start_time (float, optional): Timestamp frame pertama (lihat `ReplaySource`).
+        """
+        super().__init__(realtime, start_time)
+        self.path = path # Path file video
+        self.cap = cv2.VideoCapture(path) # Pembaca file video
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0 # 30 jika tidak tersedia di metadata
+        self.index = 0 # Indeks frame berikutnya
+
+    def read_timestamped(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            return False, None, None # Akhir video
+        offset = self.index / self.fps
+        self.index += 1
+        return self._emit(frame, offset)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource(ReplaySource):
+    """
+    Urutan file gambar (direktori atau pola glob, diurutkan berdasarkan nama) pada FPS tetap.
+    """
+    def __init__(self, pattern, fps=30.0, realtime=False, start_time=None):
+        """
+        Konstruktor untuk kelas ImageSequenceSource.
+
+        Args:
+            pattern (str): Direktori berisi gambar, atau pola glob (misalnya "frames/*.png").
+            fps (float, optional): Laju frame urutan gambar. Defaultnya adalah 30.0.
+            realtime (bool, optional): Replay dengan tempo asli. Defaultnya adalah False.
+            start_time (float, optional): Timestamp frame pertama (lihat `ReplaySource`).
+        """
+        super().__init__(realtime, start_time)
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(p for p in paths if p.lower().endswith(IMAGE_EXTENSIONS)) # File gambar terurut
+        self.fps = fps
+        self.index = 0 # Indeks gambar berikutnya
+
+    def read_timestamped(self):
+        while self.index < len(self.paths):
+            path = self.paths[self.index]
+            offset = self.index / self.fps
+            self.index += 1
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                return self._emit(frame, offset)
+            print(f"Peringatan: gambar {path} tidak dapat dibaca, dilewati.")
+        return False, None, None # Akhir urutan
+
+    def isOpened(self):
+        return bool(self.paths)
+
+
+def _read_raw_header(path):
+    """
+    Membaca header rekaman mentah.
+
+    Returns:
+        tuple: (lebar, tinggi, jumlah kanal, fps nominal).
+    """
+    with open(path, "rb") as f:
+        header = f.read(RAW_HEADER_SIZE)
+    if len(header) < RAW_HEADER_SIZE:
+        raise ValueError(f"{path}: header rekaman tidak lengkap")
+    magic, version, width, height, channels, fps = struct.unpack_from(RAW_HEADER_FORMAT, header)
+    if magic != RAW_MAGIC or version != RAW_VERSION:
+        raise ValueError(f"{path}: bukan file rekaman {RAW_EXTENSION} versi {RAW_VERSION}")
+    return width, height, channels, fps
+
+
+def session_recording_path(path):
+    """
+    Membuat path rekaman baru untuk satu sesi dari path dasar, dengan stempel waktu mulai sesi.
+
+    Contoh: "rekaman/sesi1.vraw" menjadi "rekaman/sesi1_20240101_093000.vraw". Jika path tersebut
+    sudah ada (dua sesi dimulai pada detik yang sama), ditambahkan nomor urut, sehingga rekaman
+    sesi sebelumnya tidak pernah ditimpa.
+
+    Args:
+        path (str): Path dasar rekaman (misalnya dari `--record`).
+
+    Returns:
+        str: Path file .vraw yang belum ada.
+    """
+    root, ext = os.path.splitext(path)
+    ext = ext or RAW_EXTENSION
+    stem = f"{root}_{time.strftime('%Y%m%d_%H%M%S')}"
+    candidate, n = stem + ext, 1
+    while os.path.exists(candidate) or os.path.exists(candidate + ".ts"):
+        candidate, n = f"{stem}_{n}{ext}", n + 1
+    return candidate
+
+
+class RawRecorder:
+    """
+    Perekam sesi ke format mentah yang ringkas: frame BGR tanpa kompresi dan timestamp capture.
+
+    File `<nama>.vraw` berisi header 64 byte diikuti frame-frame uint8 berurutan, dan file
+    `<nama>.vraw.ts` berisi timestamp float64. Tanpa encoding, biaya perekaman hanya satu
+    penulisan berurutan per frame, dan rekaman dapat dibaca kembali dengan memory map tanpa
+    decoding. Jika program berhenti mendadak, semua frame yang sudah lengkap tetap terbaca.
+    """
+    def __init__(self, path, fps=30.0):
+        """
+        Konstruktor untuk kelas RawRecorder.
+
+        Args:
+            path (str): Path file rekaman (sebaiknya berekstensi .vraw); file yang sudah ada ditimpa
+                        (lihat `session_recording_path` untuk satu file baru per sesi).
+            fps (float, optional): FPS nominal yang dicatat di header (informasi saja). Defaultnya adalah 30.0.
+        """
+        self.path = path # Path file frame
+        self.fps = fps # FPS nominal
+        self.shape = None # Bentuk frame (tinggi, lebar, kanal), ditetapkan oleh frame pertama
+        self.count = 0 # Jumlah frame yang sudah ditulis
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._frames = open(path, "wb") # File frame
+        self._timestamps = open(path + ".ts", "wb") # File timestamp
+
+    def write(self, frame, timestamp):
+        """
+        Menambahkan satu frame beserta timestamp capture-nya.
+
+        Args:
+            frame (numpy.ndarray): Frame BGR uint8; semua frame harus berukuran sama.
+            timestamp (float): Timestamp capture (detik).
+        """
+        if self.shape is None:
+            self.shape = frame.shape
+            height, width = frame.shape[:2]
+            channels = frame.shape[2] if frame.ndim == 3 else 1
+            header = struct.pack(RAW_HEADER_FORMAT, RAW_MAGIC, RAW_VERSION, width, height, channels, float(self.fps))
+            self._frames.write(header.ljust(RAW_HEADER_SIZE, b"\0"))
+        elif frame.shape != self.shape:
+            raise ValueError(f"Ukuran frame berubah dari {self.shape} menjadi {frame.shape}")
+        self._frames.write(np.ascontiguousarray(frame, dtype=np.uint8).data) # Tanpa salinan tambahan
+        self._timestamps.write(struct.pack("<d", timestamp))
+        self.count += 1
+
+    def close(self):
+        """
+        Menutup file rekaman.
+        """
+        self._frames.close()
+        self._timestamps.close()
+
+
+class RawRecordingSource(ReplaySource):
+    """
+    Replay rekaman `RawRecorder` melalui memory map: frame dibaca langsung dari page cache
+    tanpa decoding maupun salinan, dengan timestamp capture asli.
+    """
+    def __init__(self, path, realtime=False, start_time=None):
+        """
+        Konstruktor untuk kelas RawRecordingSource.
+
+        Args:
+            path (str): Path file .vraw.
+            realtime (bool, optional): Replay dengan tempo asli. Defaultnya adalah False.
+            start_time (float, optional): Timestamp frame pertama (lihat `ReplaySource`).
+        """
+        super().__init__(realtime, start_time)
+        self.path = path
+        self.index = 0 # Indeks frame berikutnya
+        try:
+            width, height, channels, self.fps = _read_raw_header(path)
+            n_timestamps = os.path.getsize(path + ".ts") // 8
+        except (OSError, ValueError) as e:
+            # Kegagalan dilaporkan lewat `isOpened()` seperti sumber lain, bukan exception
+            print(f"Error: Rekaman {path} tidak dapat dibaca ({e}).")
+            self.fps = None
+            self.n_frames = 0
+            self.frames = self.timestamps = None
+            return
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        frame_bytes = width * height * channels
+        n_frames = (os.path.getsize(path) - RAW_HEADER_SIZE) // frame_bytes # Hanya frame yang lengkap
+        self.n_frames = min(n_frames, n_timestamps) # Jumlah frame yang dapat diputar
+        if self.n_frames:
+            self.frames = np.memmap(path, dtype=np.uint8, mode="r", offset=RAW_HEADER_SIZE,
+                                    shape=(self.n_frames,) + shape) # Frame (read-only, tanpa salinan)
+            self.timestamps = np.memmap(path + ".ts", dtype="<f8", mode="r", shape=(self.n_frames,))
+        else:
+            self.frames = np.empty((0,) + shape, np.uint8)
+            self.timestamps = np.empty(0)
+
+    def __len__(self):
+        return self.n_frames
+
+    def read_timestamped(self):
+        if self.index >= self.n_frames:
+            return False, None, None # Akhir rekaman
+        frame = self.frames[self.index] # View read-only ke memory map
+        offset = float(self.timestamps[self.index] - self.timestamps[0])
+        self.index += 1
+        return self._emit(frame, offset)
+
+    def isOpened(self):
+        return self.n_frames > 0
+
+    def release(self):
+        self.frames = self.timestamps = None # Tutup memory map
+
+
+class RecordingSource(FrameSource):
+    """
+    Membungkus sumber frame lain dan merekam setiap frame yang dibaca ke `RawRecorder`.
+    """
+    def __init__(self, source, path):
+        """
+        Konstruktor untuk kelas RecordingSource.
+
+        Args:
+            source (FrameSource): Sumber frame yang direkam.
+            path (str): Path file rekaman .vraw.
+        """
+        self.source = source # Sumber frame asli
+        self.fps = source.fps
+        self.recorder = RawRecorder(path, fps=source.fps or 30.0) # Perekam sesi
+
+    def read_timestamped(self):
+        ret, frame, timestamp = self.source.read_timestamped()
+        if ret:
+            self.recorder.write(frame, timestamp)
+        return ret, frame, timestamp
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def release(self):
+        self.source.release()
+        self.recorder.close()
+        print(f"Rekaman {self.recorder.count} frame disimpan ke {self.recorder.path}.")
+
+
+def open_source(spec=0, realtime=True, start_time=None, width=640, height=480, fps=30.0):
+    """
+    Membuka sumber frame berdasarkan spesifikasinya.
+
+    - Angka (atau string angka): kamera dengan indeks tersebut.
+    - File berekstensi .vraw: rekaman mentah (`RawRecordingSource`).
+    - Direktori atau pola glob berisi '*': urutan gambar (`ImageSequenceSource`).
+    - Selain itu: file video (`VideoFileSource`).
+
+    Args:
+        spec (int or str, optional): Spesifikasi sumber. Defaultnya adalah 0 (kamera default).
+        realtime (bool, optional): Untuk rekaman: replay dengan tempo asli (True) atau secepat mungkin (False). Defaultnya adalah True.
+        start_time (float, optional): Untuk rekaman: timestamp frame pertama (lihat `ReplaySource`).
+        width (int, optional): Untuk kamera: lebar frame. Defaultnya adalah 640.
+        height (int, optional): Untuk kamera: tinggi frame. Defaultnya adalah 480.
+        fps (float, optional): Untuk urutan gambar: laju frame. Defaultnya adalah 30.0.
+
+    Returns:
+        FrameSource: Sumber frame (periksa `isOpened()` sebelum dipakai).
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec), width, height)
+    if spec.lower().endswith(RAW_EXTENSION):
+        return RawRecordingSource(spec, realtime, start_time)
+    if os.path.isdir(spec) or "*" in spec:
+        return ImageSequenceSource(spec, fps, realtime, start_time)
+    return VideoFileSource(spec, realtime, start_time)
@@ -0,0 +1,74 @@
+import threading # Mengimpor threading untuk melindungi cache konversi yang dibagikan antar thread
+import cv2 # Mengimpor OpenCV untuk resize dan konversi warna
+
+
+def to_inference_rgb(frame, scale=1.0):
+    """
+    Menyiapkan frame RGB untuk inferensi MediaPipe, opsional dengan resolusi yang diperkecil.
+
+    Resize dilakukan sebelum konversi warna sehingga konversi hanya memproses piksel yang tersisa.
+    MediaPipe mengembalikan koordinat ternormalisasi (0-1), jadi hasil deteksi pada frame kecil
+    dapat langsung dipetakan kembali ke koordinat frame resolusi penuh.
+
+    Args:
+        frame (numpy.ndarray): Frame BGR OpenCV resolusi penuh.
+        scale (float, optional): Faktor skala inferensi (misalnya 0.5 atau 0.25). Defaultnya adalah 1.0.
+
+    Returns:
+        numpy.ndarray: Frame RGB untuk inferensi.
+    """
+    if scale != 1.0:
+        # INTER_AREA memberikan hasil downscale yang bersih (tanpa aliasing) dengan biaya rendah
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+class InferenceFrame:
+    """
+    Pembungkus satu frame yang menyimpan (cache) hasil konversi yang dibutuhkan beberapa prosesor.
+
+    Konversi BGR->RGB (per skala inferensi) dan BGR->grayscale hanya dihitung sekali per frame
+    saat pertama kali diminta, lalu dibagikan ke semua prosesor. Karena dihitung secara lazy,
+    frame yang tidak memerlukan deteksi (misalnya saat ROI sedang dilacak) tidak membayar
+    biaya konversi RGB sama sekali. Aman dipakai dari beberapa thread sekaligus.
+    """
+    def __init__(self, frame):
+        """
+        Konstruktor untuk kelas InferenceFrame.
+
+        Args:
+            frame (numpy.ndarray): Frame BGR OpenCV resolusi penuh (read-only).
+        """
+        self.frame = frame # Frame BGR resolusi penuh
+        self._rgb = {} # Cache frame RGB per skala inferensi
+        self._gray = None # Cache frame grayscale resolusi penuh
+        self._lock = threading.Lock() # Lock agar konversi tidak dihitung dua kali oleh thread berbeda
+
+    def rgb(self, scale=1.0):
+        """
+        Mengembalikan frame RGB untuk inferensi pada skala tertentu.
+
+        Args:
+            scale (float, optional): Faktor skala inferensi. Defaultnya adalah 1.0.
+
+        Returns:
+            numpy.ndarray: Frame RGB (dibagikan, jangan dimodifikasi).
+        """
+        with self._lock:
+            rgb = self._rgb.get(scale)
+            if rgb is None:
+                rgb = to_inference_rgb(self.frame, scale)
+                self._rgb[scale] = rgb
+            return rgb
+
+    def gray(self):
+        """
+        Mengembalikan frame grayscale resolusi penuh (untuk pelacakan ROI dan intensitas).
+
+        Returns:
+            numpy.ndarray: Frame grayscale (dibagikan, jangan dimodifikasi).
+        """
+        with self._lock:
+            if self._gray is None:
+                self._gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+            return self._gray
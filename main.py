@@ -1,5 +1,13 @@
-from main_dashboard import VitalDashboard # Mengimpor kelas VitalDashboard dari file main_dashboard.py
-import tkinter as tk # Mengimpor modul tkinter sebagai tk untuk membuat GUI
+from startup import StartupTimeline # Diimpor paling awal: titik nol linimasa cold start
+timeline = StartupTimeline() # Mencatat fase startup hingga frame pertama tampil
+
+with timeline.phase("impor modul GUI"):
+    import argparse # Mengimpor argparse untuk memilih sumber frame dari baris perintah
+    from rppg_methods import RPPG_METHODS # Metode ekstraksi sinyal rPPG yang tersedia
+    from respiration_methods import RESPIRATION_METHODS # Metode ekstraksi sinyal pernapasan yang tersedia
+    from face_mesh_roi import FACE_ROI_MODES # Mode ROI wajah rPPG yang tersedia
+    from main_dashboard import VitalDashboard # Mengimpor kelas VitalDashboard dari file main_dashboard.py
+    import tkinter as tk # Mengimpor modul tkinter sebagai tk untuk membuat GUI
 
 # Titik masuk utama aplikasi
 if __name__ == "__main__":
@@ -8,6 +16,32 @@ if __name__ == "__main__":
     Fungsi ini menginisialisasi root window Tkinter, membuat instance dari VitalDashboard,
     dan memulai event loop utama Tkinter.
     """
-    root = tk.Tk()  # Membuat instance utama (root window) dari Tkinter
-    app = VitalDashboard(root)  # Membuat instance dari aplikasi VitalDashboard, meneruskan root window
-    root.mainloop()  # Memulai event loop Tkinter, membuat jendela tetap terbuka dan responsif
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Monitor sinyal vital real-time.")
+    parser.add_argument("--source", default="0",
+                        help="Indeks kamera, file video, direktori/pola urutan gambar, atau rekaman .vraw (default: 0)")
+    parser.add_argument("--record", default=None, help="Rekam setiap sesi ke file .vraw baru: nama ini ditambah stempel waktu sesi")
+    parser.add_argument("--fast", action="store_true", help="Putar sumber rekaman secepat mungkin, bukan dengan tempo asli")
+    parser.add_argument("--rppg-method", choices=RPPG_METHODS, default="pos",
+                        help="Metode ekstraksi sinyal rPPG: green, chrom, atau pos (default: pos)")
+    parser.add_argument("--respiration-method", choices=RESPIRATION_METHODS, default="intensity",
+                        help="Metode ekstraksi sinyal pernapasan: intensity, flow, atau landmark (default: intensity)")
+    parser.add_argument("--face-roi", choices=FACE_ROI_MODES, default="box",
+                        help="ROI wajah rPPG: box (sub-ROI persegi) atau mesh (masker kulit dari landmark Face Mesh) (default: box)")
+    parser.add_argument("--target-fps", type=float, default=30.0,
+                        help="Laju pemrosesan frame yang dituju; interval deteksi dan resolusi inferensi disesuaikan (default: 30)")
+    parser.add_argument("--export", default=None,
+                        help="Ekspor sinyal dan estimasi laju setiap sesi ke subdirektori baru di direktori ini")
+    parser.add_argument("--subjects", type=int, default=1,
+                        help="Jumlah maksimum subjek yang dipantau; lebih dari 1 mengaktifkan mode multi-subjek (default: 1)")
+    args = parser.parse_args()
+
+    with timeline.phase("buat jendela"):
+        root = tk.Tk()  # Membuat instance utama (root window) dari Tkinter
+        # Capture dan inferensi berjalan di thread terpisah; laporan latensi per tahap disimpan ke profil_sesi/ setiap sesi berakhir.
+        # Model MediaPipe dimuat di latar belakang; linimasa startup dicetak saat model siap dan saat frame pertama tampil.
+        app = VitalDashboard(root, use_pipeline=True, profile_dir="profil_sesi", source=args.source,
+                             realtime=not args.fast, record_path=args.record,
+                             rppg_method=args.rppg_method, respiration_method=args.respiration_method,
+                             subjects=args.subjects, face_roi=args.face_roi, target_fps=args.target_fps,
+                             timeline=timeline, export_dir=args.export)  # Membuat instance dari aplikasi VitalDashboard
+    root.mainloop()  # Memulai event loop Tkinter, membuat jendela tetap terbuka dan responsif
@@ -1,15 +1,25 @@
 import tkinter as tk  # Mengimpor modul Tkinter untuk membuat GUI
 from tkinter import ttk, font as tkFont  # Mengimpor submodule ttk untuk widget yang lebih modern dan font untuk kustomisasi font
-from PIL import Image, ImageTk  # Mengimpor Image dan ImageTk dari Pillow untuk menangani gambar
-import cv2  # Mengimpor OpenCV untuk pemrosesan video dan gambar
 import numpy as np  # Mengimpor NumPy untuk operasi numerik, terutama array
+import os  # Mengimpor os untuk path direktori ekspor sesi
+import time  # Mengimpor time untuk mengukur durasi tiap tahap pemrosesan
 # Matplotlib dan FigureCanvasTkAgg digunakan di dalam kelas Visualization, tidak perlu diimpor langsung di sini jika sudah di-handle di sana.
 
-# Mengimpor kelas-kelas dan fungsi yang dibutuhkan dari file lain dalam proyek
-from respirasi_processor import RespirationProcessor # Untuk memproses sinyal pernapasan
-from rppg_processor import RPPGProcessor # Untuk memproses sinyal rPPG
-from visualization import Visualization # Untuk visualisasi sinyal menggunakan Matplotlib
-from vital_cam_gui import start_video_capture # Fungsi untuk menginisialisasi penangkapan video dari kamera
+# Mengimpor kelas-kelas dan fungsi yang dibutuhkan dari file lain dalam proyek.
+# Hanya modul ringan yang diimpor di sini agar jendela tampil secepat mungkin. Modul berat diimpor
+# saat dibutuhkan: Matplotlib/Pillow (Visualization, VideoRenderer) setelah jendela tampil, OpenCV
+# (vital_cam_gui) saat monitoring dimulai, dan MediaPipe (prosesor) di thread `ModelLoader`.
+from startup import ModelLoader, StartupTimeline # Pemuatan model di latar belakang dan linimasa cold start
+from frame_pipeline import FramePipeline, StageStats # Pipeline capture/inferensi berbasis thread dan statistik tahapnya
+from profiler import Profiler # Profiler latensi per tahap (p50/p95/p99) dengan overlay dan ekspor laporan
+from vital_estimator import heart_rate_estimator, respiration_rate_estimator # Estimator laju jantung dan pernapasan
+from sliding_spectrum import heart_rate_spectrum, respiration_spectrum # Spektrum geser per sampel untuk plot spektrum
+from frame_scheduler import AdaptiveScheduler # Penjadwal laju pemrosesan dengan beban inferensi adaptif
+from signal_store import SignalStoreWriter, SessionExporter # Ekspor sinyal dan estimasi sesi ke file kolumnar
+
+# Jumlah sampel terakhir yang di-plot per sinyal (10 detik pada 30 fps); buffer pernapasan menyimpan
+# 30 detik untuk estimasi laju, tetapi plot tetap menampilkan jendela yang sama dengan sinyal rPPG
+PLOT_SAMPLES = 300
 
 class VitalDashboard:
     """
@@ -18,19 +28,71 @@ class VitalDashboard:
     dan visualisasi data vital secara real-time. Kelas ini mengintegrasikan semua komponen
     aplikasi menjadi satu kesatuan fungsional.
     """
-    def __init__(self, root):
+    def __init__(self, root, use_pipeline=False, profile_dir=None, source=0, realtime=True, record_path=None,
+                 rppg_method="pos", subjects=1, timeline=None, export_dir=None, respiration_method="intensity",
+                 face_roi="box", target_fps=30.0):
         """
         Konstruktor untuk kelas VitalDashboard.
 
         Menginisialisasi jendela utama, mengatur gaya (style) untuk widget Tkinter,
         menata letak (layout) elemen-elemen GUI, membuat dan menempatkan widget
-        (seperti tombol, label, dan frame). Juga menginisialisasi objek untuk
-        pemrosesan sinyal (RespirationProcessor, RPPGProcessor) dan visualisasi data (Visualization).
+        (seperti tombol, label, dan frame). Visualisasi data (Visualization) dibuat setelah jendela
+        tampil, dan prosesor sinyal (RespirationProcessor, RPPGProcessor) dibangun serta dipanaskan
+        di thread latar belakang (`ModelLoader`); tombol "Mulai" aktif setelah model siap.
 
         Args:
             root (tk.Tk): Instance root window dari Tkinter yang menjadi dasar aplikasi.
+            use_pipeline (bool, optional): Jika True, capture dan inferensi dijalankan di thread
+                                           terpisah (`FramePipeline`) dan loop Tkinter hanya
+                                           menampilkan hasil terbaru. Defaultnya adalah False.
+            profile_dir (str, optional): Direktori tempat laporan profiler (JSON dan CSV) disimpan setiap
+                                         kali monitoring dihentikan. Default: laporan tidak disimpan.
+            source (int or str, optional): Sumber frame: indeks kamera, file video, direktori/pola urutan
+                                           gambar, atau rekaman .vraw. Defaultnya adalah 0 (kamera default).
+            realtime (bool, optional): Untuk sumber rekaman: putar dengan tempo asli (True) atau secepat
+                                       mungkin (False). Defaultnya adalah True.
+            record_path (str, optional): Jika diberikan, setiap sesi direkam ke file .vraw baru dengan nama ini
+                                         ditambah stempel waktu sesi (misalnya `sesi1_20240101_093000.vraw`).
+            rppg_method (str, optional): Metode ekstraksi sinyal rPPG: "green", "chrom", atau "pos".
+                                         Defaultnya adalah "pos".
+            subjects (int, optional): Jumlah maksimum subjek yang dipantau. Lebih dari 1 mengaktifkan mode
+                                      multi-subjek (`MultiSubjectProcessor`): semua wajah dideteksi sekali per
+                                      frame dan plot menampilkan subjek dengan ID terkecil. Defaultnya adalah 1.
+            timeline (StartupTimeline, optional): Linimasa cold start tempat fase startup dicatat.
+                                                  Default: linimasa baru.
+            export_dir (str, optional): Jika diberikan, sinyal mentah, sinyal terfilter, dan estimasi laju setiap
+                                        sesi diekspor ke subdirektori `sesi_<waktu>` di direktori ini
+                                        (`SignalStoreWriter`). Default: tidak diekspor.
+            respiration_method (str, optional): Metode ekstraksi sinyal pernapasan: "intensity", "flow", atau
+                                                "landmark" (lihat `respiration_methods`). Tidak berlaku pada mode
+                                                multi-subjek. Defaultnya adalah "intensity".
+            face_roi (str, optional): Mode ROI wajah rPPG: "box" atau "mesh" (masker kulit dari landmark Face Mesh,
+                                      lihat `face_mesh_roi`). Tidak berlaku pada mode multi-subjek.
+                                      Defaultnya adalah "box".
+            target_fps (float, optional): Laju pemrosesan frame yang dituju. Interval deteksi dan resolusi inferensi
+                                          disesuaikan agar laju ini tercapai (`AdaptiveScheduler`). Defaultnya adalah 30.0.
         """
         self.root = root  # Menyimpan referensi ke root window Tkinter
+        self.use_pipeline = use_pipeline # Mode pipeline berbasis thread atau loop tunggal di thread Tkinter
+        self.profile_dir = profile_dir # Direktori laporan profiler (None = tidak disimpan)
+        self.source = source # Spesifikasi sumber frame (kamera, file, atau rekaman)
+        self.realtime = realtime # Tempo replay untuk sumber rekaman
+        self.record_path = record_path # File rekaman sesi (None = tidak direkam)
+        self.export_dir = export_dir # Direktori ekspor sinyal (None = tidak diekspor)
+        self.signal_writer = None # SignalStoreWriter sesi yang sedang berjalan
+        self.exporter = None # SessionExporter untuk `signal_writer`
+        self.profiler = Profiler() # Profiler latensi setiap tahap (capture, deteksi, ROI, tampilan, plot)
+        self.timeline = timeline if timeline is not None else StartupTimeline() # Linimasa cold start
+        self.rppg_method = rppg_method # Metode ekstraksi sinyal rPPG
+        self.respiration_method = respiration_method # Metode ekstraksi sinyal pernapasan
+        self.face_roi = face_roi # Mode ROI wajah rPPG
+        self.target_fps = target_fps # Laju pemrosesan yang dituju
+        self.scheduler = None # AdaptiveScheduler untuk prosesor aktif (dibuat setelah model siap)
+        self.subjects = subjects # Jumlah maksimum subjek
+        # Model MediaPipe dibangun dan dipanaskan di latar belakang sementara widget dibuat dan jendela tampil
+        self.model_loader = ModelLoader(self._build_processors, timeline=self.timeline)
+        self.model_loader.start()
+        self.show_profile_overlay = False # Overlay statistik profiler di atas video (tombol 'p')
         self.root.title("Monitor Sinyal Vital Real-time") # Mengatur judul jendela aplikasi
         self.root.geometry("1200x750") # Mengatur ukuran awal jendela aplikasi (lebar x tinggi)
         self.root.configure(bg="#2E2E2E") # Mengatur warna latar belakang utama jendela menjadi abu-abu sangat gelap
@@ -109,6 +171,17 @@ class VitalDashboard:
                                       command=self.stop_video, style="Dark.TButton", width=22) # Menghubungkan dengan metode stop_video
         self.stop_button.grid(row=0, column=1, padx=15) # Menempatkan tombol di frame tombol dengan padding horizontal
         self.stop_button.config(state=tk.DISABLED) # Tombol stop awalnya dinonaktifkan karena monitoring belum dimulai
+        self.start_button.config(state=tk.DISABLED) # Tombol mulai aktif setelah model selesai dimuat (`poll_model_loader`)
+
+        # Label untuk menampilkan estimasi detak jantung dan laju pernapasan
+        self.vitals_label = tk.Label(self.button_frame, text="Memuat model...", font=self.label_font,
+                                     fg="white", bg="#2E2E2E")
+        self.vitals_label.grid(row=1, column=0, columnspan=2, pady=(10, 0))
+
+        # Label untuk menampilkan throughput dan latensi tiap tahap pemrosesan
+        self.stats_label = tk.Label(self.button_frame, text="", font=("Helvetica", 9),
+                                    fg="#AAAAAA", bg="#2E2E2E")
+        self.stats_label.grid(row=2, column=0, columnspan=2, pady=(8, 0))
 
         # --- Bingkai Video ---
         # Membuat LabelFrame (bingkai dengan judul) untuk menampilkan video dari kamera
@@ -122,6 +195,7 @@ class VitalDashboard:
         # Label untuk menampilkan frame video dari kamera
         self.video_label = ttk.Label(self.video_frame, background="#1E1E1E") # Warna latar belakang area video (hitam keabuan)
         self.video_label.grid(row=0, column=0, sticky="nsew", padx=5, pady=5) # Menempatkan label video di dalam frame video, mengisi ruang
+        self.video_renderer = None # Dibuat di `_build_display` setelah jendela tampil
 
 
         # --- Bingkai Sinyal ---
@@ -133,24 +207,31 @@ class VitalDashboard:
         self.signal_frame.columnconfigure(0, weight=1) # Mengatur agar konten di dalam frame sinyal (canvas plot) dapat mengisi ruang horizontal
         self.signal_frame.rowconfigure(0, weight=1)  # Mengatur agar konten di dalam frame sinyal (canvas plot) dapat mengisi ruang vertikal
 
-        # --- Inisialisasi Visualisasi (Matplotlib) ---
-        # Membuat instance dari kelas Visualization, meneruskan frame sinyal sebagai master widget
-        # dan parameter warna untuk kustomisasi tampilan plot agar sesuai dengan tema gelap aplikasi
-        self.visualization = Visualization(self.signal_frame,
-                                           fig_bg_color="#3C3C3C",      # Warna latar belakang Figure Matplotlib
-                                           axes_bg_color="#252525",     # Warna latar belakang area plot (Axes)
-                                           text_color="white",          # Warna teks pada plot (judul, label, tick)
-                                           grid_color="#555555",        # Warna garis grid pada plot
-                                           line1_color="#00FF00",       # Warna garis untuk sinyal pernapasan (hijau terang)
-                                           line2_color="#00FFFF")       # Warna garis untuk sinyal rPPG (cyan terang)
-
-        # --- Inisialisasi Prosesor Sinyal ---
-        self.respiration_processor = RespirationProcessor() # Membuat instance dari RespirationProcessor
-        self.rppg_processor = RPPGProcessor() # Membuat instance dari RPPGProcessor
+        # --- Visualisasi (Matplotlib) dan Prosesor Sinyal ---
+        # Keduanya dibuat setelah jendela tampil: visualisasi di `_build_display` (thread GUI),
+        # prosesor di thread `ModelLoader` lalu dipasang oleh `poll_model_loader`.
+        self.visualization = None
+        self.multi_processor = None # Mode multi-subjek (subjects > 1)
+        self.respiration_processor = None # Mode satu subjek
+        self.rppg_processor = None
+        self.fanout = None # FrameFanout untuk prosesor yang aktif
+
+        # --- Inisialisasi Estimator Laju ---
+        # Estimasi dihitung dari jendela geser buffer sinyal, sekali per detik (bukan setiap frame)
+        self.heart_rate_estimator = heart_rate_estimator(hop_sec=1.0) # Detak jantung dari sinyal rPPG (0.7-4 Hz)
+        self.respiration_rate_estimator = respiration_rate_estimator(hop_sec=1.0) # Laju napas dari sinyal pernapasan (0.1-0.5 Hz)
+        self.heart_rate = None # Estimasi detak jantung terakhir (RateEstimate atau None)
+        self.respiration_rate = None # Estimasi laju pernapasan terakhir (RateEstimate atau None)
+        # Spektrum yang ditampilkan diperbarui per sampel (DFT geser), bukan FFT penuh setiap frame
+        self.heart_rate_spectrum = heart_rate_spectrum() # Spektrum pita denyut jantung dari sinyal rPPG
+        self.respiration_spectrum = respiration_spectrum() # Spektrum pita pernapasan dari sinyal pernapasan
 
         # --- Variabel Status Aplikasi ---
         self.cap = None # Variabel untuk menyimpan objek VideoCapture OpenCV, awalnya None (tidak ada kamera aktif)
         self.running = False # Flag boolean untuk menandakan apakah proses penangkapan video dan monitoring sedang berjalan
+        self.pipeline = None # Objek FramePipeline saat mode pipeline aktif
+        self.display_stats = StageStats("tampilan") # Statistik tahap tampilan (resize video + update plot) di thread GUI
+        self.last_stats_update = 0.0 # Waktu terakhir label statistik diperbarui
 
         # --- Menangani Penutupan Jendela dan Pintasan Keyboard ---
         # Menetapkan fungsi on_closing untuk dipanggil saat pengguna menekan tombol 'X' (close) pada jendela
@@ -158,6 +239,102 @@ class VitalDashboard:
         # Mengikat event penekanan tombol keyboard ('<Key>') ke fungsi key_press_handler
         self.root.bind('<Key>', self.key_press_handler)
 
+        # Event loop Tkinter menggambar jendela terlebih dahulu, baru kemudian modul berat dimuat
+        self.root.after(1, self._build_display)
+        self.root.after(50, self.poll_model_loader)
+
+    def _build_processors(self):
+        """
+        Membuat prosesor sinyal sesuai mode. Dijalankan di thread `ModelLoader`.
+
+        Deteksi MediaPipe penuh setiap 5 frame pada setengah resolusi; di antaranya ROI dilacak dengan
+        optical flow. ROI tetap diukur pada frame resolusi penuh.
+
+        Returns:
+            list: [MultiSubjectProcessor] pada mode multi-subjek, atau [RespirationProcessor, RPPGProcessor].
+        """
+        if self.subjects > 1:
+            from multi_subject_processor import MultiSubjectProcessor # Untuk memantau beberapa subjek dalam satu kamera
+            # Mode multi-subjek: satu deteksi wajah per frame untuk semua subjek, sinyal dan estimator per subjek
+            return [MultiSubjectProcessor(max_subjects=self.subjects, detect_interval=5, inference_scale=0.5,
+                                          method=self.rppg_method, profiler=self.profiler)]
+        from respirasi_processor import RespirationProcessor # Untuk memproses sinyal pernapasan
+        from rppg_processor import RPPGProcessor # Untuk memproses sinyal rPPG
+        # Sinyal rPPG dari proyeksi RGB (default POS) yang lebih tahan perubahan cahaya daripada kanal hijau saja
+        return [RespirationProcessor(detect_interval=5, inference_scale=0.5, profiler=self.profiler,
+                                     method=self.respiration_method),
+                RPPGProcessor(detect_interval=5, inference_scale=0.5, profiler=self.profiler, method=self.rppg_method,
+                              roi_mode=self.face_roi)]
+
+    def _build_display(self):
+        """
+        Membuat plot Matplotlib dan renderer video setelah jendela pertama kali tampil.
+        """
+        self.root.update_idletasks() # Pastikan widget sudah tergambar sebelum impor berat
+        self.timeline.mark("jendela tampil")
+        with self.timeline.phase("bangun visualisasi"):
+            from visualization import Visualization # Untuk visualisasi sinyal menggunakan Matplotlib
+            from video_renderer import VideoRenderer # Untuk menampilkan frame video di label Tkinter dengan biaya rendah
+            # Renderer menyimpan ukuran label dari event <Configure> dan memakai ulang satu PhotoImage;
+            # tampilan di-refresh maksimal 30 kali per detik
+            self.video_renderer = VideoRenderer(self.video_label, max_fps=30)
+            width, height = self.video_label.winfo_width(), self.video_label.winfo_height()
+            if width > 1 and height > 1: # Event <Configure> pertama sudah lewat sebelum renderer dibuat
+                self.video_renderer.target_size = (width, height)
+            # Membuat instance dari kelas Visualization, meneruskan frame sinyal sebagai master widget
+            # dan parameter warna untuk kustomisasi tampilan plot agar sesuai dengan tema gelap aplikasi
+            self.visualization = Visualization(self.signal_frame,
+                                               fig_bg_color="#3C3C3C",      # Warna latar belakang Figure Matplotlib
+                                               axes_bg_color="#252525",     # Warna latar belakang area plot (Axes)
+                                               text_color="white",          # Warna teks pada plot (judul, label, tick)
+                                               grid_color="#555555",        # Warna garis grid pada plot
+                                               line1_color="#00FF00",       # Warna garis untuk sinyal pernapasan (hijau terang)
+                                               line2_color="#00FFFF",       # Warna garis untuk sinyal rPPG (cyan terang)
+                                               blit=True,                   # Hanya garis yang digambar ulang setiap update
+                                               max_fps=20,                  # Plot di-refresh maksimal 20 kali per detik
+                                               show_spectrum=True)          # Spektrum pernapasan dan rPPG di bawah plot sinyal
+        self._enable_start_if_ready() # Model mungkin sudah siap lebih dulu
+
+    def _ready(self):
+        """
+        True jika model (prosesor) dan tampilan (renderer video dan plot) sudah siap dipakai.
+        """
+        return self.fanout is not None and self.video_renderer is not None and self.visualization is not None
+
+    def _enable_start_if_ready(self):
+        """
+        Mengaktifkan tombol "Mulai" hanya jika model dan tampilan sudah siap dan monitoring belum berjalan.
+        Dipanggil dari `_build_display` dan `poll_model_loader`, mana pun yang selesai terakhir.
+        """
+        if self._ready() and not self.running:
+            self.start_button.config(state=tk.NORMAL)
+
+    def poll_model_loader(self):
+        """
+        Memeriksa thread `ModelLoader` tanpa memblokir GUI; setelah model siap, prosesor dipasang
+        dan tombol "Mulai" diaktifkan.
+        """
+        if not self.model_loader.ready.is_set():
+            self.root.after(50, self.poll_model_loader) # Periksa lagi tanpa menahan event loop
+            return
+        if self.model_loader.error is not None:
+            print(f"Error saat memuat model: {self.model_loader.error}")
+            self.vitals_label.config(text="Gagal memuat model.")
+            return
+        from frame_fanout import FrameFanout # Menjalankan prosesor secara paralel pada frame yang sama
+        processors = self.model_loader.result
+        if self.subjects > 1:
+            self.multi_processor = processors[0]
+        else:
+            self.respiration_processor, self.rppg_processor = processors
+        # Prosesor membaca frame yang sama secara paralel; ROI digambar sekali di akhir
+        self.fanout = FrameFanout(processors)
+        # Penjadwal mengatur interval deteksi dan skala inferensi prosesor agar laju target tercapai
+        self.scheduler = AdaptiveScheduler(self.target_fps, processors)
+        self.vitals_label.config(text="")
+        self._enable_start_if_ready() # Model siap: monitoring boleh dimulai jika tampilan juga sudah dibuat
+        print(self.timeline.report())
+
     def key_press_handler(self, event):
         """
         Menangani event penekanan tombol keyboard untuk menyediakan pintasan (shortcuts).
@@ -166,6 +343,7 @@ class VitalDashboard:
         - 'q': Keluar dari aplikasi (sama seperti menutup jendela).
         - 's': Memulai monitoring (jika belum berjalan).
         - 'x': Menghentikan monitoring (jika sedang berjalan).
+        - 'p': Menampilkan/menyembunyikan overlay statistik latensi per tahap.
 
         Args:
             event (tk.Event): Objek event Tkinter yang berisi informasi tentang tombol yang ditekan,
@@ -178,6 +356,8 @@ class VitalDashboard:
             self.start_video() # Panggil fungsi untuk memulai video/monitoring
         elif char == 'x' and self.running: # Jika tombol 'x' ditekan DAN monitoring sedang berjalan
             self.stop_video() # Panggil fungsi untuk menghentikan video/monitoring
+        elif char == 'p': # Jika tombol 'p' ditekan
+            self.show_profile_overlay = not self.show_profile_overlay # Tampilkan/sembunyikan overlay profiler
 
 
     def on_closing(self):
@@ -189,6 +369,8 @@ class VitalDashboard:
         (melepaskan resource kamera) sebelum aplikasi keluar dan jendela dihancurkan.
         """
         self.stop_video() # Memastikan proses penangkapan video dihentikan dan kamera dilepaskan
+        if self.fanout is not None:
+            self.fanout.shutdown() # Menghentikan thread pool prosesor
         self.root.quit()    # Keluar dari mainloop Tkinter, menghentikan pemrosesan event
         self.root.destroy() # Menghancurkan semua widget dan jendela utama, membersihkan resource
 
@@ -205,11 +387,17 @@ class VitalDashboard:
         5. Memanggil `capture_video()` untuk memulai loop pemrosesan frame.
         6. Mengatur ulang state tombol "Mulai" (menjadi nonaktif) dan "Hentikan" (menjadi aktif).
         """
+        if not self._ready():
+            print("Model atau tampilan masih dimuat; monitoring belum dapat dimulai.") # Mis. tombol 's' ditekan terlalu cepat
+            return
         if not self.running: # Hanya jalankan jika monitoring belum/tidak sedang berjalan
+            self.timeline.mark("monitoring dimulai")
             try:
-                # Menggunakan fungsi dari vital_cam_gui.py untuk menginisialisasi kamera
-                # Angka 0 biasanya merujuk pada kamera default/internal
-                self.cap = start_video_capture(0) # Panggil fungsi eksternal untuk setup kamera
+                from vital_cam_gui import start_video_capture # Impor tertunda: OpenCV baru dibutuhkan saat kamera dibuka
+                # Menggunakan fungsi dari vital_cam_gui.py untuk menginisialisasi sumber frame
+                # Angka 0 biasanya merujuk pada kamera default/internal; sumber lain berupa file atau rekaman
+                self.cap = start_video_capture(self.source, realtime=self.realtime,
+                                               record_path=self.record_path) # Panggil fungsi eksternal untuk setup kamera
                 
                 # Memeriksa apakah objek kamera berhasil dibuat dan dibuka
                 if self.cap is None or not self.cap.isOpened():
@@ -223,11 +411,39 @@ class VitalDashboard:
                 return # Keluar dari fungsi
 
             self.running = True # Set flag bahwa monitoring sedang berjalan
-            self.respiration_processor.reset() # Mereset buffer dan state di RespirationProcessor
-            self.rppg_processor.reset() # Mereset buffer dan state di RPPGProcessor
+            if self.multi_processor is not None:
+                self.multi_processor.reset() # Menghapus semua subjek beserta buffer dan estimatornya
+            else:
+                self.respiration_processor.reset() # Mereset buffer dan state di RespirationProcessor
+                self.rppg_processor.reset() # Mereset buffer dan state di RPPGProcessor
+            self.heart_rate_estimator.reset() # Mereset estimator detak jantung
+            self.respiration_rate_estimator.reset() # Mereset estimator laju pernapasan
+            self.heart_rate_spectrum.reset() # Mereset spektrum geser detak jantung
+            self.respiration_spectrum.reset() # Mereset spektrum geser pernapasan
+            self.heart_rate = None
+            self.respiration_rate = None
             self.visualization.clear_plots() # Membersihkan data dari plot sebelumnya di visualizer
-            
-            self.capture_video() # Memulai fungsi rekursif untuk menangkap dan memproses frame video
+            self.display_stats.reset() # Mereset statistik tahap tampilan
+            self.video_renderer.reset() # Frame pertama langsung ditampilkan
+            self.profiler.reset() # Statistik profiler dihitung per sesi
+            self.scheduler.reset() # Tingkat beban awal dan jadwal baru setiap sesi
+            if self.export_dir:
+                # Penulis berjalan di thread sendiri; thread pemrosesan hanya memasukkan batch kecil ke antrian
+                session_dir = os.path.join(self.export_dir, time.strftime("sesi_%Y%m%d_%H%M%S"))
+                self.signal_writer = SignalStoreWriter(session_dir, metadata={
+                    "source": str(self.source), "rppg_method": self.rppg_method,
+                    "respiration_method": self.respiration_method, "face_roi": self.face_roi,
+                    "subjects": self.subjects, "target_fps": self.target_fps})
+                self.exporter = SessionExporter(self.signal_writer)
+
+            if self.use_pipeline:
+                # Capture dan inferensi berjalan di thread terpisah; loop Tkinter hanya mengambil hasil terbaru
+                self.pipeline = FramePipeline(self.cap, self.process_frame, profiler=self.profiler,
+                                              scheduler=self.scheduler)
+                self.pipeline.start()
+                self.poll_pipeline()
+            else:
+                self.capture_video() # Memulai fungsi rekursif untuk menangkap dan memproses frame video
             
             # Mengatur ulang state tombol GUI
             self.start_button.config(state=tk.DISABLED) # Tombol "Mulai Monitoring" dinonaktifkan
@@ -245,14 +461,212 @@ class VitalDashboard:
         """
         if self.running: # Hanya jalankan jika monitoring sedang berjalan
             self.running = False # Set flag bahwa monitoring dihentikan
+            if self.pipeline is not None: # Hentikan thread pipeline sebelum kamera dilepas
+                self.pipeline.stop()
+                print(f"Statistik pipeline: {self.pipeline.summary()}")
+                self.pipeline = None
+            if self.signal_writer is not None: # Setelah pipeline berhenti tidak ada lagi batch baru
+                # Chunk terakhir dan kolom gabungan ditulis di thread penulis; GUI tidak menunggu disk
+                self.signal_writer.close(wait=False)
+                print(f"Sinyal sesi diekspor ke {self.signal_writer.directory}.")
+                self.signal_writer = None
+                self.exporter = None
             if self.cap is not None: # Jika objek VideoCapture ada (kamera sedang digunakan)
                 self.cap.release() # Melepaskan resource kamera
                 self.cap = None # Set objek kamera kembali ke None
-            
+            if self.profile_dir: # Simpan laporan latensi sesi ini
+                try:
+                    json_path, csv_path = self.profiler.export(self.profile_dir)
+                    print(f"Laporan profiler disimpan ke {json_path} dan {csv_path}.")
+                except OSError as e:
+                    print(f"Error saat menyimpan laporan profiler: {e}")
+
             # Mengatur ulang state tombol GUI
             self.start_button.config(state=tk.NORMAL)   # Tombol "Mulai Monitoring" diaktifkan kembali
             self.stop_button.config(state=tk.DISABLED) # Tombol "Hentikan Monitoring" dinonaktifkan
 
+    def process_frame(self, frame, timestamp=None):
+        """
+        Memproses satu frame untuk mendapatkan sinyal pernapasan dan rPPG.
+
+        Dipanggil langsung oleh `capture_video` pada mode loop tunggal, atau dari thread
+        inferensi `FramePipeline` pada mode pipeline.
+
+        Args:
+            frame (numpy.ndarray): Frame video input dalam format BGR OpenCV.
+            timestamp (float, optional): Waktu pengambilan frame (time.monotonic()).
+
+        Returns:
+            tuple:
+                - numpy.ndarray: Frame yang sudah diberi ROI untuk ditampilkan.
+                - numpy.ndarray: Sinyal pernapasan di buffer.
+                - numpy.ndarray: Sinyal rPPG di buffer.
+                - tuple: Spektrum pernapasan dan rPPG, masing-masing (frekuensi, daya) atau None.
+        """
+        # Pose dan Face Detection dijalankan paralel pada satu frame yang sama (sudah di-flip sekali).
+        # Frame hasil adalah salinan khusus tampilan yang sudah berisi kotak ROI kedua prosesor.
+        with self.profiler.stage("fanout"):
+            final_processed_frame, _ = self.fanout.process(frame, timestamp)
+
+        # Estimasi laju dari jendela geser buffer; spektrum hanya dihitung sekali per hop
+        with self.profiler.stage("estimasi"):
+            if self.multi_processor is not None:
+                self.multi_processor.update_estimates() # Estimasi setiap subjek (ditampilkan di atas kotak wajahnya)
+                # Label estimasi menampilkan subjek utama (subjek yang sama dengan plot)
+                subject = self.multi_processor.primary_subject()
+                self.heart_rate = subject.heart_rate if subject is not None else None
+                self.respiration_rate = subject.respiration_rate if subject is not None else None
+            else:
+                # Penanda artefak gerakan membuat jendela yang rusak dilewati (lihat signal_quality.py)
+                self.heart_rate = self.heart_rate_estimator.update_from_buffer(self.rppg_processor.signal_buffer,
+                                                                               self.rppg_processor.artifact_buffer)
+                self.respiration_rate = self.respiration_rate_estimator.update_from_buffer(
+                    self.respiration_processor.signal_buffer, self.respiration_processor.artifact_buffer)
+        if self.exporter is not None:
+            with self.profiler.stage("ekspor"):
+                self.export_signals()
+        respiration_buffer, rppg_buffer = self.signal_buffers()
+        if rppg_buffer is None:
+            return final_processed_frame, np.zeros(0), np.zeros(0), (None, None) # Belum ada subjek
+        with self.profiler.stage("spektrum"):
+            # Hanya sampel baru yang dimasukkan (O(jumlah bin) per sampel); buffer subjek utama yang berganti
+            # pada mode multi-subjek membuat spektrum diisi ulang dari buffer barunya
+            self.respiration_spectrum.update_from_buffer(respiration_buffer)
+            self.heart_rate_spectrum.update_from_buffer(rppg_buffer)
+            # Daya spektrum adalah array baru, aman dikirim ke thread GUI tanpa salinan tambahan
+            spectra = (self.respiration_spectrum.spectrum(), self.heart_rate_spectrum.spectrum())
+        respiration_signal = respiration_buffer.values(PLOT_SAMPLES) # View buffer sinyal pernapasan
+        rppg_signal = rppg_buffer.values(PLOT_SAMPLES) # View buffer sinyal rPPG
+        if self.use_pipeline:
+            # Hasil dikirim ke thread GUI sementara thread inferensi terus menulis buffer,
+            # sehingga view perlu disalin (satu memcpy NumPy per sinyal).
+            respiration_signal = respiration_signal.copy()
+            rppg_signal = rppg_signal.copy()
+        return final_processed_frame, respiration_signal, rppg_signal, spectra
+
+    def show_frame(self, final_processed_frame, respiration_signal, rppg_signal, spectra=None):
+        """
+        Menampilkan frame yang sudah diproses di label video dan memperbarui plot sinyal.
+
+        Harus dipanggil dari thread Tkinter.
+
+        Args:
+            final_processed_frame (numpy.ndarray): Frame BGR yang akan ditampilkan.
+            respiration_signal (numpy.ndarray): Sinyal pernapasan di buffer.
+            rppg_signal (numpy.ndarray): Sinyal rPPG di buffer.
+            spectra (tuple, optional): Spektrum pernapasan dan rPPG dari `process_frame`.
+        """
+        start = time.monotonic() # Awal pengukuran tahap tampilan
+        # Video dan plot masing-masing dibatasi `max_fps`-nya sendiri, terpisah dari kecepatan pemrosesan;
+        # frame yang datang sebelum waktunya hanya dilewati (sinyalnya tetap tercatat di buffer)
+        video_due = self.video_renderer.due(start)
+
+        # --- Memperbarui Tampilan Video di GUI ---
+        if video_due:
+            try:
+                if self.show_profile_overlay:
+                    self.profiler.draw_overlay(final_processed_frame) # Frame tampilan adalah salinan, boleh digambari
+                # Resize (cv2), konversi warna, dan paste ke PhotoImage yang dipakai ulang
+                with self.profiler.stage("video"):
+                    self.video_renderer.render(final_processed_frame, start)
+            except Exception as e:
+                # Menangani potensi error saat konversi atau update gambar (misalnya, jika frame rusak)
+                print(f"Error saat memperbarui frame video: {e}")
+
+        # --- Memperbarui Grafik Sinyal ---
+        # Mengirimkan data sinyal pernapasan dan rPPG yang baru didapatkan ke objek visualisasi untuk di-plot
+        # (dilewati di dalam `update` jika belum waktunya menurut `max_fps` plot)
+        with self.profiler.stage("plot"):
+            plotted = self.visualization.update([respiration_signal, rppg_signal], spectra)
+
+        if not (video_due or plotted):
+            return
+        self.display_stats.record(time.monotonic() - start) # Catat durasi tahap tampilan
+        if "frame pertama" not in self.timeline.marks:
+            self.timeline.mark("frame pertama") # Time-to-first-frame
+            print(self.timeline.report())
+
+    def export_signals(self):
+        """
+        Mengirim sampel baru semua buffer sinyal dan estimasi laju terbaru ke penulis sesi.
+
+        Dipanggil dari thread yang menjalankan `process_frame`; hanya menyalin beberapa sampel per frame.
+        """
+        if self.multi_processor is None:
+            self.exporter.subject("", self.respiration_processor.signal_buffer, self.rppg_processor.signal_buffer,
+                                  self.heart_rate, self.respiration_rate, rgb_buffer=self.rppg_processor.rgb_buffer,
+                                  respiration_artifacts=self.respiration_processor.artifact_buffer,
+                                  rppg_artifacts=self.rppg_processor.artifact_buffer)
+            return
+        for subject_id, subject in list(self.multi_processor.subjects.items()):
+            self.exporter.subject(f"subjek{subject_id}_", subject.respiration_buffer, subject.rppg_buffer,
+                                  subject.heart_rate, subject.respiration_rate,
+                                  respiration_artifacts=subject.respiration_artifacts,
+                                  rppg_artifacts=subject.rppg_artifacts)
+
+    def signal_buffers(self):
+        """
+        Mengembalikan buffer sinyal yang ditampilkan di plot dan label estimasi.
+
+        Pada mode multi-subjek, buffer subjek utama (ID terkecil) dipakai. Dipanggil dari thread
+        pemrosesan dan thread GUI, sehingga tidak mengubah state apa pun.
+
+        Returns:
+            tuple: (buffer pernapasan, buffer rPPG), atau (None, None) jika belum ada subjek.
+        """
+        if self.multi_processor is None:
+            return self.respiration_processor.signal_buffer, self.rppg_processor.signal_buffer
+        subject = self.multi_processor.primary_subject()
+        if subject is None:
+            return None, None
+        return subject.respiration_buffer, subject.rppg_buffer
+
+    def sampling_rate_text(self):
+        """
+        Mengembalikan teks frekuensi sampling efektif sinyal rPPG yang diukur dari timestamp buffer,
+        beserta ringkasan penjadwal (laju yang tercapai, interval deteksi, dan skala inferensi).
+
+        Returns:
+            str: Contoh: "fs 29.7 Hz | jadwal 29.6/30 fps, deteksi 1/5, skala 0.50", atau "fs -" jika sampel belum cukup.
+        """
+        _, rppg_buffer = self.signal_buffers()
+        fs = rppg_buffer.effective_fs() if rppg_buffer is not None else None
+        text = f"fs {fs:.1f} Hz" if fs else "fs -"
+        return f"{text} | {self.scheduler.summary()}" if self.scheduler is not None else text
+
+    def update_vitals_label(self):
+        """
+        Memperbarui label estimasi detak jantung dan laju pernapasan beserta SNR-nya.
+        Estimasi yang sedang ditahan karena artefak gerakan diberi keterangan "gerakan".
+        """
+        hr = self.heart_rate # Referensi lokal karena nilai ini ditulis dari thread inferensi
+        rr = self.respiration_rate
+        hr_estimator, rr_estimator = self.heart_rate_estimator, self.respiration_rate_estimator
+        if self.multi_processor is not None:
+            subject = self.multi_processor.primary_subject()
+            if subject is not None:
+                hr_estimator, rr_estimator = subject.heart_rate_estimator, subject.respiration_rate_estimator
+        hr_text = f"{hr.rate:.0f} BPM (SNR {hr.snr:.1f} dB)" if hr else "-"
+        rr_text = f"{rr.rate:.1f} napas/menit (SNR {rr.snr:.1f} dB)" if rr else "-"
+        if hr_estimator.gated:
+            hr_text += " [gerakan]"
+        if rr_estimator.gated:
+            rr_text += " [gerakan]"
+        self.vitals_label.config(text=f"Detak jantung: {hr_text}    |    Pernapasan: {rr_text}")
+
+    def update_stats_label(self, text):
+        """
+        Memperbarui label statistik performa dan label estimasi laju, maksimal dua kali per detik.
+
+        Args:
+            text (str): Teks ringkasan statistik yang akan ditampilkan.
+        """
+        now = time.monotonic()
+        if now - self.last_stats_update >= 0.5: # Batasi frekuensi update label agar tidak membebani GUI
+            self.stats_label.config(text=text)
+            self.update_vitals_label()
+            self.last_stats_update = now
+
     def capture_video(self):
         """
         Menangkap satu frame dari kamera, memprosesnya untuk mendapatkan sinyal pernapasan dan rPPG,
@@ -265,8 +679,8 @@ class VitalDashboard:
         Proses per frame:
         1. Baca frame dari kamera.
         2. Jika gagal, hentikan video.
-        3. Proses frame menggunakan `RespirationProcessor`.
-        4. Proses frame (hasil dari `RespirationProcessor`) menggunakan `RPPGProcessor`.
+        3. Proses frame dengan `RespirationProcessor` dan `RPPGProcessor` secara paralel (`FrameFanout`).
+        4. Gambar ROI kedua prosesor pada salinan frame untuk tampilan.
         5. Konversi frame yang sudah diproses untuk ditampilkan di label video Tkinter.
         6. Perbarui visualisasi sinyal dengan data baru.
         7. Jadwalkan pemanggilan berikutnya untuk `capture_video`.
@@ -276,76 +690,54 @@ class VitalDashboard:
             self.stop_video() # Jika kondisi tidak terpenuhi, pastikan video dihentikan dengan benar
             return # Keluar dari fungsi (menghentikan loop)
 
-        ret, frame = self.cap.read() # Membaca satu frame dari kamera; `ret` adalah boolean (berhasil/gagal), `frame` adalah data gambar
+        with self.profiler.stage("capture"):
+            # Membaca satu frame beserta timestamp capture-nya; `ret` adalah boolean (berhasil/gagal), `frame` adalah data gambar
+            ret, frame, timestamp = self.cap.read_timestamped()
         if not ret: # Jika frame tidak berhasil ditangkap (misalnya, kamera terputus)
             print("Error: Gagal menangkap frame.") # Cetak pesan error ke konsol
             self.stop_video() # Hentikan proses monitoring
             return # Keluar dari fungsi
 
         # --- Pemrosesan Frame ---
-        # frame.copy() digunakan untuk mengirim salinan frame ke prosesor, sehingga modifikasi
-        # di satu prosesor tidak mempengaruhi input ke prosesor lain jika frame asli masih dibutuhkan.
-        # 1. Proses frame untuk sinyal pernapasan
-        processed_frame_resp, respiration_signal = self.respiration_processor.process(frame.copy())
-        
-        # 2. Proses frame (yang mungkin sudah ada ROI pernapasan dari prosesor sebelumnya) untuk sinyal rPPG
-        final_processed_frame, rppg_signal = self.rppg_processor.process(processed_frame_resp)
-
-        # --- Memperbarui Tampilan Video di GUI ---
-        try:
-            # Konversi frame dari format OpenCV (BGR) ke format RGB yang umum digunakan oleh Pillow/PIL
-            cv2_frame_rgb = cv2.cvtColor(final_processed_frame, cv2.COLOR_BGR2RGB)
-            # Membuat objek Image dari Pillow dari array NumPy (frame RGB)
-            pil_image = Image.fromarray(cv2_frame_rgb)
-
-            # Mendapatkan dimensi aktual dari widget label video untuk penyesuaian ukuran gambar (resize)
-            video_label_width = self.video_label.winfo_width()  # Lebar widget label video saat ini
-            video_label_height = self.video_label.winfo_height() # Tinggi widget label video saat ini
-
-            # Pastikan dimensi label valid (lebih besar dari 1x1 piksel) sebelum mengubah ukuran.
-            # Ini untuk menghindari error jika widget belum sepenuhnya digambar.
-            if video_label_width > 1 and video_label_height > 1:
-                img_aspect_ratio = pil_image.width / pil_image.height # Rasio aspek gambar asli
-                label_aspect_ratio = video_label_width / video_label_height # Rasio aspek label video
-
-                # Menentukan apakah penyesuaian ukuran didasarkan pada lebar atau tinggi label,
-                # agar gambar pas di dalam label tanpa distorsi, mempertahankan rasio aspek aslinya.
-                if img_aspect_ratio > label_aspect_ratio:
-                    # Jika gambar lebih lebar relatif terhadap label, sesuaikan lebar gambar dengan lebar label
-                    new_width = video_label_width
-                    new_height = int(new_width / img_aspect_ratio) # Hitung tinggi baru berdasarkan rasio aspek
-                else:
-                    # Jika gambar lebih tinggi relatif terhadap label (atau rasio aspeknya sama), sesuaikan tinggi gambar dengan tinggi label
-                    new_height = video_label_height
-                    new_width = int(new_height * img_aspect_ratio) # Hitung lebar baru berdasarkan rasio aspek
-                
-                # Mengubah ukuran gambar menggunakan metode resampling LANCZOS untuk kualitas terbaik
-                resized_image = pil_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                # Mengkonversi gambar PIL yang sudah di-resize ke PhotoImage Tkinter agar bisa ditampilkan di label
-                photo = ImageTk.PhotoImage(image=resized_image)
-            else:
-                # Jika dimensi label belum siap (misalnya saat inisialisasi awal atau jika tersembunyi),
-                # tampilkan gambar dengan ukuran aslinya atau ukuran default tanpa resize.
-                photo = ImageTk.PhotoImage(image=pil_image)
+        start = time.monotonic() # Durasi pemrosesan diukur tanpa waktu tunggu kamera
+        final_processed_frame, respiration_signal, rppg_signal, spectra = self.process_frame(frame, timestamp)
 
-
-            self.video_label.config(image=photo) # Menetapkan gambar yang sudah diproses ke label video
-            # Menyimpan referensi ke objek PhotoImage (self.video_label.image = photo).
-            # Ini PENTING di Tkinter agar gambar tidak di-garbage collect oleh Python,
-            # yang akan menyebabkan gambar tidak tampil atau hilang.
-            self.video_label.image = photo
-        except Exception as e:
-            # Menangani potensi error saat konversi atau update gambar (misalnya, jika frame rusak)
-            print(f"Error saat memperbarui frame video: {e}")
-
-
-        # --- Memperbarui Grafik Sinyal ---
-        # Mengirimkan data sinyal pernapasan dan rPPG yang baru didapatkan ke objek visualisasi untuk di-plot
-        self.visualization.update([respiration_signal, rppg_signal])
+        # --- Memperbarui Tampilan Video dan Grafik Sinyal ---
+        self.show_frame(final_processed_frame, respiration_signal, rppg_signal, spectra)
+        self.update_stats_label(f"{self.display_stats.summary()} | {self.sampling_rate_text()}")
+        end = time.monotonic()
+        self.scheduler.record(end - start, end) # Beban prosesor disesuaikan jika anggaran per frame terlampaui
 
         # --- Loop untuk Frame Berikutnya ---
         if self.running: # Jika monitoring masih harus berjalan
-            # Jadwalkan pemanggilan fungsi capture_video lagi setelah 20 milidetik.
-            # Ini menciptakan loop yang berjalan dengan target sekitar 50 FPS (1000ms / 20ms = 50 FPS).
-            # Nilai interval (20ms) bisa disesuaikan untuk trade-off antara kelancaran video dan beban CPU.
-            self.root.after(20, self.capture_video)
\ No newline at end of file
+            # Frame berikutnya dijadwalkan satu periode target setelah jadwal frame ini (bukan setelah frame
+            # selesai), sehingga durasi pemrosesan tidak menggeser laju sampling
+            delay = self.scheduler.next_delay(end)
+            self.root.after(max(1, int(round(delay * 1000))), self.capture_video)
+
+    def poll_pipeline(self):
+        """
+        Mengambil hasil terbaru dari `FramePipeline` dan menampilkannya di GUI.
+
+        Berjalan di thread Tkinter melalui `self.root.after()`. Tidak pernah menunggu kamera
+        maupun inferensi: jika belum ada hasil baru, fungsi langsung menjadwalkan dirinya lagi.
+        Hasil lama yang belum sempat ditampilkan dibuang (hanya hasil terbaru yang dipakai).
+        """
+        if not self.running or self.pipeline is None:
+            return # Monitoring sudah dihentikan
+
+        if self.pipeline.finished: # Thread capture berhenti sendiri (misalnya kamera terputus)
+            print(f"Error: {self.pipeline.error or 'Pipeline berhenti.'}")
+            self.stop_video()
+            return
+
+        result = self.pipeline.get_latest_result() # Ambil hasil terbaru tanpa menunggu
+        if result is not None:
+            final_processed_frame, respiration_signal, rppg_signal, spectra = result.value
+            self.show_frame(final_processed_frame, respiration_signal, rppg_signal, spectra)
+            self.update_stats_label(f"{self.pipeline.summary()} | {self.display_stats.summary()} | "
+                                    f"{self.sampling_rate_text()}")
+
+        if self.running:
+            # Polling cepat agar hasil baru segera tampil; pekerjaan berat ada di thread pipeline
+            self.root.after(10, self.poll_pipeline)
@@ -0,0 +1,303 @@
+import cv2 # Mengimpor OpenCV untuk menggambar ROI dan ID subjek
+import numpy as np # Mengimpor NumPy untuk ROI gabungan semua subjek
+import time # Mengimpor time untuk timestamp sampel default
+from ring_buffer import TimestampedRingBuffer # Ring buffer NumPy dengan timestamp untuk sinyal per subjek
+from inference_frame import InferenceFrame # Cache konversi RGB yang dibagikan antar prosesor
+from roi_stats import BGR_TO_GRAY, clip_rois, face_subrois, grid_subrois, roi_means # Statistik multi-ROI
+from rppg_methods import RPPG_METHODS, DEFAULT_WINDOW_SEC, OverlapAddProjector # Proyeksi CHROM/POS inkremental
+from subject_tracker import SubjectTracker # Pelacak ID subjek berbasis IoU/centroid
+from vital_estimator import heart_rate_estimator, respiration_rate_estimator # Estimator laju per subjek
+from profiler import Profiler # Profiler latensi per tahap
+from signal_quality import MotionGate, projected_flags # Deteksi artefak gerakan dari ROI dan intensitasnya
+from respirasi_processor import SIGNAL_BUFFER_SIZE as RESPIRATION_BUFFER_SIZE # Kapasitas buffer pernapasan (30 detik)
+
+# Jumlah ROI per subjek: 3 sub-ROI wajah (dahi, dua pipi) lalu 6 petak dada (grid 2x3)
+FACE_ROI_COUNT = 3
+CHEST_ROI_COUNT = 6
+# Warna kotak per subjek (BGR), dipakai bergiliran berdasarkan ID
+SUBJECT_COLORS = [(255, 0, 0), (0, 200, 255), (255, 0, 255), (0, 255, 255), (255, 255, 0), (0, 128, 255)]
+
+
+def chest_roi_from_face(face_roi):
+    """
+    Memperkirakan ROI dada dari bounding box wajah.
+
+    Model Pose MediaPipe hanya mendeteksi satu orang, sehingga untuk banyak subjek area dada
+    diperkirakan dari geometri wajah: selebar 2.5x wajah, dimulai sedikit di bawah dagu.
+
+    Args:
+        face_roi (tuple): Bounding box wajah (x1, y1, x2, y2).
+
+    Returns:
+        tuple: ROI dada (x1, y1, x2, y2) dalam piksel (belum dibatasi ke frame).
+    """
+    x1, y1, x2, y2 = face_roi
+    w, h = x2 - x1, y2 - y1
+    cx = (x1 + x2) // 2
+    return (int(cx - 1.25 * w), int(y2 + 0.6 * h), int(cx + 1.25 * w), int(y2 + 1.8 * h))
+
+
+class Subject:
+    """
+    State satu subjek: ROI, buffer sinyal rPPG dan pernapasan, serta estimator lajunya.
+    """
+    def __init__(self, subject_id, face_roi, method, window_size, hop, hop_sec):
+        """
+        Konstruktor untuk kelas Subject.
+
+        Args:
+            subject_id (int): ID stabil dari `SubjectTracker`.
+            face_roi (tuple): Bounding box wajah awal (x1, y1, x2, y2).
+            method (str): Metode ekstraksi rPPG ("green", "chrom", atau "pos").
+            window_size (int): Panjang jendela proyeksi CHROM/POS (sampel).
+            hop (int): Jarak antar jendela proyeksi (sampel).
+            hop_sec (float): Selang waktu antar estimasi laju (detik).
+        """
+        self.id = subject_id # ID subjek
+        self.rppg_buffer = TimestampedRingBuffer(300) # Sinyal rPPG subjek
+        self.respiration_buffer = TimestampedRingBuffer(RESPIRATION_BUFFER_SIZE) # Sinyal pernapasan subjek
+        self.projector = None if method == "green" else OverlapAddProjector(method, window_size, hop)
+        # Penanda artefak gerakan per sampel (1 = tertandai), selaras dengan buffer sinyal masing-masing
+        self.rppg_artifacts = TimestampedRingBuffer(300) #
+        self.respiration_artifacts = TimestampedRingBuffer(RESPIRATION_BUFFER_SIZE) #
+        self.rppg_gate = MotionGate() # Gerakan kotak wajah dan lompatan luminansi wajah
+        self.respiration_gate = MotionGate() # Gerakan kotak dada dan lompatan intensitas dada
+        # Penanda per sampel RGB untuk CHROM/POS (lihat RPPGProcessor.motion_flags)
+        self.motion_flags = None if self.projector is None else TimestampedRingBuffer(2 * self.projector.window_size - 1)
+        self.heart_rate_estimator = heart_rate_estimator(hop_sec=hop_sec) # Estimator detak jantung subjek
+        self.respiration_rate_estimator = respiration_rate_estimator(hop_sec=hop_sec) # Estimator laju pernapasan subjek
+        self.heart_rate = None # Estimasi detak jantung terakhir (RateEstimate atau None)
+        self.respiration_rate = None # Estimasi laju pernapasan terakhir (RateEstimate atau None)
+        self.set_roi(face_roi)
+
+    def set_roi(self, face_roi):
+        """
+        Memperbarui ROI wajah beserta ROI turunannya (sub-ROI wajah dan petak dada).
+        """
+        self.face_roi = face_roi # Bounding box wajah
+        self.chest_roi = chest_roi_from_face(face_roi) # Perkiraan ROI dada
+        # 9 ROI subjek ini dalam urutan tetap: sub-ROI wajah lalu petak dada
+        self.rois = np.concatenate([face_subrois(face_roi), grid_subrois(self.chest_roi)])
+
+
+class MultiSubjectProcessor:
+    """
+    Prosesor sinyal vital untuk beberapa subjek dalam satu kamera.
+
+    Wajah semua subjek dideteksi sekali per frame deteksi (model Face Detection jarak jauh),
+    lalu setiap wajah diberi ID stabil oleh `SubjectTracker`. Setiap subjek memiliki buffer
+    sinyal dan estimator laju sendiri. Rata-rata semua ROI semua subjek dihitung dalam satu
+    panggilan `roi_means` (satu integral image untuk seluruh ROI), sehingga biaya per frame
+    didominasi oleh deteksi dan integral image yang dibagikan, bukan oleh jumlah subjek.
+    """
+    def __init__(self, max_subjects=4, detect_interval=5, inference_scale=0.5, method="pos",
+                 window_sec=DEFAULT_WINDOW_SEC, fs=30.0, hop=1, hop_sec=1.0, profiler=None):
+        """
+        Konstruktor untuk kelas MultiSubjectProcessor.
+
+        Args:
+            max_subjects (int, optional): Jumlah maksimum subjek yang dipantau. Defaultnya adalah 4.
+            detect_interval (int, optional): Deteksi wajah dijalankan setiap N frame; di antaranya ROI terakhir
+                                             dipakai kembali. Defaultnya adalah 5.
+            inference_scale (float, optional): Skala resolusi frame untuk MediaPipe. Defaultnya adalah 0.5.
+            method (str, optional): Metode ekstraksi rPPG: "green", "chrom", atau "pos". Defaultnya adalah "pos".
+            window_sec (float, optional): Panjang jendela proyeksi CHROM/POS (detik). Defaultnya adalah 1.6.
+            fs (float, optional): Perkiraan laju frame (Hz) untuk jendela proyeksi. Defaultnya adalah 30.0.
+            hop (int, optional): Jarak antar jendela proyeksi (sampel). Defaultnya adalah 1.
+            hop_sec (float, optional): Selang waktu antar estimasi laju (detik). Defaultnya adalah 1.0.
+            profiler (Profiler, optional): Profiler untuk mencatat durasi tahap. Default: profiler nonaktif.
+        """
+        if method not in RPPG_METHODS:
+            raise ValueError(f"Metode rPPG tidak dikenal: {method} (pilihan: {', '.join(RPPG_METHODS)})")
+        import mediapipe as mp # Impor tertunda hingga prosesor dibuat (lihat RespirationProcessor)
+        self.mp_face = mp.solutions.face_detection # Mengakses solusi deteksi wajah dari MediaPipe
+        # Model jarak jauh (model_selection=1, hingga ~5 m) agar pasien di beberapa tempat tidur terdeteksi
+        self.face_detector = self.mp_face.FaceDetection(model_selection=1, min_detection_confidence=0.5) #
+        self.tracker = SubjectTracker(max_subjects=max_subjects) # Pelacak ID subjek
+        self.detect_interval = max(1, int(detect_interval)) # Interval deteksi wajah
+        self.inference_scale = inference_scale # Skala resolusi untuk inferensi MediaPipe
+        self.method = method # Metode ekstraksi rPPG
+        self.window_size = max(2, round(window_sec * fs)) # Panjang jendela proyeksi (sampel)
+        self.hop = hop # Jarak antar jendela proyeksi
+        self.hop_sec = hop_sec # Selang waktu antar estimasi laju
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False) # Profiler tahap
+        self.reset()
+
+    def warm_up(self, frame_shape=(480, 640, 3)):
+        """
+        Menjalankan satu inferensi Face Detection pada frame hitam agar graf MediaPipe dan interpreter
+        TensorFlow Lite sudah terinisialisasi sebelum frame kamera pertama tiba.
+
+        Args:
+            frame_shape (tuple, optional): Bentuk frame pemanasan (tinggi, lebar, kanal); sebaiknya sama
+                                           dengan resolusi kamera. Defaultnya adalah (480, 640, 3).
+        """
+        self._detect_faces(InferenceFrame(np.zeros(frame_shape, dtype=np.uint8))) # Hasil deteksi diabaikan
+
+    def reset(self):
+        """
+        Menghapus semua subjek dan state deteksi. Dipanggil sebelum memulai sesi baru.
+        """
+        self.tracker.reset()
+        self.subjects = {} # ID subjek -> Subject (hanya diubah dan diiterasi oleh thread pemrosesan)
+        self._primary = None # Subjek utama yang dipublikasikan untuk dibaca thread GUI
+        self.frame_count = 0 # Jumlah frame sejak reset
+        self._rois = None # ROI gabungan semua subjek (9 * S, 4); dibangun ulang hanya saat ROI berubah
+        self._chest_areas = None # Luas petak dada per subjek (S, 6), mengikuti `_rois`
+
+    def _detect_faces(self, inference_frame):
+        """
+        Menjalankan Face Detection dan mengembalikan semua bounding box wajah dalam piksel resolusi penuh.
+        """
+        results = self.face_detector.process(inference_frame.rgb(self.inference_scale))
+        if not results.detections:
+            return np.zeros((0, 4))
+        h, w = inference_frame.frame.shape[:2]
+        boxes = []
+        for detection in results.detections:
+            box = detection.location_data.relative_bounding_box
+            x1, y1 = int(box.xmin * w), int(box.ymin * h)
+            boxes.append((x1, y1, x1 + int(box.width * w), y1 + int(box.height * h)))
+        return np.array(boxes)
+
+    def _update_subjects(self, inference_frame):
+        """
+        Deteksi wajah, pencocokan ID, lalu memperbarui daftar subjek beserta ROI-nya.
+        """
+        with self.profiler.stage("face detection"):
+            boxes = self._detect_faces(inference_frame)
+        visible, removed = self.tracker.update(boxes)
+        for subject_id in removed:
+            del self.subjects[subject_id] # Subjek keluar dari frame
+        for subject_id, face_roi in visible.items():
+            if subject_id in self.subjects:
+                self.subjects[subject_id].set_roi(face_roi)
+            else:
+                self.subjects[subject_id] = Subject(subject_id, face_roi, self.method, self.window_size,
+                                                    self.hop, self.hop_sec)
+        self._rois = None
+        # Satu penggantian referensi (atomik di bawah GIL): thread GUI tidak pernah membaca `subjects`
+        # yang sedang diubah
+        self._primary = self.subjects[min(self.subjects)] if self.subjects else None
+
+    def analyze(self, frame, timestamp=None, inference_frame=None):
+        """
+        Mengekstraksi satu sampel rPPG dan pernapasan untuk setiap subjek dari frame tanpa memodifikasinya.
+
+        Args:
+            frame (numpy.ndarray): Frame video BGR OpenCV yang sudah di-flip (efek cermin).
+            timestamp (float, optional): Waktu pengambilan frame (time.monotonic()). Default: waktu saat ini.
+            inference_frame (InferenceFrame, optional): Cache konversi RGB untuk `frame` yang dibagikan
+                                                        dengan prosesor lain (lihat `FrameFanout`).
+
+        Returns:
+            dict: ID subjek -> (nilai pernapasan, nilai rPPG) pada frame ini; nilai rPPG None jika
+                  sampel CHROM/POS belum final.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic() # Waktu sebelum inferensi sebagai perkiraan waktu pengambilan frame
+        if inference_frame is None:
+            inference_frame = InferenceFrame(frame) # Cache konversi lokal jika tidak dibagikan
+
+        if self.frame_count % self.detect_interval == 0:
+            self._update_subjects(inference_frame) # Satu deteksi untuk semua subjek
+        self.frame_count += 1
+        if not self.subjects:
+            return {}
+
+        subjects = list(self.subjects.values())
+        per_subject = FACE_ROI_COUNT + CHEST_ROI_COUNT
+        with self.profiler.stage("roi subjek"):
+            if self._rois is None:
+                self._rois = clip_rois(np.concatenate([s.rois for s in subjects]), frame.shape)
+                # Bobot luas petak dada setiap subjek untuk rata-rata gabungan, bentuk (S, 6)
+                areas = (self._rois[:, 2] - self._rois[:, 0]) * (self._rois[:, 3] - self._rois[:, 1])
+                self._chest_areas = areas.reshape(len(subjects), per_subject)[:, FACE_ROI_COUNT:].astype(np.float64)
+            # Satu lintasan statistik untuk ROI semua subjek (integral image bersama bila ROI banyak)
+            means = roi_means(frame, self._rois).reshape(len(subjects), per_subject, -1)
+            # Rata-rata gabungan semua subjek sekaligus: BGR wajah (S, 3) dan grayscale dada (S,)
+            face = means[:, :FACE_ROI_COUNT]
+            face_valid = ~np.isnan(face[..., 0])
+            face_count = face_valid.sum(axis=1)
+            face_bgr = np.where(face_valid[..., None], face, 0.0).sum(axis=1) / np.maximum(face_count, 1)[:, None]
+            chest_gray = means[:, FACE_ROI_COUNT:] @ BGR_TO_GRAY
+            chest_valid = ~np.isnan(chest_gray)
+            chest_weight = np.where(chest_valid, self._chest_areas, 0.0)
+            chest_total = chest_weight.sum(axis=1)
+            chest_mean = (np.where(chest_valid, chest_gray, 0.0) * chest_weight).sum(axis=1) / np.maximum(chest_total, 1e-9)
+
+        values = {}
+        for k, subject in enumerate(subjects):
+            resp_value = None
+            if chest_total[k] > 0:
+                resp_value = chest_mean[k]
+                quality = subject.respiration_gate.update(subject.chest_roi, resp_value, timestamp)
+                subject.respiration_buffer.append(resp_value, timestamp)
+                subject.respiration_artifacts.append(float(quality.flagged), timestamp)
+            rppg_value = None
+            if face_count[k] > 0:
+                mean_rgb = face_bgr[k, ::-1] # Urutan kanal R, G, B
+                flag = float(subject.rppg_gate.update(subject.face_roi, float(mean_rgb.mean()), timestamp).flagged)
+                if subject.projector is None:
+                    rppg_value = mean_rgb[1] # Kanal hijau
+                    subject.rppg_buffer.append(rppg_value, timestamp)
+                    subject.rppg_artifacts.append(flag, timestamp)
+                else:
+                    pulse, times = subject.projector.push(mean_rgb, timestamp)
+                    subject.motion_flags.append(flag, timestamp)
+                    final_flags = projected_flags(subject.motion_flags.values(), subject.projector.window_size, len(pulse))
+                    for value, sample_time, final_flag in zip(pulse, times, final_flags):
+                        subject.rppg_buffer.append(value, sample_time)
+                        subject.rppg_artifacts.append(final_flag, sample_time)
+                    rppg_value = pulse[-1] if len(pulse) else None
+            values[subject.id] = (resp_value, rppg_value)
+        return values
+
+    def update_estimates(self):
+        """
+        Memperbarui estimasi detak jantung dan laju pernapasan setiap subjek.
+
+        Dapat dipanggil setiap frame; spektrum hanya dihitung sekali per `hop_sec`.
+
+        Returns:
+            dict: ID subjek -> (RateEstimate detak jantung atau None, RateEstimate pernapasan atau None).
+        """
+        estimates = {}
+        for subject in self.subjects.values():
+            subject.heart_rate = subject.heart_rate_estimator.update_from_buffer(subject.rppg_buffer, subject.rppg_artifacts)
+            subject.respiration_rate = subject.respiration_rate_estimator.update_from_buffer(
+                subject.respiration_buffer, subject.respiration_artifacts)
+            estimates[subject.id] = (subject.heart_rate, subject.respiration_rate)
+        return estimates
+
+    def primary_subject(self):
+        """
+        Mengembalikan subjek dengan ID terkecil (subjek yang paling lama dipantau).
+
+        Aman dipanggil dari thread GUI: yang dibaca adalah referensi yang dipublikasikan setelah setiap
+        deteksi, bukan dict `subjects` yang sedang diubah oleh thread pemrosesan.
+
+        Returns:
+            Subject or None: Subjek utama, atau None jika belum ada subjek.
+        """
+        return self._primary
+
+    def draw_roi(self, frame):
+        """
+        Menggambar kotak wajah, kotak dada, ID, dan estimasi laju setiap subjek pada frame tampilan.
+
+        Args:
+            frame (numpy.ndarray): Frame BGR yang boleh dimodifikasi (salinan untuk tampilan).
+        """
+        for subject in self.subjects.values():
+            color = SUBJECT_COLORS[(subject.id - 1) % len(SUBJECT_COLORS)]
+            x1, y1, x2, y2 = subject.face_roi
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+            cx1, cy1, cx2, cy2 = subject.chest_roi
+            cv2.rectangle(frame, (cx1, cy1), (cx2, cy2), color, 1)
+            label = f"#{subject.id}"
+            if subject.heart_rate is not None:
+                label += f" {subject.heart_rate.rate:.0f} BPM"
+            if subject.respiration_rate is not None:
+                label += f" {subject.respiration_rate.rate:.0f}/mnt"
+            cv2.putText(frame, label, (x1, max(y1 - 6, 12)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
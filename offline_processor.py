@@ -0,0 +1,276 @@
+import argparse # Mengimpor argparse untuk antarmuka baris perintah
+import csv # Mengimpor csv untuk menulis sinyal per frame ke disk
+import os # Mengimpor os untuk operasi path dan direktori
+import sys # Mengimpor sys untuk kode keluar program
+import time # Mengimpor time untuk mengukur kecepatan pemrosesan
+
+import numpy as np # Mengimpor NumPy untuk ringkasan statistik
+
+from respirasi_processor import RespirationProcessor # Untuk memproses sinyal pernapasan
+from rppg_processor import RPPGProcessor # Untuk memproses sinyal rPPG
+from multi_subject_processor import MultiSubjectProcessor # Untuk memproses beberapa subjek dalam satu video
+from rppg_methods import RPPG_METHODS # Metode ekstraksi sinyal rPPG yang tersedia
+from respiration_methods import RESPIRATION_METHODS # Metode ekstraksi sinyal pernapasan yang tersedia
+from face_mesh_roi import FACE_ROI_MODES # Mode ROI wajah rPPG yang tersedia
+from frame_fanout import FrameFanout # Menjalankan kedua prosesor secara paralel pada frame yang sama
+from frame_source import open_source # Membaca file video, urutan gambar, atau rekaman .vraw
+from vital_estimator import heart_rate_estimator, respiration_rate_estimator # Estimator laju jantung dan pernapasan
+
+# Kolom file CSV hasil per frame
+CSV_COLUMNS = ["frame", "timestamp", "respirasi", "rppg",
+               "detak_jantung_bpm", "detak_jantung_snr_db", "pernapasan_per_menit", "pernapasan_snr_db"]
+# Kolom file CSV mode multi-subjek: satu baris per subjek per frame
+MULTI_CSV_COLUMNS = CSV_COLUMNS[:2] + ["subjek"] + CSV_COLUMNS[2:]
+
+
+def _fmt(value):
+    """
+    Memformat nilai untuk CSV; None ditulis sebagai sel kosong.
+    """
+    return "" if value is None else f"{value:.6g}"
+
+
+def _rate_cells(hr, rr):
+    """
+    Sel CSV estimasi detak jantung dan laju pernapasan beserta SNR-nya.
+    """
+    return [_fmt(hr.rate if hr else None), _fmt(hr.snr if hr else None),
+            _fmt(rr.rate if rr else None), _fmt(rr.snr if rr else None)]
+
+
+class OfflineProcessor:
+    """
+    Pemroses video rekaman tanpa GUI (headless) untuk menilai ulang sesi yang diarsipkan.
+
+    Setiap frame diproses oleh RespirationProcessor dan RPPGProcessor secara paralel
+    (tanpa flip, overlay ROI, resize tampilan, maupun plotting), lalu sinyal per frame dan
+    estimasi laju ditulis ke file CSV. Timestamp diambil dari posisi frame di dalam video
+    (atau dari timestamp capture asli untuk rekaman .vraw), sehingga hasilnya deterministik
+    dan tidak bergantung pada kecepatan pemrosesan. Pada mode multi-subjek (`subjects` > 1),
+    `MultiSubjectProcessor` dipakai dan CSV berisi satu baris per subjek per frame.
+
+    Instance ini dapat dipakai ulang untuk banyak file; model MediaPipe hanya dibuat sekali.
+    """
+    def __init__(self, hop_sec=1.0, detect_interval=5, inference_scale=0.5, rppg_method="pos", subjects=1,
+                 respiration_method="intensity", face_roi="box"):
+        """
+        Konstruktor untuk kelas OfflineProcessor.
+
+        Args:
+            hop_sec (float, optional): Selang waktu antar estimasi laju (detik video). Defaultnya adalah 1.0.
+            detect_interval (int, optional): Deteksi MediaPipe penuh setiap N frame, ROI dilacak di antaranya. Defaultnya adalah 5.
+            inference_scale (float, optional): Skala resolusi untuk inferensi MediaPipe. Defaultnya adalah 0.5.
+            rppg_method (str, optional): Metode ekstraksi sinyal rPPG ("green", "chrom", "pos"). Defaultnya adalah "pos".
+            subjects (int, optional): Jumlah maksimum subjek; lebih dari 1 mengaktifkan mode multi-subjek. Defaultnya adalah 1.
+            respiration_method (str, optional): Metode ekstraksi sinyal pernapasan ("intensity", "flow", "landmark");
+                                                tidak berlaku pada mode multi-subjek. Defaultnya adalah "intensity".
+            face_roi (str, optional): Mode ROI wajah rPPG ("box", "mesh"); tidak berlaku pada mode multi-subjek.
+                                      Defaultnya adalah "box".
+        """
+        if subjects > 1:
+            # Satu deteksi wajah per frame untuk semua subjek, sinyal dan estimator per subjek
+            self.multi_processor = MultiSubjectProcessor(max_subjects=subjects, detect_interval=detect_interval,
+                                                         inference_scale=inference_scale, method=rppg_method,
+                                                         hop_sec=hop_sec)
+            self.respiration_processor = None
+            self.rppg_processor = None
+            processors = [self.multi_processor]
+        else:
+            self.multi_processor = None
+            # Prosesor sinyal pernapasan (MediaPipe Pose) dan rPPG (MediaPipe Face Detection)
+            self.respiration_processor = RespirationProcessor(detect_interval=detect_interval, inference_scale=inference_scale,
+                                                              method=respiration_method)
+            self.rppg_processor = RPPGProcessor(detect_interval=detect_interval, inference_scale=inference_scale,
+                                                method=rppg_method, roi_mode=face_roi)
+            processors = [self.respiration_processor, self.rppg_processor]
+        # Frame rekaman tidak perlu dibalik karena tidak ditampilkan ke pengguna
+        self.fanout = FrameFanout(processors, mirror=False)
+        self.heart_rate_estimator = heart_rate_estimator(hop_sec=hop_sec) # Estimator detak jantung
+        self.respiration_rate_estimator = respiration_rate_estimator(hop_sec=hop_sec) # Estimator laju pernapasan
+
+    def reset(self):
+        """
+        Mereset buffer prosesor dan estimator sebelum memproses file baru.
+        """
+        for processor in self.fanout.processors:
+            processor.reset()
+        self.heart_rate_estimator.reset()
+        self.respiration_rate_estimator.reset()
+
+    def process_file(self, video_path, output_dir, max_frames=None):
+        """
+        Memproses satu file video dan menulis sinyal serta estimasi laju per frame ke CSV.
+
+        Args:
+            video_path (str): Path file video input, direktori/pola urutan gambar, atau rekaman .vraw.
+            output_dir (str): Direktori untuk file hasil.
+            max_frames (int, optional): Batas jumlah frame yang diproses. Default: seluruh video.
+
+        Returns:
+            dict or None: Ringkasan hasil (jumlah frame, durasi, kecepatan, median laju), atau None jika video gagal dibuka.
+        """
+        # Dibaca secepat mungkin; timestamp mengikuti jam rekaman dan dimulai dari 0
+        cap = open_source(video_path, realtime=False, start_time=0.0)
+        if not cap.isOpened():
+            print(f"Error: Tidak dapat membuka video {video_path}.")
+            cap.release()
+            return None
+        video_fps = cap.fps or 30.0 # FPS rekaman; 30 jika tidak tersedia di metadata
+
+        os.makedirs(output_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(os.path.normpath(video_path)))[0]
+        output_path = os.path.join(output_dir, f"{stem}_sinyal.csv")
+
+        self.reset()
+        heart_rates = {} # ID subjek -> estimasi detak jantung (satu per hop) untuk ringkasan
+        respiration_rates = {} # ID subjek -> estimasi laju pernapasan (satu per hop) untuk ringkasan
+        last_estimates = {} # (ID subjek, jenis) -> estimasi terakhir yang sudah dicatat
+        frame_index = 0
+        start = time.perf_counter()
+        with open(output_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS if self.multi_processor is None else MULTI_CSV_COLUMNS)
+            while max_frames is None or frame_index < max_frames:
+                ret, frame, timestamp = cap.read_timestamped() # Timestamp = waktu frame di dalam rekaman (detik)
+                if not ret:
+                    break # Akhir video
+                _, values = self.fanout.process(frame, timestamp, draw=False)
+
+                if self.multi_processor is None:
+                    resp_value, rppg_value = values
+                    hr = self.heart_rate_estimator.update_from_buffer(self.rppg_processor.signal_buffer,
+                                                                      self.rppg_processor.artifact_buffer)
+                    rr = self.respiration_rate_estimator.update_from_buffer(self.respiration_processor.signal_buffer,
+                                                                            self.respiration_processor.artifact_buffer)
+                    rows = {None: (resp_value, rppg_value, hr, rr)}
+                else:
+                    estimates = self.multi_processor.update_estimates()
+                    rows = {subject_id: sample + estimates[subject_id] for subject_id, sample in values[0].items()}
+
+                for subject_id, (resp_value, rppg_value, hr, rr) in rows.items():
+                    # Estimasi baru dicatat untuk ringkasan hanya sekali, pada frame saat estimasi dihitung
+                    # (timestamp estimasi CHROM/POS tertinggal satu jendela dari frame, jadi dibandingkan per objek)
+                    for kind, estimate, rates in (("hr", hr, heart_rates), ("rr", rr, respiration_rates)):
+                        if estimate is not None and estimate is not last_estimates.get((subject_id, kind)):
+                            rates.setdefault(subject_id, []).append(estimate.rate)
+                            last_estimates[subject_id, kind] = estimate
+                    subject_cells = [] if subject_id is None else [subject_id]
+                    writer.writerow([frame_index, f"{timestamp:.4f}"] + subject_cells
+                                    + [_fmt(resp_value), _fmt(rppg_value)] + _rate_cells(hr, rr))
+                frame_index += 1
+        cap.release()
+
+        elapsed = time.perf_counter() - start
+        duration = frame_index / video_fps # Durasi nominal rekaman
+        medians = {subject_id: {"heart_rate_bpm": _median(heart_rates.get(subject_id)),
+                                "respiration_rate_per_min": _median(respiration_rates.get(subject_id))}
+                   for subject_id in sorted(set(heart_rates) | set(respiration_rates), key=lambda i: (i is not None, i))}
+        # Laju utama: satu subjek, atau subjek dengan ID terkecil pada mode multi-subjek
+        primary = next(iter(medians.values()), {"heart_rate_bpm": None, "respiration_rate_per_min": None})
+        summary = {
+            "file": video_path,
+            "output": output_path,
+            "frames": frame_index,
+            "duration_sec": duration,
+            "elapsed_sec": elapsed,
+            "fps": frame_index / elapsed if elapsed > 0 else 0.0,
+            "realtime_factor": duration / elapsed if elapsed > 0 else 0.0,
+            "heart_rate_bpm": primary["heart_rate_bpm"],
+            "respiration_rate_per_min": primary["respiration_rate_per_min"],
+        }
+        if self.multi_processor is not None:
+            summary["subjects"] = {str(subject_id): rates for subject_id, rates in medians.items()}
+        return summary
+
+    def close(self):
+        """
+        Menghentikan thread pool prosesor.
+        """
+        self.fanout.shutdown()
+
+
+def _median(values):
+    """
+    Median daftar estimasi, atau None jika kosong.
+    """
+    return float(np.median(values)) if values else None
+
+
+def format_summary(summary):
+    """
+    Memformat ringkasan hasil satu file menjadi satu baris teks.
+
+    Args:
+        summary (dict): Ringkasan dari `OfflineProcessor.process_file`.
+
+    Returns:
+        str: Ringkasan yang siap dicetak.
+    """
+    hr = summary["heart_rate_bpm"]
+    rr = summary["respiration_rate_per_min"]
+    text = (f"{summary['file']}: {summary['frames']} frame dalam {summary['elapsed_sec']:.1f} s "
+            f"({summary['fps']:.1f} frame/detik, {summary['realtime_factor']:.1f}x real-time) | "
+            f"detak jantung {f'{hr:.0f} BPM' if hr is not None else '-'} | "
+            f"pernapasan {f'{rr:.1f}/menit' if rr is not None else '-'} -> {summary['output']}")
+    for subject_id, rates in summary.get("subjects", {}).items():
+        hr = rates["heart_rate_bpm"]
+        rr = rates["respiration_rate_per_min"]
+        text += (f"\n  subjek #{subject_id}: detak jantung {f'{hr:.0f} BPM' if hr is not None else '-'} | "
+                 f"pernapasan {f'{rr:.1f}/menit' if rr is not None else '-'}")
+    return text
+
+
+def main(argv=None):
+    """
+    Titik masuk CLI: memproses satu atau lebih file video tanpa GUI.
+
+    Args:
+        argv (list, optional): Argumen baris perintah. Default: sys.argv[1:].
+
+    Returns:
+        int: Kode keluar (0 jika semua file berhasil diproses).
+    """
+    parser = argparse.ArgumentParser(description="Memproses video rekaman secara offline (tanpa GUI).")
+    parser.add_argument("videos", nargs="+", help="File video yang akan diproses")
+    parser.add_argument("-o", "--output-dir", default="hasil_offline", help="Direktori hasil (default: hasil_offline)")
+    parser.add_argument("--hop", type=float, default=1.0, help="Selang waktu antar estimasi laju dalam detik (default: 1.0)")
+    parser.add_argument("--detect-interval", type=int, default=5,
+                        help="Deteksi MediaPipe penuh setiap N frame, ROI dilacak di antaranya (default: 5, 1 = setiap frame)")
+    parser.add_argument("--inference-scale", type=float, default=0.5,
+                        help="Skala resolusi untuk inferensi MediaPipe, misalnya 0.5 atau 0.25 (default: 0.5)")
+    parser.add_argument("--rppg-method", choices=RPPG_METHODS, default="pos",
+                        help="Metode ekstraksi sinyal rPPG (default: pos)")
+    parser.add_argument("--respiration-method", choices=RESPIRATION_METHODS, default="intensity",
+                        help="Metode ekstraksi sinyal pernapasan: intensity, flow, atau landmark (default: intensity)")
+    parser.add_argument("--face-roi", choices=FACE_ROI_MODES, default="box",
+                        help="ROI wajah rPPG: box (sub-ROI persegi) atau mesh (masker kulit dari landmark Face Mesh) (default: box)")
+    parser.add_argument("--subjects", type=int, default=1,
+                        help="Jumlah maksimum subjek; lebih dari 1 mengaktifkan mode multi-subjek (default: 1)")
+    parser.add_argument("--max-frames", type=int, default=None, help="Batas jumlah frame per video")
+    args = parser.parse_args(argv)
+
+    processor = OfflineProcessor(hop_sec=args.hop, detect_interval=args.detect_interval,
+                                 inference_scale=args.inference_scale, rppg_method=args.rppg_method,
+                                 subjects=args.subjects, respiration_method=args.respiration_method,
+                                 face_roi=args.face_roi)
+    failed = 0
+    total_frames = 0
+    start = time.perf_counter()
+    try:
+        for video_path in args.videos:
+            summary = processor.process_file(video_path, args.output_dir, args.max_frames)
+            if summary is None:
+                failed += 1
+                continue
+            total_frames += summary["frames"]
+            print(format_summary(summary))
+    finally:
+        processor.close()
+    elapsed = time.perf_counter() - start
+    if elapsed > 0:
+        print(f"Total: {total_frames} frame, {total_frames / elapsed:.1f} frame/detik.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+import csv # Mengimpor csv untuk ekspor laporan per tahap
+import json # Mengimpor json untuk ekspor laporan lengkap
+import math # Mengimpor math untuk indeks bin histogram logaritmik
+import os # Mengimpor os untuk operasi path dan direktori
+import threading # Mengimpor threading karena tahap dicatat dari beberapa thread sekaligus
+import time # Mengimpor time untuk pengukuran durasi dan timestamp laporan
+from contextlib import nullcontext # Context manager kosong saat profiler dinonaktifkan
+
+# Rentang histogram latensi (milidetik) dan resolusinya; 20 bin per dekade = galat kuantisasi ~6%
+HIST_MIN_MS = 0.01
+HIST_MAX_MS = 10000.0
+HIST_BINS_PER_DECADE = 20
+# Kolom file CSV laporan
+REPORT_COLUMNS = ["stage", "count", "fps", "dropped", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+
+
+class LatencyHistogram:
+    """
+    Histogram latensi dengan bin logaritmik berukuran tetap.
+
+    Mencatat satu sampel hanya berupa satu increment (O(1), tanpa alokasi), sehingga aman
+    dipakai di jalur per frame. Persentil diperkirakan dari bin (nilai tengah geometris bin).
+    """
+    _n_bins = int(round(math.log10(HIST_MAX_MS / HIST_MIN_MS) * HIST_BINS_PER_DECADE)) + 1
+
+    def __init__(self):
+        """
+        Konstruktor untuk kelas LatencyHistogram.
+        """
+        self.counts = [0] * self._n_bins # Jumlah sampel per bin
+        self.count = 0 # Jumlah total sampel
+        self.total_ms = 0.0 # Jumlah durasi (untuk rata-rata)
+        self.max_ms = 0.0 # Durasi terbesar
+
+    def record(self, ms):
+        """
+        Mencatat satu durasi.
+
+        Args:
+            ms (float): Durasi dalam milidetik.
+        """
+        if ms <= HIST_MIN_MS:
+            index = 0
+        else:
+            index = min(int(math.log10(ms / HIST_MIN_MS) * HIST_BINS_PER_DECADE), self._n_bins - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, other):
+        """
+        Menambahkan isi histogram lain ke histogram ini.
+
+        Args:
+            other (LatencyHistogram): Histogram yang digabungkan.
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q):
+        """
+        Memperkirakan persentil ke-q.
+
+        Args:
+            q (float): Persentil (0-100).
+
+        Returns:
+            float: Perkiraan durasi (milidetik), 0.0 jika histogram kosong.
+        """
+        if self.count == 0:
+            return 0.0
+        target = q / 100.0 * self.count
+        cumulative = 0
+        for index, n in enumerate(self.counts):
+            cumulative += n
+            if cumulative >= target and n:
+                # Nilai tengah geometris bin, dibatasi durasi maksimum yang benar-benar tercatat
+                return min(HIST_MIN_MS * 10 ** ((index + 0.5) / HIST_BINS_PER_DECADE), self.max_ms)
+        return self.max_ms
+
+    def mean(self):
+        """
+        Returns:
+            float: Rata-rata durasi (milidetik), 0.0 jika histogram kosong.
+        """
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class StageProfile:
+    """
+    Statistik satu tahap: histogram bergulir untuk tampilan langsung dan histogram sesi untuk laporan.
+
+    Histogram bergulir terdiri dari dua jendela (sebelumnya dan saat ini) yang dirotasi setiap
+    `window_sec` detik, sehingga persentil langsung mencerminkan 1-2 jendela terakhir.
+    """
+    def __init__(self, name, window_sec=5.0):
+        """
+        Konstruktor untuk kelas StageProfile.
+
+        Args:
+            name (str): Nama tahap.
+            window_sec (float, optional): Panjang satu jendela histogram bergulir (detik). Defaultnya adalah 5.0.
+        """
+        self.name = name # Nama tahap
+        self.window_sec = window_sec # Panjang jendela bergulir
+        self.session = LatencyHistogram() # Histogram seluruh sesi
+        self.current = LatencyHistogram() # Histogram jendela saat ini
+        self.previous = LatencyHistogram() # Histogram jendela sebelumnya
+        self.window_start = None # Awal jendela saat ini
+        self.previous_start = None # Awal jendela sebelumnya
+        self.last_timestamp = None # Timestamp sampel terakhir
+        self.first_timestamp = None # Timestamp sampel pertama sesi
+        self.dropped = 0 # Jumlah frame yang dibuang pada tahap ini
+
+    def record(self, ms, timestamp):
+        """
+        Mencatat satu eksekusi tahap.
+
+        Args:
+            ms (float): Durasi eksekusi dalam milidetik.
+            timestamp (float): Waktu selesai eksekusi (time.monotonic()).
+        """
+        if self.window_start is None:
+            self.window_start = self.previous_start = self.first_timestamp = timestamp
+        elif timestamp - self.window_start >= self.window_sec:
+            # Rotasi jendela: jendela saat ini menjadi jendela sebelumnya
+            self.previous, self.current = self.current, self.previous
+            self.current.__init__()
+            self.previous_start, self.window_start = self.window_start, timestamp
+        self.current.record(ms)
+        self.session.record(ms)
+        self.last_timestamp = timestamp
+
+    def snapshot(self, session=False):
+        """
+        Mengembalikan ringkasan statistik tahap.
+
+        Args:
+            session (bool, optional): Jika True, statistik dihitung dari seluruh sesi; jika False,
+                                      dari jendela bergulir terakhir. Defaultnya adalah False.
+
+        Returns:
+            dict: Berisi kolom `REPORT_COLUMNS`.
+        """
+        if session:
+            hist = self.session
+            start = self.first_timestamp
+        else:
+            hist = LatencyHistogram()
+            hist.merge(self.previous)
+            hist.merge(self.current)
+            start = self.previous_start
+        fps = 0.0
+        if hist.count > 1 and self.last_timestamp is not None and self.last_timestamp > start:
+            fps = hist.count / (self.last_timestamp - start) # Laju eksekusi efektif
+        return {"stage": self.name, "count": hist.count, "fps": fps, "dropped": self.dropped,
+                "mean_ms": hist.mean(), "p50_ms": hist.percentile(50), "p95_ms": hist.percentile(95),
+                "p99_ms": hist.percentile(99), "max_ms": hist.max_ms}
+
+
+class _StageTimer:
+    """
+    Context manager pengukur durasi satu tahap (dibuat oleh `Profiler.stage`).
+    """
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """
+    Profiler latensi per tahap dengan overhead rendah.
+
+    Setiap tahap (capture, Pose, Face Detection, rata-rata ROI, resize video, plot, ...) dicatat
+    lewat `with profiler.stage("nama"):` atau `record()`. Profiler menyimpan persentil p50/p95/p99
+    bergulir, FPS efektif, dan jumlah frame yang dibuang; hasilnya dapat ditampilkan sebagai overlay
+    pada frame dan diekspor ke JSON/CSV di akhir sesi. Jika dinonaktifkan, `stage()` mengembalikan
+    context manager kosong sehingga biayanya hampir nol.
+    """
+    def __init__(self, enabled=True, window_sec=5.0):
+        """
+        Konstruktor untuk kelas Profiler.
+
+        Args:
+            enabled (bool, optional): Jika False, tidak ada yang dicatat. Defaultnya adalah True.
+            window_sec (float, optional): Panjang jendela histogram bergulir (detik). Defaultnya adalah 5.0.
+        """
+        self.enabled = enabled # Flag profiler aktif
+        self.window_sec = window_sec # Panjang jendela bergulir
+        self._stages = {} # Statistik per tahap, urutan sesuai tahap pertama kali dicatat
+        self._lock = threading.Lock() # Lock karena tahap dicatat dari thread capture, inferensi, fan-out, dan GUI
+        self._null = nullcontext() # Context manager kosong yang dipakai ulang saat profiler nonaktif
+        self.started_at = time.time() # Waktu mulai sesi (untuk laporan)
+
+    def _get_stage(self, name):
+        """
+        Mengambil (atau membuat) statistik tahap. Harus dipanggil dengan lock dipegang.
+        """
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = StageProfile(name, self.window_sec)
+        return stage
+
+    def stage(self, name):
+        """
+        Mengukur durasi blok kode sebagai tahap `name`.
+
+        Args:
+            name (str): Nama tahap.
+
+        Returns:
+            contextmanager: Dipakai dengan `with profiler.stage("pose"): ...`.
+        """
+        if not self.enabled:
+            return self._null
+        return _StageTimer(self, name)
+
+    def record(self, name, duration, timestamp=None):
+        """
+        Mencatat satu eksekusi tahap yang durasinya sudah diukur.
+
+        Args:
+            name (str): Nama tahap.
+            duration (float): Durasi dalam detik.
+            timestamp (float, optional): Waktu selesai eksekusi. Default: time.monotonic().
+        """
+        if not self.enabled:
+            return
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._lock:
+            self._get_stage(name).record(duration * 1000.0, timestamp)
+
+    def set_dropped(self, name, total):
+        """
+        Menetapkan jumlah total frame yang dibuang pada suatu tahap (misalnya dari penghitung antrian).
+
+        Args:
+            name (str): Nama tahap.
+            total (int): Jumlah total frame yang dibuang.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._get_stage(name).dropped = total
+
+    def reset(self):
+        """
+        Menghapus semua statistik; dipanggil di awal sesi monitoring baru.
+        """
+        with self._lock:
+            self._stages.clear()
+            self.started_at = time.time()
+
+    def snapshot(self, session=False):
+        """
+        Mengembalikan statistik semua tahap.
+
+        Args:
+            session (bool, optional): Statistik seluruh sesi (True) atau jendela bergulir (False). Defaultnya adalah False.
+
+        Returns:
+            list: Daftar dict per tahap (lihat `StageProfile.snapshot`).
+        """
+        with self._lock:
+            return [stage.snapshot(session) for stage in self._stages.values()]
+
+    def overlay_lines(self):
+        """
+        Mengembalikan teks overlay, satu baris per tahap.
+
+        Returns:
+            list: Contoh baris: "pose          9.8 /  14.2 /  21.0 ms   29.9 fps".
+        """
+        lines = ["tahap          p50 /   p95 /   p99 ms"]
+        for snap in self.snapshot():
+            line = (f"{snap['stage'][:14]:<14} {snap['p50_ms']:6.1f} / {snap['p95_ms']:5.1f} / "
+                    f"{snap['p99_ms']:5.1f}  {snap['fps']:5.1f} fps")
+            if snap["dropped"]:
+                line += f"  drop {snap['dropped']}"
+            lines.append(line)
+        return lines
+
+    def draw_overlay(self, frame, origin=(10, 20), scale=0.45):
+        """
+        Menggambar statistik bergulir di pojok frame (di atas latar gelap semi-transparan).
+
+        Args:
+            frame (numpy.ndarray): Frame BGR yang boleh dimodifikasi (salinan untuk tampilan).
+            origin (tuple, optional): Posisi baris pertama (x, y). Defaultnya adalah (10, 20).
+            scale (float, optional): Skala font. Defaultnya adalah 0.45.
+        """
+        import cv2 # Impor tertunda: profiler dibuat sebelum jendela tampil, OpenCV baru dibutuhkan di sini
+        lines = self.overlay_lines()
+        line_height = int(32 * scale) + 4
+        x, y = origin
+        h, w = frame.shape[:2]
+        x2 = min(w, x + int(720 * scale))
+        y2 = min(h, y + line_height * len(lines))
+        if x2 > x and y2 > y:
+            # Gelapkan area teks agar tetap terbaca di atas video
+            region = frame[max(y - line_height, 0):y2, x:x2]
+            region[:] = region // 3
+        for i, line in enumerate(lines):
+            cv2.putText(frame, line, (x + 4, y + i * line_height), cv2.FONT_HERSHEY_SIMPLEX, scale,
+                        (0, 255, 255), 1, cv2.LINE_AA)
+
+    def report(self):
+        """
+        Menyusun laporan seluruh sesi.
+
+        Returns:
+            dict: Berisi waktu mulai/selesai sesi dan statistik per tahap.
+        """
+        return {"started_at": self.started_at, "finished_at": time.time(),
+                "stages": self.snapshot(session=True)}
+
+    def export_json(self, path):
+        """
+        Menyimpan laporan sesi ke file JSON.
+
+        Args:
+            path (str): Path file output.
+
+        Returns:
+            str: Path file output.
+        """
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def export_csv(self, path):
+        """
+        Menyimpan statistik sesi per tahap ke file CSV (satu baris per tahap).
+
+        Args:
+            path (str): Path file output.
+
+        Returns:
+            str: Path file output.
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+            writer.writeheader()
+            for snap in self.snapshot(session=True):
+                writer.writerow({k: (f"{v:.4f}" if isinstance(v, float) else v) for k, v in snap.items()})
+        return path
+
+    def export(self, output_dir, prefix="profil"):
+        """
+        Menyimpan laporan sesi sebagai JSON dan CSV dengan nama berisi waktu sesi.
+
+        Args:
+            output_dir (str): Direktori output.
+            prefix (str, optional): Awalan nama file. Defaultnya adalah "profil".
+
+        Returns:
+            tuple: (path JSON, path CSV).
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        stem = os.path.join(output_dir, f"{prefix}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(self.started_at))}")
+        return self.export_json(stem + ".json"), self.export_csv(stem + ".csv")
@@ -1,7 +1,17 @@
 import cv2 # Mengimpor OpenCV untuk pemrosesan gambar dan video
-import mediapipe as mp # Mengimpor MediaPipe untuk deteksi pose tubuh
-import numpy as np # Mengimpor NumPy untuk operasi numerik, terutama array dan mean
-from collections import deque # Mengimpor deque untuk buffer sinyal dengan ukuran tetap
+import numpy as np # Mengimpor NumPy untuk frame pemanasan model
+import time # Mengimpor time untuk timestamp sampel default
+from ring_buffer import TimestampedRingBuffer # Ring buffer NumPy dengan timestamp untuk sinyal
+from roi_tracker import ROITracker # Pelacak ROI berbasis optical flow di antara deteksi penuh
+from inference_frame import InferenceFrame # Cache konversi RGB/grayscale per frame yang dibagikan antar prosesor
+from roi_stats import clip_rois, combine_means, gray_means, grid_subrois # Statistik multi-ROI tanpa salinan grayscale
+from profiler import Profiler # Profiler latensi per tahap (deteksi, pelacakan, rata-rata ROI)
+from signal_quality import MotionGate # Deteksi artefak gerakan dari ROI dan intensitasnya
+from respiration_methods import RESPIRATION_METHODS, ChestFlowTracker, shoulder_band # Metode ekstraksi pernapasan
+
+# Kapasitas buffer sinyal pernapasan: 30 detik pada 30 fps, sama dengan jendela `respiration_rate_estimator`
+# (resolusi frekuensi ~0.03 Hz = 2 napas/menit; buffer 10 detik hanya memberi ~6 napas/menit)
+SIGNAL_BUFFER_SIZE = 900
 
 class RespirationProcessor:
     """
@@ -9,20 +19,69 @@ class RespirationProcessor:
     Menggunakan MediaPipe Pose untuk mendeteksi landmark bahu,
     menentukan Region of Interest (ROI) di area dada/bahu,
     dan menghitung perubahan intensitas rata-rata piksel di ROI tersebut
-    sebagai indikasi pergerakan pernapasan.
+    sebagai indikasi pergerakan pernapasan ("intensity"). Sebagai alternatif, naik-turunnya
+    bahu dapat diukur langsung: dengan optical flow pada pita bahu ("flow") atau dari
+    koordinat y landmark bahu ("landmark"); lihat `respiration_methods`.
     """
-    def __init__(self):
+    def __init__(self, detect_interval=1, inference_scale=1.0, profiler=None, pose=None, method="intensity",
+                 flow_scale=0.5):
         """
         Konstruktor untuk kelas RespirationProcessor.
         Menginisialisasi model MediaPipe Pose dan buffer untuk menyimpan sinyal.
+
+        Args:
+            detect_interval (int, optional): Deteksi Pose penuh dijalankan setiap N frame; di antaranya
+                                             ROI dilacak dengan optical flow (`ROITracker`).
+                                             1 berarti deteksi di setiap frame. Defaultnya adalah 1.
+            inference_scale (float, optional): Skala resolusi frame yang diberikan ke MediaPipe (misalnya 0.5
+                                               atau 0.25). ROI tetap dipetakan dan diukur pada resolusi penuh.
+                                               Defaultnya adalah 1.0.
+            profiler (Profiler, optional): Profiler untuk mencatat durasi tahap deteksi, pelacakan,
+                                           dan rata-rata ROI. Default: profiler nonaktif.
+            pose (object, optional): Model Pose yang sudah dibuat (apa pun yang memiliki metode `process`),
+                                     misalnya model milik worker inferensi yang dipakai bersama beberapa
+                                     stream. Default: model Pose baru milik prosesor ini.
+            method (str, optional): Metode ekstraksi sinyal: "intensity", "flow", atau "landmark".
+                                    Metode "landmark" menjalankan Pose di setiap frame (tanpa `ROITracker`).
+                                    Defaultnya adalah "intensity".
+            flow_scale (float, optional): Faktor skala ROI grayscale untuk metode "flow". Defaultnya adalah 0.5.
         """
+        if method not in RESPIRATION_METHODS:
+            raise ValueError(f"Metode pernapasan tidak dikenal: {method} (pilihan: {', '.join(RESPIRATION_METHODS)})")
+        # MediaPipe (beserta TensorFlow Lite) diimpor saat prosesor dibuat, bukan saat modul diimpor,
+        # agar aplikasi dapat tampil lebih dulu dan model dibangun di latar belakang (lihat startup.py)
+        import mediapipe as mp # Mengimpor MediaPipe untuk deteksi pose tubuh
         self.mp_pose = mp.solutions.pose # Mengakses solusi pose dari MediaPipe
         # Inisialisasi objek Pose dengan parameter kepercayaan deteksi dan pelacakan minimum
-        self.pose = self.mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        self.pose = pose if pose is not None else self.mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
         # Buffer untuk menyimpan nilai sinyal pernapasan (intensitas rata-rata ROI)
-        # maxlen=300 berarti buffer akan menyimpan 300 sampel terakhir
-        self.signal_buffer = deque(maxlen=300) #
+        # Ring buffer `SIGNAL_BUFFER_SIZE` sampel terakhir beserta timestamp pengambilannya (dialokasikan sekali di awal)
+        self.signal_buffer = TimestampedRingBuffer(SIGNAL_BUFFER_SIZE) #
+        # Penanda artefak gerakan per sampel (1 = tertandai), diisi bersamaan dengan buffer sinyal
+        self.artifact_buffer = TimestampedRingBuffer(SIGNAL_BUFFER_SIZE) #
+        self.motion_gate = MotionGate() # Penilai pergeseran ROI dan lompatan intensitas per frame
         self.roi_coords = None # Menyimpan koordinat ROI (x1, y1, x2, y2), awalnya None
+        self.tile_means = None # Intensitas rata-rata setiap petak ROI dada pada frame terakhir, bentuk (6,)
+        self.method = method # Metode ekstraksi sinyal pernapasan
+        self.shoulder_y = None # Posisi y garis bahu (piksel, float) dari deteksi Pose terakhir; None jika gagal
+        # Pelacak pergeseran vertikal pita bahu untuk metode "flow" (None untuk metode lain)
+        self.chest_flow = ChestFlowTracker(scale=flow_scale) if method == "flow" else None
+        # Pelacak ROI untuk melewati deteksi Pose di antara deteksi penuh (None jika deteksi setiap frame).
+        # Metode "landmark" membutuhkan landmark di setiap frame, sehingga tidak memakai pelacak.
+        self.tracker = ROITracker(detect_interval) if detect_interval > 1 and method != "landmark" else None
+        self.inference_scale = inference_scale # Skala resolusi untuk inferensi MediaPipe
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False) # Profiler tahap
+
+    def warm_up(self, frame_shape=(480, 640, 3)):
+        """
+        Menjalankan satu inferensi Pose pada frame hitam agar graf MediaPipe dan interpreter
+        TensorFlow Lite sudah terinisialisasi sebelum frame kamera pertama tiba.
+
+        Args:
+            frame_shape (tuple, optional): Bentuk frame pemanasan (tinggi, lebar, kanal); sebaiknya sama
+                                           dengan resolusi kamera. Defaultnya adalah (480, 640, 3).
+        """
+        self._detect_roi(InferenceFrame(np.zeros(frame_shape, dtype=np.uint8))) # Hasil deteksi diabaikan
 
     def reset(self):
         """
@@ -30,73 +89,174 @@ class RespirationProcessor:
         Biasanya dipanggil sebelum memulai sesi monitoring baru.
         """
         self.signal_buffer.clear() # Mengosongkan buffer sinyal
+        self.artifact_buffer.clear() # Mengosongkan penanda artefak
+        self.motion_gate.reset() # Mereset state gerakan
         self.roi_coords = None # Mereset koordinat ROI
+        self.tile_means = None # Mereset intensitas petak
+        self.shoulder_y = None # Mereset posisi bahu
+        if self.chest_flow is not None:
+            self.chest_flow.reset() # Mereset posisi dan titik optical flow dada
+        if self.tracker is not None:
+            self.tracker.reset() # Mereset state pelacakan ROI
 
-    def process(self, frame):
+    def _detect_roi(self, inference_frame):
         """
-        Memproses satu frame video untuk mengekstraksi sinyal pernapasan.
+        Menjalankan MediaPipe Pose dan menghitung ROI dada/bahu dari landmark bahu.
 
         Args:
-            frame (numpy.ndarray): Frame video input dalam format BGR OpenCV.
+            inference_frame (InferenceFrame): Frame beserta cache konversinya. Inferensi dijalankan pada
+                                              frame RGB berskala `inference_scale`, sedangkan koordinat
+                                              landmark/bounding box (ternormalisasi 0-1) dipetakan ke
+                                              resolusi penuh.
 
         Returns:
-            tuple:
-                - numpy.ndarray: Frame video yang telah diproses (mungkin dengan ROI digambar).
-                - list: Daftar (list) dari sinyal pernapasan yang ada di buffer.
+            tuple or None: Koordinat ROI (x1, y1, x2, y2), atau None jika pose tidak terdeteksi.
+                           Untuk metode "flow" dan "landmark", ROI berupa pita yang berpusat di garis bahu.
         """
-        # Membalik frame secara horizontal (efek cermin) agar lebih intuitif bagi pengguna
-        frame = cv2.flip(frame, 1) #
-        # Konversi frame dari BGR (format OpenCV) ke RGB (format yang dibutuhkan MediaPipe)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) #
+        self.shoulder_y = None # Diisi ulang jika pose terdeteksi
+        # Frame RGB (format yang dibutuhkan MediaPipe) berskala inferensi, dikonversi sekali per frame
+        # dan dibagikan dengan prosesor lain yang memakai skala yang sama
+        rgb_frame = inference_frame.rgb(self.inference_scale) #
         # Memproses frame RGB dengan model MediaPipe Pose untuk mendapatkan landmark pose
         results = self.pose.process(rgb_frame) #
 
-        h, w, _ = frame.shape # Mendapatkan tinggi (h) dan lebar (w) frame
+        # Jika landmark pose tidak terdeteksi
+        if not results.pose_landmarks:
+            return None
+
+        h, w, _ = inference_frame.frame.shape # Tinggi (h) dan lebar (w) frame resolusi penuh
+
+        # Mendapatkan landmark untuk bahu kiri dan kanan
+        left_shoulder = results.pose_landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_SHOULDER] #
+        right_shoulder = results.pose_landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_SHOULDER] #
+
+        # Mengkonversi koordinat landmark (normalisasi 0-1) ke koordinat piksel
+        left_x, left_y = int(left_shoulder.x * w), int(left_shoulder.y * h) #
+        right_x, right_y = int(right_shoulder.x * w), int(right_shoulder.y * h) #
+
+        # Menentukan koordinat x untuk ROI berdasarkan posisi bahu
+        # ROI akan membentang dari bahu terkiri ke bahu terkanan
+        x1 = max(min(left_x, right_x), 0) # Pastikan x1 tidak kurang dari 0
+        x2 = min(max(left_x, right_x), w) # Pastikan x2 tidak lebih dari lebar frame
+        
+        # Menghitung posisi y tengah antara kedua bahu
+        y_shoulder = int((left_y + right_y) / 2) #
+        # Posisi bahu sub-piksel (tanpa pembulatan) untuk metode "landmark"
+        self.shoulder_y = (left_shoulder.y + right_shoulder.y) / 2.0 * h
+        if self.method != "intensity":
+            # Pita yang memuat kontur bahu itu sendiri, bagian yang paling jelas naik-turun saat bernapas
+            return shoulder_band(x1, x2, self.shoulder_y, h)
+
+        # Menentukan koordinat y untuk ROI
+        # ROI ditempatkan sedikit di bawah garis bahu (area dada atas)
+        y1 = max(y_shoulder - 80, 0) # Titik y atas ROI, 80 piksel di atas y_shoulder (atau batas atas frame)
+        box_height = 60 # Tinggi kotak ROI
+        y2 = min(y1 + box_height, h) # Titik y bawah ROI, pastikan tidak melebihi tinggi frame
+
+        return (x1, y1, x2, y2)
+
+    def analyze(self, frame, timestamp=None, inference_frame=None):
+        """
+        Mengekstraksi satu sampel sinyal pernapasan dari frame tanpa memodifikasi frame.
 
-        # Jika landmark pose terdeteksi
-        if results.pose_landmarks:
-            # Mendapatkan landmark untuk bahu kiri dan kanan
-            left_shoulder = results.pose_landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_SHOULDER] #
-            right_shoulder = results.pose_landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_SHOULDER] #
+        Berbeda dengan `process`, metode ini tidak membalik frame dan tidak menggambar ROI,
+        sehingga frame yang sama (read-only) dapat dibaca bersamaan oleh prosesor lain.
+        Jika `detect_interval` > 1, deteksi Pose hanya dijalankan setiap N frame atau saat
+        pelacakan ROI kehilangan kepercayaan; di antaranya ROI dilacak dengan optical flow.
 
-            # Mengkonversi koordinat landmark (normalisasi 0-1) ke koordinat piksel
-            left_x, left_y = int(left_shoulder.x * w), int(left_shoulder.y * h) #
-            right_x, right_y = int(right_shoulder.x * w), int(right_shoulder.y * h) #
+        Args:
+            frame (numpy.ndarray): Frame video BGR OpenCV yang sudah di-flip (efek cermin).
+            timestamp (float, optional): Waktu pengambilan frame (time.monotonic()). Default: waktu saat ini.
+            inference_frame (InferenceFrame, optional): Cache konversi RGB/grayscale untuk `frame` yang
+                                                        dibagikan dengan prosesor lain (lihat `FrameFanout`).
 
-            # Menentukan koordinat x untuk ROI berdasarkan posisi bahu
-            # ROI akan membentang dari bahu terkiri ke bahu terkanan
-            x1 = max(min(left_x, right_x), 0) # Pastikan x1 tidak kurang dari 0
-            x2 = min(max(left_x, right_x), w) # Pastikan x2 tidak lebih dari lebar frame
-            
-            # Menghitung posisi y tengah antara kedua bahu
-            y_shoulder = int((left_y + right_y) / 2) #
+        Returns:
+            float or None: Nilai sinyal pernapasan pada frame ini: intensitas rata-rata ROI ("intensity"), atau
+                           posisi vertikal bahu dalam piksel, positif ke atas ("flow" dan "landmark").
+                           None jika ROI (atau landmark bahu pada frame ini) belum tersedia.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic() # Waktu sebelum inferensi sebagai perkiraan waktu pengambilan frame
 
-            # Menentukan koordinat y untuk ROI
-            # ROI ditempatkan sedikit di bawah garis bahu (area dada atas)
-            y1 = max(y_shoulder - 80, 0) # Titik y atas ROI, 80 piksel di atas y_shoulder (atau batas atas frame)
-            box_height = 60 # Tinggi kotak ROI
-            y2 = min(y1 + box_height, h) # Titik y bawah ROI, pastikan tidak melebihi tinggi frame
+        if inference_frame is None:
+            inference_frame = InferenceFrame(frame) # Cache konversi lokal jika tidak dibagikan
+        # Frame grayscale dipakai untuk pelacakan ROI dan optical flow dada; jika sudah ada, intensitas ROI
+        # juga dihitung darinya
+        gray = inference_frame.gray() if self.tracker is not None or self.chest_flow is not None else None
 
-            # Menyimpan koordinat ROI yang baru dihitung
-            self.roi_coords = (x1, y1, x2, y2) #
+        tracked_roi = None
+        if self.tracker is not None and not self.tracker.needs_detection():
+            with self.profiler.stage("lacak respirasi"):
+                tracked_roi = self.tracker.track(gray) # Propagasi ROI murah dengan optical flow
+        if tracked_roi is not None:
+            self.roi_coords = tracked_roi
+        else:
+            with self.profiler.stage("pose"):
+                detected_roi = self._detect_roi(inference_frame) # Deteksi Pose penuh
+            if detected_roi is not None:
+                # Menyimpan koordinat ROI yang baru dihitung
+                self.roi_coords = detected_roi #
+                if self.tracker is not None:
+                    self.tracker.start(gray, detected_roi) # Mulai pelacakan dari hasil deteksi
 
         # Jika koordinat ROI sudah ditentukan (baik dari frame ini atau frame sebelumnya)
-        if self.roi_coords is not None:
-            x1, y1, x2, y2 = self.roi_coords # Ambil koordinat ROI
-            # Ekstraksi Region of Interest (ROI) dari frame
-            roi = frame[y1:y2, x1:x2] #
-            
-            # Pastikan ROI tidak kosong (memiliki ukuran)
-            if roi.size != 0:
-                # Konversi ROI ke grayscale untuk analisis intensitas
-                gray_roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) #
-                # Hitung intensitas rata-rata piksel dalam ROI grayscale
-                mean_intensity = np.mean(gray_roi) #
-                # Tambahkan nilai intensitas rata-rata ini ke buffer sinyal
-                self.signal_buffer.append(mean_intensity) #
+        if self.roi_coords is None:
+            return None
+        if self.method == "flow":
+            with self.profiler.stage("flow respirasi"):
+                # Pergeseran vertikal pita bahu dari optical flow pada ROI grayscale yang diperkecil
+                value = self.chest_flow.update(gray, self.roi_coords, timestamp)
+        elif self.method == "landmark":
+            if self.shoulder_y is None:
+                return None # Pose tidak terdeteksi pada frame ini
+            value = -self.shoulder_y # Sumbu y citra mengarah ke bawah; bahu naik saat inspirasi
+        else:
+            with self.profiler.stage("roi respirasi"):
+                # ROI dada dibagi menjadi 2x3 petak; intensitas grayscale setiap petak dihitung pada view
+                # frame (tanpa salinan), langsung dari rata-rata BGR jika grayscale belum tersedia
+                tiles = clip_rois(grid_subrois(self.roi_coords), frame.shape) # ROI hasil pelacakan bisa sedikit keluar dari frame
+                self.tile_means = gray_means(gray if gray is not None else frame, tiles) #
+                # Intensitas rata-rata ROI = rata-rata petak dibobot luasnya
+                value = combine_means(self.tile_means, tiles)
+                # Pastikan ROI tidak kosong (memiliki ukuran)
+                if value is None:
+                    return None
+        with self.profiler.stage("kualitas respirasi"):
+            # Gerakan bahu/badan menggeser ROI dan membuat lonjakan sinyal yang jauh melebihi napas
+            quality = self.motion_gate.update(self.roi_coords, value, timestamp)
+        # Tambahkan nilai sinyal ini ke buffer sinyal
+        self.signal_buffer.append(value, timestamp) # Simpan bersama timestamp pengambilan frame
+        self.artifact_buffer.append(float(quality.flagged), timestamp) # Penanda selaras dengan sampel sinyal
+        return value
+
+    def draw_roi(self, frame):
+        """
+        Menggambar kotak ROI pernapasan (hijau) pada frame tampilan.
 
+        Args:
+            frame (numpy.ndarray): Frame BGR yang boleh dimodifikasi (salinan untuk tampilan).
+        """
+        if self.roi_coords is not None:
+            x1, y1, x2, y2 = self.roi_coords
             # Gambar persegi panjang hijau di sekitar ROI pada frame untuk visualisasi
             cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2) #
 
-        # Kembalikan frame yang telah diproses (dengan ROI digambar) dan list dari buffer sinyal
-        return frame, list(self.signal_buffer) #
\ No newline at end of file
+    def process(self, frame):
+        """
+        Memproses satu frame video untuk mengekstraksi sinyal pernapasan.
+
+        Args:
+            frame (numpy.ndarray): Frame video input dalam format BGR OpenCV.
+
+        Returns:
+            tuple:
+                - numpy.ndarray: Frame video yang telah diproses (mungkin dengan ROI digambar).
+                - numpy.ndarray: View (tanpa salinan) dari sinyal pernapasan yang ada di buffer.
+        """
+        # Membalik frame secara horizontal (efek cermin) agar lebih intuitif bagi pengguna
+        frame = cv2.flip(frame, 1) #
+        self.analyze(frame) # Ekstraksi sampel sinyal dari frame
+        self.draw_roi(frame) # Gambar ROI pada frame untuk visualisasi
+
+        # Kembalikan frame yang telah diproses (dengan ROI digambar) dan view dari buffer sinyal
+        return frame, self.signal_buffer.values() #
@@ -0,0 +1,185 @@
+import numpy as np # Mengimpor NumPy untuk rata-rata terpangkas pergeseran titik dan peluruhan drift
+
+# Metode ekstraksi sinyal pernapasan yang didukung:
+# - "intensity": intensitas grayscale rata-rata ROI di atas garis bahu (peka terhadap perubahan cahaya,
+#                lemah jika cahaya stabil dan pakaian polos)
+# - "flow": pergeseran vertikal pita bahu/dada dengan optical flow Lucas-Kanade jarang pada ROI grayscale
+#           yang diperkecil (`ChestFlowTracker`)
+# - "landmark": koordinat y rata-rata landmark bahu MediaPipe Pose (deteksi Pose di setiap frame)
+RESPIRATION_METHODS = ("intensity", "flow", "landmark")
+# Setengah tinggi pita bahu (piksel) yang dilacak pada metode "flow" dan ditampilkan pada metode "landmark"
+SHOULDER_BAND_HALF_HEIGHT = 40
+
+
+def shoulder_band(x1, x2, y_shoulder, frame_height, half_height=SHOULDER_BAND_HALF_HEIGHT):
+    """
+    Membuat ROI pita horizontal yang berpusat di garis bahu, selebar jarak kedua bahu.
+
+    Berbeda dengan ROI intensitas (di atas garis bahu), pita ini memuat kontur bahu itu sendiri,
+    yang naik-turun paling jelas saat bernapas.
+
+    Args:
+        x1 (int): Batas kiri (piksel).
+        x2 (int): Batas kanan (piksel).
+        y_shoulder (float): Posisi y garis bahu (piksel).
+        frame_height (int): Tinggi frame (piksel).
+        half_height (int, optional): Setengah tinggi pita (piksel). Defaultnya adalah 40.
+
+    Returns:
+        tuple: ROI (x1, y1, x2, y2) dalam piksel.
+    """
+    y = int(y_shoulder)
+    return (x1, max(y - half_height, 0), x2, min(y + half_height, frame_height))
+
+
+def _trimmed_mean(values, trim):
+    """
+    Rata-rata setelah membuang fraksi `trim` nilai terkecil dan terbesar.
+    """
+    values = np.sort(values)
+    k = int(len(values) * trim)
+    return float(values[k:len(values) - k].mean()) if len(values) > 2 * k else float(np.median(values))
+
+
+class ChestFlowTracker:
+    """
+    Pengukur pergeseran vertikal dada/bahu dengan optical flow Lucas-Kanade jarang.
+
+    Jendela tetap (ROI ditambah margin) dipotong dari frame grayscale, diperkecil dengan faktor
+    `scale`, lalu titik fitur di dalam ROI dilacak dari frame ke frame. Pergeseran vertikal per frame
+    adalah rata-rata terpangkas pergeseran titik yang lolos pemeriksaan forward-backward, dalam piksel
+    resolusi penuh. Rata-rata terpangkas dipakai (bukan median) karena pita bahu juga memuat latar
+    belakang yang diam: titik latar hanya mengecilkan amplitudo, tidak menghapus gelombang napas.
+
+    Jendela hanya dipindahkan (dan titik dicari ulang) jika ROI keluar dari jendela atau titik yang
+    tersisa terlalu sedikit, sehingga getaran hasil deteksi ROI per frame tidak masuk ke sinyal.
+    Pergeseran diakumulasi menjadi posisi dengan peluruhan (`drift_sec`) agar drift pelacakan tidak
+    menumpuk; arah positif berarti bergerak ke atas (inspirasi).
+    """
+    def __init__(self, scale=0.5, max_corners=40, min_points=6, fb_threshold=0.5, margin=0.3,
+                 drift_sec=10.0, trim=0.2):
+        """
+        Konstruktor untuk kelas ChestFlowTracker.
+
+        Args:
+            scale (float, optional): Faktor skala jendela grayscale sebelum optical flow. Defaultnya adalah 0.5.
+            max_corners (int, optional): Jumlah maksimum titik fitur. Defaultnya adalah 40.
+            min_points (int, optional): Jumlah minimum titik agar pergeseran dihitung. Defaultnya adalah 6.
+            fb_threshold (float, optional): Batas galat forward-backward (piksel jendela kecil). Defaultnya adalah 0.5.
+            margin (float, optional): Margin jendela di setiap sisi ROI, relatif terhadap ukuran ROI. Defaultnya adalah 0.3.
+            drift_sec (float, optional): Konstanta waktu peluruhan posisi (detik); jauh lebih panjang dari satu
+                                         siklus napas. Defaultnya adalah 10.0.
+            trim (float, optional): Fraksi pergeseran terkecil/terbesar yang dibuang. Defaultnya adalah 0.2.
+        """
+        import cv2 # Diimpor saat dibuat agar modul ini tetap ringan (daftar metode dipakai di proses utama batch)
+        self.scale = scale # Faktor skala jendela
+        self.max_corners = max_corners # Jumlah maksimum titik fitur
+        self.min_points = min_points # Jumlah minimum titik
+        self.fb_threshold = fb_threshold # Batas galat forward-backward
+        self.margin = margin # Margin jendela relatif
+        self.drift_sec = drift_sec # Konstanta waktu peluruhan posisi
+        self.trim = trim # Fraksi pemangkasan
+        # Parameter optical flow Lucas-Kanade piramidal untuk jendela kecil
+        self.lk_params = dict(winSize=(11, 11), maxLevel=2,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        self.reset()
+
+    def reset(self):
+        """
+        Menghapus state pelacakan dan posisi. Dipanggil sebelum memulai sesi monitoring baru.
+        """
+        self.window = None # Jendela potongan (x1, y1, x2, y2) resolusi penuh
+        self.prev = None # Jendela grayscale kecil frame sebelumnya
+        self.points = None # Titik fitur yang dilacak, bentuk (N, 1, 2) float32, koordinat jendela kecil
+        self.initial_count = 0 # Jumlah titik saat pencarian terakhir
+        self.confidence = 0.0 # Fraksi titik yang masih terlacak (0-1)
+        self.displacement = 0.0 # Posisi vertikal terakumulasi (piksel, positif = ke atas)
+        self.last_timestamp = None # Timestamp sampel terakhir
+        self.reseeds = 0 # Jumlah pencarian ulang titik
+
+    def _crop(self, gray):
+        """
+        Memotong jendela dari frame grayscale lalu memperkecilnya (view + satu resize).
+        """
+        import cv2
+        x1, y1, x2, y2 = self.window
+        return cv2.resize(gray[y1:y2, x1:x2], self._size, interpolation=cv2.INTER_AREA)
+
+    def _contains(self, roi):
+        """
+        True jika ROI masih sepenuhnya berada di dalam jendela.
+        """
+        x1, y1, x2, y2 = self.window
+        return roi[0] >= x1 and roi[1] >= y1 and roi[2] <= x2 and roi[3] <= y2
+
+    def _find_points(self):
+        """
+        Mencari titik fitur di area ROI pada jendela kecil terakhir.
+        """
+        import cv2
+        x1, y1, x2, y2 = self._roi_small
+        mask = np.zeros_like(self.prev)
+        mask[y1:y2, x1:x2] = 255 # Titik hanya dicari di dalam ROI, bukan di margin
+        points = cv2.goodFeaturesToTrack(self.prev, maxCorners=self.max_corners, qualityLevel=0.01,
+                                         minDistance=3, mask=mask)
+        self.points = points if points is not None and len(points) >= self.min_points else None
+        self.initial_count = len(self.points) if self.points is not None else 0
+        self.reseeds += 1
+
+    def _seed(self, gray, roi):
+        """
+        Menempatkan jendela baru di sekitar ROI dan mencari titik fitur.
+        """
+        h, w = gray.shape[:2]
+        x1, y1, x2, y2 = roi
+        mx, my = self.margin * (x2 - x1), self.margin * (y2 - y1)
+        wx1, wy1 = max(int(x1 - mx), 0), max(int(y1 - my), 0)
+        wx2, wy2 = min(int(x2 + mx), w), min(int(y2 + my), h)
+        if wx2 - wx1 < 16 or wy2 - wy1 < 16:
+            self.window = self.prev = self.points = None # ROI terlalu kecil untuk dilacak
+            return
+        self.window = (wx1, wy1, wx2, wy2)
+        self._size = (max(int(round((wx2 - wx1) * self.scale)), 8), max(int(round((wy2 - wy1) * self.scale)), 8))
+        sx, sy = self._size[0] / (wx2 - wx1), self._size[1] / (wy2 - wy1)
+        self._roi_small = (max(int((x1 - wx1) * sx), 0), max(int((y1 - wy1) * sy), 0),
+                           int((x2 - wx1) * sx), int((y2 - wy1) * sy))
+        self.prev = self._crop(gray)
+        self._find_points()
+
+    def update(self, gray, roi, timestamp):
+        """
+        Melacak satu frame dan mengembalikan posisi vertikal dada/bahu.
+
+        Args:
+            gray (numpy.ndarray): Frame grayscale resolusi penuh.
+            roi (tuple): ROI dada/bahu (x1, y1, x2, y2) pada frame ini.
+            timestamp (float): Timestamp pengambilan frame (detik).
+
+        Returns:
+            float: Posisi vertikal terakumulasi (piksel resolusi penuh, positif = ke atas).
+        """
+        import cv2
+        dy = 0.0 # Pergeseran vertikal frame ini (piksel resolusi penuh, sumbu y citra ke bawah)
+        if self.window is None or self.points is None or not self._contains(roi):
+            self._seed(gray, roi) # Frame pertama, pelacakan hilang, atau ROI berpindah jauh
+        else:
+            small = self._crop(gray)
+            next_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev, small, self.points, None, **self.lk_params)
+            back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(small, self.prev, next_points, None, **self.lk_params)
+            fb_error = np.abs(self.points - back_points).reshape(-1, 2).max(axis=1) # Galat forward-backward per titik
+            good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < self.fb_threshold)
+            n_good = int(good.sum())
+            self.confidence = n_good / self.initial_count if self.initial_count else 0.0
+            self.prev = small
+            if n_good >= self.min_points:
+                dy = _trimmed_mean((next_points - self.points).reshape(-1, 2)[good, 1], self.trim) / self.scale
+                self.points = next_points[good].reshape(-1, 1, 2)
+            if n_good < max(self.min_points, self.initial_count // 2):
+                self._find_points() # Titik menipis (keluar ROI/terhalang); cari ulang di jendela yang sama
+
+        if self.last_timestamp is not None:
+            # Peluruhan eksponensial: setara high-pass orde satu ~1 / (2 pi drift_sec) Hz, di bawah pita napas
+            self.displacement *= float(np.exp(-max(timestamp - self.last_timestamp, 0.0) / self.drift_sec))
+        self.last_timestamp = timestamp
+        self.displacement -= dy # Sumbu y citra mengarah ke bawah; dada naik saat inspirasi
+        return self.displacement
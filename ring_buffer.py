@@ -0,0 +1,135 @@
+import time # Mengimpor time untuk timestamp default
+import numpy as np # Mengimpor NumPy untuk penyimpanan buffer yang dialokasikan di awal
+
+
+class TimestampedRingBuffer:
+    """
+    Ring buffer NumPy berukuran tetap untuk nilai sinyal beserta timestamp pengambilannya.
+
+    Memori dialokasikan sekali di awal dengan panjang dua kali kapasitas; setiap sampel
+    ditulis di dua posisi (i dan i + kapasitas). Dengan begitu `capacity` sampel terakhir
+    selalu berada di satu potongan memori yang kontigu dan dapat dikembalikan sebagai
+    view NumPy tanpa penyalinan. Timestamp yang tersimpan juga memungkinkan estimasi
+    frekuensi sampling efektif (fs) dari laju frame yang sebenarnya.
+
+    Catatan: view yang dikembalikan berbagi memori dengan buffer. Konsumen di thread lain
+    sebaiknya menyalinnya (`.copy()`) jika buffer terus ditulis saat data dibaca.
+    """
+    def __init__(self, capacity=300, channels=None, dtype=np.float64):
+        """
+        Konstruktor untuk kelas TimestampedRingBuffer.
+
+        Args:
+            capacity (int, optional): Jumlah sampel terakhir yang disimpan. Defaultnya adalah 300.
+            channels (int, optional): Jumlah kanal per sampel. None berarti sinyal 1D (satu nilai per sampel).
+            dtype (numpy.dtype, optional): Tipe data nilai sinyal. Defaultnya adalah np.float64.
+        """
+        self.capacity = int(capacity) # Kapasitas buffer
+        shape = (2 * self.capacity,) if channels is None else (2 * self.capacity, channels)
+        self._values = np.zeros(shape, dtype=dtype) # Penyimpanan nilai (panjang ganda)
+        self._times = np.zeros(2 * self.capacity, dtype=np.float64) # Penyimpanan timestamp (panjang ganda)
+        self._head = 0 # Indeks posisi tulis berikutnya dalam rentang [0, capacity)
+        self._size = 0 # Jumlah sampel valid di buffer
+        self.total = 0 # Jumlah total sampel yang pernah ditambahkan sejak reset
+
+    def append(self, value, timestamp=None):
+        """
+        Menambahkan satu sampel ke buffer, menimpa sampel tertua jika buffer penuh.
+
+        Args:
+            value (float or array-like): Nilai sampel (array berukuran `channels` untuk buffer multi-kanal).
+            timestamp (float, optional): Waktu pengambilan sampel dalam detik. Default: time.monotonic().
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        i = self._head
+        j = i + self.capacity # Posisi cermin di paruh kedua penyimpanan
+        self._values[i] = value
+        self._values[j] = value
+        self._times[i] = timestamp
+        self._times[j] = timestamp
+        self._head = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.total += 1
+
+    def clear(self):
+        """
+        Mengosongkan buffer tanpa membebaskan memori yang sudah dialokasikan.
+        """
+        self._head = 0
+        self._size = 0
+        self.total = 0
+
+    def _start(self):
+        """
+        Indeks awal sampel tertua di penyimpanan.
+        """
+        return (self._head - self._size) % self.capacity
+
+    def values(self, n=None):
+        """
+        Mengembalikan view kontigu dari nilai sampel, urut dari yang tertua.
+
+        Args:
+            n (int, optional): Jumlah sampel terakhir yang diambil. Default: semua sampel di buffer.
+
+        Returns:
+            numpy.ndarray: View (tanpa salinan) dari nilai sampel.
+        """
+        start, stop = self._range(n)
+        return self._values[start:stop]
+
+    def timestamps(self, n=None):
+        """
+        Mengembalikan view kontigu dari timestamp sampel, urut dari yang tertua.
+
+        Args:
+            n (int, optional): Jumlah sampel terakhir yang diambil. Default: semua sampel di buffer.
+
+        Returns:
+            numpy.ndarray: View (tanpa salinan) dari timestamp sampel.
+        """
+        start, stop = self._range(n)
+        return self._times[start:stop]
+
+    def _range(self, n):
+        """
+        Menghitung rentang indeks penyimpanan untuk `n` sampel terakhir.
+        """
+        size = self._size if n is None else max(0, min(int(n), self._size))
+        stop = self._start() + self._size # Posisi setelah sampel terbaru
+        return stop - size, stop
+
+    def last(self):
+        """
+        Mengembalikan sampel terbaru.
+
+        Returns:
+            tuple or None: (nilai, timestamp) sampel terbaru, atau None jika buffer kosong.
+        """
+        if self._size == 0:
+            return None
+        i = (self._head - 1) % self.capacity
+        return self._values[i], self._times[i]
+
+    def effective_fs(self, n=None):
+        """
+        Mengestimasi frekuensi sampling efektif dari timestamp sampel.
+
+        Args:
+            n (int, optional): Jumlah sampel terakhir yang digunakan. Default: semua sampel di buffer.
+
+        Returns:
+            float or None: Frekuensi sampling dalam Hz, atau None jika sampel belum cukup.
+        """
+        times = self.timestamps(n)
+        if len(times) < 2:
+            return None
+        duration = times[-1] - times[0] # Rentang waktu yang dicakup sampel
+        if duration <= 0:
+            return None
+        return (len(times) - 1) / duration
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,157 @@
+import cv2 # Mengimpor OpenCV untuk integral image dan rata-rata ROI
+import numpy as np # Mengimpor NumPy untuk operasi array ter-vektorisasi
+
+# Bobot konversi BGR ke grayscale (ITU-R BT.601, sama dengan cv2.COLOR_BGR2GRAY).
+# Karena rata-rata bersifat linear, rata-rata grayscale ROI = bobot . rata-rata BGR ROI,
+# sehingga salinan grayscale sementara tidak perlu dibuat.
+BGR_TO_GRAY = np.array([0.114, 0.587, 0.299])
+
+# Sub-ROI wajah sebagai fraksi bounding box wajah (x1, y1, x2, y2):
+# dahi, pipi kiri, dan pipi kanan (area kulit dengan pembuluh darah yang padat, tanpa mata/mulut)
+FACE_SUBROI_FRACTIONS = np.array([
+    [0.30, 0.05, 0.70, 0.25], # Dahi
+    [0.12, 0.50, 0.38, 0.75], # Pipi kiri
+    [0.62, 0.50, 0.88, 0.75], # Pipi kanan
+])
+# Hingga sejumlah ROI ini, `cv2.mean` per view ROI lebih murah daripada membangun integral image
+DIRECT_MEAN_MAX_ROIS = 8
+
+
+def clip_rois(rois, shape):
+    """
+    Membatasi koordinat ROI ke dalam frame.
+
+    Args:
+        rois (array-like): ROI berbentuk (N, 4) dengan kolom (x1, y1, x2, y2).
+        shape (tuple): Bentuk frame (tinggi, lebar, ...).
+
+    Returns:
+        numpy.ndarray: ROI int64 (N, 4) yang sudah dibatasi; ROI di luar frame menjadi kosong (x2 <= x1).
+    """
+    h, w = shape[:2]
+    rois = np.asarray(rois, dtype=np.int64).reshape(-1, 4)
+    return np.minimum(np.maximum(rois, 0), (w, h, w, h))
+
+
+def roi_means(frame, rois):
+    """
+    Menghitung rata-rata setiap kanal untuk banyak ROI persegi sekaligus.
+
+    Untuk sedikit ROI (hingga `DIRECT_MEAN_MAX_ROIS`), setiap ROI dihitung dengan `cv2.mean` pada
+    view-nya (tanpa salinan). Untuk banyak ROI, integral image dihitung sekali pada kotak pembungkus
+    semua ROI, lalu jumlah piksel setiap ROI diperoleh dari empat titik sudut integral image secara
+    ter-vektorisasi (O(1) per ROI), sehingga biayanya tidak bertambah dengan jumlah ROI yang tumpang tindih.
+
+    Args:
+        frame (numpy.ndarray): Frame BGR (H, W, C) atau grayscale (H, W), uint8.
+        rois (array-like): ROI (N, 4) dengan kolom (x1, y1, x2, y2) dalam piksel.
+
+    Returns:
+        numpy.ndarray: Rata-rata per ROI dan kanal, bentuk (N, C) float64; NaN untuk ROI kosong.
+    """
+    channels = frame.shape[2] if frame.ndim == 3 else 1
+    rois = clip_rois(rois, frame.shape)
+    means = np.full((len(rois), channels), np.nan)
+
+    if len(rois) <= DIRECT_MEAN_MAX_ROIS:
+        for i, (x1, y1, x2, y2) in enumerate(rois.tolist()):
+            if x2 > x1 and y2 > y1:
+                means[i] = cv2.mean(frame[y1:y2, x1:x2])[:channels] # View ROI, tanpa salinan
+        return means
+
+    areas = (rois[:, 2] - rois[:, 0]) * (rois[:, 3] - rois[:, 1])
+    valid = (rois[:, 2] > rois[:, 0]) & (rois[:, 3] > rois[:, 1])
+    if not valid.any():
+        return means
+
+    # Kotak pembungkus semua ROI yang valid; integral image hanya dihitung di area ini
+    bx1, by1 = rois[valid, 0].min(), rois[valid, 1].min()
+    bx2, by2 = rois[valid, 2].max(), rois[valid, 3].max()
+    integral = cv2.integral(frame[by1:by2, bx1:bx2], sdepth=cv2.CV_32S) # (h+1, w+1[, C]) jumlah kumulatif
+    integral = integral.reshape(integral.shape[0], integral.shape[1], channels)
+
+    r = rois[valid] - (bx1, by1, bx1, by1) # Koordinat relatif terhadap kotak pembungkus
+    x1, y1, x2, y2 = r[:, 0], r[:, 1], r[:, 2], r[:, 3]
+    sums = (integral[y2, x2].astype(np.int64) - integral[y1, x2] - integral[y2, x1] + integral[y1, x1])
+    means[valid] = sums / areas[valid, None]
+    return means
+
+
+def gray_means(frame, rois):
+    """
+    Menghitung rata-rata intensitas grayscale banyak ROI dari frame BGR tanpa konversi grayscale.
+
+    Args:
+        frame (numpy.ndarray): Frame BGR (H, W, 3), atau frame grayscale (H, W).
+        rois (array-like): ROI (N, 4) dengan kolom (x1, y1, x2, y2).
+
+    Returns:
+        numpy.ndarray: Rata-rata grayscale per ROI, bentuk (N,); NaN untuk ROI kosong.
+    """
+    means = roi_means(frame, rois)
+    if means.shape[1] == 1:
+        return means[:, 0]
+    return means @ BGR_TO_GRAY
+
+
+def face_subrois(face_roi):
+    """
+    Menghitung sub-ROI dahi, pipi kiri, dan pipi kanan dari bounding box wajah.
+
+    Args:
+        face_roi (tuple): Bounding box wajah (x1, y1, x2, y2).
+
+    Returns:
+        numpy.ndarray: Sub-ROI int64 (3, 4).
+    """
+    x1, y1, x2, y2 = face_roi
+    w, h = x2 - x1, y2 - y1
+    scale = np.array([w, h, w, h])
+    return (np.array([x1, y1, x1, y1]) + FACE_SUBROI_FRACTIONS * scale).astype(np.int64)
+
+
+def grid_subrois(roi, rows=2, cols=3):
+    """
+    Membagi ROI menjadi petak-petak grid (misalnya petak dada).
+
+    Args:
+        roi (tuple): ROI (x1, y1, x2, y2).
+        rows (int, optional): Jumlah baris petak. Defaultnya adalah 2.
+        cols (int, optional): Jumlah kolom petak. Defaultnya adalah 3.
+
+    Returns:
+        numpy.ndarray: Petak int64 (rows * cols, 4), urut baris demi baris.
+    """
+    x1, y1, x2, y2 = (int(v) for v in roi)
+    # Batas petak dihitung dengan aritmetika integer biasa (grid kecil; lebih murah daripada linspace/meshgrid)
+    xs = [x1 + (x2 - x1) * i // cols for i in range(cols + 1)]
+    ys = [y1 + (y2 - y1) * j // rows for j in range(rows + 1)]
+    return np.array([(xs[i], ys[j], xs[i + 1], ys[j + 1]) for j in range(rows) for i in range(cols)], dtype=np.int64)
+
+
+def combine_means(means, rois=None):
+    """
+    Menggabungkan rata-rata beberapa sub-ROI menjadi satu nilai per kanal.
+
+    Args:
+        means (numpy.ndarray): Rata-rata per ROI, bentuk (N,) atau (N, C); NaN untuk ROI kosong.
+        rois (array-like, optional): ROI yang sama (sudah dibatasi dengan `clip_rois`); jika diberikan,
+                                     rata-rata dibobot luas ROI (setara dengan rata-rata piksel gabungan
+                                     semua sub-ROI yang tidak tumpang tindih).
+
+    Returns:
+        float or numpy.ndarray or None: Rata-rata gabungan, atau None jika semua ROI kosong.
+    """
+    means = np.asarray(means, dtype=np.float64)
+    flat = means.reshape(len(means), -1)
+    valid = ~np.isnan(flat[:, 0]) # ROI kosong bernilai NaN
+    if rois is None:
+        weights = valid.astype(np.float64)
+    else:
+        rois = np.asarray(rois).reshape(-1, 4)
+        weights = ((rois[:, 2] - rois[:, 0]) * (rois[:, 3] - rois[:, 1])) * valid
+    total = weights.sum()
+    if total <= 0:
+        return None
+    combined = (weights @ np.where(valid[:, None], flat, 0.0)) / total
+    return combined if means.ndim > 1 else combined[0]
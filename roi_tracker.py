@@ -0,0 +1,125 @@
+import cv2 # Mengimpor OpenCV untuk deteksi fitur dan optical flow Lucas-Kanade
+import numpy as np # Mengimpor NumPy untuk operasi array dan median pergeseran
+
+
+class ROITracker:
+    """
+    Pelacak ROI ringan untuk melewati deteksi MediaPipe pada sebagian besar frame.
+
+    Setelah deteksi penuh berhasil, titik-titik fitur (goodFeaturesToTrack) di dalam ROI
+    dilacak antar frame dengan optical flow Lucas-Kanade. Pergeseran ROI adalah median
+    pergeseran titik yang lolos pemeriksaan forward-backward, sehingga ROI bergerak halus
+    dan tidak "melompat" seperti hasil deteksi per frame. Deteksi penuh dijadwalkan ulang
+    setiap `detect_interval` frame, atau lebih cepat jika kepercayaan pelacakan turun.
+    """
+    def __init__(self, detect_interval=5, min_confidence=0.5, max_corners=40, min_points=6, fb_threshold=1.0):
+        """
+        Konstruktor untuk kelas ROITracker.
+
+        Args:
+            detect_interval (int, optional): Deteksi penuh dijalankan setiap N frame. 1 berarti setiap frame. Defaultnya adalah 5.
+            min_confidence (float, optional): Fraksi minimum titik yang berhasil dilacak sebelum deteksi ulang dipaksa. Defaultnya adalah 0.5.
+            max_corners (int, optional): Jumlah maksimum titik fitur di dalam ROI. Defaultnya adalah 40.
+            min_points (int, optional): Jumlah minimum titik fitur agar pelacakan dianggap valid. Defaultnya adalah 6.
+            fb_threshold (float, optional): Batas galat forward-backward (piksel) untuk titik yang valid. Defaultnya adalah 1.0.
+        """
+        self.detect_interval = max(1, int(detect_interval)) # Interval deteksi penuh
+        self.min_confidence = min_confidence # Kepercayaan minimum pelacakan
+        self.max_corners = max_corners # Jumlah maksimum titik fitur
+        self.min_points = min_points # Jumlah minimum titik fitur
+        self.fb_threshold = fb_threshold # Batas galat forward-backward
+        # Parameter optical flow Lucas-Kanade piramidal
+        self.lk_params = dict(winSize=(15, 15), maxLevel=2,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        self.reset()
+
+    def reset(self):
+        """
+        Menghapus state pelacakan; frame berikutnya akan memicu deteksi penuh.
+        """
+        self.prev_gray = None # Frame grayscale sebelumnya
+        self.points = None # Titik fitur yang sedang dilacak, bentuk (N, 1, 2) float32
+        self.initial_count = 0 # Jumlah titik saat deteksi terakhir
+        self.roi = None # ROI dalam koordinat float (x1, y1, x2, y2)
+        self.frames_since_detection = 0 # Jumlah frame sejak deteksi penuh terakhir
+        self.confidence = 0.0 # Kepercayaan pelacakan terakhir (0-1)
+        self.detections = 0 # Jumlah deteksi penuh sejak reset
+        self.tracked_frames = 0 # Jumlah frame yang ROI-nya diperoleh dari pelacakan
+
+    def needs_detection(self):
+        """
+        Menentukan apakah frame ini perlu deteksi penuh.
+
+        Returns:
+            bool: True jika deteksi penuh perlu dijalankan.
+        """
+        return (self.detect_interval <= 1 or self.points is None
+                or self.frames_since_detection >= self.detect_interval)
+
+    def start(self, gray, roi):
+        """
+        Memulai pelacakan dari ROI hasil deteksi penuh.
+
+        Args:
+            gray (numpy.ndarray): Frame grayscale saat deteksi.
+            roi (tuple): Koordinat ROI (x1, y1, x2, y2) dalam piksel.
+        """
+        self.detections += 1
+        self.frames_since_detection = 0
+        self.roi = np.array(roi, dtype=np.float64)
+        self.prev_gray = gray
+        self.points = None
+        if self.detect_interval <= 1:
+            return # Deteksi setiap frame: pelacakan tidak diperlukan
+
+        h, w = gray.shape[:2]
+        x1, y1, x2, y2 = (int(v) for v in roi)
+        x1, y1 = max(x1, 0), max(y1, 0) # Batasi ROI ke dalam frame
+        x2, y2 = min(x2, w), min(y2, h)
+        if x2 - x1 < 8 or y2 - y1 < 8:
+            return # ROI terlalu kecil untuk dilacak
+        # Cari titik fitur hanya di dalam ROI
+        points = cv2.goodFeaturesToTrack(gray[y1:y2, x1:x2], maxCorners=self.max_corners,
+                                         qualityLevel=0.01, minDistance=4)
+        if points is None or len(points) < self.min_points:
+            return # Tekstur ROI tidak cukup; deteksi penuh akan dijalankan lagi di frame berikutnya
+        points[:, 0, 0] += x1 # Konversi koordinat ke koordinat frame penuh
+        points[:, 0, 1] += y1
+        self.points = points.astype(np.float32)
+        self.initial_count = len(points)
+        self.confidence = 1.0
+
+    def track(self, gray):
+        """
+        Memperbarui posisi ROI dengan optical flow dari frame sebelumnya.
+
+        Args:
+            gray (numpy.ndarray): Frame grayscale saat ini.
+
+        Returns:
+            tuple or None: ROI baru (x1, y1, x2, y2) dalam piksel, atau None jika pelacakan
+                           gagal (kepercayaan rendah) sehingga deteksi penuh perlu dijalankan.
+        """
+        if self.points is None or self.prev_gray is None:
+            return None
+        self.frames_since_detection += 1
+
+        # Lacak titik maju (frame lama -> frame baru) lalu mundur untuk validasi
+        next_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None, **self.lk_params)
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, next_points, None, **self.lk_params)
+        fb_error = np.abs(self.points - back_points).reshape(-1, 2).max(axis=1) # Galat forward-backward per titik
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < self.fb_threshold)
+
+        n_good = int(good.sum())
+        self.confidence = n_good / self.initial_count if self.initial_count else 0.0
+        if n_good < self.min_points or self.confidence < self.min_confidence:
+            self.points = None # Pelacakan hilang; paksa deteksi penuh
+            return None
+
+        # Pergeseran ROI = median pergeseran titik yang valid (tahan terhadap outlier)
+        dx, dy = np.median((next_points - self.points).reshape(-1, 2)[good], axis=0)
+        self.roi += (dx, dy, dx, dy)
+        self.points = next_points[good].reshape(-1, 1, 2)
+        self.prev_gray = gray
+        self.tracked_frames += 1
+        return tuple(int(round(v)) for v in self.roi)
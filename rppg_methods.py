@@ -0,0 +1,155 @@
+import numpy as np # Mengimpor NumPy untuk proyeksi ter-vektorisasi per jendela
+
+from ring_buffer import TimestampedRingBuffer # Riwayat RGB singkat untuk jendela proyeksi terbaru
+
+# Metode ekstraksi sinyal rPPG yang didukung:
+# - "green": rata-rata kanal hijau (paling sederhana, peka terhadap perubahan cahaya dan gerakan)
+# - "chrom": proyeksi krominans (de Haan & Jeanne, 2013)
+# - "pos": proyeksi Plane-Orthogonal-to-Skin (Wang dkk., 2017)
+RPPG_METHODS = ("green", "chrom", "pos")
+# Panjang jendela proyeksi default (detik); cukup untuk satu denyut pada laju jantung terendah (~40 BPM)
+DEFAULT_WINDOW_SEC = 1.6
+# Mencegah pembagian dengan nol pada jendela yang rata (misalnya ROI jenuh)
+EPS = 1e-9
+
+
+def _project(rgb, method):
+    """
+    Memproyeksikan jendela-jendela rata-rata RGB menjadi sinyal pulsa.
+
+    Semua operasi ter-vektorisasi pada sumbu sampel (dan sumbu jendela, jika ada), sehingga
+    banyak jendela yang tumpang tindih dapat dihitung dalam satu panggilan.
+
+    Args:
+        rgb (numpy.ndarray): Rata-rata RGB berbentuk (..., L, 3) dengan urutan kanal R, G, B.
+        method (str): "chrom" atau "pos".
+
+    Returns:
+        numpy.ndarray: Sinyal pulsa berbentuk (..., L) dengan rata-rata nol per jendela.
+    """
+    # Normalisasi temporal: setiap kanal dibagi rata-ratanya di jendela (menghilangkan warna kulit dan intensitas cahaya)
+    cn = rgb / (rgb.mean(axis=-2, keepdims=True) + EPS)
+    r, g, b = cn[..., 0], cn[..., 1], cn[..., 2]
+    if method == "chrom":
+        x = 3.0 * r - 2.0 * g # Sinyal krominans X
+        y = 1.5 * r + g - 1.5 * b # Sinyal krominans Y
+    else:
+        x = g - b # Proyeksi ke bidang ortogonal terhadap warna kulit
+        y = g + b - 2.0 * r
+    # Penyetelan alfa: komponen gerakan/specular yang sama di kedua sinyal saling menghilangkan
+    alpha = x.std(axis=-1, keepdims=True) / (y.std(axis=-1, keepdims=True) + EPS)
+    if method == "chrom":
+        pulse = x - alpha * y
+    else:
+        pulse = x + alpha * y
+    return pulse - pulse.mean(axis=-1, keepdims=True)
+
+
+def _taper(method, window_size):
+    """
+    Bobot jendela untuk overlap-add: Hann untuk CHROM, persegi untuk POS.
+
+    Jendela Hann dibuat tanpa titik nol di ujungnya agar setiap sampel mendapat bobot.
+    """
+    if method == "chrom":
+        return np.hanning(window_size + 2)[1:-1]
+    return np.ones(window_size)
+
+
+def project_signal(rgb, method="pos", window_size=48, hop=1):
+    """
+    Menghitung sinyal pulsa CHROM/POS dari seluruh deret rata-rata RGB sekaligus.
+
+    Semua jendela yang tumpang tindih diambil sebagai view (`sliding_window_view`), diproyeksikan
+    dalam satu operasi ter-vektorisasi, lalu digabung dengan overlap-add berbobot. Hasilnya sama
+    dengan keluaran `OverlapAddProjector` untuk deret yang sama, sehingga fungsi ini berguna untuk
+    analisis ulang rekaman secara offline.
+
+    Args:
+        rgb (array-like): Rata-rata RGB per frame berbentuk (N, 3), urutan kanal R, G, B.
+        method (str, optional): "chrom" atau "pos". Defaultnya adalah "pos".
+        window_size (int, optional): Panjang jendela proyeksi (sampel). Defaultnya adalah 48.
+        hop (int, optional): Jarak antar awal jendela (sampel). Defaultnya adalah 1.
+
+    Returns:
+        numpy.ndarray: Sinyal pulsa (N,); kosong jika N < `window_size`.
+    """
+    rgb = np.asarray(rgb, dtype=np.float64)
+    n = len(rgb)
+    if n < window_size:
+        return np.zeros(0)
+    # Jendela berakhir setiap `hop` sampel: (K, L, 3) view tanpa salinan
+    windows = np.lib.stride_tricks.sliding_window_view(rgb, window_size, axis=0)[::hop].transpose(0, 2, 1)
+    taper = _taper(method, window_size)
+    pulses = _project(windows, method) * taper # (K, L)
+    starts = np.arange(len(pulses)) * hop
+    index = (starts[:, None] + np.arange(window_size)).ravel() # Posisi setiap sampel jendela di deret
+    acc = np.bincount(index, weights=pulses.ravel(), minlength=n)
+    weight = np.bincount(index, weights=np.broadcast_to(taper, pulses.shape).ravel(), minlength=n)
+    covered = weight > 0
+    return acc[covered] / weight[covered]
+
+
+class OverlapAddProjector:
+    """
+    Proyeksi CHROM/POS inkremental dengan overlap-add.
+
+    Setiap kali `hop` sampel RGB baru masuk, hanya jendela terbaru (`window_size` sampel) yang
+    diproyeksikan (O(window_size), bukan seluruh buffer), lalu ditambahkan ke akumulator
+    overlap-add. Sampel yang tidak akan tercakup jendela berikutnya sudah final dan dikeluarkan
+    beserta timestamp aslinya, sehingga keluaran tertunda sekitar satu jendela.
+    """
+    def __init__(self, method="pos", window_size=48, hop=1):
+        """
+        Konstruktor untuk kelas OverlapAddProjector.
+
+        Args:
+            method (str, optional): "chrom" atau "pos". Defaultnya adalah "pos".
+            window_size (int, optional): Panjang jendela proyeksi (sampel). Defaultnya adalah 48.
+            hop (int, optional): Jarak antar jendela (sampel); 1 berarti satu jendela per frame. Defaultnya adalah 1.
+        """
+        if method not in ("chrom", "pos"):
+            raise ValueError(f"Metode proyeksi tidak dikenal: {method}")
+        self.method = method # Metode proyeksi
+        self.window_size = int(window_size) # Panjang jendela
+        self.hop = max(1, min(int(hop), self.window_size)) # Jarak antar jendela
+        self.taper = _taper(method, self.window_size) # Bobot overlap-add per posisi jendela
+        # Riwayat RGB terakhir; cukup panjang untuk satu jendela penuh
+        self.history = TimestampedRingBuffer(self.window_size, channels=3)
+        self._acc = np.zeros(self.window_size) # Jumlah kontribusi pulsa untuk sampel jendela terakhir
+        self._weight = np.zeros(self.window_size) # Jumlah bobot untuk sampel yang sama
+
+    def reset(self):
+        """
+        Mengosongkan riwayat dan akumulator.
+        """
+        self.history.clear()
+        self._acc[:] = 0.0
+        self._weight[:] = 0.0
+
+    def push(self, rgb, timestamp):
+        """
+        Menambahkan satu sampel rata-rata RGB dan mengembalikan sampel pulsa yang sudah final.
+
+        Args:
+            rgb (array-like): Rata-rata (R, G, B) ROI pada frame ini.
+            timestamp (float): Timestamp pengambilan frame.
+
+        Returns:
+            tuple: (nilai, timestamp) berupa numpy.ndarray; kosong jika belum ada sampel final.
+        """
+        self.history.append(rgb, timestamp)
+        n = self.history.total
+        if n < self.window_size or (n - self.window_size) % self.hop:
+            return np.zeros(0), np.zeros(0)
+        if n > self.window_size:
+            # Geser akumulator sejauh `hop` agar selaras dengan jendela terbaru
+            self._acc[:-self.hop] = self._acc[self.hop:]
+            self._weight[:-self.hop] = self._weight[self.hop:]
+            self._acc[-self.hop:] = 0.0
+            self._weight[-self.hop:] = 0.0
+        self._acc += _project(self.history.values(), self.method) * self.taper
+        self._weight += self.taper
+        # `hop` sampel terdepan tidak tercakup jendela berikutnya, sehingga sudah final
+        values = self._acc[:self.hop] / self._weight[:self.hop]
+        return values, self.history.timestamps()[:self.hop].copy()
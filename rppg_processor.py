@@ -1,27 +1,103 @@
 import cv2 # Mengimpor OpenCV untuk pemrosesan gambar dan video
-import mediapipe as mp # Mengimpor MediaPipe untuk deteksi wajah
-import numpy as np # Mengimpor NumPy untuk operasi numerik, terutama array dan mean
-from collections import deque # Mengimpor deque untuk buffer sinyal dengan ukuran tetap
+import numpy as np # Mengimpor NumPy untuk frame pemanasan model
+import time # Mengimpor time untuk timestamp sampel default
+from ring_buffer import TimestampedRingBuffer # Ring buffer NumPy dengan timestamp untuk sinyal
+from roi_tracker import ROITracker # Pelacak ROI berbasis optical flow di antara deteksi penuh
+from inference_frame import InferenceFrame # Cache konversi RGB/grayscale per frame yang dibagikan antar prosesor
+from roi_stats import combine_means, face_subrois, roi_means # Statistik multi-ROI (dahi dan pipi) dalam satu lintasan
+from rppg_methods import RPPG_METHODS, DEFAULT_WINDOW_SEC, OverlapAddProjector # Proyeksi CHROM/POS inkremental
+from profiler import Profiler # Profiler latensi per tahap (deteksi, pelacakan, rata-rata ROI)
+from signal_quality import MotionGate, projected_flags # Deteksi artefak gerakan dari ROI dan intensitasnya
+from face_mesh_roi import FACE_ROI_MODES, SkinMask, mesh_points, points_box # Masker kulit dari landmark Face Mesh
 
 class RPPGProcessor:
     """
     Kelas untuk memproses frame video guna mengekstraksi sinyal photoplethysmography jarak jauh (rPPG).
-    Menggunakan MediaPipe Face Detection untuk mendeteksi wajah dan menentukan Region of Interest (ROI).
-    Sinyal rPPG diestimasi dari perubahan rata-rata intensitas piksel pada kanal hijau di dalam ROI wajah,
-    yang berkorelasi dengan perubahan volume darah.
+    Menggunakan MediaPipe Face Detection untuk mendeteksi wajah dan menentukan Region of Interest (ROI),
+    atau MediaPipe Face Mesh untuk membangun masker kulit dahi dan pipi dari landmark (`roi_mode="mesh"`).
+    Sinyal rPPG diestimasi dari perubahan rata-rata intensitas piksel di dalam ROI wajah, yang berkorelasi
+    dengan perubahan volume darah: kanal hijau saja ("green"), atau proyeksi ketiga kanal RGB dengan
+    CHROM/POS yang lebih tahan terhadap perubahan cahaya dan gerakan.
     """
-    def __init__(self):
+    def __init__(self, detect_interval=1, inference_scale=1.0, profiler=None, method="green",
+                 window_sec=DEFAULT_WINDOW_SEC, fs=30.0, hop=1, face_detector=None, roi_mode="box", face_mesh=None):
         """
         Konstruktor untuk kelas RPPGProcessor.
         Menginisialisasi model MediaPipe Face Detection dan buffer untuk menyimpan sinyal.
+
+        Args:
+            detect_interval (int, optional): Deteksi wajah penuh dijalankan setiap N frame; di antaranya
+                                             ROI dilacak dengan optical flow (`ROITracker`).
+                                             1 berarti deteksi di setiap frame. Defaultnya adalah 1.
+            inference_scale (float, optional): Skala resolusi frame yang diberikan ke MediaPipe (misalnya 0.5
+                                               atau 0.25). ROI tetap dipetakan dan diukur pada resolusi penuh.
+                                               Defaultnya adalah 1.0.
+            profiler (Profiler, optional): Profiler untuk mencatat durasi tahap deteksi, pelacakan,
+                                           dan rata-rata ROI. Default: profiler nonaktif.
+            method (str, optional): Metode ekstraksi sinyal: "green", "chrom", atau "pos". Defaultnya adalah "green".
+            window_sec (float, optional): Panjang jendela proyeksi CHROM/POS (detik). Defaultnya adalah 1.6.
+            fs (float, optional): Perkiraan laju frame (Hz) untuk mengonversi `window_sec` ke jumlah sampel.
+                                  Defaultnya adalah 30.0.
+            hop (int, optional): Jarak antar jendela proyeksi (sampel). Defaultnya adalah 1.
+            face_detector (object, optional): Model Face Detection yang sudah dibuat (apa pun yang memiliki metode
+                                              `process`), misalnya model milik worker inferensi yang dipakai
+                                              bersama beberapa stream. Default: model baru milik prosesor ini.
+                                              Tidak dipakai pada `roi_mode="mesh"`.
+            roi_mode (str, optional): Mode ROI wajah: "box" (sub-ROI persegi dari bounding box wajah) atau "mesh"
+                                      (masker kulit dari poligon landmark Face Mesh, lihat `face_mesh_roi`).
+                                      Defaultnya adalah "box".
+            face_mesh (object, optional): Model Face Mesh yang sudah dibuat untuk `roi_mode="mesh"` (apa pun yang
+                                          memiliki metode `process`). Default: model baru milik prosesor ini.
         """
+        if method not in RPPG_METHODS:
+            raise ValueError(f"Metode rPPG tidak dikenal: {method} (pilihan: {', '.join(RPPG_METHODS)})")
+        if roi_mode not in FACE_ROI_MODES:
+            raise ValueError(f"Mode ROI wajah tidak dikenal: {roi_mode} (pilihan: {', '.join(FACE_ROI_MODES)})")
+        import mediapipe as mp # Impor tertunda hingga prosesor dibuat (lihat RespirationProcessor)
         self.mp_face = mp.solutions.face_detection # Mengakses solusi deteksi wajah dari MediaPipe
-        # Inisialisasi objek FaceDetection dengan parameter kepercayaan deteksi minimum
-        self.face_detector = self.mp_face.FaceDetection(min_detection_confidence=0.5) #
-        # Buffer untuk menyimpan nilai sinyal rPPG (rata-rata intensitas kanal hijau ROI)
-        # maxlen=300 berarti buffer akan menyimpan 300 sampel terakhir
-        self.signal_buffer = deque(maxlen=300) #
+        self.roi_mode = roi_mode # Mode ROI wajah
+        self.face_detector = None # Model Face Detection (mode "box")
+        self.face_mesh = None # Model Face Mesh (mode "mesh")
+        self.skin_mask = None # Masker kulit dahi dan pipi yang di-cache (mode "mesh")
+        if roi_mode == "mesh":
+            # Satu wajah, tanpa landmark iris (tidak dibutuhkan untuk poligon kulit)
+            self.face_mesh = face_mesh if face_mesh is not None else mp.solutions.face_mesh.FaceMesh(
+                max_num_faces=1, refine_landmarks=False, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+            self.skin_mask = SkinMask()
+        else:
+            # Inisialisasi objek FaceDetection dengan parameter kepercayaan deteksi minimum
+            self.face_detector = face_detector if face_detector is not None else self.mp_face.FaceDetection(min_detection_confidence=0.5) #
+        # Buffer untuk menyimpan nilai sinyal rPPG (kanal hijau ROI atau sinyal pulsa CHROM/POS)
+        # Ring buffer 300 sampel terakhir beserta timestamp pengambilannya (dialokasikan sekali di awal)
+        self.signal_buffer = TimestampedRingBuffer(300) #
+        # Rata-rata RGB ROI wajah per frame (urutan R, G, B), dasar semua metode ekstraksi
+        self.rgb_buffer = TimestampedRingBuffer(300, channels=3) #
+        self.method = method # Metode ekstraksi sinyal rPPG
+        # Proyeksi inkremental untuk CHROM/POS (None untuk metode kanal hijau)
+        self.projector = None if method == "green" else OverlapAddProjector(method, max(2, round(window_sec * fs)), hop)
+        # Penanda artefak gerakan per sampel buffer sinyal (1 = tertandai), diisi bersamaan dengan buffer sinyal
+        self.artifact_buffer = TimestampedRingBuffer(300) #
+        self.motion_gate = MotionGate() # Penilai pergeseran ROI dan lompatan intensitas per frame
+        # Penanda per sampel RGB untuk CHROM/POS: sampel pulsa final tercampur dari semua jendela yang
+        # mencakupnya, yaitu 2 * window_size - 1 sampel RGB terakhir (lihat `projected_flags`)
+        self.motion_flags = None if self.projector is None else TimestampedRingBuffer(2 * self.projector.window_size - 1)
         self.roi_coords = None # Menyimpan koordinat ROI wajah (x1, y1, x2, y2), awalnya None
+        self.subroi_means = None # Rata-rata BGR dahi, pipi kiri, dan pipi kanan pada frame terakhir, bentuk (3, 3)
+        # Pelacak ROI untuk melewati deteksi wajah di antara deteksi penuh (None jika deteksi setiap frame)
+        self.tracker = ROITracker(detect_interval) if detect_interval > 1 else None
+        self.inference_scale = inference_scale # Skala resolusi untuk inferensi MediaPipe
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False) # Profiler tahap
+
+    def warm_up(self, frame_shape=(480, 640, 3)):
+        """
+        Menjalankan satu inferensi Face Detection (atau Face Mesh) pada frame hitam agar graf MediaPipe dan interpreter
+        TensorFlow Lite sudah terinisialisasi sebelum frame kamera pertama tiba.
+
+        Args:
+            frame_shape (tuple, optional): Bentuk frame pemanasan (tinggi, lebar, kanal); sebaiknya sama
+                                           dengan resolusi kamera. Defaultnya adalah (480, 640, 3).
+        """
+        self._detect_roi(InferenceFrame(np.zeros(frame_shape, dtype=np.uint8))) # Hasil deteksi diabaikan
 
     def reset(self):
         """
@@ -29,72 +105,202 @@ class RPPGProcessor:
         Biasanya dipanggil sebelum memulai sesi monitoring baru.
         """
         self.signal_buffer.clear() # Mengosongkan buffer sinyal
+        self.rgb_buffer.clear() # Mengosongkan buffer RGB
+        self.artifact_buffer.clear() # Mengosongkan penanda artefak
+        self.motion_gate.reset() # Mereset state gerakan
+        if self.projector is not None:
+            self.projector.reset() # Mengosongkan jendela proyeksi
+            self.motion_flags.clear() # Mengosongkan penanda per sampel RGB
         self.roi_coords = None # Mereset koordinat ROI
+        self.subroi_means = None # Mereset rata-rata sub-ROI
+        if self.skin_mask is not None:
+            self.skin_mask.reset() # Menghapus masker kulit yang di-cache
+        if self.tracker is not None:
+            self.tracker.reset() # Mereset state pelacakan ROI
 
-    def process(self, frame):
+    def _detect_roi(self, inference_frame):
         """
-        Memproses satu frame video untuk mengekstraksi sinyal rPPG.
+        Menjalankan MediaPipe Face Detection dan mengembalikan bounding box wajah pertama.
+        Pada `roi_mode="mesh"`, Face Mesh dijalankan sebagai gantinya: masker kulit diperbarui dari
+        landmark, dan ROI yang dikembalikan adalah kotak pembungkus poligon dahi dan pipi.
 
         Args:
-            frame (numpy.ndarray): Frame video input dalam format BGR OpenCV.
+            inference_frame (InferenceFrame): Frame beserta cache konversinya. Inferensi dijalankan pada
+                                              frame RGB berskala `inference_scale`, sedangkan koordinat
+                                              landmark/bounding box (ternormalisasi 0-1) dipetakan ke
+                                              resolusi penuh.
 
         Returns:
-            tuple:
-                - numpy.ndarray: Frame video yang telah diproses (mungkin dengan ROI wajah digambar).
-                - list: Daftar (list) dari sinyal rPPG yang ada di buffer.
-        """
-        # Membalik frame secara horizontal (efek cermin) agar lebih intuitif bagi pengguna
-        # Catatan: Jika frame sudah di-flip di RespirationProcessor dan outputnya digunakan di sini,
-        # flip ini mungkin perlu dipertimbangkan ulang atau dihilangkan untuk menghindari double flip.
-        # Namun, jika kedua prosesor menerima frame asli yang sama (setelah satu flip awal), ini OK.
-        # Berdasarkan main_dashboard.py, rppg_processor menerima output dari respiration_processor,
-        # yang sudah di-flip. Jadi, flip ini akan menjadi flip kedua. Idealnya, flip dilakukan sekali saja.
-        # Untuk saat ini, saya biarkan sesuai kode asli, namun ini adalah area potensial untuk perbaikan.
-        frame = cv2.flip(frame, 1) #
-        # Konversi frame dari BGR (format OpenCV) ke RGB (format yang dibutuhkan MediaPipe)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) #
+            tuple or None: Koordinat ROI wajah (x1, y1, x2, y2), atau None jika tidak ada wajah.
+        """
+        # Frame RGB (format yang dibutuhkan MediaPipe) berskala inferensi, dikonversi sekali per frame
+        # dan dibagikan dengan prosesor lain yang memakai skala yang sama
+        rgb_frame = inference_frame.rgb(self.inference_scale) #
+        if self.face_mesh is not None:
+            return self._detect_mesh_roi(rgb_frame, inference_frame.frame.shape)
         # Memproses frame RGB dengan model MediaPipe Face Detection
         results = self.face_detector.process(rgb_frame) #
 
-        h, w, _ = frame.shape # Mendapatkan tinggi (h) dan lebar (w) frame
+        # Jika tidak ada wajah yang terdeteksi
+        if not results.detections:
+            return None
+
+        h, w, _ = inference_frame.frame.shape # Tinggi (h) dan lebar (w) frame resolusi penuh
+
+        detection = results.detections[0] # Ambil deteksi pertama (asumsi hanya satu wajah utama)
+        # Dapatkan bounding box relatif dari wajah yang terdeteksi
+        bboxC = detection.location_data.relative_bounding_box #
+        
+        # Konversi koordinat bounding box relatif (0-1) ke koordinat piksel absolut
+        x1 = int(bboxC.xmin * w) #
+        y1 = int(bboxC.ymin * h) #
+        box_w = int(bboxC.width * w) #
+        box_h = int(bboxC.height * h) #
+
+        # Hitung koordinat x2 dan y2 untuk bounding box
+        x2 = x1 + box_w #
+        y2 = y1 + box_h #
+        return (x1, y1, x2, y2)
+
+    def _detect_mesh_roi(self, rgb_frame, shape):
+        """
+        Menjalankan MediaPipe Face Mesh, memperbarui masker kulit, dan mengembalikan ROI pembungkusnya.
+
+        Args:
+            rgb_frame (numpy.ndarray): Frame RGB berskala `inference_scale`.
+            shape (tuple): Bentuk frame resolusi penuh (tinggi, lebar, kanal).
+
+        Returns:
+            tuple or None: Kotak pembungkus poligon kulit (x1, y1, x2, y2), atau None jika tidak ada wajah.
+        """
+        results = self.face_mesh.process(rgb_frame)
+        if not results.multi_face_landmarks:
+            return None
+        h, w = shape[:2]
+        # Landmark ternormalisasi (0-1) dipetakan ke resolusi penuh dengan presisi sub-piksel
+        points = mesh_points(results.multi_face_landmarks[0], w, h)
+        roi = points_box(points)
+        self.skin_mask.update(points, roi) # Masker lama dipakai ulang jika bentuk wajah tidak berubah
+        return roi
+
+    def analyze(self, frame, timestamp=None, inference_frame=None):
+        """
+        Mengekstraksi satu sampel sinyal rPPG dari frame tanpa memodifikasi frame.
 
-        # Jika ada wajah yang terdeteksi
-        if results.detections:
-            detection = results.detections[0] # Ambil deteksi pertama (asumsi hanya satu wajah utama)
-            # Dapatkan bounding box relatif dari wajah yang terdeteksi
-            bboxC = detection.location_data.relative_bounding_box #
-            
-            # Konversi koordinat bounding box relatif (0-1) ke koordinat piksel absolut
-            x1 = int(bboxC.xmin * w) #
-            y1 = int(bboxC.ymin * h) #
-            box_w = int(bboxC.width * w) #
-            box_h = int(bboxC.height * h) #
+        Berbeda dengan `process`, metode ini tidak membalik frame dan tidak menggambar ROI,
+        sehingga rata-rata kanal hijau diukur pada frame asli (bukan frame yang sudah
+        berisi kotak ROI pernapasan) dan frame dapat dibaca bersamaan oleh prosesor lain.
+        Jika `detect_interval` > 1, deteksi wajah hanya dijalankan setiap N frame atau saat
+        pelacakan ROI kehilangan kepercayaan; di antaranya ROI dilacak dengan optical flow.
 
-            # Hitung koordinat x2 dan y2 untuk bounding box
-            x2 = x1 + box_w #
-            y2 = y1 + box_h #
+        Args:
+            frame (numpy.ndarray): Frame video BGR OpenCV yang sudah di-flip (efek cermin).
+            timestamp (float, optional): Waktu pengambilan frame (time.monotonic()). Default: waktu saat ini.
+            inference_frame (InferenceFrame, optional): Cache konversi RGB/grayscale untuk `frame` yang
+                                                        dibagikan dengan prosesor lain (lihat `FrameFanout`).
 
-            # Simpan koordinat ROI wajah yang baru dihitung
-            self.roi_coords = (x1, y1, x2, y2) #
+        Returns:
+            float or None: Untuk metode "green", rata-rata kanal hijau ROI wajah pada frame ini. Untuk CHROM/POS,
+                           sampel pulsa terbaru yang sudah final (tertunda sekitar satu jendela proyeksi).
+                           None jika ROI atau sampel belum tersedia.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic() # Waktu sebelum inferensi sebagai perkiraan waktu pengambilan frame
+
+        if inference_frame is None:
+            inference_frame = InferenceFrame(frame) # Cache konversi lokal jika tidak dibagikan
+        # Frame grayscale hanya dibutuhkan untuk pelacakan ROI
+        gray = inference_frame.gray() if self.tracker is not None else None
+
+        tracked_roi = None
+        if self.tracker is not None and not self.tracker.needs_detection():
+            with self.profiler.stage("lacak rppg"):
+                tracked_roi = self.tracker.track(gray) # Propagasi ROI murah dengan optical flow
+        if tracked_roi is not None:
+            self.roi_coords = tracked_roi
+        else:
+            with self.profiler.stage("face detection"):
+                detected_roi = self._detect_roi(inference_frame) # Deteksi wajah penuh
+            if detected_roi is not None:
+                # Simpan koordinat ROI wajah yang baru dihitung
+                self.roi_coords = detected_roi #
+                if self.tracker is not None:
+                    self.tracker.start(gray, detected_roi) # Mulai pelacakan dari hasil deteksi
 
         # Jika koordinat ROI wajah sudah ditentukan
-        if self.roi_coords is not None:
-            x1, y1, x2, y2 = self.roi_coords # Ambil koordinat ROI
-            # Ekstraksi Region of Interest (ROI) dari frame (area wajah)
-            roi = frame[y1:y2, x1:x2] #
-            
+        if self.roi_coords is None:
+            return None
+        with self.profiler.stage("roi rppg"):
+            # Rata-rata BGR dahi dan kedua pipi dihitung pada view frame tanpa salinan
+            # (area kulit tanpa mata, alis, dan mulut yang bergerak)
+            if self.skin_mask is not None:
+                self.subroi_means = self.skin_mask.means(frame, self.roi_coords) # Rata-rata bermasker poligon kulit
+            else:
+                self.subroi_means = roi_means(frame, face_subrois(self.roi_coords)) #
+            # Sub-ROI digabung dengan bobot sama sehingga gangguan lokal di satu area teredam
+            mean_bgr = combine_means(self.subroi_means)
             # Pastikan ROI tidak kosong (memiliki ukuran)
-            if roi.size != 0:
-                # Ekstrak kanal hijau (Green channel) dari ROI. Kanal hijau seringkali
-                # memberikan sinyal rPPG yang lebih baik karena penyerapan hemoglobin.
-                green_channel = roi[:, :, 1] # Indeks 1 untuk kanal Hijau dalam BGR
-                # Hitung rata-rata intensitas piksel pada kanal hijau
-                mean_green = np.mean(green_channel) #
-                # Tambahkan nilai rata-rata ini ke buffer sinyal rPPG
-                self.signal_buffer.append(mean_green) #
+            if mean_bgr is None:
+                return None
+            mean_rgb = mean_bgr[::-1] # Urutan kanal R, G, B
+            self.rgb_buffer.append(mean_rgb, timestamp) # Simpan bersama timestamp pengambilan frame
+        with self.profiler.stage("kualitas rppg"):
+            # Lompatan kotak wajah (deteksi ulang/gerakan kepala) dan lompatan luminansi ROI
+            quality = self.motion_gate.update(self.roi_coords, float(mean_rgb.mean()), timestamp)
+        flag = float(quality.flagged)
+
+        if self.projector is None:
+            # Ambil kanal hijau (Green channel). Kanal hijau seringkali memberikan sinyal rPPG
+            # yang lebih baik karena penyerapan hemoglobin.
+            mean_green = mean_rgb[1] #
+            # Tambahkan nilai rata-rata ini ke buffer sinyal rPPG
+            self.signal_buffer.append(mean_green, timestamp) #
+            self.artifact_buffer.append(flag, timestamp) # Penanda selaras dengan sampel sinyal
+            return mean_green
 
+        with self.profiler.stage("proyeksi rppg"):
+            # Hanya jendela terbaru yang diproyeksikan; sampel yang sudah final masuk ke buffer sinyal
+            values, times = self.projector.push(mean_rgb, timestamp)
+        self.motion_flags.append(flag, timestamp)
+        # Sampel pulsa final tertandai jika sampel RGB tertandai mendominasi jendela yang mencakupnya
+        final_flags = projected_flags(self.motion_flags.values(), self.projector.window_size, len(values))
+        for value, sample_time, final_flag in zip(values, times, final_flags):
+            self.signal_buffer.append(value, sample_time) # Timestamp asli sampel, bukan frame saat ini
+            self.artifact_buffer.append(final_flag, sample_time)
+        return values[-1] if len(values) else None
+
+    def draw_roi(self, frame):
+        """
+        Menggambar kotak ROI wajah (biru) pada frame tampilan; pada `roi_mode="mesh"`, poligon masker kulit.
+
+        Args:
+            frame (numpy.ndarray): Frame BGR yang boleh dimodifikasi (salinan untuk tampilan).
+        """
+        if self.roi_coords is not None and self.skin_mask is not None:
+            cv2.polylines(frame, self.skin_mask.polygons(self.roi_coords), True, (255, 0, 0), 1) # Poligon dahi dan pipi
+        elif self.roi_coords is not None:
+            x1, y1, x2, y2 = self.roi_coords
             # Gambar persegi panjang biru di sekitar ROI wajah pada frame untuk visualisasi
             cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)  # Kotak biru untuk rPPG
 
-        # Kembalikan frame yang telah diproses (dengan ROI wajah digambar) dan list dari buffer sinyal rPPG
-        return frame, list(self.signal_buffer) #
\ No newline at end of file
+    def process(self, frame):
+        """
+        Memproses satu frame video untuk mengekstraksi sinyal rPPG.
+
+        Args:
+            frame (numpy.ndarray): Frame video input dalam format BGR OpenCV.
+
+        Returns:
+            tuple:
+                - numpy.ndarray: Frame video yang telah diproses (mungkin dengan ROI wajah digambar).
+                - numpy.ndarray: View (tanpa salinan) dari sinyal rPPG yang ada di buffer.
+        """
+        # Membalik frame secara horizontal (efek cermin) agar lebih intuitif bagi pengguna.
+        # Untuk memproses satu frame dengan beberapa prosesor sekaligus tanpa flip ganda
+        # dan tanpa kontaminasi kotak ROI, gunakan `FrameFanout` (frame_fanout.py).
+        frame = cv2.flip(frame, 1) #
+        self.analyze(frame) # Ekstraksi sampel sinyal dari frame
+        self.draw_roi(frame) # Gambar ROI wajah pada frame untuk visualisasi
+
+        # Kembalikan frame yang telah diproses (dengan ROI wajah digambar) dan view dari buffer sinyal rPPG
+        return frame, self.signal_buffer.values() #
@@ -0,0 +1,158 @@
+from collections import namedtuple # Mengimpor namedtuple untuk struktur metrik kualitas per frame
+import numpy as np # Mengimpor NumPy untuk persentil riwayat selisih intensitas
+
+# Metrik kualitas satu frame:
+# - displacement: pergeseran centroid ROI terhadap frame sebelumnya, relatif terhadap diagonal ROI
+# - scale_change: perubahan ukuran (diagonal) ROI terhadap frame sebelumnya, relatif (0 = tetap)
+# - jump: lompatan intensitas dalam satuan simpangan robust selisih intensitas yang bersih
+# - flagged: True jika sampel frame ini ditandai artefak gerakan (termasuk masa tahan setelah gerakan)
+QualityMetrics = namedtuple("QualityMetrics", ["displacement", "scale_change", "jump", "flagged"])
+# Fraksi bobot sampel RGB tertandai maksimum agar sampel pulsa CHROM/POS final tidak ditandai
+MAX_PROJECTED_FLAG_FRACTION = 0.25
+
+
+def _roi_geometry(roi):
+    """
+    Mengembalikan centroid (cx, cy) dan diagonal ROI (x1, y1, x2, y2).
+    """
+    x1, y1, x2, y2 = roi
+    return (x1 + x2) / 2.0, (y1 + y2) / 2.0, float(np.hypot(x2 - x1, y2 - y1))
+
+
+def projected_flags(flags, window_size, count, max_fraction=MAX_PROJECTED_FLAG_FRACTION):
+    """
+    Menurunkan penanda artefak sampel pulsa CHROM/POS final dari penanda per sampel RGB.
+
+    Sampel pulsa ke-i adalah rata-rata overlap-add proyeksi semua jendela yang mencakupnya, sehingga
+    sampel RGB ke-j ikut menyumbang dengan bobot sebanding jumlah jendela yang memuat keduanya
+    (segitiga, `window_size - |i - j|`). Sampel pulsa ditandai jika fraksi bobot sampel RGB yang
+    tertandai melewati `max_fraction`. Berbeda dengan menandai seluruh rentang 2 * window_size - 1
+    sampel, gerakan singkat hanya menandai sampel pulsa yang memang didominasi olehnya, sehingga
+    jendela estimasi tidak langsung dilewati (lihat `RateEstimator.max_flagged_fraction`).
+
+    Args:
+        flags (numpy.ndarray): Penanda sampel RGB terakhir (1 = tertandai), paling banyak 2 * window_size - 1.
+        window_size (int): Panjang jendela proyeksi (sampel).
+        count (int): Jumlah sampel pulsa yang baru final, yaitu sampel RGB tertua jendela terakhir.
+        max_fraction (float, optional): Fraksi bobot tertandai maksimum. Defaultnya adalah 0.25.
+
+    Returns:
+        numpy.ndarray: Penanda (count,) float64 untuk sampel pulsa final, urut waktu.
+    """
+    flags = np.asarray(flags, dtype=np.float64)
+    offsets = np.arange(1 - window_size, window_size)
+    kernel = (window_size - np.abs(offsets)).astype(np.float64) # Bobot segitiga overlap-add
+    result = np.zeros(count)
+    for k in range(count):
+        index = len(flags) - window_size + k + offsets
+        valid = (index >= 0) & (index < len(flags))
+        weight = kernel[valid]
+        result[k] = float(weight @ flags[index[valid]] > max_fraction * weight.sum())
+    return result
+
+
+class MotionGate:
+    """
+    Detektor artefak gerakan per frame dari data yang sudah dimiliki prosesor: ROI dan intensitas rata-ratanya.
+
+    Gerakan kepala atau badan muncul sebagai lompatan ROI (deteksi ulang atau pelacakan yang bergeser)
+    dan lompatan intensitas rata-rata ROI yang jauh lebih besar daripada variasi napas atau denyut.
+    Setiap frame dinilai dengan tiga metrik (lihat `QualityMetrics`); jika salah satunya melewati
+    ambang, sampel ditandai, begitu pula sampel selama `hold_sec` berikutnya agar ekor gangguan
+    (misalnya ROI yang masih menyesuaikan posisi) ikut tertandai. Skala lompatan intensitas dipelajari
+    dari selisih yang bersih; selisih yang melewati ambang hanya dicatat sebesar ambangnya, sehingga
+    gerakan sesaat tidak menaikkan ambang, tetapi noise yang memang meningkat permanen tetap terserap.
+    """
+    def __init__(self, max_displacement=0.05, max_scale_change=0.08, max_jump=6.0, hold_sec=0.5,
+                 history=90, min_history=15, min_scale=0.05):
+        """
+        Konstruktor untuk kelas MotionGate.
+
+        Args:
+            max_displacement (float, optional): Pergeseran centroid ROI maksimum per frame, relatif terhadap
+                                                diagonal ROI. Defaultnya adalah 0.05.
+            max_scale_change (float, optional): Perubahan diagonal ROI relatif maksimum per frame. Defaultnya adalah 0.08.
+            max_jump (float, optional): Lompatan intensitas maksimum (kelipatan simpangan robust). Defaultnya adalah 6.0.
+            hold_sec (float, optional): Lama penandaan setelah gerakan terakhir terdeteksi (detik). Defaultnya adalah 0.5.
+            history (int, optional): Jumlah selisih intensitas bersih untuk estimasi simpangan robust. Defaultnya adalah 90.
+            min_history (int, optional): Jumlah selisih minimum sebelum uji lompatan intensitas aktif. Defaultnya adalah 15.
+            min_scale (float, optional): Batas bawah simpangan robust (satuan intensitas), agar sinyal yang nyaris
+                                         konstan tidak membuat setiap perubahan kecil dianggap lompatan.
+                                         Defaultnya adalah 0.05.
+        """
+        self.max_displacement = max_displacement # Ambang pergeseran ROI
+        self.max_scale_change = max_scale_change # Ambang perubahan ukuran ROI
+        self.max_jump = max_jump # Ambang lompatan intensitas
+        self.hold_sec = hold_sec # Masa tahan penandaan
+        self.min_history = min_history # Riwayat minimum uji intensitas
+        self.min_scale = min_scale # Batas bawah simpangan robust
+        self._diffs = np.zeros(history) # Ring selisih intensitas absolut yang bersih
+        self.reset()
+
+    def reset(self):
+        """
+        Menghapus state gerakan. Dipanggil sebelum memulai sesi monitoring baru.
+        """
+        self._roi = None # Geometri ROI frame sebelumnya (cx, cy, diagonal)
+        self._value = None # Intensitas frame sebelumnya
+        self._n_diffs = 0 # Jumlah selisih yang pernah dicatat ke ring
+        self._flag_until = None # Timestamp akhir masa tahan penandaan
+        self.latest = None # Metrik frame terakhir (QualityMetrics atau None)
+        self.frames = 0 # Jumlah frame yang dinilai
+        self.flagged_frames = 0 # Jumlah frame yang ditandai
+
+    def update(self, roi, value, timestamp):
+        """
+        Menilai satu frame.
+
+        Args:
+            roi (tuple): ROI frame ini (x1, y1, x2, y2) dalam piksel.
+            value (float): Intensitas rata-rata ROI frame ini (satu kanal, misalnya grayscale atau luminansi).
+            timestamp (float): Timestamp pengambilan frame (detik).
+
+        Returns:
+            QualityMetrics: Metrik frame ini beserta keputusan penandaannya.
+        """
+        cx, cy, diag = _roi_geometry(roi)
+        displacement = scale_change = jump = 0.0
+        if self._roi is not None:
+            prev_cx, prev_cy, prev_diag = self._roi
+            prev_diag = max(prev_diag, 1e-9)
+            displacement = float(np.hypot(cx - prev_cx, cy - prev_cy)) / prev_diag
+            scale_change = abs(diag / prev_diag - 1.0)
+        diff = None
+        scale = None
+        if self._value is not None:
+            diff = abs(value - self._value)
+            if self._n_diffs >= self.min_history:
+                count = min(self._n_diffs, len(self._diffs))
+                # Simpangan robust dari persentil ke-90 selisih absolut (= 1.645 simpangan baku untuk Gaussian).
+                # Median tidak dipakai karena intensitas ROI berubah bertingkat (kuantisasi 8-bit): sebagian
+                # besar selisih hampir nol sehingga setiap perpindahan tingkat akan tampak sebagai lompatan.
+                scale = max(np.percentile(self._diffs[:count], 90) / 1.645, self.min_scale)
+                jump = diff / scale
+
+        roi_moved = displacement > self.max_displacement or scale_change > self.max_scale_change
+        motion = roi_moved or jump > self.max_jump
+        if motion:
+            self._flag_until = timestamp + self.hold_sec
+        if diff is not None and not roi_moved:
+            # Selisih akibat lompatan ROI tidak dicatat; lompatan intensitas dicatat terpotong di ambang
+            self._diffs[self._n_diffs % len(self._diffs)] = diff if scale is None else min(diff, self.max_jump * scale)
+            self._n_diffs += 1
+        flagged = motion or (self._flag_until is not None and timestamp < self._flag_until)
+
+        self._roi = (cx, cy, diag)
+        self._value = value
+        self.frames += 1
+        self.flagged_frames += flagged
+        self.latest = QualityMetrics(displacement=displacement, scale_change=scale_change,
+                                     jump=float(jump), flagged=bool(flagged))
+        return self.latest
+
+    @property
+    def flagged_ratio(self):
+        """
+        Fraksi frame yang ditandai sejak reset terakhir (0-1).
+        """
+        return self.flagged_frames / self.frames if self.frames else 0.0
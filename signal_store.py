@@ -0,0 +1,543 @@
+import argparse # Mengimpor argparse untuk antarmuka baris perintah (ringkasan sesi)
+import json # Mengimpor json untuk manifest sesi
+import os # Mengimpor os untuk operasi path, direktori, dan penggantian file atomik
+import queue # Mengimpor queue untuk antrian batch dari thread pemrosesan ke thread penulis
+import sys # Mengimpor sys untuk kode keluar program
+import threading # Mengimpor threading untuk penulis latar belakang
+import time # Mengimpor time untuk batas umur chunk dan stempel waktu manifest
+from collections import deque # Mengimpor deque untuk riwayat interval timestamp per tabel
+
+import numpy as np # Mengimpor NumPy untuk buffer kolom, file NPZ, dan memory map
+
+from signal_utils import BandpassFilter # Filter bandpass kausal untuk kolom sinyal terfilter
+from vital_estimator import HEART_RATE_BAND, RESPIRATION_BAND # Pita frekuensi sinyal rPPG dan pernapasan
+
+# Nama file manifest di dalam direktori sesi
+MANIFEST_NAME = "manifest.json"
+# Versi format sesi
+STORE_VERSION = 1
+# Jumlah baris per chunk NPZ (~2 menit pada 30 fps); buffer kolom dialokasikan sekali sebesar ini
+DEFAULT_CHUNK_ROWS = 4096
+# Chunk yang belum penuh tetap ditulis setelah umur ini (detik), agar data yang hilang saat crash terbatas
+DEFAULT_FLUSH_SEC = 60.0
+# Batas antrian batch; jika penulis tertinggal (disk lambat), batch baru dibuang alih-alih menahan capture
+DEFAULT_QUEUE_SIZE = 1024
+# Kolom tabel estimasi laju (selain "t")
+ESTIMATE_COLUMNS = ("rate", "frequency", "snr", "confidence", "fs")
+# Pita filter kolom "filtered" untuk tabel sinyal bawaan sesi dashboard
+SIGNAL_BANDS = {"respirasi": RESPIRATION_BAND, "rppg": HEART_RATE_BAND}
+# Jumlah interval timestamp terakhir untuk median fs kolom "filtered" (~10 detik pada 30 fps)
+FS_HISTORY = 300
+# Jumlah interval minimum sebelum fs dianggap dapat diperkirakan (~1 detik pada 30 fps)
+FS_MIN_INTERVALS = 30
+# Perubahan relatif median fs minimum sebelum desain filter diganti (dan state filter direset)
+FS_TOLERANCE = 0.05
+
+
+def _write_json_atomic(path, data):
+    """
+    Menulis JSON ke file sementara lalu menggantinya secara atomik, sehingga pembaca (atau sesi
+    yang terhenti mendadak) tidak pernah melihat manifest yang setengah tertulis.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+class _TableBuffer:
+    """
+    Buffer kolom satu tabel berukuran tetap (`chunk_rows`) yang diisi sampai penuh lalu ditulis.
+    """
+    def __init__(self, columns, chunk_rows, band=None):
+        self.columns = list(columns) # Nama kolom, "t" selalu yang pertama
+        self.data = np.empty((len(self.columns), chunk_rows)) # Satu baris array per kolom (dialokasikan sekali)
+        self.rows = 0 # Jumlah baris terisi
+        self.started = None # Waktu baris pertama chunk ini masuk (time.monotonic())
+        self.band = band # Pita filter kolom "filtered", atau None
+        self.filter = None # BandpassFilter kausal; dibuat saat fs dapat diperkirakan
+        self.last_t = None # Timestamp terakhir untuk memperkirakan fs antar batch
+        self.intervals = deque(maxlen=FS_HISTORY) # Interval timestamp terakhir untuk median fs
+
+
+class SignalStoreWriter:
+    """
+    Penulis sinyal dan estimasi laju ke file kolumnar ber-chunk (NPZ terkompresi) di latar belakang.
+
+    Thread pemrosesan hanya memasukkan batch kecil ke antrian (`append` tidak pernah menunggu disk).
+    Thread penulis menyalin batch ke buffer kolom berukuran tetap; setiap kali buffer suatu tabel penuh
+    (atau berumur `flush_sec`), buffer ditulis sebagai satu chunk `np.savez_compressed` dan dipakai
+    ulang. Memori tetap konstan berapa pun panjang sesinya. Setelah setiap chunk, `manifest.json`
+    diperbarui secara atomik, sehingga sesi yang terhenti mendadak tetap terbaca sampai chunk terakhir.
+
+    Struktur direktori sesi::
+
+        <sesi>/manifest.json
+        <sesi>/<tabel>/chunk_000000.npz   # satu array per kolom
+        <sesi>/<tabel>/<kolom>.npy        # kolom gabungan untuk memory map (dibuat saat sesi ditutup)
+    """
+    def __init__(self, directory, chunk_rows=DEFAULT_CHUNK_ROWS, flush_sec=DEFAULT_FLUSH_SEC,
+                 queue_size=DEFAULT_QUEUE_SIZE, metadata=None):
+        """
+        Konstruktor untuk kelas SignalStoreWriter.
+
+        Args:
+            directory (str): Direktori sesi (dibuat jika belum ada).
+            chunk_rows (int, optional): Jumlah baris per chunk. Defaultnya adalah 4096.
+            flush_sec (float, optional): Umur maksimum chunk yang belum penuh sebelum ditulis (detik).
+                                         Defaultnya adalah 60.0.
+            queue_size (int, optional): Kapasitas antrian batch. Defaultnya adalah 1024.
+            metadata (dict, optional): Informasi tambahan sesi yang disimpan di manifest (misalnya sumber
+                                       dan metode rPPG).
+        """
+        self.directory = directory # Direktori sesi
+        self.chunk_rows = int(chunk_rows) # Baris per chunk
+        self.flush_sec = flush_sec # Umur maksimum chunk
+        self.dropped = 0 # Jumlah batch yang dibuang karena antrian penuh
+        os.makedirs(directory, exist_ok=True)
+        self._queue = queue.Queue(maxsize=queue_size) # Batch dari thread pemrosesan
+        self._tables = {} # Nama tabel -> _TableBuffer (hanya diakses thread penulis)
+        self._manifest = {"version": STORE_VERSION, "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                          "closed": False, "metadata": metadata or {}, "tables": {}}
+        self._consolidate = True # Apakah kolom gabungan dibuat saat ditutup
+        self.error = None # Exception dari thread penulis, jika ada
+        # Bukan daemon: interpreter menunggu chunk terakhir ditulis sebelum keluar
+        self._thread = threading.Thread(target=self._run, name="signal-store-writer")
+        self._thread.start()
+
+    def define(self, table, columns, band=None):
+        """
+        Mendefinisikan tabel beserta kolomnya. Tabel yang tidak didefinisikan dibuat otomatis dari
+        kolom batch pertamanya.
+
+        Args:
+            table (str): Nama tabel (juga nama subdirektori).
+            columns (list): Nama kolom selain "t".
+            band (tuple, optional): Pita (lowcut, highcut) Hz; jika diberikan, kolom "filtered" berisi
+                                    kolom pertama yang difilter bandpass secara kausal di thread penulis.
+        """
+        self._put(("define", table, tuple(columns), band))
+
+    def append(self, table, timestamps, **columns):
+        """
+        Menambahkan satu batch baris ke tabel tanpa menunggu disk.
+
+        Args:
+            table (str): Nama tabel.
+            timestamps (array-like): Timestamp setiap baris (detik).
+            **columns (array-like): Nilai setiap kolom, panjang sama dengan `timestamps`.
+
+        Returns:
+            bool: False jika batch dibuang karena antrian penuh.
+        """
+        t = np.array(timestamps, dtype=np.float64, ndmin=1) # Salinan: buffer pemanggil boleh ditimpa
+        values = {name: np.array(v, dtype=np.float64, ndmin=1) for name, v in columns.items()}
+        return self._put(("append", table, t, values))
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self, consolidate=True, wait=True):
+        """
+        Menulis sisa data, menandai sesi selesai, dan (opsional) membuat kolom gabungan `.npy`.
+
+        Args:
+            consolidate (bool, optional): Gabungkan chunk menjadi satu file `.npy` per kolom untuk memory
+                                          map. Defaultnya adalah True.
+            wait (bool, optional): Tunggu thread penulis selesai. Jika False, penulisan akhir berjalan di
+                                   latar belakang (misalnya dari thread GUI). Defaultnya adalah True.
+        """
+        self._consolidate = consolidate
+        if not self._thread.is_alive():
+            return # Thread penulis sudah berhenti (misalnya karena error disk)
+        self._queue.put(("close",)) # Selalu masuk, walaupun antrian penuh (menunggu sebentar)
+        if wait:
+            self._thread.join()
+
+    def _run(self):
+        """
+        Loop thread penulis: mengambil batch, mengisi buffer kolom, dan menulis chunk.
+        """
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=1.0)
+                except queue.Empty:
+                    item = None
+                if item is not None and item[0] == "close":
+                    break
+                if item is not None and item[0] == "define":
+                    self._define(*item[1:])
+                elif item is not None:
+                    self._append(*item[1:])
+                self._flush_expired()
+            for table in list(self._tables):
+                self._flush(table)
+            self._manifest["closed"] = True
+            self._manifest["dropped_batches"] = self.dropped
+            self._write_manifest()
+            if self._consolidate:
+                for table in self._manifest["tables"]:
+                    consolidate_table(self.directory, table, self._manifest)
+        except Exception as e: # Kegagalan disk tidak boleh mematikan sesi monitoring
+            self.error = e
+            print(f"Error saat menulis sinyal sesi: {e}")
+
+    def _define(self, table, columns, band):
+        if table in self._tables:
+            return
+        buffer = _TableBuffer(("t",) + columns + (("filtered",) if band else ()), self.chunk_rows, band)
+        self._tables[table] = buffer
+        self._manifest["tables"][table] = {"columns": buffer.columns, "rows": 0, "chunks": []}
+        os.makedirs(os.path.join(self.directory, table), exist_ok=True)
+
+    def _append(self, table, t, values):
+        if table not in self._tables:
+            self._define(table, tuple(values), None)
+        buffer = self._tables[table]
+        if buffer.band is not None:
+            values["filtered"] = self._filter(buffer, t, values[buffer.columns[1]])
+        offset = 0
+        while offset < len(t):
+            if buffer.rows == 0:
+                buffer.started = time.monotonic()
+            n = min(len(t) - offset, self.chunk_rows - buffer.rows)
+            buffer.data[0, buffer.rows:buffer.rows + n] = t[offset:offset + n]
+            for i, name in enumerate(buffer.columns[1:], start=1):
+                column = values.get(name)
+                buffer.data[i, buffer.rows:buffer.rows + n] = column[offset:offset + n] if column is not None else np.nan
+            buffer.rows += n
+            offset += n
+            if buffer.rows == self.chunk_rows:
+                self._flush(table)
+
+    def _filter(self, buffer, t, x):
+        """
+        Filter bandpass kausal untuk satu batch; fs diperkirakan dari median interval timestamp terakhir.
+
+        Batch dari dashboard hanya berisi satu sampel, sehingga fs per batch mengikuti jitter frame.
+        Median `FS_HISTORY` interval terakhir stabil, dan desain filter hanya diganti jika median
+        bergeser lebih dari `FS_TOLERANCE`; setiap penggantian mereset state filter.
+        """
+        previous = buffer.last_t
+        buffer.last_t = t[-1]
+        dt = np.diff(t) if previous is None else np.diff(t, prepend=previous)
+        buffer.intervals.extend(dt[dt > 0])
+        fs = 1.0 / float(np.median(buffer.intervals)) if len(buffer.intervals) >= FS_MIN_INTERVALS else None
+        # fs yang terlalu rendah untuk pita ini (misalnya karena jeda atau batch yang dibuang) diabaikan;
+        # margin 10% menjaga frekuensi atas tetap di bawah Nyquist setelah fs dibulatkan untuk cache desain
+        if fs is not None and fs > 2.2 * buffer.band[1]:
+            if buffer.filter is None:
+                # Orde 2: respons kausal tetap stabil untuk pita pernapasan yang sangat rendah relatif terhadap fs
+                buffer.filter = BandpassFilter(*buffer.band, fs, order=2)
+            elif abs(fs - buffer.filter.fs) > FS_TOLERANCE * buffer.filter.fs:
+                buffer.filter.set_fs(fs) # fs benar-benar berubah (misalnya kamera berganti mode)
+        if buffer.filter is None:
+            return np.full(len(x), np.nan) # fs belum dapat diperkirakan
+        return buffer.filter.process(x)
+
+    def _flush_expired(self):
+        now = time.monotonic()
+        for table, buffer in self._tables.items():
+            if buffer.rows and now - buffer.started >= self.flush_sec:
+                self._flush(table)
+
+    def _flush(self, table):
+        """
+        Menulis buffer kolom tabel sebagai satu chunk NPZ terkompresi dan memperbarui manifest.
+        """
+        buffer = self._tables[table]
+        if buffer.rows == 0:
+            return
+        info = self._manifest["tables"][table]
+        name = f"chunk_{len(info['chunks']):06d}.npz"
+        path = os.path.join(self.directory, table, name)
+        rows = buffer.rows
+        np.savez_compressed(path + ".tmp.npz", **{c: buffer.data[i, :rows] for i, c in enumerate(buffer.columns)})
+        os.replace(path + ".tmp.npz", path)
+        info["chunks"].append({"file": name, "rows": rows, "t0": float(buffer.data[0, 0]),
+                               "t1": float(buffer.data[0, rows - 1])})
+        info["rows"] += rows
+        buffer.rows = 0
+        self._write_manifest()
+
+    def _write_manifest(self):
+        _write_json_atomic(os.path.join(self.directory, MANIFEST_NAME), self._manifest)
+
+
+def consolidate_table(directory, table, manifest=None):
+    """
+    Menggabungkan chunk NPZ satu tabel menjadi satu file `.npy` per kolom.
+
+    Chunk didekompresi dan disalin satu per satu ke file tujuan yang dibuka sebagai memory map,
+    sehingga memori yang dipakai hanya sebesar satu chunk. File ditulis ke nama sementara lalu
+    diganti secara atomik; kolom gabungan yang lebih lama (misalnya dari sesi yang masih berjalan)
+    ditimpa.
+
+    Args:
+        directory (str): Direktori sesi.
+        table (str): Nama tabel.
+        manifest (dict, optional): Manifest sesi. Default: dibaca dari `manifest.json`.
+
+    Returns:
+        int: Jumlah baris kolom gabungan.
+    """
+    if manifest is None:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    info = manifest["tables"][table]
+    rows = sum(chunk["rows"] for chunk in info["chunks"])
+    table_dir = os.path.join(directory, table)
+    tmp_paths = {c: os.path.join(table_dir, f"{c}.npy.tmp") for c in info["columns"]}
+    if rows == 0:
+        for path in tmp_paths.values():
+            with open(path, "wb") as f:
+                np.save(f, np.zeros(0)) # Memory map berukuran nol tidak dapat dibuat
+    else:
+        outputs = {c: np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(rows,))
+                   for c, path in tmp_paths.items()}
+        offset = 0
+        for chunk in info["chunks"]:
+            with np.load(os.path.join(table_dir, chunk["file"])) as data:
+                for column, out in outputs.items():
+                    out[offset:offset + chunk["rows"]] = data[column]
+            offset += chunk["rows"]
+        for out in outputs.values():
+            out.flush()
+        outputs.clear() # Menutup memory map sebelum file diganti
+    for column, path in tmp_paths.items():
+        os.replace(path, os.path.join(table_dir, f"{column}.npy"))
+    return rows
+
+
+class SignalStore:
+    """
+    Pembaca sesi `SignalStoreWriter` untuk analisis setelah sesi.
+
+    Kolom dibaca sebagai memory map read-only dari file `.npy` gabungan (tanpa dekompresi maupun
+    salinan). Jika kolom gabungan belum ada atau tertinggal dari manifest (sesi masih berjalan atau
+    terhenti mendadak), kolom dibuat ulang dari chunk pada akses pertama.
+    """
+    def __init__(self, directory):
+        """
+        Konstruktor untuk kelas SignalStore.
+
+        Args:
+            directory (str): Direktori sesi.
+        """
+        self.directory = directory # Direktori sesi
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f) # Manifest sesi
+        self._cache = {} # Nama tabel -> dict kolom memory map
+
+    @property
+    def tables(self):
+        """
+        list: Nama tabel dalam sesi.
+        """
+        return list(self.manifest["tables"])
+
+    def columns(self, table):
+        """
+        Mengembalikan nama kolom suatu tabel ("t" selalu yang pertama).
+        """
+        return list(self.manifest["tables"][table]["columns"])
+
+    def __len__(self):
+        return len(self.manifest["tables"])
+
+    def table(self, table):
+        """
+        Mengembalikan semua kolom tabel sebagai memory map read-only.
+
+        Args:
+            table (str): Nama tabel.
+
+        Returns:
+            dict: Nama kolom -> numpy.memmap (N,) float64.
+        """
+        if table in self._cache:
+            return self._cache[table]
+        info = self.manifest["tables"][table]
+        table_dir = os.path.join(self.directory, table)
+        paths = {c: os.path.join(table_dir, f"{c}.npy") for c in info["columns"]}
+        columns = {}
+        for column, path in paths.items():
+            if not os.path.exists(path):
+                break
+            columns[column] = np.load(path, mmap_mode="r")
+            if len(columns[column]) != info["rows"]:
+                break
+        else:
+            self._cache[table] = columns
+            return columns
+        consolidate_table(self.directory, table, self.manifest) # Kolom gabungan belum ada atau tertinggal
+        self._cache[table] = {c: np.load(path, mmap_mode="r") for c, path in paths.items()}
+        return self._cache[table]
+
+    def between(self, table, t0=None, t1=None):
+        """
+        Mengambil baris dengan timestamp dalam rentang [t0, t1] memakai pencarian biner pada kolom "t".
+
+        Args:
+            table (str): Nama tabel.
+            t0 (float, optional): Batas bawah timestamp. Default: awal sesi.
+            t1 (float, optional): Batas atas timestamp. Default: akhir sesi.
+
+        Returns:
+            dict: Nama kolom -> view memory map untuk rentang tersebut.
+        """
+        columns = self.table(table)
+        t = columns["t"]
+        start = 0 if t0 is None else int(np.searchsorted(t, t0, side="left"))
+        stop = len(t) if t1 is None else int(np.searchsorted(t, t1, side="right"))
+        return {name: column[start:stop] for name, column in columns.items()}
+
+    def iter_chunks(self, table):
+        """
+        Membaca chunk tabel satu per satu (memori konstan, tanpa kolom gabungan).
+
+        Yields:
+            dict: Nama kolom -> numpy.ndarray untuk satu chunk.
+        """
+        info = self.manifest["tables"][table]
+        for chunk in info["chunks"]:
+            with np.load(os.path.join(self.directory, table, chunk["file"])) as data:
+                yield {column: data[column] for column in info["columns"]}
+
+    def summary(self):
+        """
+        Mengembalikan ringkasan teks sesi: jumlah baris, durasi, dan kolom setiap tabel.
+        """
+        lines = [f"Sesi {self.directory} ({'selesai' if self.manifest.get('closed') else 'belum ditutup'})"]
+        for table, info in self.manifest["tables"].items():
+            chunks = info["chunks"]
+            duration = chunks[-1]["t1"] - chunks[0]["t0"] if chunks else 0.0
+            lines.append(f"  {table}: {info['rows']} baris, {duration:.1f} s, {len(chunks)} chunk, "
+                         f"kolom {', '.join(info['columns'])}")
+        return "\n".join(lines)
+
+
+class SessionExporter:
+    """
+    Mengalirkan isi buffer sinyal prosesor dan estimasi laju ke `SignalStoreWriter`.
+
+    Dipanggil sekali per frame dari thread pemrosesan. Hanya sampel yang baru masuk ke setiap
+    `TimestampedRingBuffer` sejak pemanggilan sebelumnya yang disalin (beberapa sampel per frame),
+    dan estimasi laju hanya ditulis saat objek estimasinya berganti.
+    """
+    def __init__(self, writer):
+        """
+        Konstruktor untuk kelas SessionExporter.
+
+        Args:
+            writer (SignalStoreWriter): Penulis tujuan.
+        """
+        self.writer = writer # Penulis sesi
+        self._defined = set() # Tabel yang sudah didefinisikan di penulis
+        self._consumed = {} # Nama tabel -> buffer.total yang sudah diekspor
+        self._last_estimates = {} # Nama tabel -> objek estimasi terakhir yang diekspor
+
+    def buffer(self, table, buffer, columns=("value",), band=None):
+        """
+        Mengekspor sampel baru sebuah buffer sinyal.
+
+        Args:
+            table (str): Nama tabel.
+            buffer (TimestampedRingBuffer): Buffer sinyal (1 kanal, atau beberapa kanal sesuai `columns`).
+            columns (tuple, optional): Nama kolom per kanal. Defaultnya adalah ("value",).
+            band (tuple, optional): Pita filter kolom "filtered" (lihat `SignalStoreWriter.define`).
+        """
+        if table not in self._defined:
+            self.writer.define(table, columns, band)
+            self._defined.add(table)
+        consumed = self._consumed.get(table, 0)
+        if buffer.total < consumed: # Buffer direset (sesi baru pada prosesor yang sama)
+            consumed = 0
+        new = min(buffer.total - consumed, len(buffer)) # Sampel yang sudah tertimpa tidak dapat diekspor lagi
+        self._consumed[table] = buffer.total
+        if new <= 0:
+            return
+        values = buffer.values(new).reshape(new, -1)
+        self.writer.append(table, buffer.timestamps(new), **{c: values[:, i] for i, c in enumerate(columns)})
+
+    def estimate(self, table, estimate):
+        """
+        Mengekspor estimasi laju (`RateEstimate`) jika berbeda dari estimasi terakhir tabel ini.
+
+        Args:
+            table (str): Nama tabel.
+            estimate (RateEstimate or None): Estimasi terbaru.
+        """
+        if estimate is None or estimate is self._last_estimates.get(table):
+            return
+        self._last_estimates[table] = estimate
+        self.writer.append(table, estimate.timestamp, **{c: getattr(estimate, c) for c in ESTIMATE_COLUMNS})
+
+    def subject(self, prefix, respiration_buffer, rppg_buffer, heart_rate=None, respiration_rate=None,
+                rgb_buffer=None, respiration_artifacts=None, rppg_artifacts=None):
+        """
+        Mengekspor semua sinyal dan estimasi satu subjek ke tabel-tabel standar sesi:
+        `respirasi` dan `rppg` (nilai mentah dan terfilter), `rppg_rgb` (rata-rata RGB ROI wajah),
+        `respirasi_artefak` dan `rppg_artefak` (penanda artefak gerakan per sampel),
+        serta `detak_jantung` dan `laju_napas` (estimasi laju).
+
+        Args:
+            prefix (str): Awalan nama tabel (misalnya "subjek2_" pada mode multi-subjek; "" untuk satu subjek).
+            respiration_buffer (TimestampedRingBuffer): Buffer sinyal pernapasan.
+            rppg_buffer (TimestampedRingBuffer): Buffer sinyal rPPG.
+            heart_rate (RateEstimate, optional): Estimasi detak jantung terbaru.
+            respiration_rate (RateEstimate, optional): Estimasi laju pernapasan terbaru.
+            rgb_buffer (TimestampedRingBuffer, optional): Buffer rata-rata RGB ROI wajah (3 kanal).
+            respiration_artifacts (TimestampedRingBuffer, optional): Penanda artefak sinyal pernapasan.
+            rppg_artifacts (TimestampedRingBuffer, optional): Penanda artefak sinyal rPPG.
+        """
+        self.buffer(prefix + "respirasi", respiration_buffer, band=SIGNAL_BANDS["respirasi"])
+        self.buffer(prefix + "rppg", rppg_buffer, band=SIGNAL_BANDS["rppg"])
+        if rgb_buffer is not None:
+            self.buffer(prefix + "rppg_rgb", rgb_buffer, columns=("r", "g", "b"))
+        if respiration_artifacts is not None:
+            self.buffer(prefix + "respirasi_artefak", respiration_artifacts, columns=("flag",))
+        if rppg_artifacts is not None:
+            self.buffer(prefix + "rppg_artefak", rppg_artifacts, columns=("flag",))
+        self.estimate(prefix + "detak_jantung", heart_rate)
+        self.estimate(prefix + "laju_napas", respiration_rate)
+
+
+def main(argv=None):
+    """
+    Titik masuk CLI: menampilkan ringkasan sesi dan (opsional) membuat kolom gabungan.
+
+    Args:
+        argv (list, optional): Argumen baris perintah. Default: sys.argv[1:].
+
+    Returns:
+        int: Kode keluar.
+    """
+    parser = argparse.ArgumentParser(description="Ringkasan sesi sinyal yang diekspor SignalStoreWriter.")
+    parser.add_argument("sessions", nargs="+", help="Direktori sesi")
+    parser.add_argument("--consolidate", action="store_true",
+                        help="Buat ulang kolom gabungan .npy dari chunk (misalnya setelah sesi terhenti mendadak)")
+    args = parser.parse_args(argv)
+    status = 0
+    for directory in args.sessions:
+        try:
+            store = SignalStore(directory)
+        except (OSError, ValueError) as e:
+            print(f"Error: {directory}: {e}")
+            status = 1
+            continue
+        if args.consolidate:
+            for table in store.tables:
+                consolidate_table(directory, table, store.manifest)
+        print(store.summary())
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
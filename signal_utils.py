@@ -1,13 +1,56 @@
 import numpy as np # Mengimpor NumPy untuk operasi numerik dan array
-from scipy.signal import butter, filtfilt # Mengimpor fungsi filter Butterworth dan filtfilt dari SciPy
+from functools import lru_cache # Mengimpor lru_cache untuk menyimpan (memoize) desain filter
+# Fungsi desain filter Butterworth dan pemfilteran second-order sections (SOS) dari SciPy diimpor
+# di dalam fungsi yang memakainya: `scipy.signal` butuh lebih dari satu detik untuk diimpor saat
+# cold start, sehingga ditunda sampai filter pertama kali dipakai (atau dimuat di latar belakang
+# oleh `startup.ModelLoader`).
+
+# Resolusi pembulatan fs untuk kunci cache desain filter (Hz). fs yang diukur dari timestamp
+# sedikit berubah di setiap jendela; pembulatan ini membuat desain yang sama dapat dipakai ulang
+# dengan galat frekuensi cut-off yang dapat diabaikan (< 0.5%).
+FS_CACHE_RESOLUTION = 0.1
+
+@lru_cache(maxsize=64)
+def _cached_bandpass_sos(lowcut, highcut, fs, order):
+    """
+    Mendesain filter bandpass Butterworth dalam bentuk SOS. Hasilnya disimpan di cache
+    dengan kunci (lowcut, highcut, fs, order).
+    """
+    from scipy.signal import butter # Impor tertunda (lihat catatan di atas)
+    nyq = 0.5 * fs  # Menghitung frekuensi Nyquist (setengah dari frekuensi sampling)
+    low = lowcut / nyq  # Normalisasi frekuensi cut-off bawah terhadap frekuensi Nyquist
+    high = highcut / nyq  # Normalisasi frekuensi cut-off atas terhadap frekuensi Nyquist
+    sos = butter(order, [low, high], btype='band', output='sos') # Desain dalam bentuk second-order sections
+    return sos # Array ini dibagikan ke semua pemanggil melalui cache, jadi tidak boleh dimodifikasi
+
+def design_bandpass_sos(lowcut, highcut, fs, order=5):
+    """
+    Mengembalikan koefisien filter bandpass Butterworth dalam bentuk second-order sections (SOS).
+
+    Desain disimpan di cache sehingga `scipy.signal.butter` hanya dipanggil sekali untuk
+    setiap kombinasi (lowcut, highcut, fs, order). Bentuk SOS jauh lebih stabil secara numerik
+    dibanding bentuk (b, a) untuk orde tinggi dan frekuensi cut-off ternormalisasi yang rendah.
+
+    Args:
+        lowcut (float): Frekuensi cut-off bawah (Hz).
+        highcut (float): Frekuensi cut-off atas (Hz).
+        fs (float): Frekuensi sampling sinyal (Hz), dibulatkan ke FS_CACHE_RESOLUTION.
+        order (int, optional): Orde filter Butterworth. Defaultnya adalah 5.
+
+    Returns:
+        numpy.ndarray: Array SOS berukuran (n_sections, 6). Array ini dibagikan melalui cache
+                       dan tidak boleh dimodifikasi.
+    """
+    fs = round(float(fs) / FS_CACHE_RESOLUTION) * FS_CACHE_RESOLUTION # Pembulatan fs untuk kunci cache
+    return _cached_bandpass_sos(float(lowcut), float(highcut), round(fs, 6), int(order))
 
 def butter_bandpass_filter(data, lowcut, highcut, fs, order=5):
     """
     Menerapkan filter bandpass Butterworth ke data sinyal.
 
     Filter ini melewatkan frekuensi dalam rentang tertentu (antara lowcut dan highcut)
-    dan meredam frekuensi di luar rentang tersebut. Menggunakan filtfilt untuk
-    pemfilteran zero-phase.
+    dan meredam frekuensi di luar rentang tersebut. Menggunakan sosfiltfilt untuk
+    pemfilteran zero-phase dengan desain filter yang diambil dari cache.
 
     Args:
         data (numpy.ndarray atau list): Sinyal input 1D.
@@ -19,20 +62,117 @@ def butter_bandpass_filter(data, lowcut, highcut, fs, order=5):
     Returns:
         numpy.ndarray: Sinyal yang telah difilter.
     """
-    nyq = 0.5 * fs  # Menghitung frekuensi Nyquist (setengah dari frekuensi sampling)
-    low = lowcut / nyq  # Normalisasi frekuensi cut-off bawah terhadap frekuensi Nyquist
-    high = highcut / nyq  # Normalisasi frekuensi cut-off atas terhadap frekuensi Nyquist
+    # Mengambil koefisien filter (SOS) dari cache; desain ulang hanya jika kombinasi parameter baru
+    sos = design_bandpass_sos(lowcut, highcut, fs, order)
     
-    # Mendesain koefisien filter Butterworth (numerator b, denominator a)
-    # 'band' menunjukkan tipe filter adalah bandpass
-    b, a = butter(order, [low, high], btype='band') #
-    
-    # Menerapkan filter ke data menggunakan filtfilt
-    # filtfilt menerapkan filter dua kali (sekali maju, sekali mundur) untuk menghasilkan output zero-phase
+    from scipy.signal import sosfiltfilt # Impor tertunda; setelah impor pertama hanya pencarian sys.modules
+    # Menerapkan filter ke data menggunakan sosfiltfilt
+    # sosfiltfilt menerapkan filter dua kali (sekali maju, sekali mundur) untuk menghasilkan output zero-phase
     # (tidak ada pergeseran fasa yang disebabkan oleh filter).
-    y = filtfilt(b, a, data) #
+    y = sosfiltfilt(sos, data) #
     return y
 
+class BandpassFilter:
+    """
+    Filter bandpass Butterworth dengan desain yang disimpan di cache dan mode streaming kausal.
+
+    Mode `filter` menerapkan filter zero-phase pada satu jendela penuh (seperti
+    `butter_bandpass_filter`). Mode `process` bersifat kausal dan menyimpan state
+    internal filter (`zi`) antar pemanggilan, sehingga setiap pemanggilan hanya memproses
+    sampel yang baru datang: biaya O(1) per sampel, bukan O(panjang jendela) per frame.
+    """
+    def __init__(self, lowcut, highcut, fs, order=5):
+        """
+        Konstruktor untuk kelas BandpassFilter.
+
+        Args:
+            lowcut (float): Frekuensi cut-off bawah (Hz).
+            highcut (float): Frekuensi cut-off atas (Hz).
+            fs (float): Frekuensi sampling sinyal (Hz).
+            order (int, optional): Orde filter Butterworth. Defaultnya adalah 5.
+        """
+        self.lowcut = lowcut # Frekuensi cut-off bawah
+        self.highcut = highcut # Frekuensi cut-off atas
+        self.order = order # Orde filter
+        self.fs = fs # Frekuensi sampling
+        self.sos = design_bandpass_sos(lowcut, highcut, fs, order) # Koefisien SOS dari cache
+        self.zi = None # State filter streaming, diinisialisasi pada sampel pertama
+        self._consumed = 0 # Jumlah sampel buffer yang sudah diproses oleh `process_buffer`
+
+    def set_fs(self, fs):
+        """
+        Mengganti frekuensi sampling. Desain diambil dari cache; state streaming direset
+        hanya jika koefisien filter benar-benar berubah.
+
+        Args:
+            fs (float): Frekuensi sampling baru (Hz).
+        """
+        sos = design_bandpass_sos(self.lowcut, self.highcut, fs, self.order)
+        self.fs = fs
+        # Isi koefisien yang dibandingkan, bukan identitas objek: entri yang sudah dikeluarkan dari cache
+        # dan didesain ulang adalah objek baru dengan koefisien yang sama
+        if not np.array_equal(sos, self.sos):
+            self.sos = sos
+            self.zi = None
+
+    def reset(self):
+        """
+        Mereset state filter streaming.
+        """
+        self.zi = None
+        self._consumed = 0
+
+    def filter(self, data):
+        """
+        Menerapkan filter zero-phase (maju-mundur) pada satu jendela data.
+
+        Args:
+            data (numpy.ndarray atau list): Sinyal input 1D.
+
+        Returns:
+            numpy.ndarray: Sinyal yang telah difilter.
+        """
+        from scipy.signal import sosfiltfilt # Impor tertunda
+        return sosfiltfilt(self.sos, data)
+
+    def process(self, samples):
+        """
+        Memfilter sampel baru secara kausal dengan melanjutkan state dari pemanggilan sebelumnya.
+
+        Args:
+            samples (float, list, atau numpy.ndarray): Satu atau beberapa sampel baru.
+
+        Returns:
+            numpy.ndarray: Output filter untuk sampel-sampel tersebut (panjang sama dengan input).
+        """
+        from scipy.signal import sosfilt, sosfilt_zi # Impor tertunda
+        x = np.atleast_1d(np.asarray(samples, dtype=np.float64))
+        if x.size == 0:
+            return x
+        if self.zi is None:
+            # Inisialisasi state seolah-olah sinyal konstan sebelumnya, untuk mencegah transien awal yang besar
+            self.zi = sosfilt_zi(self.sos) * x[0]
+        y, self.zi = sosfilt(self.sos, x, zi=self.zi)
+        return y
+
+    def process_buffer(self, buffer):
+        """
+        Memfilter hanya sampel yang baru masuk ke `TimestampedRingBuffer` sejak pemanggilan terakhir.
+
+        Args:
+            buffer (TimestampedRingBuffer): Buffer sinyal (misalnya `processor.signal_buffer`).
+
+        Returns:
+            numpy.ndarray: Output filter untuk sampel-sampel baru (bisa kosong).
+        """
+        if buffer.total < self._consumed: # Buffer sudah direset sejak pemanggilan terakhir
+            self.reset()
+        new = buffer.total - self._consumed # Jumlah sampel baru
+        self._consumed = buffer.total
+        if new <= 0:
+            return np.empty(0)
+        return self.process(buffer.values(new))
+
 def normalize_signal(signal):
     """
     Menormalisasi sinyal ke rentang [0, 1].
@@ -83,4 +223,48 @@ def smooth_signal(signal, window_len=5):
     # Melakukan konvolusi antara sinyal dan jendela filter
     # mode='same' menghasilkan output dengan panjang yang sama dengan input,
     # dengan penanganan padding yang sesuai di tepi sinyal.
-    return np.convolve(signal, window, mode='same') #
\ No newline at end of file
+    return np.convolve(signal, window, mode='same') #
+
+
+def sampling_jitter(timestamps):
+    """
+    Mengukur ketidakseragaman interval sampling.
+
+    Args:
+        timestamps (numpy.ndarray atau list): Timestamp sampel (detik), urut naik.
+
+    Returns:
+        float: Deviasi terbesar interval antar sampel terhadap median interval, relatif terhadap median
+               (0 = seragam sempurna, 1 = ada interval dua kali median, misalnya satu frame terlewat).
+    """
+    dt = np.diff(np.asarray(timestamps, dtype=np.float64))
+    if dt.size == 0:
+        return 0.0
+    median = np.median(dt)
+    if median <= 0:
+        return float("inf")
+    return float(np.abs(dt - median).max() / median)
+
+
+def resample_uniform(values, timestamps, fs=None):
+    """
+    Menginterpolasi linear sinyal dengan timestamp tidak seragam ke grid waktu seragam.
+
+    Filter digital dan FFT mengasumsikan jarak sampel yang sama; frame yang terlewat atau tertunda
+    (misalnya saat CPU terbebani) membuat asumsi ini salah, sehingga sinyal diinterpolasi terlebih dahulu.
+
+    Args:
+        values (numpy.ndarray atau list): Nilai sinyal 1D.
+        timestamps (numpy.ndarray atau list): Timestamp setiap nilai (detik), urut naik.
+        fs (float, optional): Frekuensi sampling grid (Hz). Default: frekuensi sampling efektif
+                              (jumlah interval / durasi), sehingga jumlah sampel hampir tidak berubah.
+
+    Returns:
+        tuple: (nilai pada grid seragam, timestamp grid).
+    """
+    t = np.asarray(timestamps, dtype=np.float64)
+    duration = t[-1] - t[0]
+    if fs is None:
+        fs = (len(t) - 1) / duration
+    grid = t[0] + np.arange(int(np.floor(duration * fs + 1e-9)) + 1) / fs
+    return np.interp(grid, t, np.asarray(values, dtype=np.float64)), grid
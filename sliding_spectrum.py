@@ -0,0 +1,264 @@
+import numpy as np # Mengimpor NumPy untuk bank DFT geser dan operasi array
+
+from ring_buffer import TimestampedRingBuffer # Jendela sampel milik spektrum (sampel yang keluar dari jendela)
+from vital_estimator import HEART_RATE_BAND, RESPIRATION_BAND # Pita frekuensi fisiologis (Hz)
+
+
+class SlidingSpectrum:
+    """
+    Spektrum daya jendela geser yang diperbarui per sampel dengan DFT geser (sliding DFT).
+
+    Alih-alih menghitung FFT penuh atas seluruh jendela setiap frame, setiap bin frekuensi pada pita
+    yang dipantau memegang jumlah DFT jendela terakhir yang diacu ke sampel terbaru:
+
+        Y(n) = x(n) + e^{-jw} Y(n-1) - x(n-N) e^{-jwN}
+
+    sehingga satu sampel baru hanya membutuhkan O(jumlah bin) operasi (setara bank filter Goertzel
+    yang juga membuang sampel lama). Grid bin dirapatkan `oversample` kali dari resolusi 1/N, sehingga
+    bin tetangga +-1/N tersedia pada grid dan jendela Hann diterapkan langsung di domain frekuensi
+    (kombinasi tiga bin). Tren linear jendela dihapus secara eksak dari jumlah berjalan sum(x) dan
+    sum(m * x), tanpa filter bandpass. Untuk membatasi galat pembulatan yang terakumulasi, semua bin
+    dihitung ulang secara langsung sekali setiap N sampel (biaya teramortisasi tetap O(jumlah bin)),
+    sekaligus memperbarui frekuensi sampling dari timestamp jika berubah melebihi `fs_tolerance`.
+
+    Sebelum jendela penuh, spektrum dihitung langsung dari sampel yang ada (jendela Hann sepanjang
+    data yang tersedia) setiap kali diminta.
+    """
+    def __init__(self, lowcut, highcut, window_sec=10.0, min_window_sec=5.0, fs=30.0, oversample=4,
+                 fs_tolerance=0.02):
+        """
+        Konstruktor untuk kelas SlidingSpectrum.
+
+        Args:
+            lowcut (float): Batas bawah pita frekuensi (Hz).
+            highcut (float): Batas atas pita frekuensi (Hz).
+            window_sec (float, optional): Panjang jendela analisis (detik); jumlah sampel jendela ditetapkan dari
+                                          `fs` awal. Defaultnya adalah 10.0.
+            min_window_sec (float, optional): Durasi data minimum sebelum spektrum tersedia (detik). Defaultnya adalah 5.0.
+            fs (float, optional): Perkiraan awal frekuensi sampling (Hz); diperbarui dari timestamp. Defaultnya adalah 30.0.
+            oversample (int, optional): Jumlah bin per resolusi frekuensi jendela (1/N). Defaultnya adalah 4.
+            fs_tolerance (float, optional): Perubahan relatif fs yang memicu pembangunan ulang grid bin. Defaultnya adalah 0.02.
+        """
+        self.lowcut = lowcut # Batas bawah pita (Hz)
+        self.highcut = highcut # Batas atas pita (Hz)
+        self.window_size = max(int(round(window_sec * fs)), 8) # Panjang jendela N (sampel)
+        self.min_samples = max(int(round(min_window_sec * fs)), 8) # Jumlah sampel minimum
+        self.oversample = int(oversample) # Kerapatan grid bin
+        self.fs_tolerance = fs_tolerance # Toleransi perubahan fs
+        self.window = TimestampedRingBuffer(self.window_size) # N sampel terakhir beserta timestamp-nya
+        self._build_grid(fs)
+        self.reset()
+
+    def reset(self):
+        """
+        Menghapus jendela dan state DFT. Dipanggil sebelum memulai sesi monitoring baru.
+        """
+        self.window.clear()
+        self._y[:] = 0 # Jumlah DFT per bin (termasuk bin tambahan di kedua sisi pita)
+        self._s0 = 0.0 # sum(x) jendela (relatif terhadap `_offset`)
+        self._s1 = 0.0 # sum(m * x) jendela, m = 0 untuk sampel terbaru
+        self._offset = 0.0 # Nilai acuan yang dikurangkan dari sampel (mengurangi galat pembulatan)
+        self._since_resync = 0 # Jumlah sampel sejak perhitungan ulang langsung terakhir
+        self._buffer = None # Buffer sumber `update_from_buffer` terakhir
+        self._buffer_total = 0 # `total` buffer sumber yang sudah dibaca
+        self._cache = None # (jumlah sampel, daya) spektrum terakhir yang dihitung
+        self.resyncs = 0 # Jumlah perhitungan ulang langsung
+
+    def _build_grid(self, fs):
+        """
+        Membangun grid bin untuk frekuensi sampling `fs` beserta konstanta rekursi dan penghapus tren.
+        """
+        n, p = self.window_size, self.oversample
+        self.fs = float(fs) # Frekuensi sampling yang dipakai grid (Hz)
+        step = self.fs / (n * p) # Jarak antar bin (Hz)
+        highcut = min(self.highcut, 0.45 * self.fs) # Batas atas harus di bawah frekuensi Nyquist
+        count = max(int(np.floor((highcut - self.lowcut) / step)) + 1, 1)
+        # Grid diperluas `oversample` bin di kedua sisi agar tetangga +-1/N untuk jendela Hann tersedia
+        grid = self.lowcut + step * np.arange(-p, count + p)
+        self.freqs = grid[p:p + count] # Frekuensi bin pita (Hz), tanpa bin tambahan
+        omega = 2.0 * np.pi * grid / self.fs
+        self._z = np.exp(-1j * omega) # Faktor rotasi per sampel
+        self._zn = np.exp(-1j * omega * n) # Faktor sampel yang keluar dari jendela
+        m = np.arange(n)
+        # Matriks e^{-jwm} untuk perhitungan langsung (perhitungan ulang dan sebelum jendela penuh)
+        self._basis = np.exp(-1j * np.outer(m, omega)) # (N, jumlah bin grid)
+        # Spektrum Hann dari komponen konstan dan linear jendela, untuk menghapus tren secara eksak
+        self._trend0 = self._hann(self._basis.sum(axis=0))
+        self._trend1 = self._hann(m @ self._basis)
+        moments = np.array([[n, m.sum()], [m.sum(), (m * m).sum()]], dtype=np.float64)
+        self._moments_inv = np.linalg.inv(moments) # Invers persamaan normal regresi linear a + b m
+        self._gain = 1.0 / (n / 2.0) ** 2 # Normalisasi daya: sinus amplitudo A memberi puncak A^2 / 4
+        self._y = np.zeros(len(grid), dtype=np.complex128)
+
+    def _hann(self, y):
+        """
+        Menerapkan jendela Hann periodik di domain frekuensi: 0.5 Y(w) - 0.25 Y(w - 2pi/N) - 0.25 Y(w + 2pi/N).
+        """
+        p = self.oversample
+        return 0.5 * y[p:-p] - 0.25 * (y[:-2 * p] + y[2 * p:])
+
+    def _resync(self):
+        """
+        Menghitung ulang semua bin dan jumlah berjalan langsung dari jendela, lalu memeriksa fs.
+        """
+        fs = self.window.effective_fs()
+        if fs and abs(fs / self.fs - 1.0) > self.fs_tolerance:
+            self._build_grid(fs) # Laju frame berubah: frekuensi bin disesuaikan dengan fs sebenarnya
+        values = self.window.values()
+        self._offset = float(values.mean())
+        x = values[::-1] - self._offset # m = 0 untuk sampel terbaru
+        self._y = x @ self._basis
+        self._s0 = float(x.sum())
+        self._s1 = float(np.arange(len(x)) @ x)
+        self._since_resync = 0
+        self.resyncs += 1
+
+    def push(self, value, timestamp):
+        """
+        Menambahkan satu sampel dan memperbarui semua bin dalam O(jumlah bin).
+
+        Args:
+            value (float): Nilai sampel sinyal.
+            timestamp (float): Timestamp pengambilan sampel (detik).
+        """
+        n = self.window_size
+        full = len(self.window) == n
+        oldest = float(self.window.values()[0]) if full else None # x(n-N), dibaca sebelum ditimpa
+        self.window.append(value, timestamp)
+        self._cache = None
+        if not full:
+            if len(self.window) == n:
+                self._resync() # Jendela baru penuh: mulai rekursi dari perhitungan langsung
+            return
+        x_new = float(value) - self._offset
+        x_old = oldest - self._offset
+        self._y *= self._z
+        self._y += x_new
+        self._y -= x_old * self._zn
+        self._s1 += self._s0 - n * x_old # sum(m * x) bergeser satu indeks
+        self._s0 += x_new - x_old
+        self._since_resync += 1
+        if self._since_resync >= n:
+            self._resync()
+
+    def update_from_buffer(self, buffer):
+        """
+        Memasukkan sampel baru dari `TimestampedRingBuffer` milik prosesor (misalnya `signal_buffer`).
+
+        Sampel baru dikenali dari `buffer.total`, sehingga fungsi ini dapat dipanggil setiap frame tanpa
+        memasukkan sampel yang sama dua kali. Jika buffer sumber berganti, dikosongkan, atau tertinggal
+        lebih dari kapasitasnya, spektrum diisi ulang dari isi buffer saat ini.
+
+        Args:
+            buffer (TimestampedRingBuffer): Buffer sinyal 1D.
+
+        Returns:
+            int: Jumlah sampel baru yang dimasukkan.
+        """
+        new = buffer.total - self._buffer_total
+        if buffer is not self._buffer or new < 0 or new > len(buffer):
+            self.reset()
+            self._buffer = buffer
+            new = len(buffer)
+        self._buffer_total = buffer.total
+        if new == 0:
+            return 0
+        for value, timestamp in zip(buffer.values(new).tolist(), buffer.timestamps(new).tolist()):
+            self.push(value, timestamp)
+        return new
+
+    @property
+    def ready(self):
+        """
+        True jika sampel sudah cukup untuk spektrum.
+        """
+        return len(self.window) >= self.min_samples
+
+    def _direct_power(self):
+        """
+        Spektrum langsung dari sampel yang tersedia sebelum jendela penuh (jendela Hann sepanjang data).
+        """
+        fs = self.window.effective_fs()
+        if fs and abs(fs / self.fs - 1.0) > self.fs_tolerance:
+            self._build_grid(fs) # Jendela belum penuh; rekursi belum berjalan sehingga grid bebas diganti
+        x = self.window.values()[::-1].astype(np.float64) # m = 0 untuk sampel terbaru
+        k = len(x)
+        m = np.arange(k)
+        slope, intercept = np.polyfit(m, x, 1)
+        taper = 0.5 - 0.5 * np.cos(2.0 * np.pi * m / k)
+        p = self.oversample
+        y = ((x - intercept - slope * m) * taper) @ self._basis[:k, p:-p]
+        return (y.real ** 2 + y.imag ** 2) / (k / 2.0) ** 2
+
+    def spectrum(self):
+        """
+        Mengembalikan spektrum daya pita saat ini.
+
+        Returns:
+            tuple or None: (frekuensi bin dalam Hz, daya per bin); daya adalah array baru yang aman dibaca
+                           thread lain. None jika sampel belum cukup.
+        """
+        if not self.ready:
+            return None
+        count = self.window.total
+        if self._cache is None or self._cache[0] != count:
+            if len(self.window) < self.window_size:
+                power = self._direct_power()
+            else:
+                a, b = self._moments_inv @ (self._s0, self._s1) # Regresi linear jendela: x(n - m) ~ a + b m
+                y = self._hann(self._y) - a * self._trend0 - b * self._trend1
+                power = (y.real ** 2 + y.imag ** 2) * self._gain
+            self._cache = (count, power)
+        return self.freqs, self._cache[1].copy()
+
+    def peak_frequency(self):
+        """
+        Mengembalikan frekuensi puncak spektrum (Hz) dengan interpolasi parabola di sekitar bin puncak.
+
+        Returns:
+            float or None: Frekuensi puncak, atau None jika spektrum belum tersedia.
+        """
+        result = self.spectrum()
+        if result is None:
+            return None
+        freqs, power = result
+        peak = int(np.argmax(power))
+        frequency = freqs[peak]
+        if 0 < peak < len(power) - 1:
+            a, b, c = np.log(power[peak - 1:peak + 2] + 1e-20)
+            denom = a - 2 * b + c
+            if denom != 0:
+                frequency += 0.5 * (a - c) / denom * (freqs[1] - freqs[0])
+        return float(frequency)
+
+
+def heart_rate_spectrum(**kwargs):
+    """
+    Membuat SlidingSpectrum untuk pita denyut jantung (0.7-4 Hz) dengan jendela yang sama seperti
+    `heart_rate_estimator`.
+
+    Args:
+        **kwargs: Parameter tambahan untuk SlidingSpectrum (misalnya fs, window_sec).
+
+    Returns:
+        SlidingSpectrum: Spektrum geser denyut jantung.
+    """
+    params = {"window_sec": 10.0, "min_window_sec": 5.0}
+    params.update(kwargs)
+    return SlidingSpectrum(*HEART_RATE_BAND, **params)
+
+
+def respiration_spectrum(**kwargs):
+    """
+    Membuat SlidingSpectrum untuk pita pernapasan (0.1-0.5 Hz) dengan jendela yang sama seperti
+    `respiration_rate_estimator`.
+
+    Args:
+        **kwargs: Parameter tambahan untuk SlidingSpectrum (misalnya fs, window_sec).
+
+    Returns:
+        SlidingSpectrum: Spektrum geser pernapasan.
+    """
+    params = {"window_sec": 30.0, "min_window_sec": 8.0}
+    params.update(kwargs)
+    return SlidingSpectrum(*RESPIRATION_BAND, **params)
@@ -0,0 +1,160 @@
+import threading # Mengimpor threading untuk memuat model di latar belakang
+import time # Mengimpor time untuk mengukur durasi setiap fase startup
+from contextlib import contextmanager # Mengimpor contextmanager untuk pencatatan fase dengan blok `with`
+
+# Titik nol linimasa startup: saat modul ini pertama kali diimpor. `main.py` mengimpor modul ini
+# paling awal, sehingga waktu impor modul GUI juga ikut terukur.
+PROCESS_START = time.monotonic()
+
+
+class StartupTimeline:
+    """
+    Pencatat fase cold start (impor, jendela tampil, pembangunan model, frame pertama).
+
+    Setiap fase dicatat sebagai (nama, mulai, selesai) dalam detik sejak `PROCESS_START`, dan
+    setiap penanda (`mark`) sebagai satu titik waktu. Aman dipanggil dari beberapa thread,
+    karena model dibangun di thread latar belakang sementara GUI berjalan di thread utama.
+    """
+    def __init__(self, origin=None):
+        """
+        Konstruktor untuk kelas StartupTimeline.
+
+        Args:
+            origin (float, optional): Titik nol linimasa (time.monotonic()). Defaultnya adalah `PROCESS_START`.
+        """
+        self.origin = PROCESS_START if origin is None else origin # Titik nol linimasa
+        self.phases = [] # Daftar (nama, mulai, selesai) dalam detik sejak titik nol
+        self.marks = {} # Nama penanda -> detik sejak titik nol (hanya kejadian pertama)
+        self._lock = threading.Lock() # Melindungi daftar fase dan penanda
+
+    def now(self):
+        """
+        Mengembalikan waktu saat ini dalam detik sejak titik nol.
+        """
+        return time.monotonic() - self.origin
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Mencatat durasi satu fase startup.
+
+        Args:
+            name (str): Nama fase, misalnya "bangun model".
+        """
+        start = self.now()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append((name, start, self.now()))
+
+    def mark(self, name):
+        """
+        Mencatat satu titik waktu (misalnya "jendela tampil" atau "frame pertama").
+        Hanya kejadian pertama yang dicatat, sehingga aman dipanggil di jalur per frame.
+
+        Args:
+            name (str): Nama penanda.
+        """
+        if name in self.marks:
+            return
+        with self._lock:
+            self.marks.setdefault(name, self.now())
+
+    def as_dict(self):
+        """
+        Mengembalikan linimasa dalam bentuk yang dapat diserialisasi ke JSON.
+
+        Returns:
+            dict: {"phases": [{"name", "start_s", "end_s", "duration_s"}], "marks": {nama: detik}}.
+        """
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+            marks = dict(self.marks)
+        return {
+            "phases": [{"name": name, "start_s": round(start, 4), "end_s": round(end, 4),
+                        "duration_s": round(end - start, 4)} for name, start, end in phases],
+            "marks": {name: round(t, 4) for name, t in sorted(marks.items(), key=lambda m: m[1])},
+        }
+
+    def report(self):
+        """
+        Membuat laporan teks linimasa startup, satu baris per fase/penanda, urut waktu.
+
+        Returns:
+            str: Laporan multi-baris.
+        """
+        data = self.as_dict()
+        rows = [(p["start_s"], f"{p['start_s'] * 1000:8.0f} ms  {p['name']:<24} {p['duration_s'] * 1000:7.0f} ms")
+                for p in data["phases"]]
+        rows += [(t, f"{t * 1000:8.0f} ms  * {name}") for name, t in data["marks"].items()]
+        return "\n".join(["Linimasa startup:"] + [row for _, row in sorted(rows, key=lambda r: r[0])])
+
+
+class ModelLoader(threading.Thread):
+    """
+    Thread latar belakang yang membangun prosesor MediaPipe dan menjalankan inferensi pemanasan.
+
+    Impor MediaPipe/TensorFlow Lite, pembangunan graf, dan inferensi pertama (yang jauh lebih lambat
+    daripada inferensi berikutnya) dijalankan di sini, sehingga jendela sudah tampil dan responsif
+    selama model dimuat. GUI memeriksa `ready` (misalnya lewat `root.after`) lalu mengambil `result`.
+    """
+    def __init__(self, factory, timeline=None, frame_shape=(480, 640, 3)):
+        """
+        Konstruktor untuk kelas ModelLoader.
+
+        Args:
+            factory (callable): Fungsi tanpa argumen yang membuat prosesor; boleh mengembalikan satu
+                                prosesor atau list/tuple prosesor. Setiap prosesor yang memiliki metode
+                                `warm_up` akan dipanaskan.
+            timeline (StartupTimeline, optional): Linimasa tempat fase pemuatan dicatat.
+                                                  Default: linimasa baru.
+            frame_shape (tuple, optional): Bentuk frame pemanasan. Defaultnya adalah (480, 640, 3).
+        """
+        super().__init__(name="model-loader", daemon=True)
+        self.factory = factory # Pembuat prosesor
+        self.timeline = timeline if timeline is not None else StartupTimeline() # Linimasa startup
+        self.frame_shape = frame_shape # Bentuk frame pemanasan
+        self.ready = threading.Event() # Di-set saat pemuatan selesai (berhasil maupun gagal)
+        self.result = None # Hasil `factory` setelah pemanasan
+        self.error = None # Exception jika pemuatan gagal
+
+    def run(self):
+        """
+        Mengimpor SciPy, membangun prosesor, lalu menjalankan inferensi pemanasan.
+        """
+        try:
+            with self.timeline.phase("impor scipy"):
+                import scipy.signal # Dipakai filter bandpass dan estimator; diimpor sekarang agar sampel pertama tidak tertunda
+            with self.timeline.phase("bangun model"):
+                result = self.factory()
+            processors = result if isinstance(result, (list, tuple)) else [result]
+            with self.timeline.phase("pemanasan model"):
+                for processor in processors:
+                    if hasattr(processor, "warm_up"):
+                        processor.warm_up(self.frame_shape)
+            self.result = result
+        except Exception as e: # Kegagalan dilaporkan ke GUI, bukan mematikan thread diam-diam
+            self.error = e
+        finally:
+            self.timeline.mark("model siap")
+            self.ready.set()
+
+    def wait(self, timeout=None):
+        """
+        Menunggu pemuatan selesai dan mengembalikan hasilnya.
+
+        Args:
+            timeout (float, optional): Batas waktu tunggu (detik). Default: tunggu tanpa batas.
+
+        Returns:
+            object: Hasil `factory`, atau None jika belum selesai dalam batas waktu.
+
+        Raises:
+            Exception: Exception dari pemuatan, jika pemuatan gagal.
+        """
+        if not self.ready.wait(timeout):
+            return None
+        if self.error is not None:
+            raise self.error
+        return self.result
@@ -0,0 +1,134 @@
+import numpy as np # Mengimpor NumPy untuk matriks IoU dan jarak centroid ter-vektorisasi
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """
+    Menghitung Intersection-over-Union setiap pasangan kotak dari dua himpunan kotak.
+
+    Args:
+        boxes_a (array-like): Kotak (N, 4) dengan kolom (x1, y1, x2, y2).
+        boxes_b (array-like): Kotak (M, 4) dengan kolom (x1, y1, x2, y2).
+
+    Returns:
+        numpy.ndarray: Matriks IoU (N, M) bernilai 0-1.
+    """
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(1, -1, 4)
+    iw = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    ih = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = iw * ih
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class SubjectTracker:
+    """
+    Pelacak identitas subjek berbasis IoU dengan cadangan jarak centroid.
+
+    Setiap pemanggilan `update` menerima kotak wajah hasil satu deteksi, lalu mencocokkannya
+    dengan subjek yang sudah dikenal secara greedy (pasangan dengan IoU tertinggi lebih dulu).
+    Jika IoU terlalu kecil (misalnya karena wajah bergerak cepat di antara deteksi), pasangan
+    masih diterima bila jarak centroid cukup dekat relatif terhadap ukuran wajah. Subjek yang
+    tidak terlihat selama `max_missed` deteksi berturut-turut dihapus, sehingga ID tetap stabil
+    selama pasien berada di dalam frame.
+    """
+    def __init__(self, max_subjects=4, iou_threshold=0.3, max_distance=0.5, max_missed=5):
+        """
+        Konstruktor untuk kelas SubjectTracker.
+
+        Args:
+            max_subjects (int, optional): Jumlah maksimum subjek yang dilacak bersamaan. Defaultnya adalah 4.
+            iou_threshold (float, optional): IoU minimum agar deteksi dicocokkan dengan subjek. Defaultnya adalah 0.3.
+            max_distance (float, optional): Jarak centroid maksimum (relatif terhadap diagonal kotak subjek)
+                                            untuk pencocokan cadangan. Defaultnya adalah 0.5.
+            max_missed (int, optional): Jumlah deteksi berturut-turut tanpa kecocokan sebelum subjek dihapus.
+                                        Defaultnya adalah 5.
+        """
+        self.max_subjects = max_subjects # Batas jumlah subjek
+        self.iou_threshold = iou_threshold # Ambang IoU pencocokan
+        self.max_distance = max_distance # Ambang jarak centroid relatif
+        self.max_missed = max_missed # Batas deteksi tanpa kecocokan
+        self.reset()
+
+    def reset(self):
+        """
+        Menghapus semua subjek; ID baru dimulai lagi dari 1.
+        """
+        self.boxes = {} # ID subjek -> kotak wajah terakhir (x1, y1, x2, y2)
+        self.missed = {} # ID subjek -> jumlah deteksi berturut-turut tanpa kecocokan
+        self._next_id = 1 # ID untuk subjek baru berikutnya
+
+    def _match_scores(self, ids, detections):
+        """
+        Skor kecocokan (T, D): IoU jika di atas ambang, skor kecil positif untuk pasangan yang hanya
+        lolos uji jarak centroid, dan nol untuk pasangan yang tidak boleh dicocokkan.
+        """
+        tracks = np.array([self.boxes[i] for i in ids], dtype=np.float64)
+        iou = iou_matrix(tracks, detections)
+        track_c = (tracks[:, :2] + tracks[:, 2:]) / 2.0
+        det_c = (detections[:, :2] + detections[:, 2:]) / 2.0
+        diag = np.hypot(tracks[:, 2] - tracks[:, 0], tracks[:, 3] - tracks[:, 1])
+        distance = np.linalg.norm(track_c[:, None] - det_c[None], axis=-1) / np.maximum(diag, 1e-9)[:, None]
+        # Pasangan berbasis jarak diberi skor di bawah semua pasangan berbasis IoU, makin dekat makin tinggi
+        fallback = np.where(distance <= self.max_distance, self.iou_threshold * (1.0 - distance / (2 * self.max_distance)), 0.0)
+        return np.where(iou >= self.iou_threshold, iou, fallback)
+
+    def update(self, detections):
+        """
+        Mencocokkan kotak wajah hasil deteksi dengan subjek yang sudah dikenal.
+
+        Args:
+            detections (array-like): Kotak wajah (D, 4) dengan kolom (x1, y1, x2, y2).
+
+        Returns:
+            tuple:
+                - dict: ID subjek -> kotak wajah (tuple int) untuk subjek yang terlihat pada deteksi ini
+                        (termasuk subjek baru).
+                - list: ID subjek yang dihapus karena terlalu lama tidak terlihat.
+        """
+        detections = np.asarray(detections, dtype=np.float64).reshape(-1, 4)
+        ids = list(self.boxes)
+        matched = {} # ID subjek -> indeks deteksi
+        if ids and len(detections):
+            scores = self._match_scores(ids, detections)
+            # Greedy: ambil pasangan dengan skor tertinggi, lalu coret baris dan kolomnya
+            for flat in np.argsort(scores, axis=None)[::-1]:
+                t, d = divmod(int(flat), len(detections))
+                if scores[t, d] <= 0:
+                    break
+                if ids[t] in matched or d in matched.values():
+                    continue
+                matched[ids[t]] = d
+
+        visible = {}
+        for subject_id, d in matched.items():
+            self.boxes[subject_id] = tuple(int(v) for v in detections[d])
+            self.missed[subject_id] = 0
+            visible[subject_id] = self.boxes[subject_id]
+
+        # Deteksi tanpa pasangan menjadi subjek baru selama kapasitas masih ada
+        used = set(matched.values())
+        for d in range(len(detections)):
+            if d in used or len(self.boxes) >= self.max_subjects:
+                continue
+            subject_id = self._next_id
+            self._next_id += 1
+            self.boxes[subject_id] = tuple(int(v) for v in detections[d])
+            self.missed[subject_id] = 0
+            visible[subject_id] = self.boxes[subject_id]
+
+        removed = []
+        for subject_id in ids:
+            if subject_id in matched:
+                continue
+            self.missed[subject_id] += 1
+            if self.missed[subject_id] > self.max_missed:
+                del self.boxes[subject_id]
+                del self.missed[subject_id]
+                removed.append(subject_id)
+        return visible, removed
+
+    def __len__(self):
+        return len(self.boxes)
@@ -0,0 +1,129 @@
+import time # Mengimpor time untuk membatasi frekuensi refresh tampilan
+import cv2 # Mengimpor OpenCV untuk resize dan konversi warna yang cepat
+from PIL import Image, ImageTk # Mengimpor Pillow untuk menjembatani array NumPy ke PhotoImage Tkinter
+
+
+def fit_size(frame_width, frame_height, target_width, target_height):
+    """
+    Menghitung ukuran gambar terbesar yang muat di dalam area target tanpa mengubah rasio aspek.
+
+    Args:
+        frame_width (int): Lebar frame asli.
+        frame_height (int): Tinggi frame asli.
+        target_width (int): Lebar area target (widget).
+        target_height (int): Tinggi area target (widget).
+
+    Returns:
+        tuple: (lebar, tinggi) hasil penyesuaian, minimal 1x1 piksel.
+    """
+    img_aspect_ratio = frame_width / frame_height # Rasio aspek gambar asli
+    label_aspect_ratio = target_width / target_height # Rasio aspek area target
+    if img_aspect_ratio > label_aspect_ratio:
+        # Gambar relatif lebih lebar: sesuaikan dengan lebar target
+        new_width = target_width
+        new_height = int(new_width / img_aspect_ratio)
+    else:
+        # Gambar relatif lebih tinggi (atau rasio sama): sesuaikan dengan tinggi target
+        new_height = target_height
+        new_width = int(new_height * img_aspect_ratio)
+    return max(new_width, 1), max(new_height, 1)
+
+
+class VideoRenderer:
+    """
+    Menampilkan frame video BGR pada sebuah label Tkinter dengan biaya serendah mungkin.
+
+    - Ukuran label di-cache dan hanya diperbarui saat event `<Configure>` (jendela di-resize),
+      bukan dengan `winfo_width/height` di setiap frame.
+    - Resize memakai `cv2.resize` (INTER_AREA saat memperkecil, INTER_LINEAR saat memperbesar)
+      yang jauh lebih murah daripada LANCZOS milik Pillow.
+    - Satu `ImageTk.PhotoImage` dipakai ulang melalui `paste()`; objek baru hanya dibuat
+      jika ukuran tampilan berubah.
+    - Frekuensi refresh dibatasi `max_fps`, terpisah dari kecepatan pemrosesan frame.
+    """
+    def __init__(self, label, max_fps=30):
+        """
+        Konstruktor untuk kelas VideoRenderer.
+
+        Args:
+            label (tkinter.Widget): Label Tkinter tempat video ditampilkan.
+            max_fps (float, optional): Batas frekuensi refresh tampilan. None atau 0 berarti tanpa batas. Defaultnya adalah 30.
+        """
+        self.label = label # Widget label video
+        self.max_fps = max_fps # Batas frekuensi refresh tampilan
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0 # Jarak minimum antar refresh (detik)
+        self.last_render = None # Waktu refresh terakhir
+        self.target_size = None # Ukuran label (lebar, tinggi) yang di-cache dari event <Configure>
+        self.display_size = None # Ukuran gambar yang sedang ditampilkan
+        self.photo = None # PhotoImage yang dipakai ulang
+        self.label.bind("<Configure>", self.on_configure, add="+") # Perbarui ukuran hanya saat widget berubah ukuran
+
+    def on_configure(self, event):
+        """
+        Handler event `<Configure>`: menyimpan ukuran label yang baru.
+
+        Args:
+            event (tkinter.Event): Event Tkinter berisi lebar dan tinggi widget.
+        """
+        if event.width > 1 and event.height > 1: # Abaikan ukuran placeholder sebelum widget tergambar
+            self.target_size = (event.width, event.height)
+
+    def reset(self):
+        """
+        Mereset pembatas refresh sehingga frame berikutnya langsung ditampilkan.
+        """
+        self.last_render = None
+
+    def due(self, now=None):
+        """
+        Menentukan apakah tampilan boleh di-refresh sekarang (sesuai batas `max_fps`).
+
+        Args:
+            now (float, optional): Waktu saat ini (time.monotonic()).
+
+        Returns:
+            bool: True jika sudah waktunya refresh.
+        """
+        if now is None:
+            now = time.monotonic()
+        return self.last_render is None or now - self.last_render >= self.min_interval
+
+    def render(self, frame, now=None):
+        """
+        Menampilkan satu frame BGR di label, kecuali jika batas refresh belum terlewati.
+
+        Args:
+            frame (numpy.ndarray): Frame video dalam format BGR OpenCV.
+            now (float, optional): Waktu saat ini (time.monotonic()).
+
+        Returns:
+            bool: True jika frame ditampilkan, False jika dilewati karena batas `max_fps`.
+        """
+        if now is None:
+            now = time.monotonic()
+        if not self.due(now):
+            return False
+        self.last_render = now
+
+        frame_height, frame_width = frame.shape[:2]
+        if self.target_size is not None:
+            size = fit_size(frame_width, frame_height, *self.target_size)
+        else:
+            size = (frame_width, frame_height) # Ukuran label belum diketahui: tampilkan ukuran asli
+        if size != (frame_width, frame_height):
+            # INTER_AREA untuk memperkecil (bebas aliasing), INTER_LINEAR untuk memperbesar
+            interpolation = cv2.INTER_AREA if size[0] < frame_width else cv2.INTER_LINEAR
+            frame = cv2.resize(frame, size, interpolation=interpolation)
+        # Konversi warna setelah resize sehingga hanya piksel tampilan yang dikonversi
+        image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+        if self.photo is None or self.display_size != size:
+            # PhotoImage baru hanya saat ukuran berubah; label menyimpan referensinya
+            # agar tidak di-garbage collect oleh Python
+            self.photo = ImageTk.PhotoImage(image=image)
+            self.display_size = size
+            self.label.config(image=self.photo)
+            self.label.image = self.photo
+        else:
+            self.photo.paste(image) # Tulis piksel baru ke PhotoImage yang sama
+        return True
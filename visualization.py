@@ -1,3 +1,4 @@
+import time # Mengimpor time untuk membatasi frekuensi refresh plot
 import numpy as np # Mengimpor NumPy untuk operasi array, terutama np.arange
 import matplotlib.pyplot as plt # Mengimpor pyplot dari Matplotlib untuk membuat plot
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg # Mengimpor FigureCanvasTkAgg untuk menyematkan plot Matplotlib di Tkinter
@@ -7,12 +8,18 @@ class Visualization:
     Kelas untuk membuat dan mengelola visualisasi sinyal menggunakan Matplotlib
     yang disematkan dalam antarmuka Tkinter.
 
-    Menampilkan dua sinyal (misalnya, pernapasan dan rPPG) pada satu plot.
+    Menampilkan dua sinyal (misalnya, pernapasan dan rPPG) pada satu plot, dan secara opsional
+    spektrum daya pita pernapasan dan denyut jantung di bawahnya (lihat `sliding_spectrum`).
     Menyediakan kustomisasi untuk warna latar belakang, teks, grid, dan garis plot.
+
+    Pada mode blitting, latar belakang statis (axes, grid, tick, legenda) disimpan sekali,
+    lalu setiap update hanya menggambar ulang kedua garis di atasnya. Batas sumbu Y diubah
+    secara histeresis (hanya saat data keluar dari batas atau menyusut jauh), sehingga
+    redraw penuh figure jarang terjadi.
     """
     def __init__(self, master, fig_bg_color='#3C3C3C', axes_bg_color='#252525',
                  text_color='white', grid_color='#555555',
-                 line1_color='lime', line2_color='cyan'):
+                 line1_color='lime', line2_color='cyan', blit=True, max_fps=20, show_spectrum=False):
         """
         Konstruktor untuk kelas Visualization.
 
@@ -24,11 +31,21 @@ class Visualization:
             grid_color (str, optional): Warna untuk garis grid. Default: '#555555'.
             line1_color (str, optional): Warna untuk garis plot sinyal pertama. Default: 'lime'.
             line2_color (str, optional): Warna untuk garis plot sinyal kedua. Default: 'cyan'.
+            blit (bool, optional): Jika True, hanya garis yang digambar ulang di atas latar belakang yang di-cache. Default: True.
+            max_fps (float, optional): Batas frekuensi refresh plot. None atau 0 berarti tanpa batas. Default: 20.
+            show_spectrum (bool, optional): Jika True, dua plot spektrum (pernapasan dan rPPG) ditampilkan di bawah
+                                            plot sinyal. Default: False.
         """
         # Membuat Figure dan Axes Matplotlib
         # figsize menentukan ukuran gambar dalam inci
         # facecolor mengatur warna latar belakang Figure
-        self.fig, self.ax = plt.subplots(figsize=(8, 5), facecolor=fig_bg_color) #
+        if show_spectrum:
+            # Plot sinyal di baris atas, spektrum pernapasan dan rPPG berdampingan di baris bawah
+            self.fig = plt.figure(figsize=(8, 5), facecolor=fig_bg_color)
+            grid = self.fig.add_gridspec(2, 2, height_ratios=(3, 1.4))
+            self.ax = self.fig.add_subplot(grid[0, :])
+        else:
+            self.fig, self.ax = plt.subplots(figsize=(8, 5), facecolor=fig_bg_color) #
         
         # Mengatur warna latar belakang area plot (Axes)
         self.ax.set_facecolor(axes_bg_color) #
@@ -55,6 +72,8 @@ class Visualization:
 
         # Ukuran buffer default untuk sumbu x, menentukan jumlah frame/data point yang ditampilkan
         self.buffer_size = 300 #
+        # Array indeks X yang dialokasikan sekali dan dipotong (view) sesuai panjang sinyal setiap update
+        self.x_index = np.arange(self.buffer_size) #
         # Mengatur batas awal sumbu X dari 0 hingga buffer_size
         self.ax.set_xlim(0, self.buffer_size) #
         # Mengatur batas awal sumbu Y, nilai ini akan diupdate secara dinamis nanti
@@ -63,8 +82,11 @@ class Visualization:
         # Membuat dua objek garis plot (Line2D) untuk dua sinyal
         # Awalnya kosong (data []), akan diupdate nanti
         # label digunakan untuk legenda
-        self.respiration_line, = self.ax.plot([], [], label="Sinyal Pernapasan", color=line1_color, linewidth=1.5) #
-        self.rppg_line, = self.ax.plot([], [], label="Sinyal rPPG", color=line2_color, linewidth=1.5) #
+        # Pada mode blitting garis ditandai `animated` agar tidak ikut tergambar di latar belakang yang di-cache
+        self.respiration_line, = self.ax.plot([], [], label="Sinyal Pernapasan", color=line1_color, linewidth=1.5,
+                                              animated=blit) #
+        self.rppg_line, = self.ax.plot([], [], label="Sinyal rPPG", color=line2_color, linewidth=1.5,
+                                       animated=blit) #
         
         # Mengatur gaya legenda plot
         legend = self.ax.legend(facecolor=axes_bg_color, edgecolor=grid_color, labelcolor=text_color, fontsize=10) #
@@ -72,6 +94,18 @@ class Visualization:
         for text in legend.get_texts():
             text.set_color(text_color) #
 
+        # Plot spektrum: daya dinormalisasi ke puncaknya (sumbu Y tetap 0-1), sumbu X dalam laju per menit,
+        # sehingga batas sumbu tidak pernah berubah dan spektrum selalu tergambar lewat jalur blitting
+        self.spectrum_lines = [] # Garis spektrum pernapasan dan rPPG (kosong jika spektrum tidak ditampilkan)
+        if show_spectrum:
+            panels = [(grid[1, 0], "Spektrum pernapasan", "napas/menit", (6, 30), line1_color),
+                      (grid[1, 1], "Spektrum rPPG", "BPM", (42, 240), line2_color)]
+            for cell, title, unit, xlim, color in panels:
+                ax = self.fig.add_subplot(cell)
+                self._style_spectrum_axes(ax, title, unit, xlim, axes_bg_color, text_color, grid_color)
+                line, = ax.plot([], [], color=color, linewidth=1.2, animated=blit)
+                self.spectrum_lines.append(line)
+
         # Membuat canvas Tkinter untuk menyematkan figure Matplotlib
         self.canvas = FigureCanvasTkAgg(self.fig, master=master) #
         # Mendapatkan widget Tkinter dari canvas Matplotlib
@@ -83,8 +117,33 @@ class Visualization:
         # Menyesuaikan layout figure agar judul, label, dan elemen lainnya tidak terpotong
         self.fig.tight_layout(pad=1.5) #
 
+        # --- Pengaturan Blitting dan Pembatas Refresh ---
+        self.blit = blit # Flag mode blitting
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0 # Jarak minimum antar refresh plot (detik)
+        self.last_update = None # Waktu refresh plot terakhir
+        self.background = None # Latar belakang statis figure yang di-cache (mode blitting)
+        if self.blit:
+            # Setiap redraw penuh (inisialisasi, resize jendela, perubahan batas sumbu) memperbarui cache latar belakang
+            self.canvas.mpl_connect("draw_event", self._on_draw)
+
+
+    @staticmethod
+    def _style_spectrum_axes(ax, title, unit, xlim, axes_bg_color, text_color, grid_color):
+        """
+        Menerapkan tema gelap pada axes spektrum dengan batas sumbu tetap.
+        """
+        ax.set_facecolor(axes_bg_color)
+        ax.set_title(title, color=text_color, fontsize=10)
+        ax.set_xlabel(unit, color=text_color, fontsize=9)
+        ax.tick_params(colors=text_color, labelsize=8)
+        ax.set_yticks([]) # Daya relatif; skala absolut tidak bermakna bagi pengguna
+        for spine in ax.spines.values():
+            spine.set_color(text_color)
+        ax.grid(True, linestyle='--', linewidth=0.5, color=grid_color)
+        ax.set_xlim(*xlim)
+        ax.set_ylim(0, 1.05)
 
-    def update(self, signals): #
+    def update(self, signals, spectra=None): #
         """
         Memperbarui data pada plot dengan sinyal baru.
 
@@ -92,62 +151,138 @@ class Visualization:
             signals (list of list/numpy.ndarray): Sebuah list yang berisi dua sinyal.
                                                   signals[0] untuk sinyal pernapasan.
                                                   signals[1] untuk sinyal rPPG.
+                                                  Array NumPy (misalnya view dari ring buffer) dipakai langsung tanpa disalin.
+            spectra (list, optional): Spektrum pernapasan dan rPPG, masing-masing (frekuensi Hz, daya) dari
+                                      `SlidingSpectrum.spectrum()` atau None jika belum tersedia. Diabaikan jika
+                                      plot spektrum tidak ditampilkan.
+
+        Returns:
+            bool: True jika plot diperbarui, False jika dilewati karena batas `max_fps`.
         """
         # Pastikan ada setidaknya dua sinyal yang diberikan
         if len(signals) < 2: #
-            return # Keluar jika data sinyal tidak lengkap
+            return False # Keluar jika data sinyal tidak lengkap
 
         resp_signal = signals[0] # Sinyal pernapasan
         rppg_signal = signals[1] # Sinyal rPPG
 
+        # Batasi frekuensi refresh plot; data terbaru akan tampil pada refresh berikutnya
+        now = time.monotonic()
+        if self.last_update is not None and now - self.last_update < self.min_interval:
+            return False
+        self.last_update = now
+
         # Memperbarui data untuk garis sinyal pernapasan
-        if resp_signal: # Hanya update jika ada data sinyal pernapasan
-            x_resp = np.arange(len(resp_signal)) # Membuat array X (indeks frame) untuk sinyal pernapasan
-            self.respiration_line.set_xdata(x_resp) # Set data X
-            self.respiration_line.set_ydata(resp_signal) # Set data Y
+        if len(resp_signal) > 0: # Hanya update jika ada data sinyal pernapasan
+            self.respiration_line.set_data(self._x_for(resp_signal), resp_signal) # Set data X (indeks frame) dan Y
 
         # Memperbarui data untuk garis sinyal rPPG
-        if rppg_signal: # Hanya update jika ada data sinyal rPPG
-            x_rppg = np.arange(len(rppg_signal)) # Membuat array X (indeks frame) untuk sinyal rPPG
-            self.rppg_line.set_xdata(x_rppg) # Set data X
-            self.rppg_line.set_ydata(rppg_signal) # Set data Y
-        
-        # --- Menyesuaikan batas sumbu Y secara dinamis ---
-        all_y_data = [] # Kumpulkan semua data Y untuk menentukan min dan max
-        if resp_signal: all_y_data.extend(resp_signal) #
-        if rppg_signal: all_y_data.extend(rppg_signal) #
-
-        if all_y_data: # Jika ada data Y
-            min_y = min(all_y_data) # Cari nilai minimum
-            max_y = max(all_y_data) # Cari nilai maksimum
-            padding_y = (max_y - min_y) * 0.1  # Tambahkan padding 10% dari rentang data Y
-            if padding_y == 0 : padding_y = 5 # Padding minimal jika data Y flat (semua nilainya sama)
-            
-            self.ax.set_ylim(min_y - padding_y, max_y + padding_y) # Atur batas Y baru dengan padding
-        else:
-            self.ax.set_ylim(0, 255) # Jika tidak ada data, kembali ke batas Y default
+        if len(rppg_signal) > 0: # Hanya update jika ada data sinyal rPPG
+            self.rppg_line.set_data(self._x_for(rppg_signal), rppg_signal) # Set data X (indeks frame) dan Y
+
+        # Memperbarui garis spektrum (frekuensi dalam laju per menit, daya relatif terhadap puncak)
+        if spectra is not None:
+            for line, spectrum in zip(self.spectrum_lines, spectra):
+                if spectrum is not None:
+                    freqs, power = spectrum
+                    peak = power.max()
+                    line.set_data(freqs * 60.0, power / peak if peak > 0 else power)
+
+        limits_changed = False # Perubahan batas sumbu membutuhkan redraw penuh
+
+        # --- Menyesuaikan batas sumbu Y secara histeresis ---
+        # Min dan max dihitung per sinyal dengan NumPy, tanpa menggabungkan data ke list baru
+        bounds = [(np.min(sig), np.max(sig)) for sig in (resp_signal, rppg_signal) if len(sig) > 0]
+        if bounds: # Jika ada data Y
+            min_y = min(b[0] for b in bounds) # Cari nilai minimum
+            max_y = max(b[1] for b in bounds) # Cari nilai maksimum
+            new_ylim = self._hysteretic_ylim(min_y, max_y)
+            if new_ylim is not None:
+                self.ax.set_ylim(*new_ylim)
+                limits_changed = True
 
         # --- Mengatur batas sumbu X ---
         # Sumbu X akan mengikuti panjang sinyal terpanjang, hingga self.buffer_size.
-        # Prosesor sinyal menggunakan deque dengan maxlen=300, jadi data yang ditampilkan
+        # Prosesor sinyal menggunakan ring buffer berkapasitas 300, jadi data yang ditampilkan
         # adalah 300 sampel terakhir jika sinyal lebih panjang dari itu.
-        # Xlim di sini disesuaikan dengan panjang data aktual yang ada di buffer sinyal yang dikirim ke update.
-        max_len_signal = 0
-        if resp_signal: max_len_signal = max(max_len_signal, len(resp_signal)) #
-        if rppg_signal: max_len_signal = max(max_len_signal, len(rppg_signal)) #
-        
-        # Batas atas sumbu X akan menjadi antara buffer_size atau panjang sinyal maksimum saat ini,
-        # mana yang lebih besar, untuk mengakomodasi semua data yang ada jika kurang dari buffer_size,
-        # atau tetap pada buffer_size jika data lebih banyak (karena data lama sudah dibuang oleh deque).
-        # Namun, karena deque sudah membatasi jumlah data, max_len_signal tidak akan melebihi buffer_size (300).
-        # Jadi, kita bisa menyederhanakannya:
-        current_xlim_max = max(self.buffer_size, max_len_signal) if max_len_signal > 0 else self.buffer_size
-        # Hanya update xlim jika batasnya berubah untuk efisiensi
-        if current_xlim_max != self.ax.get_xlim()[1] or self.ax.get_xlim()[1] == 0: # Periksa juga jika xlim[1] masih 0 (inisial)
-            self.ax.set_xlim(0, current_xlim_max if current_xlim_max > 0 else self.buffer_size) #
-
-        # Menggambar ulang canvas hanya jika ada perubahan (draw_idle lebih efisien)
-        self.canvas.draw_idle() #
+        max_len_signal = max(len(resp_signal), len(rppg_signal))
+        current_xlim_max = max(self.buffer_size, max_len_signal)
+        # Hanya update xlim jika batasnya berubah
+        if current_xlim_max != self.ax.get_xlim()[1]:
+            self.ax.set_xlim(0, current_xlim_max)
+            limits_changed = True
+
+        if not self.blit:
+            # Menggambar ulang canvas hanya jika ada perubahan (draw_idle lebih efisien)
+            self.canvas.draw_idle() #
+        elif limits_changed or self.background is None:
+            # Redraw penuh (jarang): latar belakang baru di-cache dan garis digambar oleh `_on_draw`
+            self.canvas.draw()
+        else:
+            # Jalur cepat: pulihkan latar belakang lalu gambar ulang hanya kedua garis
+            self.canvas.restore_region(self.background)
+            self._draw_lines()
+            # Dengan plot spektrum, semua axes berubah sehingga seluruh figure di-blit
+            self.canvas.blit(self.fig.bbox if self.spectrum_lines else self.ax.bbox)
+        return True
+
+    def _hysteretic_ylim(self, min_y, max_y):
+        """
+        Menentukan batas sumbu Y baru hanya jika data keluar dari batas saat ini atau
+        rentangnya menyusut jauh (kurang dari sepertiga tinggi sumbu). Data flat yang berada di
+        dalam batas tidak memicu rescale, karena batas untuk data flat selalu memakai padding tetap.
+
+        Args:
+            min_y (float): Nilai minimum data.
+            max_y (float): Nilai maksimum data.
+
+        Returns:
+            tuple or None: Batas (bawah, atas) baru, atau None jika batas saat ini masih cocok.
+        """
+        low, high = self.ax.get_ylim()
+        span = max_y - min_y
+        inside = low <= min_y and max_y <= high
+        if inside and (span == 0 or span * 3 >= high - low):
+            return None # Data masih di dalam pita (atau flat); tidak perlu rescale
+        # Padding 25% memberi ruang agar fluktuasi kecil tidak langsung memicu rescale lagi
+        padding_y = span * 0.25
+        if padding_y == 0: padding_y = 5 # Padding minimal jika data Y flat (semua nilainya sama)
+        return min_y - padding_y, max_y + padding_y
+
+    def _draw_lines(self):
+        """
+        Menggambar kedua garis sinyal dan garis spektrum (artist animated) di atas latar belakang.
+        """
+        self.ax.draw_artist(self.respiration_line)
+        self.ax.draw_artist(self.rppg_line)
+        for line in self.spectrum_lines:
+            line.axes.draw_artist(line)
+
+    def _on_draw(self, event):
+        """
+        Handler `draw_event`: menyimpan latar belakang statis setelah redraw penuh,
+        lalu menggambar garis di atasnya.
+
+        Args:
+            event (matplotlib.backend_bases.DrawEvent): Event redraw Matplotlib.
+        """
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_lines()
+
+    def _x_for(self, signal):
+        """
+        Mengembalikan array indeks X untuk sinyal, tanpa alokasi baru jika panjangnya <= buffer_size.
+
+        Args:
+            signal (list/numpy.ndarray): Sinyal yang akan di-plot.
+
+        Returns:
+            numpy.ndarray: Indeks frame 0..len(signal)-1.
+        """
+        n = len(signal)
+        if n <= len(self.x_index):
+            return self.x_index[:n] # View dari array indeks yang sudah dialokasikan
+        return np.arange(n)
 
     def clear_plots(self):
         """
@@ -160,11 +295,14 @@ class Visualization:
         # Mengosongkan data pada garis sinyal rPPG
         self.rppg_line.set_xdata([]) #
         self.rppg_line.set_ydata([]) #
+        for line in self.spectrum_lines:
+            line.set_data([], []) # Mengosongkan garis spektrum
         
         # Mereset batas sumbu Y ke nilai default
         self.ax.set_ylim(0, 255) #
         # Mereset batas sumbu X ke nilai default (buffer_size)
         self.ax.set_xlim(0, self.buffer_size) #
+        self.last_update = None # Update berikutnya langsung digambar
         
         # Menggambar ulang canvas untuk menampilkan plot yang kosong
         self.canvas.draw_idle() #
\ No newline at end of file
@@ -1,31 +1,35 @@
-import cv2 # Mengimpor OpenCV untuk fungsionalitas terkait kamera
+from frame_source import open_source, session_recording_path, RecordingSource # Mengimpor lapisan sumber frame (kamera, file, rekaman)
 
-def start_video_capture(camera_index=0):
+def start_video_capture(camera_index=0, realtime=True, record_path=None):
     """
-    Menginisialisasi dan mengembalikan objek VideoCapture dari OpenCV.
+    Menginisialisasi dan mengembalikan sumber frame untuk monitoring.
 
-    Fungsi ini mencoba untuk membuka koneksi ke kamera yang ditentukan oleh `camera_index`,
-    dan mengatur properti lebar dan tinggi frame kamera.
+    Secara default membuka kamera yang ditentukan oleh `camera_index` pada 640x480. Selain
+    indeks kamera, sumber juga dapat berupa file video, direktori/pola urutan gambar, atau
+    rekaman mentah .vraw (lihat `frame_source.open_source`), sehingga dashboard dapat
+    dijalankan tanpa webcam.
 
     Args:
-        camera_index (int, optional): Indeks kamera yang akan digunakan.
-                                      Defaultnya adalah 0 (biasanya kamera internal/default).
+        camera_index (int or str, optional): Indeks kamera atau spesifikasi sumber lain.
+                                             Defaultnya adalah 0 (biasanya kamera internal/default).
+        realtime (bool, optional): Untuk sumber rekaman: putar dengan tempo asli (True) atau
+                                   secepat mungkin (False). Defaultnya adalah True.
+        record_path (str, optional): Jika diberikan, setiap frame yang dibaca beserta timestamp
+                                     capture-nya direkam ke file .vraw baru dengan nama ini ditambah
+                                     stempel waktu sesi (lihat `session_recording_path`).
 
     Returns:
-        cv2.VideoCapture or None: Objek VideoCapture jika kamera berhasil dibuka,
-                                  None jika gagal.
+        FrameSource or None: Sumber frame jika berhasil dibuka, None jika gagal.
     """
-    # Membuat objek VideoCapture untuk kamera dengan indeks yang diberikan
-    cap = cv2.VideoCapture(camera_index) #
-    
-    # Mengatur lebar frame yang diinginkan dari kamera
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640) #
-    # Mengatur tinggi frame yang diinginkan dari kamera
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480) #
-    
-    # Periksa apakah kamera berhasil dibuka
+    # Membuka sumber frame (kamera 640x480 untuk indeks angka)
+    cap = open_source(camera_index, realtime=realtime) #
+
+    # Periksa apakah sumber berhasil dibuka
     if not cap.isOpened():
-        print(f"Error: Tidak dapat membuka kamera dengan indeks {camera_index}.")
-        return None # Kembalikan None jika gagal membuka kamera
-        
-    return cap # Kembalikan objek VideoCapture yang berhasil diinisialisasi
\ No newline at end of file
+        print(f"Error: Tidak dapat membuka sumber video {camera_index}.")
+        cap.release()
+        return None # Kembalikan None jika gagal membuka sumber
+
+    if record_path:
+        cap = RecordingSource(cap, session_recording_path(record_path)) # Rekam sesi ke file baru sambil monitoring
+    return cap # Kembalikan sumber frame yang berhasil diinisialisasi
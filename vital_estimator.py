@@ -0,0 +1,244 @@
+from collections import namedtuple # Mengimpor namedtuple untuk struktur hasil estimasi
+import numpy as np # Mengimpor NumPy untuk FFT dan operasi array
+
+from signal_utils import butter_bandpass_filter, resample_uniform, sampling_jitter # Filter bandpass dan grid waktu seragam
+
+# Pita frekuensi fisiologis (Hz)
+HEART_RATE_BAND = (0.7, 4.0) # 42-240 denyut per menit
+RESPIRATION_BAND = (0.1, 0.5) # 6-30 napas per menit
+
+# Hasil satu estimasi laju:
+# - rate: laju per menit (BPM atau napas/menit)
+# - frequency: frekuensi puncak spektrum (Hz)
+# - snr: rasio daya puncak terhadap sisa pita (dB)
+# - confidence: fraksi daya pita yang berada di sekitar puncak (0-1)
+# - fs: frekuensi sampling efektif jendela (Hz)
+# - timestamp: timestamp sampel terakhir di jendela
+RateEstimate = namedtuple("RateEstimate", ["rate", "frequency", "snr", "confidence", "fs", "timestamp"])
+
+
+class RateEstimator:
+    """
+    Estimator laju (denyut jantung atau pernapasan) berbasis spektrum pada jendela geser.
+
+    Setiap `hop_sec` detik, sampel dalam `window_sec` detik terakhir difilter bandpass
+    (`signal_utils.butter_bandpass_filter`), diberi jendela Hann, lalu dianalisis dengan
+    satu FFT real ter-vektorisasi. Frekuensi sampling diambil dari timestamp sampel,
+    bukan diasumsikan, sehingga estimasi tetap tepat walaupun laju frame berubah. Jika jarak sampel
+    tidak seragam (frame terlewat atau tertunda saat laju target tidak tercapai), jendela lebih dulu
+    diinterpolasi ke grid waktu seragam sebelum difilter.
+
+    Jika penanda artefak gerakan disertakan (lihat `signal_quality.MotionGate`), jendela yang terlalu
+    banyak tertandai dilewati (estimasi terakhir dipertahankan dan `gated` bernilai True), sedangkan
+    sampel tertandai yang sedikit diganti interpolasi linear dari sampel bersih di sekitarnya.
+    """
+    def __init__(self, lowcut, highcut, window_sec=10.0, min_window_sec=5.0, hop_sec=1.0,
+                 filter_order=3, peak_width_hz=None, max_flagged_fraction=0.2, max_jitter=0.5):
+        """
+        Konstruktor untuk kelas RateEstimator.
+
+        Args:
+            lowcut (float): Batas bawah pita frekuensi (Hz).
+            highcut (float): Batas atas pita frekuensi (Hz).
+            window_sec (float, optional): Panjang jendela analisis (detik). Defaultnya adalah 10.0.
+            min_window_sec (float, optional): Durasi data minimum sebelum estimasi pertama (detik). Defaultnya adalah 5.0.
+            hop_sec (float, optional): Selang waktu antar estimasi (detik). Defaultnya adalah 1.0.
+            filter_order (int, optional): Orde filter Butterworth. Defaultnya adalah 3.
+            peak_width_hz (float, optional): Setengah lebar area puncak untuk perhitungan SNR (Hz).
+                                             Default: resolusi frekuensi jendela (1 / durasi).
+            max_flagged_fraction (float, optional): Fraksi sampel tertandai maksimum dalam jendela; di atasnya
+                                                    jendela dilewati. Defaultnya adalah 0.2.
+            max_jitter (float, optional): Deviasi interval sampling maksimum (relatif terhadap median interval)
+                                          sebelum jendela diinterpolasi ke grid seragam. Defaultnya adalah 0.5.
+        """
+        self.lowcut = lowcut # Batas bawah pita (Hz)
+        self.highcut = highcut # Batas atas pita (Hz)
+        self.window_sec = window_sec # Panjang jendela analisis
+        self.min_window_sec = min_window_sec # Durasi minimum data
+        self.hop_sec = hop_sec # Selang waktu antar estimasi
+        self.filter_order = filter_order # Orde filter bandpass
+        self.peak_width_hz = peak_width_hz # Setengah lebar area puncak
+        self.max_flagged_fraction = max_flagged_fraction # Batas fraksi sampel tertandai per jendela
+        self.max_jitter = max_jitter # Batas ketidakseragaman interval sebelum interpolasi ke grid seragam
+        self.reset()
+
+    def reset(self):
+        """
+        Menghapus estimasi terakhir. Dipanggil sebelum memulai sesi monitoring baru.
+        """
+        self.latest = None # Estimasi terakhir (RateEstimate atau None)
+        self._next_update = None # Waktu (timestamp sampel) estimasi berikutnya boleh dijalankan
+        self.gated = False # True jika jendela terakhir dilewati karena artefak gerakan
+        self.flagged_fraction = 0.0 # Fraksi sampel tertandai pada jendela terakhir yang diperiksa
+        self.skipped_windows = 0 # Jumlah jendela yang dilewati karena artefak gerakan
+        self.resampled = False # True jika jendela estimasi terakhir diinterpolasi ke grid seragam
+
+    def _window_start(self, timestamps):
+        """
+        Indeks sampel pertama di dalam jendela `window_sec` terakhir.
+        """
+        return int(np.searchsorted(timestamps, timestamps[-1] - self.window_sec))
+
+    def update(self, values, timestamps, flags=None):
+        """
+        Menjalankan estimasi jika sudah waktunya (berdasarkan `hop_sec`), lalu mengembalikan estimasi terakhir.
+
+        Dapat dipanggil setiap frame; perhitungan spektrum hanya dilakukan sekali per hop.
+
+        Args:
+            values (numpy.ndarray): Nilai sinyal, urut dari yang tertua (misalnya `signal_buffer.values()`).
+            timestamps (numpy.ndarray): Timestamp setiap nilai (detik).
+            flags (numpy.ndarray, optional): Penanda artefak per nilai (bukan nol = tertandai), selaras
+                                             dengan `values`. Default: semua sampel dianggap bersih.
+
+        Returns:
+            RateEstimate or None: Estimasi terakhir, atau None jika belum ada.
+        """
+        if len(timestamps) == 0:
+            return self.latest
+        now = timestamps[-1] # Waktu sampel terbaru
+        if self._next_update is not None and now < self._next_update:
+            return self.latest # Belum waktunya estimasi berikutnya
+        if flags is not None:
+            # Periksa kualitas jendela sebelum filter dan FFT; jendela yang rusak tidak dihitung sama sekali
+            # dan dicoba lagi pada hop berikutnya
+            window_flags = np.asarray(flags)[self._window_start(timestamps):]
+            self.flagged_fraction = float(np.count_nonzero(window_flags)) / max(len(window_flags), 1)
+            self.gated = self.flagged_fraction > self.max_flagged_fraction
+            if self.gated:
+                self.skipped_windows += 1
+                self._next_update = now + self.hop_sec
+                return self.latest
+        estimate = self.estimate(values, timestamps, flags)
+        if estimate is not None:
+            self.latest = estimate
+        # Jendela yang gagal (misalnya sampel belum cukup) juga baru dicoba lagi pada hop berikutnya
+        self._next_update = now + self.hop_sec
+        return self.latest
+
+    def estimate(self, values, timestamps, flags=None):
+        """
+        Menghitung estimasi laju dari jendela terakhir secara langsung (tanpa memperhatikan hop).
+
+        Args:
+            values (numpy.ndarray): Nilai sinyal, urut dari yang tertua.
+            timestamps (numpy.ndarray): Timestamp setiap nilai (detik).
+            flags (numpy.ndarray, optional): Penanda artefak per nilai (bukan nol = tertandai), selaras dengan
+                                             `values`. Sampel tertandai diinterpolasi dari sampel bersih.
+
+        Returns:
+            RateEstimate or None: Hasil estimasi, atau None jika data belum cukup atau jendela
+                                  terlalu banyak tertandai.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(values) < 2:
+            return None
+
+        # Ambil sampel dalam jendela window_sec terakhir
+        start = self._window_start(timestamps)
+        x = values[start:]
+        t = timestamps[start:]
+        duration = t[-1] - t[0]
+        if duration < self.min_window_sec or len(x) <= 3 * (2 * self.filter_order + 1):
+            return None # Data belum cukup panjang untuk filter dan resolusi frekuensi
+        if flags is not None:
+            bad = np.asarray(flags)[start:] != 0 # Sampel tertandai artefak di dalam jendela
+            if bad.any():
+                if bad.mean() > self.max_flagged_fraction:
+                    return None # Jendela didominasi artefak gerakan
+                # Lonjakan diganti interpolasi agar tidak mendominasi spektrum
+                x = x.copy()
+                x[bad] = np.interp(t[bad], t[~bad], x[~bad])
+        fs = (len(t) - 1) / duration # Frekuensi sampling efektif dari timestamp
+        self.resampled = sampling_jitter(t) > self.max_jitter
+        if self.resampled:
+            # Frame terlewat/tertunda: filter dan FFT membutuhkan jarak sampel yang sama
+            x, t = resample_uniform(x, t, fs)
+
+        highcut = min(self.highcut, 0.45 * fs) # Batas atas harus di bawah frekuensi Nyquist
+        if highcut <= self.lowcut:
+            return None
+
+        # Filter bandpass untuk meredam tren lambat dan noise frekuensi tinggi
+        filtered = butter_bandpass_filter(x - np.mean(x), self.lowcut, highcut, fs, order=self.filter_order)
+
+        # Spektrum daya dengan jendela Hann dan zero-padding untuk interpolasi frekuensi
+        nfft = max(1024, 1 << int(np.ceil(np.log2(len(filtered) * 4))))
+        spectrum = np.fft.rfft(filtered * np.hanning(len(filtered)), n=nfft)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        freqs = np.fft.rfftfreq(nfft, d=1.0 / fs)
+
+        band = (freqs >= self.lowcut) & (freqs <= highcut) # Indeks frekuensi di dalam pita
+        band_power = power[band]
+        if band_power.size == 0 or band_power.sum() <= 0:
+            return None
+        band_freqs = freqs[band]
+        peak = int(np.argmax(band_power))
+        frequency = band_freqs[peak]
+
+        # Interpolasi parabola di sekitar puncak untuk frekuensi yang lebih halus
+        if 0 < peak < len(band_power) - 1:
+            a, b, c = np.log(band_power[peak - 1:peak + 2] + 1e-20)
+            denom = a - 2 * b + c
+            if denom != 0:
+                frequency += 0.5 * (a - c) / denom * (freqs[1] - freqs[0])
+
+        # SNR: daya di sekitar puncak dibandingkan sisa daya di dalam pita
+        half_width = self.peak_width_hz or 1.0 / duration
+        near_peak = np.abs(band_freqs - band_freqs[peak]) <= half_width
+        signal_power = band_power[near_peak].sum()
+        noise_power = band_power[~near_peak].sum()
+        total_power = signal_power + noise_power
+        snr = 10.0 * np.log10(signal_power / noise_power) if noise_power > 0 else float("inf")
+        confidence = signal_power / total_power
+
+        return RateEstimate(rate=float(60.0 * frequency), frequency=float(frequency), snr=float(snr),
+                            confidence=float(confidence), fs=float(fs), timestamp=float(timestamps[-1]))
+
+    def update_from_buffer(self, buffer, flag_buffer=None):
+        """
+        Menjalankan `update` langsung dari `TimestampedRingBuffer` milik prosesor.
+
+        Args:
+            buffer (TimestampedRingBuffer): Buffer sinyal (misalnya `processor.signal_buffer`).
+            flag_buffer (TimestampedRingBuffer, optional): Buffer penanda artefak yang diisi bersamaan dengan
+                                                           `buffer` (misalnya `processor.artifact_buffer`).
+
+        Returns:
+            RateEstimate or None: Estimasi terakhir, atau None jika belum ada.
+        """
+        flags = None
+        if flag_buffer is not None and len(flag_buffer) >= len(buffer):
+            flags = flag_buffer.values(len(buffer)) # Penanda sampel yang masih ada di buffer sinyal
+        return self.update(buffer.values(), buffer.timestamps(), flags)
+
+
+def heart_rate_estimator(**kwargs):
+    """
+    Membuat RateEstimator untuk denyut jantung dari sinyal rPPG (pita 0.7-4 Hz).
+
+    Args:
+        **kwargs: Parameter tambahan untuk RateEstimator (misalnya window_sec, hop_sec).
+
+    Returns:
+        RateEstimator: Estimator denyut jantung.
+    """
+    params = {"window_sec": 10.0, "min_window_sec": 5.0}
+    params.update(kwargs)
+    return RateEstimator(*HEART_RATE_BAND, **params)
+
+
+def respiration_rate_estimator(**kwargs):
+    """
+    Membuat RateEstimator untuk laju pernapasan dari sinyal pernapasan (pita 0.1-0.5 Hz).
+
+    Args:
+        **kwargs: Parameter tambahan untuk RateEstimator (misalnya window_sec, hop_sec).
+
+    Returns:
+        RateEstimator: Estimator laju pernapasan.
+    """
+    params = {"window_sec": 30.0, "min_window_sec": 8.0, "filter_order": 2}
+    params.update(kwargs)
+    return RateEstimator(*RESPIRATION_BAND, **params)
@@ -0,0 +1,478 @@
+import argparse # Mengimpor argparse untuk antarmuka baris perintah
+import json # Mengimpor json untuk respons API
+import os # Mengimpor os untuk jumlah core CPU
+import sys # Mengimpor sys untuk kode keluar program
+import threading # Mengimpor threading untuk thread capture, worker inferensi, dan server HTTP
+import time # Mengimpor time untuk timestamp dan pembatasan laju frame
+from collections import deque # Mengimpor deque untuk antrian stream yang siap diproses (round-robin)
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # Server HTTP lokal (pustaka standar)
+from urllib.parse import parse_qs, urlparse # Mengurai path dan parameter query API
+
+from frame_pipeline import LatestQueue, StageStats # Antrian drop-oldest per stream dan statistik tahap
+from frame_source import open_source # Membuka kamera, file video, urutan gambar, atau rekaman .vraw
+from inference_frame import InferenceFrame # Cache konversi RGB/grayscale per frame
+from respirasi_processor import RespirationProcessor # Untuk memproses sinyal pernapasan
+from rppg_processor import RPPGProcessor # Untuk memproses sinyal rPPG
+from rppg_methods import RPPG_METHODS # Metode ekstraksi sinyal rPPG yang tersedia
+from respiration_methods import RESPIRATION_METHODS # Metode ekstraksi sinyal pernapasan yang tersedia
+from face_mesh_roi import FACE_ROI_MODES # Mode ROI wajah rPPG yang tersedia
+from vital_estimator import heart_rate_estimator, respiration_rate_estimator # Estimator laju jantung dan pernapasan
+
+# Jumlah sampel sinyal default yang dikirim oleh endpoint /streams/<id>/signals
+DEFAULT_SIGNAL_SAMPLES = 300
+
+
+class WorkerLocalModel:
+    """
+    Proksi model MediaPipe yang memiliki satu instance per thread worker.
+
+    Prosesor setiap stream memegang proksi ini sebagai model Pose/Face Detection-nya. Saat
+    `process` dipanggil, proksi meneruskannya ke instance milik thread worker yang sedang
+    memproses stream tersebut (dibuat sekali per worker saat pertama dipakai), sehingga jumlah
+    model sama dengan jumlah worker, bukan jumlah stream, dan tidak ada model yang dipakai dua
+    thread sekaligus.
+    """
+    def __init__(self, factory):
+        """
+        Konstruktor untuk kelas WorkerLocalModel.
+
+        Args:
+            factory (callable): Fungsi tanpa argumen yang membuat instance model baru.
+        """
+        self.factory = factory # Pembuat model
+        self._local = threading.local() # Instance model per thread
+
+    def process(self, image):
+        """
+        Menjalankan model milik thread pemanggil pada `image`.
+        """
+        model = getattr(self._local, "model", None)
+        if model is None:
+            model = self._local.model = self.factory()
+        return model.process(image)
+
+
+def _pose_factory():
+    """
+    Model Pose untuk worker. Mode gambar statis dipakai karena frame berurutan yang diterima satu
+    worker dapat berasal dari stream yang berbeda, sehingga pelacakan landmark antar frame MediaPipe
+    tidak berlaku (pelacakan ROI tetap dilakukan per stream oleh `ROITracker`).
+    """
+    import mediapipe as mp # Impor tertunda hingga model worker pertama dibuat
+    return mp.solutions.pose.Pose(static_image_mode=True, min_detection_confidence=0.5)
+
+
+def _face_factory():
+    """
+    Model Face Detection untuk worker (tanpa state antar frame).
+    """
+    import mediapipe as mp # Impor tertunda hingga model worker pertama dibuat
+    return mp.solutions.face_detection.FaceDetection(min_detection_confidence=0.5)
+
+
+def _face_mesh_factory():
+    """
+    Model Face Mesh untuk worker (mode ROI "mesh"). Mode gambar statis dipakai dengan alasan yang sama
+    seperti `_pose_factory`; masker kulit tetap di-cache per stream oleh `SkinMask`.
+    """
+    import mediapipe as mp # Impor tertunda hingga model worker pertama dibuat
+    return mp.solutions.face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1, refine_landmarks=False,
+                                           min_detection_confidence=0.5)
+
+
+class MonitoredStream:
+    """
+    Satu sumber frame yang dipantau: thread capture, frame terbaru, prosesor, dan estimasi lajunya.
+
+    Thread capture hanya menyimpan frame terbaru (`LatestQueue` berukuran 1, drop-oldest), sehingga
+    stream yang tertinggal tidak menumpuk antrian (backpressure per stream) dan frame yang dibuang
+    tercatat. State sinyal (buffer, ROI, pelacak) milik stream; model MediaPipe milik worker.
+    """
+    def __init__(self, stream_id, spec, pose, face_detector, max_fps=15.0, detect_interval=5,
+                 inference_scale=0.5, rppg_method="pos", realtime=True, respiration_method="intensity",
+                 face_roi="box", face_mesh=None):
+        """
+        Konstruktor untuk kelas MonitoredStream.
+
+        Args:
+            stream_id (str): ID stream pada API.
+            spec (int or str): Spesifikasi sumber untuk `open_source` (indeks kamera, file, atau rekaman).
+            pose (WorkerLocalModel): Proksi model Pose milik worker.
+            face_detector (WorkerLocalModel): Proksi model Face Detection milik worker.
+            max_fps (float, optional): Laju frame maksimum yang diproses; frame di atas laju ini dilewati
+                                       saat capture. Defaultnya adalah 15.0.
+            detect_interval (int, optional): Deteksi MediaPipe penuh setiap N frame. Defaultnya adalah 5.
+            inference_scale (float, optional): Skala resolusi untuk inferensi MediaPipe. Defaultnya adalah 0.5.
+            rppg_method (str, optional): Metode ekstraksi sinyal rPPG. Defaultnya adalah "pos".
+            realtime (bool, optional): Putar sumber rekaman dengan tempo asli. Defaultnya adalah True.
+            respiration_method (str, optional): Metode ekstraksi sinyal pernapasan. Defaultnya adalah "intensity".
+            face_roi (str, optional): Mode ROI wajah rPPG ("box", "mesh"). Defaultnya adalah "box".
+            face_mesh (WorkerLocalModel, optional): Proksi model Face Mesh milik worker untuk mode "mesh".
+        """
+        self.id = stream_id # ID stream
+        self.spec = spec # Spesifikasi sumber
+        self.max_fps = max_fps # Laju frame maksimum yang diproses
+        self.realtime = realtime # Tempo replay sumber rekaman
+        self.frames = LatestQueue(maxsize=1) # Frame terbaru yang menunggu diproses
+        self.respiration_processor = RespirationProcessor(detect_interval=detect_interval, inference_scale=inference_scale,
+                                                          pose=pose, method=respiration_method)
+        self.rppg_processor = RPPGProcessor(detect_interval=detect_interval, inference_scale=inference_scale,
+                                            method=rppg_method, fs=max_fps, face_detector=face_detector,
+                                            roi_mode=face_roi, face_mesh=face_mesh)
+        self.heart_rate_estimator = heart_rate_estimator(hop_sec=1.0) # Estimator detak jantung stream ini
+        self.respiration_rate_estimator = respiration_rate_estimator(hop_sec=1.0) # Estimator laju pernapasan stream ini
+        self.heart_rate = None # Estimasi detak jantung terakhir
+        self.respiration_rate = None # Estimasi laju pernapasan terakhir
+        self.capture_stats = StageStats("capture") # Frame yang diterima dari sumber
+        self.process_stats = StageStats("inferensi") # Frame yang selesai diproses worker
+        self.lock = threading.Lock() # Melindungi buffer sinyal dan estimasi saat dibaca API
+        self.status = "memulai" # memulai, berjalan, selesai, atau gagal
+        self.scheduled = False # True jika stream sedang antre atau diproses worker (dikelola penjadwal)
+        self.thread = None # Thread capture
+
+    def capture_loop(self, running, on_frame):
+        """
+        Loop thread capture: membaca frame, melewati frame di atas `max_fps`, dan menyimpan frame terbaru.
+
+        Args:
+            running (threading.Event): Capture berhenti saat event ini dihapus.
+            on_frame (callable): Dipanggil dengan stream ini setiap ada frame baru (untuk penjadwal).
+        """
+        source = open_source(self.spec, realtime=self.realtime)
+        if not source.isOpened():
+            print(f"Error: Tidak dapat membuka sumber {self.spec} (stream {self.id}).")
+            source.release()
+            self.status = "gagal"
+            return
+        self.status = "berjalan"
+        min_interval = 1.0 / self.max_fps if self.max_fps else 0.0
+        last_kept = None
+        try:
+            while running.is_set():
+                start = time.monotonic()
+                ret, frame, timestamp = source.read_timestamped()
+                if not ret:
+                    break # Sumber berakhir (file atau rekaman)
+                # Toleransi 5% agar sumber 30 fps dengan target 15 fps tepat mengambil setiap frame kedua
+                if last_kept is not None and timestamp - last_kept < 0.95 * min_interval:
+                    continue # Di atas laju target: dilewati tanpa dihitung sebagai drop
+                last_kept = timestamp
+                self.capture_stats.record(time.monotonic() - start)
+                self.frames.put((frame, timestamp)) # Frame lama yang belum diproses dibuang
+                on_frame(self)
+        finally:
+            source.release()
+            if self.status == "berjalan":
+                self.status = "selesai"
+
+    def process(self, frame, timestamp):
+        """
+        Memproses satu frame dengan kedua prosesor lalu memperbarui estimasi laju. Dipanggil oleh worker.
+        """
+        start = time.monotonic()
+        shared = InferenceFrame(frame) # Konversi RGB/grayscale dibagikan kedua prosesor
+        with self.lock:
+            self.respiration_processor.analyze(frame, timestamp, shared)
+            self.rppg_processor.analyze(frame, timestamp, shared)
+            self.heart_rate = self.heart_rate_estimator.update_from_buffer(
+                self.rppg_processor.signal_buffer, self.rppg_processor.artifact_buffer)
+            self.respiration_rate = self.respiration_rate_estimator.update_from_buffer(
+                self.respiration_processor.signal_buffer, self.respiration_processor.artifact_buffer)
+        self.process_stats.record(time.monotonic() - start)
+
+    def summary(self):
+        """
+        Ringkasan status stream untuk API.
+
+        Returns:
+            dict: Status, laju frame, jumlah frame yang dibuang, latensi, dan estimasi laju terakhir.
+        """
+        capture = self.capture_stats.snapshot()
+        processed = self.process_stats.snapshot()
+        with self.lock:
+            hr, rr = self.heart_rate, self.respiration_rate
+            # True jika jendela estimasi terakhir dilewati karena artefak gerakan (estimasi lama dipertahankan)
+            motion = {"heart_rate": self.heart_rate_estimator.gated,
+                      "respiration_rate": self.respiration_rate_estimator.gated}
+        return {
+            "id": self.id,
+            "source": str(self.spec),
+            "status": self.status,
+            "capture_fps": round(capture["fps"], 2),
+            "processed_fps": round(processed["fps"], 2),
+            "processed_frames": processed["count"],
+            "dropped_frames": self.frames.dropped,
+            "process_ms": round(processed["mean_ms"], 2),
+            "heart_rate": _estimate_dict(hr),
+            "respiration_rate": _estimate_dict(rr),
+            "motion_gated": motion,
+        }
+
+    def signals(self, n=DEFAULT_SIGNAL_SAMPLES):
+        """
+        Salinan `n` sampel sinyal terakhir beserta timestamp-nya untuk API.
+        """
+        with self.lock:
+            resp = self.respiration_processor.signal_buffer
+            rppg = self.rppg_processor.signal_buffer
+            return {
+                "id": self.id,
+                "respiration": {"t": resp.timestamps(n).tolist(), "value": resp.values(n).tolist()},
+                "rppg": {"t": rppg.timestamps(n).tolist(), "value": rppg.values(n).tolist()},
+            }
+
+
+def _estimate_dict(estimate):
+    """
+    Mengubah RateEstimate menjadi dict JSON (None jika belum ada estimasi).
+    """
+    if estimate is None:
+        return None
+    return {"rate": round(estimate.rate, 2), "snr_db": round(estimate.snr, 2),
+            "confidence": round(estimate.confidence, 3), "timestamp": estimate.timestamp}
+
+
+class VitalServer:
+    """
+    Layanan headless yang memantau banyak stream dengan satu pool worker inferensi.
+
+    Setiap stream memiliki thread capture sendiri yang hanya menyimpan frame terbaru. Stream yang
+    memiliki frame baru dimasukkan ke antrian siap (round-robin): worker mengambil stream terdepan,
+    memproses frame terbarunya, lalu mengembalikan stream ke belakang antrian jika frame baru sudah
+    datang. Satu stream tidak pernah diproses dua worker sekaligus (urutan sampel terjaga), dan
+    tidak ada stream yang dapat memonopoli worker. Sinyal dan estimasi setiap stream tersedia melalui
+    API HTTP lokal (lihat `ApiHandler`).
+    """
+    def __init__(self, sources, workers=None, max_fps=15.0, detect_interval=5, inference_scale=0.5,
+                 rppg_method="pos", realtime=True, respiration_method="intensity", face_roi="box"):
+        """
+        Konstruktor untuk kelas VitalServer.
+
+        Args:
+            sources (list): Spesifikasi sumber untuk setiap stream (indeks kamera, file, atau rekaman .vraw).
+            workers (int, optional): Jumlah worker inferensi. Default: jumlah core CPU, maksimal jumlah stream.
+            max_fps (float, optional): Laju frame maksimum yang diproses per stream. Defaultnya adalah 15.0.
+            detect_interval (int, optional): Deteksi MediaPipe penuh setiap N frame. Defaultnya adalah 5.
+            inference_scale (float, optional): Skala resolusi untuk inferensi MediaPipe. Defaultnya adalah 0.5.
+            rppg_method (str, optional): Metode ekstraksi sinyal rPPG. Defaultnya adalah "pos".
+            realtime (bool, optional): Putar sumber rekaman dengan tempo asli. Defaultnya adalah True.
+            respiration_method (str, optional): Metode ekstraksi sinyal pernapasan. Defaultnya adalah "intensity".
+            face_roi (str, optional): Mode ROI wajah rPPG ("box", "mesh"). Defaultnya adalah "box".
+        """
+        self.workers = workers or min(os.cpu_count() or 1, max(1, len(sources))) # Jumlah worker inferensi
+        # Satu instance Pose dan Face Detection per worker, dipakai bergantian oleh semua stream
+        pose = WorkerLocalModel(_pose_factory)
+        face_detector = WorkerLocalModel(_face_factory)
+        face_mesh = WorkerLocalModel(_face_mesh_factory) # Hanya dibuat di worker jika mode ROI "mesh" dipakai
+        self.streams = {} # ID stream -> MonitoredStream (urutan sesuai argumen)
+        for index, spec in enumerate(sources):
+            stream_id = str(index)
+            self.streams[stream_id] = MonitoredStream(stream_id, spec, pose, face_detector, max_fps=max_fps,
+                                                      detect_interval=detect_interval, inference_scale=inference_scale,
+                                                      rppg_method=rppg_method, realtime=realtime,
+                                                      respiration_method=respiration_method,
+                                                      face_roi=face_roi, face_mesh=face_mesh)
+        self._ready = deque() # Stream yang memiliki frame baru dan menunggu worker
+        self._cond = threading.Condition() # Sinkronisasi antrian siap
+        self.running = threading.Event() # Di-set selama layanan berjalan
+        self._threads = [] # Thread capture dan worker
+        self.httpd = None # Server HTTP API (None jika tidak dijalankan)
+
+    def _schedule(self, stream):
+        """
+        Dipanggil thread capture saat frame baru tersedia: masukkan stream ke antrian siap jika belum ada.
+        """
+        with self._cond:
+            if not stream.scheduled:
+                stream.scheduled = True
+                self._ready.append(stream)
+                self._cond.notify()
+
+    def _worker_loop(self):
+        """
+        Loop worker inferensi: ambil stream terdepan, proses frame terbarunya, lalu jadwalkan ulang.
+        """
+        while self.running.is_set():
+            with self._cond:
+                while not self._ready and self.running.is_set():
+                    self._cond.wait(0.5)
+                if not self._ready:
+                    continue
+                stream = self._ready.popleft()
+            item = stream.frames.get_latest()
+            if item is not None:
+                try:
+                    stream.process(*item)
+                except Exception as e:
+                    print(f"Error saat memproses stream {stream.id}: {e}")
+            with self._cond:
+                if len(stream.frames):
+                    self._ready.append(stream) # Frame baru datang selama diproses: antre di belakang
+                    self._cond.notify()
+                else:
+                    stream.scheduled = False
+
+    def start(self, host="127.0.0.1", port=8765):
+        """
+        Memulai thread capture, worker inferensi, dan (jika `port` tidak None) server API.
+
+        Args:
+            host (str, optional): Alamat server API. Defaultnya adalah "127.0.0.1" (hanya lokal).
+            port (int, optional): Port server API; None berarti tanpa API. Defaultnya adalah 8765.
+        """
+        self.running.set()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        for stream in self.streams.values():
+            stream.thread = threading.Thread(target=stream.capture_loop, args=(self.running, self._schedule),
+                                             name=f"capture-{stream.id}", daemon=True)
+            stream.thread.start()
+            self._threads.append(stream.thread)
+        if port is not None:
+            self.httpd = ThreadingHTTPServer((host, port), ApiHandler)
+            self.httpd.daemon_threads = True
+            self.httpd.vital_server = self # Diakses handler melalui self.server.vital_server
+            thread = threading.Thread(target=self.httpd.serve_forever, name="api", daemon=True)
+            thread.start()
+
+    def stop(self):
+        """
+        Menghentikan capture, worker, dan server API.
+        """
+        self.running.clear()
+        with self._cond:
+            self._cond.notify_all()
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def finished(self):
+        """
+        True jika semua stream sudah berakhir (misalnya semua file rekaman selesai diputar) dan tidak ada yang diproses.
+        """
+        with self._cond:
+            idle = not self._ready and not any(s.scheduled for s in self.streams.values())
+        return idle and all(s.status in ("selesai", "gagal") for s in self.streams.values())
+
+    def summary(self):
+        """
+        Ringkasan semua stream.
+
+        Returns:
+            dict: Jumlah worker dan daftar ringkasan stream.
+        """
+        return {"workers": self.workers, "streams": [s.summary() for s in self.streams.values()]}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """
+    API HTTP lokal (JSON, hanya GET):
+
+    - ``/streams``: ringkasan semua stream (status, fps, frame dibuang, estimasi laju).
+    - ``/streams/<id>``: ringkasan satu stream.
+    - ``/streams/<id>/signals?n=300``: sampel sinyal pernapasan dan rPPG terakhir beserta timestamp.
+    """
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        server = self.server.vital_server
+        if parts == ["streams"]:
+            return self._send(200, server.summary())
+        if len(parts) >= 2 and parts[0] == "streams" and parts[1] in server.streams:
+            stream = server.streams[parts[1]]
+            if len(parts) == 2:
+                return self._send(200, stream.summary())
+            if parts[2:] == ["signals"]:
+                query = parse_qs(url.query)
+                try:
+                    n = int(query.get("n", [DEFAULT_SIGNAL_SAMPLES])[0])
+                except ValueError:
+                    return self._send(400, {"error": "parameter n harus bilangan bulat"})
+                return self._send(200, stream.signals(n))
+        return self._send(404, {"error": f"tidak ditemukan: {url.path}"})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Permintaan API tidak dicetak ke konsol
+
+
+def format_status(summary):
+    """
+    Memformat ringkasan layanan menjadi teks status beberapa baris untuk konsol.
+    """
+    lines = []
+    for s in summary["streams"]:
+        hr = f"{s['heart_rate']['rate']:.0f} BPM" if s["heart_rate"] else "-"
+        rr = f"{s['respiration_rate']['rate']:.1f}/menit" if s["respiration_rate"] else "-"
+        lines.append(f"[{s['id']}] {s['status']:<8} {s['processed_fps']:5.1f} fps, {s['process_ms']:5.1f} ms, "
+                     f"drop {s['dropped_frames']:4d} | detak jantung {hr} | pernapasan {rr}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Titik masuk CLI: memantau beberapa sumber frame tanpa GUI dan menyajikan hasilnya lewat API lokal.
+
+    Args:
+        argv (list, optional): Argumen baris perintah. Default: sys.argv[1:].
+
+    Returns:
+        int: Kode keluar.
+    """
+    parser = argparse.ArgumentParser(description="Layanan monitoring multi-kamera tanpa GUI dengan API HTTP lokal.")
+    parser.add_argument("sources", nargs="+",
+                        help="Sumber frame: indeks kamera, file video, direktori/pola urutan gambar, atau rekaman .vraw")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Jumlah worker inferensi (default: jumlah core CPU, maksimal jumlah stream)")
+    parser.add_argument("--fps", type=float, default=15.0, help="Laju frame maksimum yang diproses per stream (default: 15)")
+    parser.add_argument("--host", default="127.0.0.1", help="Alamat server API (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port server API (default: 8765)")
+    parser.add_argument("--detect-interval", type=int, default=5,
+                        help="Deteksi MediaPipe penuh setiap N frame, ROI dilacak di antaranya (default: 5)")
+    parser.add_argument("--inference-scale", type=float, default=0.5,
+                        help="Skala resolusi untuk inferensi MediaPipe (default: 0.5)")
+    parser.add_argument("--rppg-method", choices=RPPG_METHODS, default="pos",
+                        help="Metode ekstraksi sinyal rPPG (default: pos)")
+    parser.add_argument("--respiration-method", choices=RESPIRATION_METHODS, default="intensity",
+                        help="Metode ekstraksi sinyal pernapasan: intensity, flow, atau landmark (default: intensity)")
+    parser.add_argument("--face-roi", choices=FACE_ROI_MODES, default="box",
+                        help="ROI wajah rPPG: box (sub-ROI persegi) atau mesh (masker kulit dari landmark Face Mesh) (default: box)")
+    parser.add_argument("--status-interval", type=float, default=5.0,
+                        help="Selang pencetakan status ke konsol dalam detik, 0 = tidak dicetak (default: 5)")
+    args = parser.parse_args(argv)
+
+    server = VitalServer(args.sources, workers=args.workers, max_fps=args.fps, detect_interval=args.detect_interval,
+                         inference_scale=args.inference_scale, rppg_method=args.rppg_method,
+                         respiration_method=args.respiration_method, face_roi=args.face_roi)
+    server.start(args.host, args.port)
+    print(f"{len(server.streams)} stream, {server.workers} worker. API: http://{args.host}:{args.port}/streams")
+    try:
+        last_status = time.monotonic()
+        while not server.finished():
+            time.sleep(0.2)
+            if args.status_interval and time.monotonic() - last_status >= args.status_interval:
+                last_status = time.monotonic()
+                print(format_status(server.summary()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(format_status(server.summary()))
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())